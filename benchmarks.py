@@ -0,0 +1,628 @@
+""" benchmarks.py
+
+This file contains the benchmark suite of the tracker's hot paths. Every benchmark runs against a
+synthetic history of 1k, 100k and 1M rows: loading the data from a fakedb stand-in for the
+pack table, the stats.py functions, the lookups behind the pack and cost list boxes, the name lookups
+of the sale and delete dialogs, reading a sorted filter through a copied frame or a RowView, and
+redrawing the player frame w/ each table engine. Some also keep how much memory they take, the
+growth in resident memory to hold the drawn rows, or the peak allocated reading the filter. The
+median of each run is compared against the baselines stored in BASELINE_FILE, and the suite exits
+w/ an error if any hot path got slower than the threshold allows
+
+This file contains classes:
+    * Fixture - Class holding the data, backend, and window one size of benchmarks runs against
+
+This file contains functions:
+    * measure( func, budget ) - times a function until the time budget is spent
+    * rss( ) - returns the resident memory of the process
+    * bench_load( fixture ), bench_calc_stats, bench_pack_box, bench_cost_box, bench_parallel - return
+      the function each benchmark times
+    * redraw_bench( engine ) - builds a benchmark of drawing every row w/ a player table engine
+    * sort_bench( cached ) - builds a benchmark of sorting every row then a filter by bin
+    * view_bench( frame ) - builds a benchmark of reading a sorted filter by frame or by RowView
+    * stats_bench( func ), dialog_bench( dialog ) - build benchmarks of a stats function or a dialog
+    * pair_bench( kernels, pack ) - builds a benchmark of the four stats, by frame or by kernel
+    * benchmarks( ) - returns every benchmark
+    * run( sizes, only, budget, render_limit ) - runs the benchmarks and returns their timings
+    * compare( results, baselines, threshold ) - returns the timings that regressed
+    * crossover( sizes, workers, budget ) - returns the rows the pool starts winning at
+    * main( ) - command line entry point
+
+    Members of Class Fixture:
+        * __init__( self, rows ) - generates the data of one size
+        * backend( self ) - returns a backend over a fake database holding the data
+        * tracker( self ) - returns a tracker loaded from that backend
+        * app( self ) - returns a GUI launched on the fake database
+        * close( self ) - destroys the window, if one was made
+
+Created October 19th, 2026.
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+import types
+
+import fakedb
+import parallel
+import stats
+import synthetic
+from config import COLUMNS, FIRST_ROWS
+
+# where baselines are stored, they only mean something on the machine that saved them
+BASELINE_FILE = "benchmarks.json"
+
+SIZES = [1000, 100000, 1000000]
+
+# a run is a regression when its median is this much slower than the baseline, and slower by
+# more than NOISE seconds so sub millisecond jitter is never reported
+THRESHOLD = 0.25
+NOISE = 0.001
+
+# seconds spent timing each benchmark at each size, every benchmark runs at least MIN_REPEATS times
+BUDGET = 2.0
+MIN_REPEATS = 3
+MAX_REPEATS = 100
+
+# a label grid of more rows than this takes minutes to draw, so larger sizes skip the redraw
+RENDER_LIMIT = 10000
+
+# the sizes --crossover times the breakdown at in process and on the pool
+CROSSOVER_SIZES = [100000, 200000, 400000, 700000, 1000000, 2000000, 3000000]
+
+
+def rss():
+    """ returns the resident memory of the process in bytes, or None where /proc is not available """
+
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+class Fixture:
+    """ The synthetic data one size of benchmarks runs against, and what is built from it on demand
+
+        __init__( self, rows )
+        rows - the number of rows of data
+    """
+
+    def __init__(self, rows):
+
+        self.rows = rows
+        self.data = synthetic.generate_frame(rows // 3 + 1, seed=0).head(rows)
+
+        self._backend = None
+        self._tracker = None
+        self._app = None
+
+    def backend(self):
+        """ returns a backend over a fake database holding the data
+        :returns: The backend
+        :rtype: tracker SQLBackend
+        """
+
+        if self._backend is None:
+            from tracker import SQLBackend
+
+            self.store = fakedb.FakeStore()
+            self.store.load(self.data)
+            self._backend = SQLBackend(self.store.connect())
+
+        return self._backend
+
+    def tracker(self):
+        """ returns a tracker loaded from the fake database
+        :returns: The tracker
+        :rtype: tracker PackTracker
+        """
+
+        if self._tracker is None:
+            from tracker import PackTracker
+
+            self._tracker = PackTracker(self.backend())
+
+        return self._tracker
+
+    def app(self):
+        """ returns a GUI launched on the fake database, w/ every row drawn
+        :returns: The app
+        :rtype: pack_tracking DisplayApp
+        """
+
+        if self._app is None:
+            from harness import launch
+
+            self.backend()
+            self._app = launch(self.store.connect)
+
+        return self._app
+
+    def close(self):
+        """ destroys the window, if one was made
+        :returns: None
+        :rtype: None
+        """
+
+        if self._app is not None:
+            self._app.lag.stop()
+            self._app.root.destroy()
+            self._app = None
+
+        return
+
+
+def measure(func, budget=BUDGET):
+    """ times a function until the budget is spent, w/ garbage collection paused like timeit
+    :param func: The function to time
+    :type func: Function
+    :param budget: (Default BUDGET) About how many seconds to spend
+    :type budget: Float
+    :returns: The median and fastest times, and how many times it ran
+    :rtype: Dictionary
+    """
+
+    times = []
+    spent = 0.0
+
+    while len(times) < MIN_REPEATS or (spent < budget and len(times) < MAX_REPEATS):
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            func()
+            took = time.perf_counter() - start
+        finally:
+            gc.enable()
+
+        times.append(took)
+        spent += took
+
+    return {"median": statistics.median(times), "min": min(times), "repeats": len(times)}
+
+
+def bench_load(fixture):
+    """ loadData, reading and stripping every row of the fake database """
+    tracker = fixture.tracker()
+    return tracker.loadData
+
+
+def stats_bench(func):
+    """ returns a benchmark of one stats.py function over all of the data """
+
+    def bench(fixture):
+        data = fixture.data
+        return lambda: func(data)
+
+    return bench
+
+
+def pair_bench(kernels, pack=False):
+    """ returns a benchmark of total_cost, total_revenue, net_profit and avg_profit together, either
+        through the frame functions or through the numpy kernels w/ the array extraction included.
+        A single pack is where the fixed overhead of pandas shows most
+    """
+
+    def bench(fixture):
+        data = fixture.data
+        if pack:
+            data = data[data["pack_id"] == data["pack_id"].iloc[len(data) // 2]]
+
+        if kernels:
+            return lambda: stats.stats_kernel(*stats.arrays(data))
+
+        return lambda: (
+            stats.total_cost(data),
+            stats.total_revenue(data),
+            stats.net_profit(data),
+            stats.avg_profit(data),
+        )
+
+    return bench
+
+
+def bench_parallel(fixture):
+    """ parallel.breakdown, partitioned by ranges of rows over every core once past PARALLEL_ROWS """
+    data = fixture.data
+
+    # start the workers first, spawning them is not what is being timed
+    parallel.breakdown(data)
+
+    return lambda: parallel.breakdown(data)
+
+
+def bench_calc_stats(fixture):
+    """ calcStats, every number of the stats pane """
+    tracker = fixture.tracker()
+    return lambda: tracker.calcStats(tracker.data)
+
+
+def bench_pack_box(fixture):
+    """ selecting a pack, the lookups and subset packBox makes before drawing """
+    tracker = fixture.tracker()
+    pick = len(tracker.packIds()) // 2
+
+    def select():
+        rows = tracker.filterPack(tracker.packIds()[pick])
+        tracker.calcStats(tracker.view(rows))
+
+    return select
+
+
+def bench_cost_box(fixture):
+    """ selecting a pack type, the lookups, subset and pack box refill costBox makes before drawing """
+    tracker = fixture.tracker()
+    pick = list(tracker.packTypes()).index("gold")
+
+    def select():
+        rows = tracker.filterType(tracker.packTypes()[pick])
+        tracker.packIds(rows)
+        tracker.calcStats(tracker.view(rows))
+
+    return select
+
+
+def sort_bench(cached):
+    """ returns a benchmark of sorting every row by bin then the gold packs among them, either from
+        the tracker's cached order or by sorting a copy of the rows each time
+    """
+
+    def bench(fixture):
+        tracker = fixture.tracker()
+        rows = tracker.filterType("gold")
+
+        if cached:
+            # the first sort builds the order, only sorts after that are timed
+            tracker.sortRows(tracker.data.index, "bin")
+            return lambda: (
+                tracker.sortRows(tracker.data.index, "bin"),
+                tracker.sortRows(rows, "bin"),
+            )
+
+        return lambda: (
+            tracker.data.sort_values("bin", kind="stable").index,
+            tracker.data.loc[rows].sort_values("bin", kind="stable").index,
+        )
+
+    return bench
+
+
+def view_bench(frame):
+    """ returns a benchmark of what showing the gold packs sorted by bin reads from the data, their
+        stats and the rows of the first screenful, either through a copied frame like handleWrite made
+        before or through a RowView. The peak memory traced while doing it once is kept on the
+        function as peak
+    """
+
+    def bench(fixture):
+        tracker = fixture.tracker()
+        rows = tracker.filterType("gold")
+        tracker.sortRows(rows, "bin")
+
+        if frame:
+
+            def show():
+                data = tracker.data.loc[rows][COLUMNS[1:]]
+                data = data.sort_values("bin", kind="stable")
+                tracker.calcStats(data)
+                return list(data.head(FIRST_ROWS).iterrows())
+
+        else:
+
+            def show():
+                view = tracker.sortView(tracker.view(rows), "bin")
+                tracker.calcStats(view)
+                return view.rows(0, FIRST_ROWS)
+
+        gc.collect()
+        tracemalloc.start()
+        show()
+        show.peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        return show
+
+    return bench
+
+
+def dialog_bench(dialog):
+    """ returns a benchmark of the validate and apply of a dialog given the name of a player """
+
+    def bench(fixture):
+        tracker = fixture.tracker()
+
+        # the rarest name that is not the start of a longer one, the dialogs match names as
+        # prefixes. validate scans the names twice and apply once, however many rows match
+        counts = tracker.data["name"].value_counts()
+        names = sorted(counts.index)
+        name = min(
+            (name for name, after in zip(names, names[1:] + [""]) if not after.startswith(name)),
+            key=lambda name: counts[name],
+        )
+        parent = types.SimpleNamespace(data=tracker.data, curr_id=tracker.curr_id)
+
+        def lookup():
+            fake = types.SimpleNamespace(
+                parent=parent,
+                result=types.SimpleNamespace(get=lambda: name),
+                value=types.SimpleNamespace(get=lambda: "500"),
+            )
+            dialog.validate(fake)
+            dialog.apply(fake)
+
+        return lookup
+
+    return bench
+
+
+def redraw_bench(engine):
+    """ returns a benchmark of writePlayers drawing every row w/ a player table engine, including the
+        slices drawn after the first screenful, then letting tk lay it out. The growth in resident
+        memory from an empty frame to every row drawn is kept on the function as rss
+    """
+
+    def bench(fixture):
+        from playertable import make_table
+
+        app = fixture.app()
+        view = app.tracker.view()
+
+        app.clearPlayerFrame()
+        app.table = make_table(engine, app.canvas, app.PALLETE, app.SELECTED, app.toggleSelection)
+
+        def redraw():
+            app.clearPlayerFrame()
+            app.writePlayers(view, False)
+            while app.rendering():
+                app.renderChunk(app.render)
+            app.root.update_idletasks()
+
+        app.clearPlayerFrame()
+        app.root.update_idletasks()
+        gc.collect()
+        before = rss()
+        redraw()
+        after = rss()
+        redraw.rss = None if before is None else after - before
+
+        return redraw
+
+    return bench
+
+
+def benchmarks():
+    """ returns every benchmark as ( name, the function building it, the largest size it runs at ) """
+
+    from pack_tracking import Delete_Dialog, Selling_Dialog
+
+    return [
+        ("loadData", bench_load, None),
+        ("stats.total_cost", stats_bench(stats.total_cost), None),
+        ("stats.total_revenue", stats_bench(stats.total_revenue), None),
+        ("stats.net_profit", stats_bench(stats.net_profit), None),
+        ("stats.avg_profit", stats_bench(stats.avg_profit), None),
+        ("stats.breakdown", stats_bench(stats.breakdown), None),
+        ("parallel.breakdown", bench_parallel, None),
+        ("stats.frame", pair_bench(False), None),
+        ("stats.kernels", pair_bench(True), None),
+        ("stats.frame.pack", pair_bench(False, pack=True), None),
+        ("stats.kernels.pack", pair_bench(True, pack=True), None),
+        ("calcStats", bench_calc_stats, None),
+        ("packBox", bench_pack_box, None),
+        ("costBox", bench_cost_box, None),
+        ("sort.frame", sort_bench(False), None),
+        ("sortRows", sort_bench(True), None),
+        ("view.frame", view_bench(True), None),
+        ("view.rows", view_bench(False), None),
+        ("Selling_Dialog.lookup", dialog_bench(Selling_Dialog), None),
+        ("Delete_Dialog.lookup", dialog_bench(Delete_Dialog), None),
+        ("writePlayers.labels", redraw_bench("labels"), "render"),
+        ("writePlayers.canvas", redraw_bench("canvas"), "render"),
+    ]
+
+
+def run(sizes=SIZES, only=None, budget=BUDGET, render_limit=RENDER_LIMIT):
+    """ runs the benchmarks at every size, printing each result as it finishes
+    :param sizes: (Default SIZES) The numbers of rows to run at
+    :type sizes: List of Integers
+    :param only: (Default None) Only run benchmarks whose name contains one of these
+    :type only: List of Strings or None
+    :param budget: (Default BUDGET) About how many seconds to spend on each benchmark and size
+    :type budget: Float
+    :param render_limit: (Default RENDER_LIMIT) The largest size writePlayers runs at
+    :type render_limit: Integer
+    :returns: The timings, keyed by name@rows, and the reasons any were skipped
+    :rtype: Tuple of types (Dictionary, Dictionary)
+    """
+
+    suite = [bench for bench in benchmarks() if not only or any(o in bench[0] for o in only)]
+
+    results = {}
+    skipped = {}
+    display = None
+
+    for rows in sizes:
+        fixture = Fixture(rows)
+
+        for name, build, limit in suite:
+            key = "%s@%d" % (name, rows)
+
+            if limit == "render":
+                if rows > render_limit:
+                    skipped[key] = "over the render limit of %d rows" % render_limit
+                    continue
+                try:
+                    if display is None:
+                        from harness import virtual_display
+
+                        display = virtual_display() or False
+                except RuntimeError as e:
+                    skipped[key] = str(e)
+                    continue
+
+            func = build(fixture)
+            results[key] = measure(func, budget)
+            line = "%-32s %12.3f ms" % (key, results[key]["median"] * 1000)
+            for memory in ("rss", "peak"):
+                if getattr(func, memory, None) is not None:
+                    results[key][memory] = getattr(func, memory)
+                    line += " %10.1f MB %s" % (getattr(func, memory) / 2 ** 20, memory)
+            print(line, flush=True)
+
+        fixture.close()
+
+    parallel.shutdown()
+    if display:
+        display.terminate()
+
+    return results, skipped
+
+
+def compare(results, baselines, threshold=THRESHOLD):
+    """ returns the timings whose median regressed against the baselines
+    :param results: The timings of this run, keyed by name@rows
+    :type results: Dictionary
+    :param baselines: The stored timings, keyed the same way
+    :type baselines: Dictionary
+    :param threshold: (Default THRESHOLD) The allowed slowdown, 0.25 allows 25%
+    :type threshold: Float
+    :returns: The regressed keys, each w/ its baseline and current median
+    :rtype: Dictionary
+    """
+
+    regressed = {}
+    for key, result in results.items():
+        if key not in baselines:
+            continue
+
+        base = baselines[key]["median"]
+        now = result["median"]
+        if now > base * (1 + threshold) and now - base > NOISE:
+            regressed[key] = (base, now)
+
+    return regressed
+
+
+def crossover(sizes=CROSSOVER_SIZES, workers=None, budget=BUDGET):
+    """ times stats.breakdown against parallel.breakdown sent to the pool at every size, printing
+        each pair. The smallest size from which the pool stays faster is what PARALLEL_ROWS in
+        parallel.py should be on this machine
+    :param sizes: (Default CROSSOVER_SIZES) The numbers of rows to time at, smallest first
+    :type sizes: List of Integers
+    :param workers: (Default None) How many partitions, None uses every core
+    :type workers: Integer or None
+    :param budget: (Default BUDGET) About how many seconds to spend on each timing
+    :type budget: Float
+    :returns: The crossover, or None if the pool was never faster
+    :rtype: Integer or None
+    """
+
+    workers = parallel.WORKERS if workers is None else workers
+    found = None
+
+    for rows in sorted(sizes):
+        data = Fixture(rows).data
+
+        # start the workers first, spawning them is not what is being timed
+        parallel.breakdown(data, workers=workers, min_rows=0)
+
+        serial = measure(lambda: stats.breakdown(data), budget)["median"]
+        pooled = measure(
+            lambda: parallel.breakdown(data, workers=workers, min_rows=0), budget
+        )["median"]
+        print(
+            "%-10d in process %10.3f ms   %d workers %10.3f ms"
+            % (rows, serial * 1000, workers, pooled * 1000),
+            flush=True,
+        )
+
+        if pooled >= serial:
+            found = None
+        elif found is None:
+            found = rows
+
+    parallel.shutdown()
+
+    return found
+
+
+def main():
+    """ runs the suite, then saves it as the baseline or checks it against the baseline
+    :returns: None
+    :rtype: None
+    """
+
+    parser = argparse.ArgumentParser(description="benchmark the pack tracker hot paths")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES, help="rows to run at")
+    parser.add_argument("--only", nargs="+", help="only benchmarks whose name contains these")
+    parser.add_argument("--budget", type=float, default=BUDGET, help="seconds per benchmark")
+    parser.add_argument("--render-limit", type=int, default=RENDER_LIMIT)
+    parser.add_argument("--baseline", default=BASELINE_FILE)
+    parser.add_argument("--threshold", type=float, default=THRESHOLD, help="allowed slowdown")
+    parser.add_argument("--save", action="store_true", help="store this run as the baseline")
+    parser.add_argument(
+        "--crossover", action="store_true", help="find PARALLEL_ROWS for this machine"
+    )
+    parser.add_argument("--workers", type=int, help="partitions for --crossover")
+    args = parser.parse_args()
+
+    if args.crossover:
+        found = crossover(workers=args.workers, budget=args.budget)
+        if found is None:
+            print(
+                "the pool was not faster at any size, keep PARALLEL_ROWS above %d"
+                % CROSSOVER_SIZES[-1]
+            )
+        else:
+            print("the pool is faster from %d rows on, set PARALLEL_ROWS to that" % found)
+        return
+
+    results, skipped = run(args.sizes, args.only, args.budget, args.render_limit)
+
+    for key, reason in skipped.items():
+        print("%-32s skipped, %s" % (key, reason))
+
+    stored = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            stored = json.load(f)
+    baselines = stored.get("results", {})
+
+    if args.save:
+        baselines.update(results)
+        stored = {
+            "python": platform.python_version(),
+            "machine": platform.platform(),
+            "results": dict(sorted(baselines.items())),
+        }
+        with open(args.baseline, "w") as f:
+            json.dump(stored, f, indent=2)
+        print("saved %d baselines to %s" % (len(results), args.baseline))
+        return
+
+    if not baselines:
+        print("no baselines in %s, run w/ --save first" % args.baseline)
+        return
+
+    regressed = compare(results, baselines, args.threshold)
+    for key, (base, now) in regressed.items():
+        print(
+            "REGRESSION %-32s %10.3f ms -> %10.3f ms (%+.0f%%)"
+            % (key, base * 1000, now * 1000, (now / base - 1) * 100)
+        )
+
+    if regressed:
+        sys.exit(1)
+
+    print("no regressions beyond %.0f%%" % (args.threshold * 100))
+
+
+if __name__ == "__main__":
+    main()
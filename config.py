@@ -0,0 +1,151 @@
+""" config.py
+
+This file contains the database settings and app wide constants, along w/ the validation rules
+they imply. It only uses the standard library, so the GUI can import it before pandas is loaded
+
+This file contains methods:
+    * string_validator( string, search ) - returns true if a string has no invalid characters
+    * validate_listing( rows, qs ) - validates the items listed from a pack
+
+Created October 19th, 2026.
+"""
+
+import re
+
+# change as necessary for database
+# this program expects a SQL Table with column names and types...
+#
+# id (primary key)      pack_id     pack_type     pack_price     player      type       bid    bin  sold
+#       int               int       nchar(10)         int       nchar(24)  nchar(10)    int    int  int
+
+# test db
+# DRIVER = "{SQL Server}"
+# SERVER = "DESKTOP-5R7EE8O\\SQLEXPRESS"
+# DATABASE = "testDB"
+# TABLE = "dbo.pack_test"
+
+# # production db
+DRIVER = "{SQL Server}"
+SERVER = "DESKTOP-5R7EE8O\\SQLEXPRESS"
+DATABASE = "player_packs"
+TABLE = "dbo.pack_tracking"
+
+# sql server refuses statements with more than 2100 parameters, so bulk statements are chunked
+MAX_PARAMS = 2000
+
+# statements that take longer than this many seconds are written to the slow query log
+SLOW_QUERY_SECONDS = 0.25
+
+# the event loop heartbeat interval, and how late a beat must be to count as a ui stall
+HEARTBEAT_SECONDS = 0.05
+STALL_SECONDS = 0.2
+
+# the rows drawn as soon as a view is shown, about a screenful, and the longest the rest of a large
+# view may hold the event loop per slice while it is drawn in the background
+FIRST_ROWS = 50
+FRAME_SECONDS = 0.016
+
+# how the player frame draws its rows, "labels" grids a tk Label per cell and "canvas" draws text
+# items on one canvas, which is lighter and faster for large views
+PLAYER_TABLE = "labels"
+
+# how many packs the pack list box holds at once, the rest are paged through
+NAV_PAGE = 200
+
+# seconds between checks of a server.py instance for changes made by other clients
+SYNC_SECONDS = 2.0
+
+# how many filtered views and their stats the tracker remembers before evicting the least recent
+CACHE_SIZE = 64
+
+# app wide constants
+COLUMNS = [
+    "id",
+    "pack_id",
+    "pack_price",
+    "pack_type",
+    "name",
+    "type",
+    "bid",
+    "bin",
+    "sold",
+]
+PACKS = {
+    "bronze": 400,
+    "bronze r": 750,
+    "silver": 2500,
+    "silver r": 3750,
+    "gold": 5000,
+    "gold r": 7500,
+}
+TYPES = [
+    "player",
+    "healing",
+    "fitness",
+    "contract",
+    "kit",
+    "stadia",
+    "badge",
+    "manager",
+    "coach",
+]
+
+# the columns a bulk edit may change, a blank sold value clears the sale
+BULK_COLUMNS = ["pack_type", "type", "sold"]
+
+# characters that may not appear in a player name
+INVALID_CHARS = re.compile(r"[^A-z0-9.\" \"\']")
+
+
+def string_validator(string, search=INVALID_CHARS.search):
+    """ checks a string for valid characters
+    :param string: a string to check
+    :type string: String
+    :param search: The characters which are valid - default is A-z and '
+    :type search: Regex Pattern object
+    :returns: True if only the characters in search are in the string, otherwise returns False
+    :rtype: Boolean
+    """
+    return not bool(search(string))
+
+
+def validate_listing(rows, qs):
+    """ validates the items listed from a pack
+    :param rows: The items, each as [ name, item type, bid, bin ]
+    :type rows: List( List( String, String, String, String ) )
+    :param qs: The quick sell price of the pack
+    :type qs: String or Integer
+    :returns: A exit value related to the error or 1 if data is valid
+    :rtype: Integer
+    """
+
+    # error codes:
+    # 0 -> characters other than A-z, '
+    # -1 -> empty player name box
+    # -2 -> int less than 150 in bid price
+    # -3 -> int less than 200 in bin price
+    # -4 -> player name greater than 24 characters (would clash later w/ database storage)
+    # -5 -> int less than 0 for quick sell price
+    # -6 -> one of bid, bin, or qs not an integer
+    # -7 -> bid higher than bin
+
+    try:
+        for row in rows:
+            if not string_validator(row[0]):
+                return 0
+            if row[0] == "":
+                return -1
+            if int(row[2]) < 150:
+                return -2
+            if int(row[3]) < 200:
+                return -3
+            if int(row[2]) > int(row[3]):
+                return -7
+            if len(row[0]) > 24:
+                return -4
+            if int(qs) < 0:
+                return -5
+    except ValueError:
+        return -6
+
+    return 1
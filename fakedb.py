@@ -0,0 +1,366 @@
+""" fakedb.py
+
+This file contains an in-process stand-in for pyodbc and the SQL Server pack table. A FakeStore
+keeps the table in a shared in-memory sqlite database, attached under the schema of TABLE so the
+app's statements run unchanged, and hands out connections that behave like pyodbc ones: parameters
+may be spread or given as a sequence, nchar columns come back padded to their width, and every round
+trip can be given a latency. Each connection has its own transaction, like a real server
+
+This file contains classes:
+    * FakeStore - Class holding the in-memory pack table and making connections to it
+    * FakeConnection - Class for a pyodbc like connection to a FakeStore
+    * FakeCursor - Class for a pyodbc like cursor
+
+This file contains methods:
+    Members of Class FakeStore:
+        * __init__( self, table, latency ) - creates an empty pack table
+        * open( self ) - returns a raw sqlite connection to the shared database
+        * connect( self, *args, **kwargs ) - returns a new connection, ignoring pyodbc arguments
+        * load( self, data ) - bulk loads rows in the tracker layout into the table
+        * count( self ) - returns the number of rows in the table
+
+    Members of Class FakeConnection:
+        * cursor( self ) - returns a new cursor
+        * commit( self ) - commits the transaction of this connection
+        * rollback( self ) - rolls back the transaction of this connection
+        * close( self ) - closes the connection
+
+    Members of Class FakeCursor:
+        * rowcount, description - the rows changed and the columns selected by the last statement
+        * execute( self, query, *params ) - runs a statement
+        * executemany( self, query, seq ) - runs a statement for many parameter sets
+        * pad( self, rows ) - pads the nchar columns of fetched rows
+        * fetchone, fetchmany, fetchall, __iter__ - fetch rows, padding nchar columns
+        * commit( self ) - commits the connection, like pyodbc cursors can
+        * close( self ) - closes the cursor
+
+Created October 19th, 2026.
+"""
+
+import itertools
+import sqlite3
+import threading
+import time
+
+from config import COLUMNS, TABLE
+
+# raised for any failed statement, so code catching pyodbc.Error can catch this instead
+Error = sqlite3.Error
+
+# the widths of the nchar columns, whose values SQL Server returns padded w/ spaces
+NCHAR = {"pack_type": 10, "name": 24, "type": 10}
+
+# every store gets its own shared memory database
+STORES = itertools.count()
+
+
+class FakeStore:
+    """ The pack table, held in a shared in-memory sqlite database for as long as this store lives
+
+        __init__( self, table, latency )
+        table - (Default TABLE) the name of the pack table, a schema prefix such as dbo. is kept
+        latency - (Default 0.0) seconds each round trip to the store sleeps, to act like a network
+    """
+
+    def __init__(self, table=TABLE, latency=0.0):
+
+        self.table = table
+        self.latency = latency
+        self.name = "fakedb%d" % next(STORES)
+        self.schema = table.split(".")[0] if "." in table else None
+
+        # the database only lives while a connection to it is open, so the store keeps one
+        self.keeper = self.open()
+        self.keeper.execute(
+            "CREATE TABLE "
+            + table
+            + " (id INTEGER PRIMARY KEY, pack_id INTEGER NOT NULL, pack_price INTEGER NOT NULL,"
+            + " pack_type TEXT NOT NULL, name TEXT NOT NULL, type TEXT NOT NULL,"
+            + " bid INTEGER NOT NULL, bin INTEGER NOT NULL, sold INTEGER)"
+        )
+        self.keeper.commit()
+
+    def open(self):
+        """ returns a new sqlite connection to the shared database, w/ the schema attached
+        :returns: The connection
+        :rtype: sqlite3 Connection
+        """
+
+        db = sqlite3.connect(
+            "file:%s?mode=memory&cache=shared" % self.name,
+            uri=True,
+            check_same_thread=False,
+            isolation_level="DEFERRED",
+        )
+        if self.schema is not None:
+            db.execute(
+                "ATTACH DATABASE ? AS " + self.schema,
+                ("file:%s-%s?mode=memory&cache=shared" % (self.name, self.schema),),
+            )
+
+        return db
+
+    def connect(self, *args, **kwargs):
+        """ returns a new connection, taking and ignoring whatever would be passed to pyodbc.connect
+        :returns: The connection
+        :rtype: FakeConnection
+        """
+
+        return FakeConnection(self)
+
+    def load(self, data):
+        """ bulk loads rows into the table, bypassing latency
+        :param data: The rows, either indexed by id like PackTracker.data or in COLUMNS order
+        :type data: pandas DataFrame or List of tuples
+        :returns: The number of rows loaded
+        :rtype: Integer
+        """
+
+        if hasattr(data, "reset_index"):
+            frame = data.reset_index() if data.index.name == "id" else data
+            frame = frame[COLUMNS].astype(object)
+            data = frame.where(frame.notna(), None).itertuples(index=False, name=None)
+
+        cursor = self.keeper.executemany(
+            "INSERT INTO " + self.table + " VALUES (" + ",".join("?" * len(COLUMNS)) + ")", data
+        )
+        self.keeper.commit()
+
+        return cursor.rowcount
+
+    def count(self):
+        """ returns the number of rows in the table, bypassing latency
+        :returns: The number of rows
+        :rtype: Integer
+        """
+
+        return self.keeper.execute("SELECT COUNT(*) FROM " + self.table).fetchone()[0]
+
+
+class FakeConnection:
+    """ A pyodbc like connection w/ its own transaction on a FakeStore
+
+        __init__( self, store )
+        store - the store to connect to
+    """
+
+    def __init__(self, store):
+
+        self.store = store
+        self.db = store.open()
+        self.lock = threading.RLock()
+        self.autocommit = False
+
+    def cursor(self):
+        """ returns a new cursor on this connection
+        :returns: The cursor
+        :rtype: FakeCursor
+        """
+
+        return FakeCursor(self)
+
+    def commit(self):
+        """ commits the transaction of this connection
+        :returns: None
+        :rtype: None
+        """
+
+        if self.store.latency:
+            time.sleep(self.store.latency)
+
+        with self.lock:
+            self.db.commit()
+
+        return
+
+    def rollback(self):
+        """ rolls back the transaction of this connection
+        :returns: None
+        :rtype: None
+        """
+
+        with self.lock:
+            self.db.rollback()
+
+        return
+
+    def close(self):
+        """ closes the connection, rolling back anything uncommitted
+        :returns: None
+        :rtype: None
+        """
+
+        with self.lock:
+            self.db.close()
+
+        return
+
+
+class FakeCursor:
+    """ A pyodbc like cursor. Rows come back as tuples w/ the nchar columns padded
+
+        __init__( self, conn )
+        conn - the FakeConnection the cursor belongs to
+    """
+
+    def __init__(self, conn):
+
+        self.conn = conn
+        self.cursor = conn.db.cursor()
+        self.fast_executemany = False
+        self.padding = []
+
+    @property
+    def rowcount(self):
+        """ the number of rows the last statement changed, -1 after a select like pyodbc
+        :returns: The number of rows
+        :rtype: Integer
+        """
+
+        return self.cursor.rowcount
+
+    @property
+    def description(self):
+        """ the name and type of each column the last statement selected
+        :returns: A tuple per column, or None if the last statement selected nothing
+        :rtype: Tuple of tuples or None
+        """
+
+        return self.cursor.description
+
+    def execute(self, query, *params):
+        """ runs a statement
+        :param query: The sql statement, w/ ? placeholders
+        :type query: String
+        :param params: The parameters, either as one sequence or spread out like pyodbc allows
+        :returns: This cursor, like pyodbc
+        :rtype: FakeCursor
+        """
+
+        if len(params) == 1 and isinstance(params[0], (list, tuple)):
+            params = params[0]
+
+        if self.conn.store.latency:
+            time.sleep(self.conn.store.latency)
+
+        with self.conn.lock:
+            self.cursor.execute(query, params)
+
+        # the positions and widths of any nchar columns selected
+        self.padding = [
+            (idx, NCHAR[col[0]])
+            for idx, col in enumerate(self.cursor.description or [])
+            if col[0] in NCHAR
+        ]
+
+        return self
+
+    def executemany(self, query, seq):
+        """ runs a statement for many parameter sets in one round trip
+        :param query: The sql statement, w/ ? placeholders
+        :type query: String
+        :param seq: The parameter sets
+        :type seq: List of sequences
+        :returns: None
+        :rtype: None
+        """
+
+        if self.conn.store.latency:
+            time.sleep(self.conn.store.latency)
+
+        with self.conn.lock:
+            self.cursor.executemany(query, seq)
+        self.padding = []
+
+        return
+
+    def pad(self, rows):
+        """ pads the nchar columns of fetched rows to their width, as SQL Server returns them
+        :param rows: The fetched rows
+        :type rows: List of tuples
+        :returns: The rows w/ their nchar columns padded w/ spaces
+        :rtype: List of tuples
+        """
+
+        if not self.padding:
+            return rows
+
+        padded = []
+        for row in rows:
+            row = list(row)
+            for idx, width in self.padding:
+                if row[idx] is not None:
+                    row[idx] = row[idx].ljust(width)
+            padded.append(tuple(row))
+
+        return padded
+
+    def fetchone(self):
+        """ fetches the next row of the last statement
+        :returns: The row, or None once every row was fetched
+        :rtype: Tuple or None
+        """
+
+        with self.conn.lock:
+            row = self.cursor.fetchone()
+
+        return None if row is None else self.pad([row])[0]
+
+    def fetchmany(self, size):
+        """ fetches the next rows of the last statement, in one round trip
+        :param size: The most rows to fetch
+        :type size: Integer
+        :returns: The rows, empty once every row was fetched
+        :rtype: List of tuples
+        """
+
+        if self.conn.store.latency:
+            time.sleep(self.conn.store.latency)
+
+        with self.conn.lock:
+            rows = self.cursor.fetchmany(size)
+
+        return self.pad(rows)
+
+    def fetchall(self):
+        """ fetches every remaining row of the last statement
+        :returns: The rows
+        :rtype: List of tuples
+        """
+
+        with self.conn.lock:
+            rows = self.cursor.fetchall()
+
+        return self.pad(rows)
+
+    def __iter__(self):
+        """ yields the remaining rows of the last statement, fetching a thousand at a time
+        :returns: A generator of rows
+        :rtype: Generator of tuples
+        """
+
+        while True:
+            rows = self.fetchmany(1000)
+            if not rows:
+                return
+            yield from rows
+
+    def commit(self):
+        """ commits the connection of this cursor, like pyodbc cursors can
+        :returns: None
+        :rtype: None
+        """
+
+        self.conn.commit()
+
+        return
+
+    def close(self):
+        """ closes the cursor, leaving the connection open
+        :returns: None
+        :rtype: None
+        """
+
+        self.cursor.close()
+
+        return
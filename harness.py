@@ -0,0 +1,687 @@
+""" harness.py
+
+This file contains a harness that drives the real GUI through whole user workflows w/o a person or
+a SQL Server. The app is launched on a fakedb.FakeStore filled w/ synthetic history, the dialogs
+are answered by a DialogDriver that fills in their fields and presses ok from inside their own event
+loop, and message boxes are recorded instead of shown. Each action is timed from the handler call
+until tk has laid out the result, so workflows can be replayed thousands of times to measure per
+action latency. On a machine w/o a display it runs under Xvfb
+
+This file contains classes:
+    * DialogDriver - Class for answering the dialogs of the GUI from a script
+    * Harness - Class for running timed user actions against a launched GUI
+
+This file contains methods:
+    Global Methods:
+        * virtual_display( ) - makes sure tk has a display, starting Xvfb if there is none
+        * launch( connect, width, height, timeout ) - builds a DisplayApp and waits for its data
+        * main( ) - command line entry point
+
+    Members of Class DialogDriver:
+        * __init__( self ) - creates a driver w/ nothing scripted
+        * install( self ) - replaces the message boxes w/ recorders
+        * uninstall( self ) - restores the message boxes
+        * showMessage( self, title, message, **options ) - records a message box
+        * askYesNo( self, title, message, **options ) - records a question and answers it
+        * script( self, *answers ) - queues the answers to the dialogs the next action opens
+        * current( self ) - returns the dialog open right now
+        * answer( self ) - fills in and confirms the open dialog
+        * finish( self, action ) - raises if the action left answers unused or a dialog rejected one
+        * fillNumber, fillListing, fillSelling, fillDelete, fillEditing, fillBulk - fill in a dialog
+
+    Members of Class Harness:
+        * __init__( self, rows, seed, latency ) - fills a store and launches the GUI on it
+        * close( self ) - destroys the GUI
+        * act( self, action, handler, *answers ) - runs and times one action
+        * randomItems( self ) - returns the items of a made up pack
+        * openPack( self, items, pack_type, reward, qs ) - opens a pack through the dialogs
+        * sell( self, id, price ) - enters a sale through the sale dialog
+        * selectPack( self, position ) - clicks a pack in the pack list box
+        * selectType( self, position ) - clicks a pack type in the cost list box
+        * reset( self ) - presses reset
+        * edit( self, id ) - edits a sold row through the edit dialogs
+        * delete( self, id ) - deletes a row through the delete dialog
+        * select( self, ids, count ) - clicks the ids of visible rows
+        * bulkEdit( self, ids, column, value ) - edits selected rows through the bulk dialog
+        * bulkDelete( self, ids ) - deletes selected rows
+        * session( self, index ) - runs one typical session of actions
+        * replay( self, times ) - runs many sessions
+        * report( self ) - returns per action latency percentiles
+
+Created October 19th, 2026.
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import time
+from tkinter import messagebox
+
+import fakedb
+import metrics
+import pack_tracking
+import synthetic
+from config import COLUMNS, PACKS, TYPES
+
+# how many rows of synthetic history the GUI is launched on, every action redraws them all
+ROWS = 500
+
+# every this many sessions also edits and deletes a selection
+BULK_EVERY = 5
+
+
+def virtual_display():
+    """ makes sure tk has a display to draw on, starting a virtual X server if there is none
+    :returns: The Xvfb process started, None if a display was already set
+    :rtype: subprocess Popen or None
+    """
+
+    if os.environ.get("DISPLAY") or sys.platform in ("win32", "darwin"):
+        return None
+
+    if shutil.which("Xvfb") is None:
+        raise RuntimeError("no display and Xvfb is not installed")
+
+    display = ":%d" % (90 + os.getpid() % 100)
+    proc = subprocess.Popen(
+        ["Xvfb", display, "-screen", "0", "1440x900x24", "-nolisten", "tcp"],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+    os.environ["DISPLAY"] = display
+    time.sleep(0.5)
+    if proc.poll() is not None:
+        raise RuntimeError("Xvfb exited w/ code %d" % proc.returncode)
+
+    return proc
+
+
+def launch(connect, width=1440, height=820, timeout=120):
+    """ builds a DisplayApp on a connection and runs its event loop until the data is shown
+    :param connect: Function returning the connection to load from, such as FakeStore.connect
+    :type connect: Function
+    :param width: (Default 1440) width of the window
+    :type width: Integer
+    :param height: (Default 820) height of the window
+    :type height: Integer
+    :param timeout: (Default 120) seconds to wait for the data
+    :type timeout: Float
+    :returns: The app, w/ its data drawn
+    :rtype: pack_tracking DisplayApp
+    """
+
+    app = pack_tracking.DisplayApp(width, height, connect=connect)
+
+    deadline = time.perf_counter() + timeout
+    while app.tracker is None:
+        if app.load_error is not None:
+            app.root.destroy()
+            raise app.load_error
+        if time.perf_counter() > deadline:
+            app.root.destroy()
+            raise RuntimeError("data did not load in %d seconds" % timeout)
+        app.root.update()
+        time.sleep(0.005)
+
+    app.root.update_idletasks()
+
+    return app
+
+
+class DialogDriver:
+    """ Answers the dialogs of the GUI from a script. Each dialog waits in its own event loop, so
+        the driver schedules itself on that loop, fills in the fields and presses ok like a user
+        would, which runs the dialog's own validation. Message boxes are recorded instead of shown
+
+        __init__( self )
+    """
+
+    # the method filling in each dialog, subclasses are listed by their own name
+    FILLERS = {
+        "NumberListing_Dialog": "fillNumber",
+        "Listing_Dialog": "fillListing",
+        "Selling_Dialog": "fillSelling",
+        "Delete_Dialog": "fillDelete",
+        "Editing_Dialog": "fillEditing",
+        "Bulk_Dialog": "fillBulk",
+    }
+
+    def __init__(self):
+
+        self.root = None
+        self.answers = []
+        self.messages = []
+        self.rejected = []
+        self.confirm = True
+        self.saved = {}
+
+    def install(self):
+        """ replaces the message box functions the GUI calls w/ recorders
+        :returns: None
+        :rtype: None
+        """
+
+        for name in ("showerror", "showinfo", "showwarning", "askyesno"):
+            self.saved[name] = getattr(messagebox, name)
+
+        messagebox.showerror = self.showMessage
+        messagebox.showinfo = self.showMessage
+        messagebox.showwarning = self.showMessage
+        messagebox.askyesno = self.askYesNo
+
+        return
+
+    def uninstall(self):
+        """ restores the message box functions
+        :returns: None
+        :rtype: None
+        """
+
+        for name, func in self.saved.items():
+            setattr(messagebox, name, func)
+        self.saved = {}
+
+        return
+
+    def showMessage(self, title, message, **options):
+        """ records a message box instead of showing it
+        :returns: What tk returns when ok is pressed
+        :rtype: String
+        """
+
+        self.messages.append((title, message))
+
+        return "ok"
+
+    def askYesNo(self, title, message, **options):
+        """ records a yes or no question and answers it w/ self.confirm
+        :returns: The scripted answer
+        :rtype: Boolean
+        """
+
+        self.messages.append((title, message))
+
+        return self.confirm
+
+    def script(self, *answers):
+        """ queues the answers to the dialogs the next action opens, in the order they open
+        :param answers: One answer per dialog, in the form its fill method takes
+        :returns: None
+        :rtype: None
+        """
+
+        self.answers = list(answers)
+        self.messages = []
+        self.rejected = []
+
+        if self.answers:
+            self.root.after(0, self.answer)
+
+        return
+
+    def current(self):
+        """ returns the dialog open right now
+        :returns: The newest dialog, None if there is none
+        :rtype: pack_tracking NumberListing_Dialog or None
+        """
+
+        dialogs = [
+            widget
+            for widget in self.root.winfo_children()
+            if isinstance(widget, pack_tracking.NumberListing_Dialog)
+        ]
+
+        return dialogs[-1] if dialogs else None
+
+    def answer(self):
+        """ fills in the open dialog w/ the next answer and presses ok. A dialog that rejects its
+            answer is cancelled, which ends the action the way a user giving up would
+        :returns: None
+        :rtype: None
+        """
+
+        dialog = self.current()
+        if dialog is None:
+            return
+
+        name = type(dialog).__name__
+        if not self.answers:
+            self.rejected.append((name, "no answer scripted"))
+            dialog.cancel()
+            return
+
+        getattr(self, self.FILLERS[name])(dialog, self.answers.pop(0))
+        dialog.ok()
+
+        if dialog.winfo_exists():
+            message = self.messages[-1][1] if self.messages else "not accepted"
+            self.rejected.append((name, message))
+            dialog.cancel()
+            return
+
+        # the next dialog of the action opens once this one has closed
+        if self.answers:
+            self.root.after(0, self.answer)
+
+        return
+
+    def finish(self, action):
+        """ checks the action used every answer and every dialog accepted its answer
+        :param action: The name of the action, for the error
+        :type action: String
+        :returns: None
+        :rtype: None
+        """
+
+        if self.rejected:
+            raise RuntimeError("%s: %s rejected, %s" % ((action,) + self.rejected[0]))
+
+        if self.answers:
+            raise RuntimeError("%s: %d answers unused" % (action, len(self.answers)))
+
+        return
+
+    def fillNumber(self, dialog, answer):
+        """ fills in the number of items to list """
+        dialog.result.set(str(answer))
+
+    def fillListing(self, dialog, answer):
+        """ fills in a pack, given as a dictionary of items, pack_type, qs, and reward """
+        dialog.pack_type.set(answer["pack_type"])
+        dialog.qs.set(str(answer.get("qs", 23)))
+        dialog.free.set(1 if answer.get("reward") else 0)
+        for fields, item in zip(dialog.result, answer["items"]):
+            for var, value in zip(fields, item):
+                var.set(str(value))
+
+    def fillSelling(self, dialog, answer):
+        """ fills in a sale, given as ( row id or name, price ) """
+        dialog.result.set(str(answer[0]))
+        dialog.value.set(str(answer[1]))
+
+    def fillDelete(self, dialog, answer):
+        """ fills in the row id or name to delete or edit """
+        dialog.result.set(str(answer))
+
+    def fillEditing(self, dialog, answer):
+        """ fills in every column of a row but the id, in COLUMNS order """
+        for var, value in zip(dialog.result, answer):
+            var.set(str(value))
+
+    def fillBulk(self, dialog, answer):
+        """ fills in a bulk edit, given as ( column, value ) """
+        dialog.column.set(answer[0])
+        dialog.result.set("" if answer[1] is None else str(answer[1]))
+
+
+class Harness:
+    """ A GUI launched on a fake database of synthetic history, and timed user actions against it.
+        The latency of every action is observed in self.metrics under the action's name, and the time
+        until a large view has been drawn in full under the name w/ .drawn appended
+
+        __init__( self, rows, seed, latency )
+        rows - (Default ROWS) rows of synthetic history to start w/
+        seed - (Default 0) seed of the history and of the actions picked
+        latency - (Default 0.0) seconds each round trip to the fake database takes
+    """
+
+    def __init__(self, rows=ROWS, seed=0, latency=0.0):
+
+        self.rng = random.Random(seed)
+        self.names = synthetic.name_pool(seed=seed)
+        self.metrics = metrics.Registry()
+
+        self.store = fakedb.FakeStore(latency=latency)
+        self.store.load(synthetic.generate_frame(rows // 3 + 1, seed).head(rows))
+
+        # the message boxes must be replaced before the app can show any
+        self.driver = DialogDriver()
+        self.driver.install()
+
+        self.app = launch(self.store.connect)
+        self.driver.root = self.app.root
+
+    def close(self):
+        """ destroys the GUI and restores the message boxes
+        :returns: None
+        :rtype: None
+        """
+
+        self.app.lag.stop()
+        self.app.root.destroy()
+        self.driver.uninstall()
+
+        return
+
+    def act(self, action, handler, *answers):
+        """ runs one action, timing it until any background work is drawn and tk has laid it out
+        :param action: The name the latency is observed under
+        :type action: String
+        :param handler: The GUI handler the user's click would call
+        :type handler: Function
+        :param answers: The answers to the dialogs the handler opens, see DialogDriver
+        :returns: How long the action took
+        :rtype: Float
+        """
+
+        self.driver.script(*answers)
+
+        start = time.perf_counter()
+        handler()
+        # filters finish on the background worker and are drawn once tk polls for them
+        while self.app.worker.busy():
+            self.app.root.update()
+            time.sleep(0.001)
+        self.app.root.update_idletasks()
+        took = time.perf_counter() - start
+
+        # the rest of a large view is drawn in slices after the first screenful, wait for it so the
+        # next action starts from a finished window
+        while self.app.rendering():
+            self.app.root.update()
+            time.sleep(0.001)
+        self.metrics.observe(action + ".drawn", time.perf_counter() - start)
+
+        try:
+            self.driver.finish(action)
+        except RuntimeError:
+            self.metrics.count(action + ".failed")
+            raise
+
+        self.metrics.observe(action, took)
+
+        return took
+
+    def randomItems(self):
+        """ returns the items of a made up pack, each as [ name, item type, bid, bin ]
+        :returns: Between one and four items
+        :rtype: List of Lists
+        """
+
+        items = []
+        for i in range(self.rng.randint(1, 4)):
+            item_type = self.rng.choice(TYPES)
+            name = self.rng.choice(self.names) if item_type == "player" else item_type
+            bin_price = self.rng.randrange(200, 2000, 50)
+            bid = max(150, bin_price - self.rng.randrange(50, 500, 50))
+            items.append([name, item_type, bid, bin_price])
+
+        return items
+
+    def openPack(self, items=None, pack_type=None, reward=False, qs=23):
+        """ opens a pack through the number and listing dialogs
+        :param items: (Default None) The items listed, each as [ name, item type, bid, bin ],
+                      None makes some up
+        :type items: List of Lists or None
+        :param pack_type: (Default None) The pack type, None picks one
+        :type pack_type: String or None
+        :param reward: (Default False) Whether the pack was free
+        :type reward: Boolean
+        :param qs: (Default 23) The quick sell value of the pack
+        :type qs: Integer
+        :returns: The ids of the new rows
+        :rtype: List of Integers
+        """
+
+        items = items or self.randomItems()
+        pack_type = pack_type or self.rng.choice(list(PACKS))
+        first = int(self.app.curr_id)
+
+        listing = {"items": items, "pack_type": pack_type, "reward": reward, "qs": qs}
+        self.act("openPack", self.app.handleNewPack, len(items), listing)
+
+        return list(range(first, int(self.app.curr_id)))
+
+    def sell(self, id=None, price=None):
+        """ enters a sale through the sale dialog
+        :param id: (Default None) The row that sold, None picks an unsold one
+        :type id: Integer or None
+        :param price: (Default None) The price it sold for, None picks one between bid and bin
+        :type price: Integer or None
+        :returns: None
+        :rtype: None
+        """
+
+        data = self.app.data
+        if id is None:
+            unsold = data.index[data["sold"].isna()]
+            id = int(unsold[self.rng.randrange(len(unsold))])
+        if price is None:
+            row = data.loc[id]
+            price = self.rng.randrange(int(row["bid"]), int(row["bin"]) + 1, 50)
+
+        self.act("sell", self.app.handleSale, (id, price))
+
+        return
+
+    def selectPack(self, position=None):
+        """ clicks a pack in the pack list box
+        :param position: (Default None) The position of the pack in the box, None picks one
+        :type position: Integer or None
+        :returns: None
+        :rtype: None
+        """
+
+        box = self.app.pkBox
+        if position is None:
+            position = self.rng.randrange(box.size())
+
+        box.selection_clear(0, "end")
+        box.selection_set(position)
+        self.act("selectPack", lambda: self.app.packBox(None))
+
+        return
+
+    def selectType(self, position=None):
+        """ clicks a pack type in the cost list box
+        :param position: (Default None) The position of the type in the box, None picks one
+        :type position: Integer or None
+        :returns: None
+        :rtype: None
+        """
+
+        box = self.app.cstBox
+        if position is None:
+            position = self.rng.randrange(box.size())
+
+        box.selection_clear(0, "end")
+        box.selection_set(position)
+        self.act("selectType", lambda: self.app.costBox(None))
+
+        return
+
+    def reset(self):
+        """ presses reset, reloading and redrawing every row
+        :returns: None
+        :rtype: None
+        """
+
+        self.act("reset", self.app.handleReset)
+
+        return
+
+    def edit(self, id=None):
+        """ edits a sold row through the row and edit dialogs, raising its bin by 50
+        :param id: (Default None) The row to edit, None picks a sold one
+        :type id: Integer or None
+        :returns: None
+        :rtype: None
+        """
+
+        data = self.app.data
+        if id is None:
+            sold = data.index[data["sold"].notna()]
+            id = int(sold[self.rng.randrange(len(sold))])
+
+        values = list(data.loc[id][COLUMNS[1:]])
+        values[COLUMNS.index("bin") - 1] += 50
+
+        self.act("edit", self.app.handleEdit, id, values)
+
+        return
+
+    def delete(self, id=None):
+        """ deletes a row through the delete dialog
+        :param id: (Default None) The row to delete, None picks one
+        :type id: Integer or None
+        :returns: None
+        :rtype: None
+        """
+
+        if id is None:
+            id = int(self.app.data.index[self.rng.randrange(len(self.app.data))])
+
+        self.act("delete", self.app.handleDelete, id)
+
+        return
+
+    def select(self, ids=None, count=3):
+        """ clicks the ids of visible rows, adding them to the selection
+        :param ids: (Default None) The rows to select, None picks visible ones
+        :type ids: List of Integers or None
+        :param count: (Default 3) How many rows to pick when ids is None
+        :type count: Integer
+        :returns: The selected ids
+        :rtype: List of Integers
+        """
+
+        if ids is None:
+            shown = list(self.app.id_labels)
+            ids = self.rng.sample(shown, min(count, len(shown)))
+
+        self.app.clearSelection()
+        for id in ids:
+            self.app.toggleSelection(None, id)
+
+        return ids
+
+    def bulkEdit(self, ids=None, column="sold", value=None):
+        """ edits the selected rows through the bulk dialog
+        :param ids: (Default None) The rows to select first, None picks visible ones
+        :type ids: List of Integers or None
+        :param column: (Default sold) The column to set, one of BULK_COLUMNS
+        :type column: String
+        :param value: (Default None) The new value, None clears a sale
+        :type value: String, Integer, or None
+        :returns: None
+        :rtype: None
+        """
+
+        self.select(ids)
+        self.act("bulkEdit", self.app.handleBulkEdit, (column, value))
+
+        return
+
+    def bulkDelete(self, ids=None):
+        """ deletes the selected rows, confirming the question asked
+        :param ids: (Default None) The rows to select first, None picks visible ones
+        :type ids: List of Integers or None
+        :returns: None
+        :rtype: None
+        """
+
+        self.select(ids)
+        self.act("bulkDelete", self.app.handleBulkDelete)
+
+        return
+
+    def session(self, index=0):
+        """ runs one typical session: open a pack, sell from it, filter, reset, edit, and delete
+            the last item opened, w/ a bulk edit and delete every BULK_EVERY sessions
+        :param index: (Default 0) The number of the session
+        :type index: Integer
+        :returns: None
+        :rtype: None
+        """
+
+        ids = self.openPack()
+        self.sell(ids[0])
+        self.selectPack()
+        self.selectType()
+        self.reset()
+        self.edit()
+        self.delete(ids[-1])
+
+        if index % BULK_EVERY == BULK_EVERY - 1:
+            self.bulkEdit(value=self.rng.randrange(150, 1000, 50))
+            self.bulkDelete()
+
+        return
+
+    def replay(self, times):
+        """ runs many sessions, printing progress every tenth of the way
+        :param times: The number of sessions
+        :type times: Integer
+        :returns: None
+        :rtype: None
+        """
+
+        step = max(times // 10, 1)
+        for index in range(times):
+            self.session(index)
+            if (index + 1) % step == 0:
+                print("%d/%d sessions, %d rows" % (index + 1, times, len(self.app.data)), flush=True)
+
+        return
+
+    def report(self):
+        """ returns the latency percentiles of every action run so far
+        :returns: The count, p50, p95, p99, and max in seconds of each action, failure counts, and
+                  the hit rate of the tracker cache
+        :rtype: Dictionary
+        """
+
+        summary = self.metrics.toJson()
+
+        return {
+            "actions": {
+                name: {key: hist[key] for key in ("count", "p50", "p95", "p99", "max")}
+                for name, hist in summary["latency_seconds"].items()
+            },
+            "failed": summary["counters"],
+            "cache": self.app.tracker.cache.summary(),
+        }
+
+
+def main():
+    """ replays user sessions against the GUI and prints the latency of each action
+    :returns: None
+    :rtype: None
+    """
+
+    parser = argparse.ArgumentParser(description="replay FIFA pack tracking workflows")
+    parser.add_argument("--rows", type=int, default=ROWS, help="rows of history to start w/")
+    parser.add_argument("--repeat", type=int, default=100, help="sessions to replay")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds per db round trip")
+    parser.add_argument("--out", help="write the action latencies and app metrics to this file")
+    args = parser.parse_args()
+
+    display = virtual_display()
+    harness = Harness(args.rows, args.seed, args.latency)
+
+    try:
+        harness.replay(args.repeat)
+    finally:
+        report = harness.report()
+        harness.close()
+        if display is not None:
+            display.terminate()
+
+    print("%-12s %7s %10s %10s %10s %10s" % ("action", "count", "p50 ms", "p95 ms", "p99 ms", "max ms"))
+    for name, row in report["actions"].items():
+        times = [row[key] * 1000 for key in ("p50", "p95", "p99", "max")]
+        print("%-12s %7d %10.2f %10.2f %10.2f %10.2f" % tuple([name, row["count"]] + times))
+
+    if args.out is not None:
+        with open(args.out, "w") as f:
+            json.dump({"harness": report, "app": metrics.METRICS.toJson()}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+""" lagmonitor.py
+
+This file contains a monitor for the responsiveness of the tk event loop. A heartbeat scheduled
+w/ root.after measures how late each beat runs, which is how long the loop was blocked. Every lag is
+observed in metrics.METRICS as ui.lag, and lags past STALL_SECONDS are written to STALL_FILE along
+w/ the handler that was running and stack samples of the main thread taken while it was stuck
+
+This file contains classes:
+    * LagMonitor - Class for measuring event loop lag and recording stalls
+
+This file contains methods:
+    Global Methods:
+        * tracked( func ) - decorator that attributes the run time of a tk handler to its name
+
+    Members of Class LagMonitor:
+        * __init__( self, root, interval, stall, stall_file ) - sets up a stopped monitor
+        * start( self ) - starts the heartbeat and the sampling thread
+        * stop( self ) - stops both
+        * beat( self ) - measures the lag of one heartbeat and schedules the next
+        * enter( self, name ) - notes that a handler started
+        * exit( self, name, started ) - notes that a handler finished
+        * sampleLoop( self ) - samples the main thread stack whenever the loop is stuck
+        * recordStall( self, lag ) - writes one stall to the stall file
+
+Created October 19th, 2026.
+"""
+
+import collections
+import datetime
+import functools
+import json
+import sys
+import threading
+import time
+import traceback
+
+import metrics
+from config import HEARTBEAT_SECONDS, STALL_SECONDS
+
+# each stall is one JSON line in this file
+STALL_FILE = "ui_stalls.jsonl"
+
+# the monitor tracked handlers report to, set by LagMonitor.start
+MONITOR = None
+
+
+class LagMonitor:
+    """ Measures how long the tk event loop is blocked and records what blocked it
+
+        __init__( self, root, interval, stall, stall_file )
+        root - the tk root whose event loop is measured
+        interval - (Default HEARTBEAT_SECONDS) seconds between heartbeats
+        stall - (Default STALL_SECONDS) lags longer than this are recorded as stalls
+        stall_file - (Default STALL_FILE) where stalls are appended, None disables it
+    """
+
+    def __init__(self, root, interval=HEARTBEAT_SECONDS, stall=STALL_SECONDS, stall_file=STALL_FILE):
+
+        self.root = root
+        self.interval = interval
+        self.stall = stall
+        self.stall_file = stall_file
+
+        self.running = False
+        self.main_thread = threading.main_thread().ident
+        self.lock = threading.Lock()
+
+        # the handlers running right now, innermost last, and the ones that ran since the last beat
+        self.active = []
+        self.ran = []
+
+        # stacks of the main thread sampled since the last beat
+        self.samples = []
+
+        self.last_beat = time.perf_counter()
+        self.stalls = 0
+
+    def start(self):
+        """ starts the heartbeat and the thread that samples stuck stacks
+        :returns: None
+        :rtype: None
+        """
+
+        global MONITOR
+        MONITOR = self
+
+        self.running = True
+        self.last_beat = time.perf_counter()
+        self.root.after(int(self.interval * 1000), self.beat)
+        threading.Thread(target=self.sampleLoop, daemon=True).start()
+
+        return
+
+    def stop(self):
+        """ stops the heartbeat and the sampling thread
+        :returns: None
+        :rtype: None
+        """
+
+        global MONITOR
+        if MONITOR is self:
+            MONITOR = None
+
+        self.running = False
+
+        return
+
+    def beat(self):
+        """ measures how late this heartbeat ran and schedules the next one
+        :returns: None
+        :rtype: None
+        """
+
+        if not self.running:
+            return
+
+        now = time.perf_counter()
+        lag = max(now - self.last_beat - self.interval, 0.0)
+        metrics.observe("ui.lag", lag)
+
+        if lag >= self.stall:
+            self.recordStall(lag)
+
+        with self.lock:
+            self.samples = []
+        self.ran = []
+
+        self.last_beat = time.perf_counter()
+        self.root.after(int(self.interval * 1000), self.beat)
+
+        return
+
+    def enter(self, name):
+        """ notes that a tracked handler started running
+        :param name: The name of the handler
+        :type name: String
+        :returns: The time it started
+        :rtype: Float
+        """
+
+        self.active.append(name)
+
+        return time.perf_counter()
+
+    def exit(self, name, started):
+        """ notes that a tracked handler finished running
+        :param name: The name of the handler
+        :type name: String
+        :param started: The time it started
+        :type started: Float
+        :returns: None
+        :rtype: None
+        """
+
+        took = time.perf_counter() - started
+        if self.active and self.active[-1] == name:
+            self.active.pop()
+        self.ran.append((name, took))
+        metrics.observe("ui.handler." + name, took)
+
+        return
+
+    def sampleLoop(self):
+        """ samples the main thread stack whenever a heartbeat is overdue, until stopped
+        :returns: None
+        :rtype: None
+        """
+
+        while self.running:
+            time.sleep(self.stall / 4)
+
+            if time.perf_counter() - self.last_beat < self.interval + self.stall / 2:
+                continue
+
+            frame = sys._current_frames().get(self.main_thread)
+            if frame is None:
+                continue
+
+            stack = traceback.extract_stack(frame)[-12:]
+            with self.lock:
+                if len(self.samples) < 200:
+                    self.samples.append(
+                        tuple("%s:%d %s" % (f.filename, f.lineno, f.name) for f in stack)
+                    )
+
+        return
+
+    def recordStall(self, lag):
+        """ writes one stall, blamed on the handler that was running, to the stall file
+        :param lag: How long the event loop was blocked
+        :type lag: Float
+        :returns: None
+        :rtype: None
+        """
+
+        self.stalls += 1
+        metrics.count("ui.stalls")
+
+        # a handler still running holds a nested loop (a dialog), otherwise blame the slowest one
+        if self.active:
+            handler = self.active[-1]
+        elif self.ran:
+            handler = max(self.ran, key=lambda item: item[1])[0]
+        else:
+            handler = "tk (redraw or geometry)"
+
+        with self.lock:
+            common = collections.Counter(self.samples).most_common(3)
+
+        stall = {
+            "date": datetime.datetime.now().isoformat(timespec="milliseconds"),
+            "lag": round(lag, 4),
+            "handler": handler,
+            "ran": [[name, round(took, 4)] for name, took in self.ran],
+            "samples": sum(n for stack, n in common),
+            "stacks": [{"count": n, "stack": list(stack)} for stack, n in common],
+        }
+
+        if self.stall_file is not None:
+            try:
+                with open(self.stall_file, "a") as f:
+                    f.write(json.dumps(stall) + "\n")
+            except OSError:
+                pass
+
+        return
+
+
+def tracked(func):
+    """ decorator that tells the running LagMonitor, if any, when a tk handler starts and finishes
+    :param func: The handler
+    :type func: Function
+    :returns: The wrapped handler
+    :rtype: Function
+    """
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        monitor = MONITOR
+        if monitor is None:
+            return func(*args, **kwargs)
+
+        started = monitor.enter(func.__name__)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            monitor.exit(func.__name__, started)
+
+    return wrapper
@@ -0,0 +1,285 @@
+""" metrics.py
+
+This file contains a small in-process metrics registry used to time the hot paths of the tracker.
+Latencies are kept as fixed bucket histograms and counts as plain counters, and both can be written
+to a local file as JSON or in the Prometheus text format. It only uses the standard library
+
+This file contains classes:
+    * Histogram - Class for a fixed bucket latency histogram
+    * Registry - Class for holding every histogram and counter
+
+This file contains methods:
+    Global Methods:
+        * timed( name ) - decorator that observes the run time of a function in METRICS
+        * observe( name, seconds ) - observes one latency in METRICS
+        * count( name, amount ) - increments a counter in METRICS
+        * export( path ) - writes METRICS to a file
+
+    Members of Class Histogram:
+        * __init__( self, buckets ) - creates an empty histogram
+        * observe( self, value ) - adds a value
+        * quantile( self, q ) - estimates a quantile from the buckets
+        * summary( self ) - returns the histogram as a dictionary
+
+    Members of Class Registry:
+        * __init__( self ) - creates an empty registry
+        * observe( self, name, seconds ) - adds a latency to a histogram
+        * count( self, name, amount ) - increments a counter
+        * reset( self ) - drops every histogram and counter
+        * toJson( self ) - returns the registry as a dictionary
+        * toPrometheus( self ) - returns the registry in the Prometheus text format
+        * export( self, path ) - writes the registry to a file, the format chosen by the extension
+
+Created October 19th, 2026.
+"""
+
+import bisect
+import functools
+import json
+import threading
+import time
+
+# upper bounds in seconds, anything slower lands in the +Inf bucket
+BUCKETS = [0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10]
+
+# where handleQuit writes the metrics of a session, a .prom extension writes Prometheus text
+METRICS_FILE = "metrics.json"
+
+
+class Histogram:
+    """ A latency histogram w/ fixed buckets, so memory stays constant however many values it sees
+
+        __init__( self, buckets )
+        buckets - (Default BUCKETS) the sorted upper bounds of the buckets
+    """
+
+    def __init__(self, buckets=BUCKETS):
+
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0
+        self.sum = 0.0
+        self.min = None
+        self.max = None
+
+    def observe(self, value):
+        """ adds a value to the histogram
+        :param value: The value to add
+        :type value: Float
+        :returns: None
+        :rtype: None
+        """
+
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.total += 1
+        self.sum += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+        return
+
+    def quantile(self, q):
+        """ estimates a quantile by interpolating inside the bucket that holds it
+        :param q: The quantile, between 0 and 1
+        :type q: Float
+        :returns: The estimated value, or None if the histogram is empty
+        :rtype: Float or None
+        """
+
+        if self.total == 0:
+            return None
+
+        rank = q * self.total
+        seen = 0
+        for idx, n in enumerate(self.counts):
+            if seen + n >= rank and n > 0:
+                lower = self.buckets[idx - 1] if idx > 0 else 0.0
+                upper = self.buckets[idx] if idx < len(self.buckets) else self.max
+                estimate = lower + (upper - lower) * (rank - seen) / n
+                return min(max(estimate, self.min), self.max)
+            seen += n
+
+        return self.max
+
+    def summary(self):
+        """ returns the histogram as a dictionary
+        :returns: The count, sum, extremes, quantiles, and cumulative bucket counts
+        :rtype: Dictionary
+        """
+
+        cumulative = []
+        seen = 0
+        for bound, n in zip(self.buckets + ["+Inf"], self.counts):
+            seen += n
+            cumulative.append([bound, seen])
+
+        return {
+            "count": self.total,
+            "sum": round(self.sum, 6),
+            "min": self.min,
+            "max": self.max,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+            "buckets": cumulative,
+        }
+
+
+class Registry:
+    """ Every latency histogram and counter, keyed by name. Safe to use from several threads
+
+        __init__( self )
+    """
+
+    def __init__(self):
+
+        self.lock = threading.Lock()
+        self.reset()
+
+    def observe(self, name, seconds):
+        """ adds a latency to the histogram of a name, creating it if needed
+        :param name: The name of the timed operation
+        :type name: String
+        :param seconds: How long the operation took
+        :type seconds: Float
+        :returns: None
+        :rtype: None
+        """
+
+        with self.lock:
+            if name not in self.histograms:
+                self.histograms[name] = Histogram()
+            self.histograms[name].observe(seconds)
+
+        return
+
+    def count(self, name, amount=1):
+        """ increments the counter of a name, creating it if needed
+        :param name: The name of the counter
+        :type name: String
+        :param amount: (Default 1) How much to add
+        :type amount: Integer
+        :returns: None
+        :rtype: None
+        """
+
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+        return
+
+    def reset(self):
+        """ drops every histogram and counter
+        :returns: None
+        :rtype: None
+        """
+
+        self.histograms = {}
+        self.counters = {}
+
+        return
+
+    def toJson(self):
+        """ returns the registry as a dictionary
+        :returns: The latencies and counters
+        :rtype: Dictionary
+        """
+
+        with self.lock:
+            return {
+                "latency_seconds": {
+                    name: hist.summary() for name, hist in sorted(self.histograms.items())
+                },
+                "counters": dict(sorted(self.counters.items())),
+            }
+
+    def toPrometheus(self):
+        """ returns the registry in the Prometheus text exposition format
+        :returns: The formatted metrics
+        :rtype: String
+        """
+
+        lines = [
+            "# HELP pack_tracking_latency_seconds Run time of instrumented operations.",
+            "# TYPE pack_tracking_latency_seconds histogram",
+        ]
+
+        with self.lock:
+            for name, hist in sorted(self.histograms.items()):
+                seen = 0
+                for bound, n in zip(hist.buckets + ["+Inf"], hist.counts):
+                    seen += n
+                    lines.append(
+                        'pack_tracking_latency_seconds_bucket{op="%s",le="%s"} %d'
+                        % (name, bound, seen)
+                    )
+                lines.append('pack_tracking_latency_seconds_sum{op="%s"} %f' % (name, hist.sum))
+                lines.append(
+                    'pack_tracking_latency_seconds_count{op="%s"} %d' % (name, hist.total)
+                )
+
+            lines.append("# HELP pack_tracking_total Counts of instrumented events.")
+            lines.append("# TYPE pack_tracking_total counter")
+            for name, value in sorted(self.counters.items()):
+                lines.append('pack_tracking_total{name="%s"} %d' % (name, value))
+
+        return "\n".join(lines) + "\n"
+
+    def export(self, path=METRICS_FILE):
+        """ writes the registry to a file, as Prometheus text for a .prom path and JSON otherwise
+        :param path: (Default METRICS_FILE) The file to write
+        :type path: String
+        :returns: None
+        :rtype: None
+        """
+
+        if path.endswith(".prom"):
+            text = self.toPrometheus()
+        else:
+            text = json.dumps(self.toJson(), indent=2)
+
+        with open(path, "w") as f:
+            f.write(text)
+
+        return
+
+
+# the registry every instrumented module reports to
+METRICS = Registry()
+
+
+def timed(name):
+    """ decorator that observes the run time of every call of a function in METRICS
+    :param name: The name to report the latency under
+    :type name: String
+    :returns: The decorator
+    :rtype: Function
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                METRICS.observe(name, time.perf_counter() - start)
+
+        return wrapper
+
+    return decorator
+
+
+def observe(name, seconds):
+    """ observes one latency in METRICS, see Registry.observe """
+    METRICS.observe(name, seconds)
+
+
+def count(name, amount=1):
+    """ increments a counter in METRICS, see Registry.count """
+    METRICS.count(name, amount)
+
+
+def export(path=METRICS_FILE):
+    """ writes METRICS to a file, see Registry.export """
+    METRICS.export(path)
@@ -0,0 +1,323 @@
+""" navigator.py
+
+This file contains the list boxes the user picks packs and pack types from. A Navigator keeps its
+items in a dict from each item to its rank in the list, so checking whether an item is listed never
+reads the list box back out of tk, and items are inserted and removed one at a time rather than
+refilling the box. The matches of a search are in rank order, so an item is found among them by a
+binary search on its rank rather than a scan.
+Only one page of the items is ever in the tk list box, flipped through w/ the buttons under it or
+the page keys, so a history of thousands of packs costs the same to show as a short one. Typing into the
+search box above it, or into the box itself, narrows it to the items starting w/ the text, or whose
+kind does, so packs can be found by id or by pack type
+
+This file contains classes:
+    * Navigator - Class for a paged, searchable list box
+
+This file contains methods:
+    Members of Class Navigator:
+        * __init__( self, parent, title, height, page, kinds ) - builds the box and its controls
+        * __contains__( self, item ) - returns whether an item is listed
+        * __len__( self ) - returns the number of items listed
+        * fill( self, items ) - replaces the items, unless they are the same
+        * insert( self, item ) - lists an item after the others
+        * remove( self, item ) - stops listing an item
+        * selected( self ) - returns the item selected in the box
+        * search( self, text ) - shows only the items matching the text
+        * turn( self, pages ) - shows a page before or after the current one
+        * typeAhead( self, event ) - starts a search from a key typed in the box
+        * pickFirst( self, event ) - selects the first match of a search
+        * matches( self, item ) - returns whether an item matches the search
+        * draw( self ) - puts the current page of matches in the box
+        * mark( self ) - shows which of the matches are on the page
+
+Created October 19th, 2026.
+"""
+
+import bisect
+import tkinter as tk
+
+import metrics
+from config import NAV_PAGE
+
+
+class Navigator:
+    """ A list box showing one page of its items at a time, w/ dict backed membership and positions,
+        and an optional search by the start of an item or of its kind
+
+        __init__( self, parent, title, height, page, kinds )
+        parent - the frame to pack the navigator in
+        title - the label above it
+        height - the rows of the list box
+        page - (Default NAV_PAGE) the items in the box at once, None puts every item in it
+        kinds - (Default None) returns the kind of each item keyed by item, only called when
+                searching, None leaves out the search box
+    """
+
+    def __init__(self, parent, title, height, page=NAV_PAGE, kinds=None):
+
+        self.page = page
+        self.kinds = kinds
+        # every item, in the order listed, mapped to a rank that only grows as items are inserted
+        self.items = {}
+        self.rank = 0
+        self.shown = []
+        self.start = 0
+        self.text = ""
+        self.found = {}
+
+        self.frame = tk.Frame(parent)
+        self.frame.pack(side=tk.TOP)
+        tk.Label(self.frame, text=title).pack(side=tk.TOP, pady=2)
+
+        self.query = None
+        if kinds is not None:
+            self.query = tk.StringVar()
+            self.entry = tk.Entry(self.frame, textvariable=self.query, width=16)
+            self.entry.pack(side=tk.TOP)
+            self.query.trace_add("write", lambda *args: self.search(self.query.get()))
+            self.entry.bind("<Return>", self.pickFirst)
+            self.entry.bind("<Down>", lambda e: self.box.focus_set())
+
+        self.box = tk.Listbox(self.frame, height=height, width=16, exportselection=0)
+        self.box.pack(side=tk.TOP, pady=0)
+
+        self.pager = None
+        if page is not None:
+            self.pager = tk.Frame(self.frame)
+            self.pager.pack(side=tk.TOP)
+            back = tk.Button(self.pager, text="<", width=2, command=lambda: self.turn(-1))
+            back.pack(side=tk.LEFT)
+            self.place = tk.Label(self.pager, width=10)
+            self.place.pack(side=tk.LEFT)
+            ahead = tk.Button(self.pager, text=">", width=2, command=lambda: self.turn(1))
+            ahead.pack(side=tk.LEFT)
+            self.box.bind("<Prior>", lambda e: self.turn(-1))
+            self.box.bind("<Next>", lambda e: self.turn(1))
+
+        if kinds is not None:
+            self.box.bind("<Key>", self.typeAhead)
+
+    def __contains__(self, item):
+        return item in self.items
+
+    def __len__(self):
+        return len(self.items)
+
+    def fill(self, items):
+        """ replaces the items w/ new ones, leaving the box alone if they are the same
+        :param items: The items, in the order listed
+        :type items: List or numpy array
+        :returns: None
+        :rtype: None
+        """
+
+        items = list(items)
+        if items == list(self.items):
+            return
+
+        self.items = {item: rank for rank, item in enumerate(items)}
+        self.rank = len(items)
+        self.search(self.text)
+
+        return
+
+    def insert(self, item):
+        """ lists an item after the others, if it is not already listed
+        :param item: The item
+        :type item: Integer or String
+        :returns: None
+        :rtype: None
+        """
+
+        if item in self.items:
+            return
+
+        self.items[item] = self.rank
+        self.rank += 1
+
+        if self.text and self.kinds is not None:
+            self.found = self.kinds()
+        if not self.matches(item):
+            return
+
+        self.shown.append(item)
+
+        # only touch the box when the item lands on the page being shown
+        if self.page is None or len(self.shown) <= self.start + self.page:
+            self.box.insert("end", item)
+        self.mark()
+
+        return
+
+    def remove(self, item):
+        """ stops listing an item, if it is listed
+        :param item: The item
+        :type item: Integer or String
+        :returns: None
+        :rtype: None
+        """
+
+        if item not in self.items:
+            return
+
+        # the matches are in rank order, so the item is where its rank would be
+        position = bisect.bisect_left(self.shown, self.items[item], key=self.items.get)
+        del self.items[item]
+
+        if position == len(self.shown) or self.shown[position] != item:
+            return
+
+        self.shown.pop(position)
+
+        if position < self.start:
+            # every item on the page moves up one
+            self.draw()
+        elif self.page is None or position < self.start + self.page:
+            self.box.delete(position - self.start)
+
+            # the first item of the next page slides up onto this one
+            if self.page is not None and len(self.shown) >= self.start + self.page:
+                self.box.insert("end", self.shown[self.start + self.page - 1])
+
+        # an emptied last page goes back a page
+        if self.start and self.start >= len(self.shown):
+            self.turn(-1)
+        self.mark()
+
+        return
+
+    def selected(self):
+        """ returns the item selected in the box
+        :returns: The item, or None if nothing is selected
+        :rtype: Integer, String, or None
+        """
+
+        selection = self.box.curselection()
+        if not selection:
+            return None
+
+        return self.shown[self.start + selection[0]]
+
+    @metrics.timed("navigator.search")
+    def search(self, text):
+        """ shows only the items starting w/ the text or whose kind does, from the first page
+        :param text: The text to match, matching ignores case. Empty shows every item
+        :type text: String
+        :returns: None
+        :rtype: None
+        """
+
+        self.text = text.strip().lower()
+        if self.text:
+            self.found = self.kinds() if self.kinds is not None else {}
+            self.shown = [item for item in self.items if self.matches(item)]
+        else:
+            self.shown = list(self.items)
+
+        self.start = 0
+        self.draw()
+
+        return
+
+    def turn(self, pages):
+        """ shows a page of the matches before or after the current one
+        :param pages: How many pages to go, negative goes back
+        :type pages: Integer
+        :returns: "break", so the box does not also handle the key
+        :rtype: String
+        """
+
+        if self.page is None:
+            return "break"
+
+        last = max(len(self.shown) - 1, 0) // self.page * self.page
+        start = min(max(self.start + pages * self.page, 0), last)
+        if start != self.start:
+            self.start = start
+            self.draw()
+
+        return "break"
+
+    def typeAhead(self, event):
+        """ moves a printable key typed into the box into the search box, so typing finds items
+        :param event: The key press
+        :type event: TKinter event
+        :returns: "break" for keys that went to the search box, None otherwise
+        :rtype: String or None
+        """
+
+        if not event.char or not event.char.isprintable() or event.char.isspace():
+            return None
+
+        self.entry.focus_set()
+        self.entry.insert("end", event.char)
+
+        return "break"
+
+    def pickFirst(self, event):
+        """ selects the first match of a search, as though it was clicked
+        :param event: The key press
+        :type event: TKinter event
+        :returns: None
+        :rtype: None
+        """
+
+        if not self.shown:
+            return
+
+        self.turn(-len(self.shown))
+        self.box.selection_clear(0, "end")
+        self.box.selection_set(0)
+        self.box.focus_set()
+        self.box.event_generate("<<ListboxSelect>>")
+
+        return
+
+    def matches(self, item):
+        """ returns whether an item matches the current search
+        :param item: The item
+        :type item: Integer or String
+        :returns: Whether it starts w/ the search, or its kind does
+        :rtype: Boolean
+        """
+
+        if not self.text:
+            return True
+
+        if str(item).lower().startswith(self.text):
+            return True
+
+        return str(self.found.get(item, "")).lower().startswith(self.text)
+
+    def draw(self):
+        """ puts the current page of matches in the box, in one call to tk
+        :returns: None
+        :rtype: None
+        """
+
+        self.box.delete(0, "end")
+        stop = len(self.shown) if self.page is None else self.start + self.page
+        page = self.shown[self.start : stop]
+        if page:
+            self.box.insert("end", *page)
+        self.mark()
+
+        return
+
+    def mark(self):
+        """ shows which items of the matches are in the box under it
+        :returns: None
+        :rtype: None
+        """
+
+        if self.pager is None:
+            return
+
+        if not self.shown:
+            self.place.config(text="0 of 0")
+            return
+
+        stop = min(self.start + self.page, len(self.shown))
+        self.place.config(text="%d-%d of %d" % (self.start + 1, stop, len(self.shown)))
+
+        return
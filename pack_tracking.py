@@ -1,22 +1,29 @@
 """ pack_tracking.py
 
 This file contains classes w/ methods to build the TKinter GUI responsible for
-tracking FIFA pack purchases
+tracking FIFA pack purchases. The data itself is held by a tracker.PackTracker
 
 This file contains classes:
     * DisplayApp - Class for creating the main GUI
     * NumberListing_Dialog - Class for creating dialog box for user to enter the # of sales from a pack
     * Listing_Dialog - Class for getting details of the players being listed
     * Selling_Dialog - Class for getting details of how much a player was sold for
+    * Bulk_Dialog - Class for getting a column and value to apply to every selected row
+    * Breakdown_Pane - Class for a window showing profit broken down by pack type, item type, and pack
     * ScrolledWindow - Class for creating a scrollable window
 
 This file contains methods:
-    Global Methods:
-        * string_validator( string, search ) - returns true if a string has no invalid characters
-
     Members of Class DisplayApp:
-        * __init___( self, width, height ) - builds the initial view of the GUI
+        * __init___( self, width, height, server, connect ) - builds the initial view of the GUI
+        * markPhase( self, name, start ) - Records how long a startup phase took
+        * backgroundLoad( self, server, connect ) - Imports, connects, and loads the data off the event loop
+        * buildSplash( self ) - Shows the loading progress in the player frame
+        * pollLoad( self ) - Updates the loading progress and shows the data once it is loaded
+        * writeStartupTiming( self ) - Appends the startup phase timings to STARTUP_LOG
+        * pollServer( self ) - Checks a server for other clients' changes every SYNC_SECONDS
+        * applyChanges( self, changes ) - Shows the rows other clients changed
         * db_connect( self, driver, server, database, trust ) - connects the display app to a MSSQL database
+        * setCounters( self ) - Sets the next free row and pack ids from the loaded data
         * test_connection( self ) - prints the currently connected database to the cmd line
         * loadData( self ) - Loads the data into a pandas DF from a MSSQL table
         * buildMenus( self ) - builds the menu ribbon of the GUI
@@ -24,17 +31,32 @@ This file contains methods:
         * buildPlayerFrame( self ) - builds the main display frame for displaying player sale records
         * buildControls( self ) - builds the control frame at the right of the GUI window
         * createButtons( self ) - Creates the buttons the user uses to control the GUI
-        * createListBoxes( self ) - Creates the list boxes the user uses to control the GUI
+        * createListBoxes( self ) - Creates the pack and pack type navigators the user filters w/
+        * fillListBoxes( self ) - Fills the list boxes w/ every pack id and pack type
         * packBox( self, event ) - Handles user selection of pack box members
         * costBox( self, event ) - Handles user selection of cost box members
+        * submitFilter( self, key ) - Hands a filter to the background worker
+        * calcFilter( self, key ) - Finds the rows and stats of a filter on the worker thread
+        * showFilter( self, result ) - Draws a calculated filter if it is still current
         * handleReset( self ) - Resets the player frame to display all data
+        * handleSort( self, column ) - Sorts the view by a column, or back to table order
         * setBindings( self ) - Sets all keyboard, mouse, and tkinter bindings
         * handleNewPack( self ) - Controls flow for pack opening
         * postData( self ) - Posts data into a new record in the MSSQL table and displays it
         * handleSale( self ) - Controls flow for sale data entry
         * postSale( self, id, price ) - Alters MSSQL table to add the sale price
-        * handleWrite( self, columns, rows, pack_id, reload, update ) - Controls flow for data writing
-        * writePlayers( self, data ) - Writes the data to the frame
+        * handleWrite( self, columns, rows, reload, update_stats ) - Sets the rows shown and marks them for redraw
+        * markDirty( self, *regions ) - Marks regions of the window for the next repaint
+        * flush( self ) - Repaints every dirty region once, when the event loop is idle
+        * writePlayers( self, data ) - Writes the first screenful of data to the frame and queues the rest
+        * renderRows( self, job, stop ) - Draws the next rows of a render job
+        * renderChunk( self, job ) - Draws one frame budget of a render job and schedules the next
+        * cancelRender( self ) - Stops drawing the rest of a view
+        * rendering( self ) - Returns whether a view is still being drawn
+        * separating( self ) - Returns whether rows are separated by pack
+        * fixSeparator( self, rdx ) - Draws or removes the pack separator below one row
+        * patchRows( self, changed, added, removed ) - Queues single row changes for the next flush
+        * applyPatches( self, patches ) - Redraws only the rows that changed
         * handleStats( self, data ) - Controls flow for profit calculations
         * calcStats( self, data ) - Calculates the statistics for display
         * writeStats( self, stats ) - Displays the stats calculated in the stats window
@@ -42,7 +64,21 @@ This file contains methods:
         * postDelete( self, id ) - Posts and commits the delete request to the sql database
         * handleEdit( self ) - Controls flow for editing a row entry
         * postEdit( self, id, data ) - Posts and commits the edit request to the sql database
-        * handleQuit( self, event ) - handles closing of the GUI
+        * toggleSelection( self, event, id ) - Adds or removes a row from the current selection
+        * clearSelection( self, event ) - Empties the current selection
+        * handleBulkDelete( self ) - Controls flow for deleting every selected row
+        * postBulkDeletion( self, ids ) - Posts and commits one delete for a set of rows
+        * handleBulkEdit( self ) - Controls flow for editing every selected row
+        * postBulkEdit( self, ids, column, value ) - Posts and commits one update for a set of rows
+        * refreshPackBox( self, packs ) - Lists the packs of the current view in the pack navigator
+        * dropPacks( self, packs ) - Stops listing packs that no longer have rows
+        * handleImport( self ) - Bulk loads a pack history file into the database
+        * handleExport( self ) - Streams the database out to a pack history file
+        * handleMetrics( self ) - Writes the session metrics to a file of the user's choosing
+        * handleProfileStart( self ) - Starts profiling a workflow
+        * handleProfileStop( self ) - Stops profiling and writes the reports
+        * handleBreakdown( self ) - Opens the profit breakdown of the current view
+        * handleQuit( self, event ) - handles closing of the GUI and writes the session metrics and query log
         * main( self ) - creates the main loop for the GUI
 
     Members of Class NumberListing_Dialog:
@@ -71,6 +107,20 @@ This file contains methods:
         * apply( self ) - override apply from NumberListing_Dialog
         * getResult_sale( self ) - gets the price the item was sold for
 
+    Members of Class Bulk_Dialog:
+        * body( self, master ) - override body from NumberListing_Dialog
+        * ok( self ) - override ok from NumberListing_Dialog
+        * validate( self ) - override validate from NumberListing_Dialog
+        * apply( self ) - override apply from NumberListing_Dialog
+        * getResult_column( self ) - gets the column to edit
+
+    Members of Class Breakdown_Pane:
+        * __init__( self, parent ) - builds the window and shows the breakdown of the current view
+        * refresh( self ) - starts recalculating the breakdown of the parent's current view
+        * poll( self, future ) - shows the breakdown once the background calculation finishes
+        * show( self, parts ) - replaces the tables w/ a calculated breakdown
+        * writeTable( self, title, table, columns ) - writes one breakdown as a grid of labels
+
     Members of Class ScrolledWindow:
         * _bound_to_mousewheel( self, event ) - binds the mousewheel to scroll action on window entry
         * _unbound_to_mousewheel( self, event ) - unbinds the mousewheel to scroll action on window exit
@@ -80,85 +130,114 @@ This file contains methods:
 Created by Ben Capodanno on July 23rd, 2019. Updated August 6th, 2019.
 """
 
+import time
+
+STARTED = time.perf_counter()
+
+import datetime
+import json
+import sys
+import threading
 import tkinter as tk
 from tkinter import ttk
 from tkinter import filedialog
 from tkinter import messagebox
-import numpy as np
-import pandas as pd
-import random
-import pyodbc
-import re
-import stats
-
-# change as necessary for database
-# this program expects a SQL Table with column names and types...
-#
-# id (primary key)      pack_id     pack_type     pack_price     player      type       bid    bin  sold
-#       int               int       nchar(10)         int       nchar(24)  nchar(10)    int    int  int
-
-# test db
-# DRIVER = "{SQL Server}"
-# SERVER = "DESKTOP-5R7EE8O\\SQLEXPRESS"
-# DATABASE = "testDB"
-# TABLE = "dbo.pack_test"
-
-# # production db
-DRIVER = "{SQL Server}"
-SERVER = "DESKTOP-5R7EE8O\\SQLEXPRESS"
-DATABASE = "player_packs"
-TABLE = "dbo.pack_tracking"
+
+import lagmonitor
+import metrics
+import navigator
+import playertable
+import profiling
+import querylog
+import worker
+# only standard library modules are imported up front so the window can draw right away. pandas,
+# numpy and pyodbc come in w/ tracker, which is imported on the loading thread
+from config import (
+    string_validator,
+    validate_listing,
+    DRIVER,
+    SERVER,
+    DATABASE,
+    TABLE,
+    COLUMNS,
+    PACKS,
+    TYPES,
+    BULK_COLUMNS,
+    FIRST_ROWS,
+    FRAME_SECONDS,
+    PLAYER_TABLE,
+    SYNC_SECONDS,
+)
+
+# each launch appends how long every startup phase took, to compare time to first paint over releases
+STARTUP_LOG = "startup_timing.jsonl"
 
 
 class DisplayApp:
-    """ An extendable GUI system with multiple control and display frame, and scrollable main frame
+    """ An extendable GUI system with multiple control and display frame, and scrollable main frame.
+        The data and every operation on it belong to a PackTracker, this class only draws it
 
-        __init__( self, width, height )
+        __init__( self, width, height, server, connect )
         width - width of root window (encompasses all frames)
         height - height of root window
+        server - (Default None) url of a server.py instance to use instead of the database
+        connect - (Default None) function returning a DB-API connection to use instead of the database,
+                  such as fakedb.FakeStore.connect
     """
 
-    def __init__(self, width, height):
+    def __init__(self, width, height, server=None, connect=None):
 
         # app wide constants
-        self.COLUMNS = [
-            "id",
-            "pack_id",
-            "pack_price",
-            "pack_type",
-            "name",
-            "type",
-            "bid",
-            "bin",
-            "sold",
-        ]
-        self.PACKS = {
-            "bronze": 400,
-            "bronze r": 750,
-            "silver": 2500,
-            "silver r": 3750,
-            "gold": 5000,
-            "gold r": 7500,
-        }
-        self.TYPES = [
-            "player",
-            "healing",
-            "fitness",
-            "contract",
-            "kit",
-            "stadia",
-            "badge",
-            "manager",
-            "coach",
-        ]
+        self.COLUMNS = COLUMNS
+        self.PACKS = PACKS
+        self.TYPES = TYPES
 
         self.PALLETE = ["#A6206A", "#2F9395", "#F8B195", "#474747", "#F6903D"]  # nice
+        self.SELECTED = "#D9D9F3"
+
+        self.BULK_COLUMNS = BULK_COLUMNS
+
+        # ids of the rows the user has selected in the player frame
+        self.selected = set()
+
+        # the column the view is sorted by and whether it is descending, None for table order
+        self.curr_sort = None
+
+        # the view being drawn a slice at a time, and the callback that draws its next slice
+        self.render = None
+        self.render_after = None
+
+        # the tracker is built on a background thread, these hold its progress until it is ready
+        self.tracker = None
+        self.loaded = None
+        self.load_error = None
+        self.load_phase = "starting"
+        self.phases = []
 
         # create a tk object, which is the root window
         self.root = tk.Tk()
+        mark = self.markPhase("create root", STARTED)
+
+        # measure how long the event loop is blocked, and by which handler
+        self.lag = lagmonitor.LagMonitor(self.root)
+        self.lag.start()
+
+        # profiles a workflow between the start and stop profiling menu entries
+        self.profiler = profiling.ProfileSession(self.root)
 
-        # create the server connection and get all columns
-        self.cursor = self.db_connect(DRIVER, SERVER, DATABASE)
+        # filters and their stats are calculated off the event loop, only the last click is drawn
+        self.worker = worker.LatestWorker(self.root)
+
+        # a tracker on a server.py instance checks it for other clients' changes on its own worker,
+        # so a check never supersedes a filter
+        self.syncer = None
+
+        # regions of the window waiting to be repainted, and anything already calculated for them
+        self.dirty = set()
+        self.ready = {}
+        self.patches = {"changed": {}, "added": [], "removed": set()}
+        self.flush_pending = False
+        self.view_columns = COLUMNS[1:]
 
         # width and height of the window
         self.initDx = width
@@ -176,33 +255,252 @@ class DisplayApp:
         # bring the window to the front
         self.root.lift()
 
-        # load the data
-        self.loadData()
-
         # setup the menus
         self.buildMenus()
 
-        # build the controls
+        # build the controls, which stay disabled until the data arrives
         self.buildControls()
+        for button in self.buttons:
+            button[1].config(state=tk.DISABLED)
 
-        # build the objects on the Canvas
-        self.buildPlayerFrame()
+        # build the objects on the Canvas, w/ a progress display where the players will go
+        self.buildPlayerFrame(write=False)
         self.buildStatsFrame()
+        self.buildSplash()
 
         # set up the key bindings
         self.setBindings()
+        mark = self.markPhase("build window", mark)
+
+        # the first idle callback runs once the window has been drawn
+        self.root.after_idle(self.markPhase, "first paint", mark)
+
+        # load the data in the background and check on it from the event loop
+        threading.Thread(
+            target=self.backgroundLoad, args=(server, connect), daemon=True
+        ).start()
+        self.root.after(50, self.pollLoad)
+
+    def markPhase(self, name, start):
+        """ records how long a startup phase that just finished took. The loader thread and the
+            event loop mark phases at the same time, so each thread passes the start of its own
+            phase rather than sharing one last mark
+        :param name: The name of the phase
+        :type name: String
+        :param start: When the phase started, from time.perf_counter
+        :type start: Float
+        :returns: When the phase finished, the start of the thread's next phase
+        :rtype: Float
+        """
+
+        now = time.perf_counter()
+        self.phases.append((name, round(now - start, 4), round(now - STARTED, 4)))
+        metrics.observe("startup." + name, now - start)
+
+        return now
+
+    def backgroundLoad(self, server, connect=None):
+        """ imports the heavy modules, connects, and loads the data off of the event loop thread
+        :param server: url of a server.py instance to use instead of the database, or None
+        :type server: String or None
+        :param connect: (Default None) function returning the connection to use, None connects to
+                        the database in config.py
+        :type connect: Function or None
+        :returns: None
+        :rtype: None
+        """
+
+        mark = time.perf_counter()
 
-        # set up system wide tracking variables
         try:
-            self.curr_pack_id = self.data["pack_id"].unique().max() + 1
-            self.curr_id = self.data.index.unique().max() + 1
-            self.curr_pack_displaying = None
-        except ValueError:
-            self.curr_pack_id = 1
-            self.curr_id = 1
+            self.load_phase = "importing modules"
+            from tracker import PackTracker, SQLBackend
+
+            mark = self.markPhase("import modules", mark)
+
+            self.load_phase = "connecting"
+            if server is None:
+                if connect is None:
+                    conn = self.db_connect(DRIVER, SERVER, DATABASE)
+                else:
+                    conn = querylog.wrap(connect())
+                backend = SQLBackend(conn)
+                mark = self.markPhase("connect", mark)
+
+                self.load_phase = "loading data"
+                self.loaded = PackTracker(backend)
+            else:
+                import server as api
+
+                self.loaded = api.RemoteTracker(server)
+            self.markPhase("load data", mark)
+        except Exception as e:
+            self.load_error = e
+
+        return
+
+    def buildSplash(self):
+        """ shows the loading progress where the players will be drawn
+        :returns: None
+        :rtype: None
+        """
+
+        self.splash = tk.Label(self.canvas.scrollwindow, text="Loading...", font=(8))
+        self.splash.grid(row=0, column=0, padx=20, pady=(20, 4))
+
+        self.progress = ttk.Progressbar(
+            self.canvas.scrollwindow, mode="indeterminate", length=240
+        )
+        self.progress.grid(row=1, column=0, padx=20)
+        self.progress.start(15)
+
+        return
+
+    @lagmonitor.tracked
+    def pollLoad(self):
+        """ updates the progress display until the background load finishes, then shows the data
+        :returns: None
+        :rtype: None
+        """
+
+        if self.load_error is not None:
+            self.progress.stop()
+            self.splash.config(text="Could not load data", foreground="red")
+            tk.messagebox.showerror("Error", str(self.load_error))
+            return
+
+        if self.loaded is None:
+            self.splash.config(
+                text="%s... %.1fs" % (self.load_phase.capitalize(), time.perf_counter() - STARTED)
+            )
+            self.root.after(50, self.pollLoad)
+            return
+
+        mark = time.perf_counter()
+        self.tracker = self.loaded
+        self.curr_index = self.data.index
+        self.curr_filter = ("all",)
+
+        self.fillListBoxes()
+        self.handleWrite(self.COLUMNS, self.curr_index, reload=False)
+        self.setCounters()
+        for button in self.buttons:
+            button[1].config(state=tk.NORMAL)
+        self.markPhase("show data", mark)
+
+        self.writeStartupTiming()
+
+        if hasattr(self.tracker, "changes"):
+            self.syncer = worker.LatestWorker(self.root)
+            self.root.after(int(SYNC_SECONDS * 1000), self.pollServer)
+
+        return
+
+    def pollServer(self):
+        """ asks the server, off the event loop, whether other clients changed the data, and asks
+            again every SYNC_SECONDS
+        :returns: None
+        :rtype: None
+        """
+
+        self.syncer.submit(
+            self.tracker.changes,
+            done=self.applyChanges,
+            failed=lambda e: metrics.count("sync.failed"),
+        )
+        self.root.after(int(SYNC_SECONDS * 1000), self.pollServer)
+
+        return
+
+    @lagmonitor.tracked
+    def applyChanges(self, changes):
+        """ loads the rows fetched from the server when other clients changed them, and shows the
+            current filter again from them
+        :param changes: What RemoteTracker.changes returned, None if nothing changed
+        :type changes: Tuple or None
+        :returns: None
+        :rtype: None
+        """
+
+        if changes is None:
+            return
+
+        metrics.count("sync.reloads")
+        self.tracker.sync(changes)
+        self.selected = {id for id in self.selected if id in self.data.index}
+
+        # an edited view is no filter's rows anymore, so it goes back to every row
+        if self.curr_filter in (None, ("all",)):
+            self.curr_index = self.data.index
+            self.curr_filter = ("all",)
+            self.markDirty("players", "stats", "packs", "types")
+        else:
+            self.markDirty("types")
+            self.submitFilter(self.curr_filter)
+
+        return
+
+    def writeStartupTiming(self):
+        """ appends the startup phase timings of this launch to STARTUP_LOG
+        :returns: None
+        :rtype: None
+        """
+
+        elapsed = {name: at for name, took, at in self.phases}
+        record = {
+            "date": datetime.datetime.now().isoformat(timespec="seconds"),
+            "rows": len(self.data),
+            "first_paint": elapsed.get("first paint"),
+            "total": elapsed["show data"],
+            "phases": {name: took for name, took, at in self.phases},
+        }
+
+        try:
+            with open(STARTUP_LOG, "a") as f:
+                f.write(json.dumps(record) + "\n")
+        except OSError:
+            pass
+
+        return
+
+    @property
+    def data(self):
+        """ the pack data held by the tracker """
+        return self.tracker.data
+
+    @property
+    def conn(self):
+        """ the database connection held by the tracker, None when using a server """
+        return getattr(self.tracker.backend, "conn", None)
+
+    @property
+    def cursor(self):
+        """ the database cursor held by the tracker, None when using a server """
+        return getattr(self.tracker.backend, "cursor", None)
+
+    @property
+    def curr_id(self):
+        """ the next free row id """
+        return self.tracker.curr_id
+
+    @property
+    def curr_pack_id(self):
+        """ the next free pack id """
+        return self.tracker.curr_pack_id
+
+    def setCounters(self):
+        """ sets the next free row and pack ids from the loaded data
+        :returns: None
+        :rtype: None
+        """
+
+        self.tracker.setCounters()
+        self.curr_pack_displaying = None
+
+        return
 
     def db_connect(self, driver, server, database, trust="yes"):
-        """ connects to the database, sets a connection object
+        """ connects to the database
         :param driver: the driver name of the sql server
         :type driver: String
         :param server: the name of the sql server
@@ -211,15 +509,13 @@ class DisplayApp:
         :type database: String
         :param trust: whether to trust the connection
         :type trust: String
-        :returns: the cursor object for db interaction
-        :rtype: pyodbc cursor
+        :returns: the connection object for db interaction
+        :rtype: pyodbc connection
         """
 
-        self.conn = pyodbc.connect(
-            driver=driver, server=server, database=database, Trusted_Connection=trust
-        )
+        from tracker import connect
 
-        return self.conn.cursor()
+        return connect(driver, server, database, trust)
 
     def test_connection(self):
         """ prints the database to ensure it is connected
@@ -227,26 +523,29 @@ class DisplayApp:
         :rtype: None
         """
 
+        if self.tracker is None:
+            print("still connecting")
+            return
+
+        if self.cursor is None:
+            print("connected to server " + self.tracker.backend.url)
+            return
+
         self.cursor.execute("SELECT * FROM " + TABLE)
 
         for row in self.cursor:
             print(row)
 
+    @metrics.timed("loadData")
     def loadData(self):
-        """ loads the data from MSSQL server into a pandas DataFrame
+        """ reloads the tracker data from MSSQL server and resets the view to all of it
         :returns: None
         :rtype: None
         """
 
-        query = "SELECT * FROM " + TABLE
-        self.cursor.execute(query)
-
-        # convert iterator to a list and then make a data frame from this list, stripping off all whitespace
-        records = pd.DataFrame.from_records(list(self.cursor), columns=self.COLUMNS)
-        self.data = records.apply(lambda x: x.str.strip() if x.dtype == "object" else x)
-        self.data.set_index("id", inplace=True)
-        self.data[["sold"]] = self.data[["sold"]].astype("Int64")
+        self.tracker.loadData()
         self.curr_index = self.data.index
+        self.curr_filter = ("all",)
 
         return
 
@@ -267,8 +566,32 @@ class DisplayApp:
         self.menulist.append(filemenu)
 
         # menu text and functions for the elements
-        menutext = [["Quit", "Test DB"]]
-        menucmd = [[self.handleQuit, self.test_connection]]
+        menutext = [
+            [
+                "Import History",
+                "Export History",
+                "-",
+                "Export Metrics",
+                "Start Profiling",
+                "Stop Profiling",
+                "-",
+                "Quit",
+                "Test DB",
+            ]
+        ]
+        menucmd = [
+            [
+                self.handleImport,
+                self.handleExport,
+                None,
+                self.handleMetrics,
+                self.handleProfileStart,
+                self.handleProfileStop,
+                None,
+                self.handleQuit,
+                self.test_connection,
+            ]
+        ]
 
         # build the menu elements and callbacks
         for i in range(len(self.menulist)):
@@ -290,12 +613,17 @@ class DisplayApp:
         self.statsArea = tk.Frame(self.bigframe, width=48)
         self.statsArea.pack(side=tk.RIGHT, padx=2, pady=4, fill=tk.Y)
 
+        # the value label of each stat, made on the first write and reconfigured after that
+        self.stat_labels = {}
+
+        # how much of a large view has been drawn, only shown while it is being drawn
+        self.render_label = tk.Label(self.statsArea, font=(6))
+        self.render_bar = ttk.Progressbar(self.statsArea, mode="determinate", length=100)
+
         # create a sepaarator line for the status area
         sep = tk.Frame(self.root, height=self.initDy, width=2, bd=1, relief=tk.SUNKEN)
         sep.pack(side=tk.RIGHT, padx=2, pady=2, fill=tk.Y)
 
-        self.handleStats(self.data)
-
         return
 
     def buildPlayerFrame(self, write=True):
@@ -312,6 +640,16 @@ class DisplayApp:
         )
         self.canvas.pack(side=tk.RIGHT)
 
+        # draws the rows, keeping their cells by row id so a change to a few rows only touches those
+        self.table = playertable.make_table(
+            PLAYER_TABLE,
+            self.canvas,
+            self.PALLETE,
+            self.SELECTED,
+            self.toggleSelection,
+            self.handleSort,
+        )
+
         # write data using all columns if write is true
         if write:
             self.handleWrite(self.COLUMNS, self.curr_index, update_stats=False)
@@ -324,7 +662,11 @@ class DisplayApp:
         :rtype: None
         """
 
+        # anything left of the last view is not drawn
+        self.cancelRender()
+
         # loops through children of the scroll window and destroys them, allowing new labels to be drawn
+        self.table.clear()
         for widget in self.canvas.scrollwindow.winfo_children():
             widget.destroy()
 
@@ -363,6 +705,7 @@ class DisplayApp:
         self.cstBox.bind("<FocusOut>", lambda e: self.cstBox.selection_clear(0, "end"))
         self.cstBox.bind("<<ListboxSelect>>", self.costBox)
         self.pkBox.bind("<<ListboxSelect>>", self.packBox)
+        self.root.bind("<Escape>", self.clearSelection)
 
     def createButtons(self):
         # make buttons for control frame, enabling user open, sell, and delete
@@ -423,6 +766,39 @@ class DisplayApp:
                 ),
             )
         )
+        self.buttons.append(
+            (
+                "bulk edit",
+                tk.Button(
+                    self.cntlframe,
+                    text="Edit Selected",
+                    command=self.handleBulkEdit,
+                    width=12,
+                ),
+            )
+        )
+        self.buttons.append(
+            (
+                "bulk delete",
+                tk.Button(
+                    self.cntlframe,
+                    text="Delete Selected",
+                    command=self.handleBulkDelete,
+                    width=12,
+                ),
+            )
+        )
+        self.buttons.append(
+            (
+                "breakdown",
+                tk.Button(
+                    self.cntlframe,
+                    text="Profit Breakdown",
+                    command=self.handleBreakdown,
+                    width=12,
+                ),
+            )
+        )
 
         # add these buttons to frame
         for bNum in range(len(self.buttons)):
@@ -436,33 +812,30 @@ class DisplayApp:
         :rtype: None
         """
 
-        xLabel = tk.Label(self.cntlframe, text="Individual Packs")
-        self.pkBox = tk.Listbox(self.cntlframe, height=16, width=16, exportselection=0)
-
-        # attach lambda to pkBox that allows for checking what entries are in listbox
-        self.pkBox.__contains__ = lambda str: str in self.pkBox.get(0, "end")
-
-        for record in self.data["pack_id"].unique():
-            self.pkBox.insert("end", record)
+        # the packs are paged and searchable by id or type, the few pack types are listed whole
+        self.packNav = navigator.Navigator(
+            self.cntlframe, "Individual Packs", 16, kinds=lambda: self.tracker.packKinds()
+        )
+        self.typeNav = navigator.Navigator(self.cntlframe, "Pack Types", 6, page=None)
 
-        yLabel = tk.Label(self.cntlframe, text="Pack Types")
-        self.cstBox = tk.Listbox(self.cntlframe, height=6, width=16, exportselection=0)
+        self.pkBox = self.packNav.box
+        self.cstBox = self.typeNav.box
+        self.listboxes = [self.pkBox, self.cstBox]
 
-        # same lambda as above but for cost box
-        self.cstBox.__contains__ = lambda str: str in self.cstBox.get(0, "end")
+        return
 
-        for record in self.data["pack_type"].unique():
-            self.cstBox.insert("end", record)
+    def fillListBoxes(self):
+        """ fills the list boxes w/ every pack id and pack type
+        :returns: None
+        :rtype: None
+        """
 
-        # draw and label the list boxes
-        self.listboxes = [self.pkBox, self.cstBox]
-        labels = [xLabel, yLabel]
-        for t in range(len(self.listboxes)):
-            labels[t].pack(side=tk.TOP, pady=2)
-            self.listboxes[t].pack(side=tk.TOP, pady=0)
+        self.packNav.fill(self.tracker.packIds())
+        self.typeNav.fill(self.tracker.packTypes())
 
         return
 
+    @lagmonitor.tracked
     def packBox(self, event):
         """ main method for handling listbox of pack subsetting
         :param event: The tkinter event that spawned this call
@@ -471,14 +844,14 @@ class DisplayApp:
         :rtype: None
         """
 
-        # this gets the indices matching the current selection and sets the current index to those rows
-        curselection = self.data["pack_id"].unique()[self.pkBox.curselection()[0]]
-        self.curr_index = self.data[self.data["pack_id"] == curselection].index
-
-        self.handleWrite(self.COLUMNS, self.curr_index, reload=False, update=True)
+        # the rows and stats of the selection are found in the background, see showFilter
+        curselection = self.packNav.selected()
+        if curselection is not None:
+            self.submitFilter(("pack", curselection))
 
         return
 
+    @lagmonitor.tracked
     def costBox(self, event):
         """ main method for handling listbox of cost subsetting
         :param event: The tkinter event that spawned this call
@@ -487,33 +860,125 @@ class DisplayApp:
         :rtype: None
         """
 
-        # this gets the indices matching the current selection and sets the current index to those rows
-        curselection = self.data["pack_type"].unique()[self.cstBox.curselection()[0]]
-        self.curr_index = self.data[
-            self.data["pack_type"].str.match(str(curselection))
-        ].index
+        # the rows, stats and packs of the selection are found in the background, see showFilter
+        curselection = self.typeNav.selected()
+        if curselection is not None:
+            self.submitFilter(("type", curselection))
 
-        self.pkBox.delete(0, "end")
-        for record in self.data.loc[self.curr_index]["pack_id"].unique():
-            self.pkBox.insert("end", record)
-        self.handleWrite(self.COLUMNS, self.curr_index, reload=False, update=True)
+        return
+
+    def submitFilter(self, key):
+        """ hands a filter to the background worker, superseding any filter still being calculated
+        :param key: The filter, either ( "pack", pack_id ) or ( "type", pack_type )
+        :type key: Tuple
+        :returns: None
+        :rtype: None
+        """
+
+        self.worker.submit(
+            self.calcFilter,
+            (key,),
+            done=self.showFilter,
+            failed=lambda e: tk.messagebox.showerror("Error", str(e)),
+        )
+
+        return
+
+    def calcFilter(self, key):
+        """ finds the rows, columns shown, and stats of a filter. Runs on the worker thread, so it
+            only reads the tracker and never touches tk
+        :param key: The filter, either ( "pack", pack_id ) or ( "type", pack_type )
+        :type key: Tuple
+        :returns: The filter, its rows, their shown columns, stats, and packs, the data version, and
+                  the sort the rows are in
+        :rtype: Tuple
+        """
+
+        version = self.tracker.version
+        sort = self.curr_sort
+
+        if key[0] == "pack":
+            rows = self.tracker.filterPack(key[1])
+            packs = None
+        else:
+            rows = self.tracker.filterType(key[1])
+            packs = self.tracker.packIds(rows)
+
+        # the view holds the positions of the rows, the columns are only read as they are needed
+        view = self.tracker.view(rows, self.COLUMNS[1:])
+        if sort is not None:
+            view = self.tracker.sortView(view, *sort)
+            rows = view.index
+
+        # cached under the version the rows were read at, an edit since then makes it a miss
+        pack_stats = self.tracker.calcStats(view, key, version)
+
+        return key, rows, view, pack_stats, packs, version, sort
+
+    @lagmonitor.tracked
+    def showFilter(self, result):
+        """ draws a filter calculated by calcFilter, recalculating it if the data changed since
+        :param result: What calcFilter returned
+        :type result: Tuple
+        :returns: None
+        :rtype: None
+        """
+
+        key, rows, view, pack_stats, packs, version, sort = result
+        if version != self.tracker.version or sort != self.curr_sort:
+            self.submitFilter(key)
+            return
+
+        self.curr_index = rows
+        self.curr_filter = key
+        self.markDirty("players", "stats")
+        self.ready = {"view": view, "stats": pack_stats}
+        if packs is not None:
+            self.ready["packs"] = packs
+            self.markDirty("packs")
 
         return
 
+    @lagmonitor.tracked
+    def handleSort(self, column):
+        """ sorts the view by a column, a second click on the same column reverses it and clicking the
+            id goes back to table order. Filters picked afterwards stay sorted the same way
+        :param column: The column whose header was clicked
+        :type column: String
+        :returns: None
+        :rtype: None
+        """
+
+        if self.tracker is None:
+            return
+
+        if column == "id":
+            self.curr_sort = None
+            self.curr_index = self.curr_index.sort_values()
+        elif self.curr_sort is not None and self.curr_sort[0] == column:
+            self.curr_sort = (column, not self.curr_sort[1])
+        else:
+            self.curr_sort = (column, False)
+
+        # the same rows in another order, so the stats and any cached filter stats still hold
+        self.ready = {}
+        self.markDirty("players")
+
+        return
+
+    @lagmonitor.tracked
     def handleReset(self):
         """ method for handling view reset
         :returns: None
         :rtype: None
         """
 
-        self.clearPlayerFrame()
         self.loadData()
-        self.handleWrite(self.COLUMNS, self.curr_index, reload=True)
-        self.pkBox.delete(0, "end")
-        for record in self.data.loc[self.curr_index]["pack_id"].unique():
-            self.pkBox.insert("end", record)
+        self.handleWrite(self.COLUMNS, self.curr_index, reload=False)
+        self.markDirty("packs")
         self.canvas.scrollwindow.focus_set()  # this isnt strictly necessary, but clears selections from the listboxes
 
+    @lagmonitor.tracked
     def handleNewPack(self):
         """ main method for handling pack opening
         :returns: None
@@ -539,15 +1004,24 @@ class DisplayApp:
         else:
             pack_price = self.PACKS[pack_type]
 
-        self.postData(to_add.getResult(), to_add.getResult_qs(), pack_type, pack_price)
+        items = to_add.getResult()
+        self.postData(items, to_add.getResult_qs(), pack_type, pack_price)
 
-        # we have to load data here even though we have that reload argument b/c otherwise the write
-        # function doesn't get the index for the new data
-        self.loadData()
-        self.handleWrite(self.COLUMNS, self.data.index, reload=False)
+        # the tracker appended the pack, so when every row is shown only the new rows are drawn.
+        # a filtered view is replaced by every row, as it would not include the new pack
+        added = self.data.index[len(self.data) - len(items) :]
+        if self.curr_filter == ("all",):
+            self.curr_index = self.data.index
+            self.patchRows(added=list(added))
+        else:
+            self.curr_index = self.data.index
+            self.curr_filter = ("all",)
+            self.handleWrite(self.COLUMNS, self.curr_index, reload=False)
+            self.markDirty("packs")
 
         return
 
+    @metrics.timed("postData")
     def postData(self, data, qs_price, pack_type, pack_price):
         """ posts data gathered into the mssql database connected currently
         :param data: The 'meat' of the data to post
@@ -562,37 +1036,15 @@ class DisplayApp:
         :rtype: None
         """
 
-        for row in data:
-            query = (
-                "INSERT INTO "
-                + TABLE
-                + "(id,pack_id,pack_price,pack_type,name,type,bid,bin) VALUES (?,?,?,?,?,?,?,?)"
-            )
-
-            self.cursor.execute(
-                query,
-                (
-                    int(self.curr_id),
-                    int(self.curr_pack_id),
-                    pack_price - qs_price,
-                    pack_type,
-                    row[0],
-                    row[1],
-                    int(row[2]),
-                    int(row[3]),
-                ),
-            )
-            self.curr_id += 1
+        pack_id = self.tracker.postData(data, qs_price, pack_type, pack_price)
 
-        self.pkBox.insert("end", self.curr_pack_id)
-        # make sure pack types do not duplicate w/in the listbox
-        if not self.cstBox.__contains__(pack_type):
-            self.cstBox.insert("end", pack_type)
-        self.curr_pack_id += 1
-        self.conn.commit()
+        # the navigators skip items they already list
+        self.packNav.insert(pack_id)
+        self.typeNav.insert(pack_type)
 
         return
 
+    @lagmonitor.tracked
     def handleSale(self):
         """ main method for handling a completed player sale
         :returns: None
@@ -606,9 +1058,17 @@ class DisplayApp:
 
         id_loc = int(selling.getResult())
 
-        self.postSale(id_loc, selling.getResult_sale())
-        self.handleWrite(self.COLUMNS, self.data.index, reload=True, update=True)
+        # the tracker checks the row exists and the price against its bin before writing
+        try:
+            self.postSale(id_loc, selling.getResult_sale())
+        except ValueError as e:
+            tk.messagebox.showerror("Error", str(e))
+            return
 
+        # the tracker patches the sale into its data, so only the sold cell is redrawn
+        self.patchRows(changed={id_loc: ("sold",)})
+
+    @metrics.timed("postSale")
     def postSale(self, id, sale_price):
         """ updates the sale price of a low in the database
         :param id: the primary key of the row to update
@@ -619,68 +1079,166 @@ class DisplayApp:
         :rtype: None
         """
 
-        query = "UPDATE " + TABLE + " SET sold = (?) WHERE id = (?)"
-        self.cursor.execute(query, (sale_price, id))
-        self.conn.commit()
+        self.tracker.postSale(id, sale_price)
 
         return
 
-    def handleWrite(self, columns, rows, reload=True, update=False, update_stats=True):
-        """ main method for handling player writing
+    @metrics.timed("handleWrite")
+    def handleWrite(self, columns, rows, reload=True, update_stats=True):
+        """ main method for handling player writing. The rows become the view and the player frame
+            is marked dirty, so any number of writes in one handler repaint it once
         :param columns: The columns on which to subset the data
         :type columns: List of Strings
-        :param pack_id: (Default None) The id number of the pack on which to subset this data
-        :type pack_id: Integer or None
+        :param rows: The ids of the rows to show
+        :type rows: pandas Index
         :param reload: (Default True) Whether to reload the data
         :type reload: Boolean
-        :param update: (Default False) Whether this call should update where the players are displayed.
-                       This makes deleting and redrawing the player frame necessary
-        :type update: Boolean
         :param update_stats: (Default True) Whether to update the stats frame on redraw
         :type update_stats: Boolean
         :returns: None
         :rtype: None
         """
 
-        # if we reload the data, we assume that we display all of it because the rows passed would
-        # not contain the reloaded rows, but if update, we dont need to do this since it'll just get
-        # destroyed later
         if reload:
             self.loadData()
-            if not update:
-                self.writePlayers(self.data.loc[rows][columns[1:]], update_stats)
-                return
 
-        # updating the frame just creates an empty canvas to write.
-        # if you are calling update=True you should be subsetting or changing the data displayed in some way
-        if update:
+        # rows other than the current filter's are shown w/o a filter, so their stats are not cached
+        if rows is not self.curr_index and not rows.equals(self.curr_index):
+            self.curr_index = rows
+            self.curr_filter = None
+
+        self.view_columns = columns[1:]
+        self.ready = {}
+        self.markDirty("players")
+        if update_stats:
+            self.markDirty("stats")
+
+        return
+
+    def markDirty(self, *regions):
+        """ marks regions of the window as needing a repaint, and schedules one flush for when the
+            event loop is next idle
+        :param regions: Any of "players", "rows", "stats", "packs" and "types"
+        :type regions: Strings
+        :returns: None
+        :rtype: None
+        """
+
+        self.dirty.update(regions)
+
+        if not self.flush_pending:
+            self.flush_pending = True
+            self.root.after_idle(self.flush)
+
+        return
+
+    @lagmonitor.tracked
+    @metrics.timed("flush")
+    def flush(self):
+        """ repaints every dirty region from the current view, once each
+        :returns: None
+        :rtype: None
+        """
+
+        dirty, self.dirty = self.dirty, set()
+        ready, self.ready = self.ready, {}
+        self.flush_pending = False
+
+        if self.tracker is None or not dirty:
+            return
+
+        metrics.count("flush.regions", len(dirty))
+
+        view = ready.get("view")
+
+        # a redrawn view keeps the sort, only a filter calculated w/ it is already in order
+        if view is None and "players" in dirty and self.curr_sort is not None:
+            view = self.tracker.view(self.curr_index, self.view_columns)
+            view = self.tracker.sortView(view, *self.curr_sort)
+            self.curr_index = view.index
+
+        if view is None and (dirty & {"players", "stats"} or "rows" in dirty):
+            view = self.tracker.view(self.curr_index, self.view_columns)
+
+        if "types" in dirty:
+            self.typeNav.fill(self.tracker.packTypes())
+
+        if "packs" in dirty:
+            self.refreshPackBox(ready.get("packs"))
+
+        patches = self.patches
+        self.patches = {"changed": {}, "added": [], "removed": set()}
+
+        if "players" in dirty:
             self.clearPlayerFrame()
+            self.writePlayers(view, False)
+        elif "rows" in dirty and self.rendering():
+            # rows still waiting to be drawn would be drawn from the view before the patches
+            self.clearPlayerFrame()
+            self.writePlayers(view, False)
+        elif "rows" in dirty:
+            self.applyPatches(patches)
 
-        self.writePlayers(self.data.loc[rows][columns[1:]], update_stats)
+        if "stats" in dirty:
+            self.writeStats(ready["stats"] if "stats" in ready else self.calcStats(view))
 
         return
 
+    @metrics.timed("writePlayers")
     def writePlayers(self, data, update_stats):
-        """ writes the player data to the main tk Frame
-        :param data: the data being written to the frame
-        :type data: pandas DataFrame
+        """ writes the player data to the main tk Frame. The first screenful is drawn right away, and
+            the rest a frame budget at a time from the event loop so large views never stall it
+        :param data: the rows being written to the frame
+        :type data: rowview RowView
         :returns: None
         rtype: None
         """
 
+        # count every widget made so slow redraws can be told apart from large ones
+        widgets = 0
+
         # creates the header row of the table
-        lab = tk.Label(self.canvas.scrollwindow, text="id")
-        lab.config(font=(8), anchor="center", width=9)
-        lab.grid(row=0, column=0, padx=(7, 0))
+        widgets += self.table.header(data.columns, self.curr_sort)
+
+        # the rows are drawn in order, and a row is followed by a separator when the next one is from
+        # another pack
+        self.render = {
+            "data": data,
+            "packs": data["pack_id"].to_numpy(),
+            "pos": 0,
+            "widgets": widgets,
+            "started": time.perf_counter(),
+            "separate": self.separating(),
+        }
+        self.renderRows(self.render, FIRST_ROWS)
+
+        if self.render["pos"] < len(data):
+            self.render_label.grid(row=98, column=0, pady=(12, 0))
+            self.render_bar.config(maximum=len(data), value=self.render["pos"])
+            self.render_bar.grid(row=99, column=0)
+            self.render_label.config(text="Drawing %d / %d" % (self.render["pos"], len(data)))
+            self.render_after = self.root.after(1, self.renderChunk, self.render)
+        else:
+            self.cancelRender()
 
-        for col in enumerate(data):
-            lab = tk.Label(self.canvas.scrollwindow, text=col[1])
-            lab.config(font=(8), anchor="center", width=9)
-            lab.grid(row=0, column=col[0] + 1, padx=(7, 0))
+        metrics.count("writePlayers.rows", len(data))
 
-        ttk.Separator(self.canvas.scrollwindow, orient=tk.HORIZONTAL).grid(
-            column=0, row=1, columnspan=10, sticky="ew"
-        )
+        # update stats pane each time records are written
+        # this keeps the stats pane consistent w/ all filters applied and any new players added
+        if update_stats:
+            self.handleStats(data)
+
+        return
+
+    def renderRows(self, job, stop):
+        """ draws the rows of a render job from where it left off up to a position
+        :param job: The view being drawn and how far it has got
+        :type job: Dictionary
+        :param stop: The position to stop before
+        :type stop: Integer
+        :returns: None
+        :rtype: None
+        """
 
         # grids and displays player data
         # for maintenance, rows are placed like...
@@ -689,221 +1247,642 @@ class DisplayApp:
         # row (1 through N) * 2: Data
         # row ((1 through N) * 2) + 1 if the next row is a diff pack: separators
 
-        for rdx, row in data.iterrows():
-            lab = tk.Label(self.canvas.scrollwindow, text=rdx)
-            lab.config(
-                font=(6), foreground=self.PALLETE[row["pack_id"] % len(self.PALLETE)]
-            )
-            lab.grid(row=(rdx) * 2, column=0, padx=(3, 0))
+        data, packs, pos = job["data"], job["packs"], job["pos"]
+        stop = min(stop, len(data))
+        widgets = 0
 
-            for col in enumerate(data):
+        for rdx, row in data.rows(pos, stop):
+            widgets += self.table.addRow(rdx, row, data.columns, rdx in self.selected)
 
-                lab = tk.Label(self.canvas.scrollwindow, text=row[col[1]])
-                lab.config(font=(6))
+            # the last row has nothing after it to be separated from
+            if job["separate"] and pos + 1 < len(data) and packs[pos + 1] != packs[pos]:
+                widgets += self.table.separator(rdx, True)
 
-                if col[1] == "player":
-                    lab.config(width=8)
+            pos += 1
 
-                if col[1] != "sold":
-                    lab.config(
-                        foreground=self.PALLETE[row["pack_id"] % len(self.PALLETE)]
-                    )
-                else:
-                    if np.isnan(row[col[1]]):
-                        lab.config(foreground="red")
-                    else:
-                        lab.config(foreground="green")
+        self.table.layout()
+        job["pos"] = pos
+        job["widgets"] += widgets
 
-                lab.grid(row=(rdx) * 2, column=col[0] + 1, padx=(3, 0))
+        return
 
-            # separate based on pack id. since index is not necessarily linear, get the series of items
-            # after the current index, then get the first index of that series to find the pack id of next item
-            # try/except catches the last row of data, but we don't need to separate as there is nothing after it
-            try:
-                if data["pack_id"].loc[rdx:].iloc[1] != row["pack_id"]:
-                    ttk.Separator(self.canvas.scrollwindow, orient=tk.HORIZONTAL).grid(
-                        column=0, row=(rdx * 2) + 1, columnspan=10, sticky="ew"
-                    )
-            except IndexError:
-                pass
+    @lagmonitor.tracked
+    @metrics.timed("renderChunk")
+    def renderChunk(self, job):
+        """ draws as many rows of a render job as fit in a frame budget, then lets the event loop run
+            before drawing more
+        :param job: The view being drawn and how far it has got
+        :type job: Dictionary
+        :returns: None
+        :rtype: None
+        """
 
-        # update stats pane each time records are written
-        # this keeps the stats pane consistent w/ all filters applied and any new players added
-        if update_stats:
-            self.handleStats(data)
+        self.render_after = None
+
+        # the view was replaced since this slice was scheduled
+        if job is not self.render:
+            return
+
+        # a handful of rows at a time keeps the clock from being checked after every label
+        deadline = time.perf_counter() + FRAME_SECONDS
+        while job["pos"] < len(job["data"]) and time.perf_counter() < deadline:
+            self.renderRows(job, job["pos"] + 8)
+
+        if job["pos"] < len(job["data"]):
+            self.render_bar.config(value=job["pos"])
+            self.render_label.config(text="Drawing %d / %d" % (job["pos"], len(job["data"])))
+            self.render_after = self.root.after(1, self.renderChunk, job)
+        else:
+            metrics.observe("render.complete", time.perf_counter() - job["started"])
+            self.cancelRender()
+
+        return
+
+    def cancelRender(self):
+        """ stops drawing the rest of the current view and hides the progress, whether it finished
+            or was replaced
+        :returns: None
+        :rtype: None
+        """
+
+        if self.render_after is not None:
+            self.root.after_cancel(self.render_after)
+            self.render_after = None
+
+        if self.render is not None:
+            if self.render["pos"] < len(self.render["data"]):
+                metrics.count("render.cancelled")
+            metrics.count("writePlayers.widgets", self.render["widgets"])
+            self.render = None
+
+        if hasattr(self, "render_bar"):
+            self.render_label.grid_remove()
+            self.render_bar.grid_remove()
+
+        return
+
+    def rendering(self):
+        """ returns whether part of the current view is still waiting to be drawn
+        :returns: Whether a render job is running
+        :rtype: Boolean
+        """
+
+        return self.render is not None
+
+    def separating(self):
+        """ returns whether rows are separated by pack, which only makes sense in pack order
+        :returns: Whether separators are drawn
+        :rtype: Boolean
+        """
+
+        return self.curr_sort is None or self.curr_sort[0] == "pack_id"
+
+    def fixSeparator(self, rdx):
+        """ draws or removes the separator below a row, depending on whether the next row shown is
+            from another pack
+        :param rdx: The id of the row
+        :type rdx: Integer
+        :returns: None
+        :rtype: None
+        """
+
+        pos = self.curr_index.get_loc(rdx)
+        needed = self.separating() and pos + 1 < len(self.curr_index) and (
+            self.data.at[self.curr_index[pos + 1], "pack_id"] != self.data.at[rdx, "pack_id"]
+        )
+
+        self.table.separator(rdx, needed)
+
+        return
+
+    def patchRows(self, changed=None, added=None, removed=None):
+        """ queues changes to single rows of the view, the next flush redraws only those rows
+            unless the whole player frame is redrawn anyway
+        :param changed: (Default None) The changed columns of each changed row, None for every column
+        :type changed: Dictionary of Integers to tuples of Strings or None
+        :param added: (Default None) The ids of rows added to the view
+        :type added: List of Integers
+        :param removed: (Default None) The ids of rows removed from the view
+        :type removed: List of Integers
+        :returns: None
+        :rtype: None
+        """
+
+        for id, columns in (changed or {}).items():
+            # a row changed twice before the flush redraws every column that changed
+            if id in self.patches["changed"] and columns is not None:
+                before = self.patches["changed"][id]
+                columns = None if before is None else tuple(set(before) | set(columns))
+            self.patches["changed"][id] = columns
+        self.patches["added"].extend(added or [])
+        self.patches["removed"].update(removed or [])
+
+        self.markDirty("rows", "stats")
+
+        return
+
+    @metrics.timed("applyPatches")
+    def applyPatches(self, patches):
+        """ redraws the rows that changed, were added, or were removed, and the separators next to
+            them. A sorted view is sorted and redrawn instead when rows would change place
+        :param patches: The changed, added, and removed rows queued by patchRows
+        :type patches: Dictionary
+        :returns: None
+        :rtype: None
+        """
+
+        sort = self.curr_sort
+        separate = self.separating()
+
+        # added rows, and rows whose sort value changed, have a new place in a sorted view
+        moved = sort is not None and (
+            patches["added"]
+            or (separate and patches["removed"])
+            or any(cols is None or sort[0] in cols for cols in patches["changed"].values())
+        )
+        if moved:
+            self.curr_index = self.tracker.sortRows(self.curr_index, *sort)
+
+        # neighbours are found by position, which needs an unsorted view in id order
+        if moved or (sort is None and not self.curr_index.is_monotonic_increasing):
+            self.clearPlayerFrame()
+            self.writePlayers(self.tracker.view(self.curr_index, self.view_columns), False)
+            return
+
+        shown = self.curr_index
+        touched = set()
+
+        for id in patches["removed"]:
+            self.table.removeRow(id)
+            self.selected.discard(id)
+
+            # the row above now borders whatever was below the removed row
+            pos = shown.searchsorted(id) if separate else 0
+            if pos > 0:
+                touched.add(shown[pos - 1])
+
+        redraw = [id for id in patches["added"] if id in shown]
+        redraw += [id for id in patches["changed"] if id in shown and id not in redraw]
+        rows = dict(self.tracker.view(redraw, self.view_columns).rows()) if redraw else {}
+
+        for id in redraw:
+            row = rows[id]
+            columns = patches["changed"].get(id)
+            if id not in self.table:
+                self.table.addRow(id, row, self.view_columns, id in self.selected)
+            elif columns is None:
+                self.table.configRow(id, row, self.view_columns)
+            else:
+                self.table.configRow(id, row, [col for col in columns if col in self.view_columns])
+
+            # a new row, or one whose pack changed, borders the rows above and below differently
+            if not separate:
+                continue
+            if id not in patches["changed"] or columns is None or "pack_id" in columns:
+                pos = shown.get_loc(id)
+                touched.add(id)
+                if pos > 0:
+                    touched.add(shown[pos - 1])
+
+        for id in touched:
+            if id in shown and id in self.table:
+                self.fixSeparator(id)
+
+        self.table.layout()
+
+        metrics.count("applyPatches.rows", len(redraw) + len(patches["removed"]))
+
+        return
+
+    def handleStats(self, data):
+        """ main method for handling overall profit statistics
+        :param data: The rows to calc stats on
+        :type data: rowview RowView or Pandas DataFrame
+        :returns: None
+        :rtype: None
+        """
+
+        stats = self.calcStats(data)
+        self.writeStats(stats)
+
+        return
+
+    @metrics.timed("calcStats")
+    def calcStats(self, data):
+        """ calculates the statistics to be displayed in the stats frame
+        :param data: The rows to calc stats on
+        :type data: rowview RowView or Pandas DataFrame
+        :returns: A dictionary containing the stats and their names
+        :rtype: Dictionary
+        """
+
+        # the stats of a filter are cached by the tracker until the data changes, so returning to
+        # an earlier pack or pack type does not recalculate them
+        return self.tracker.calcStats(data, self.curr_filter)
+
+    @metrics.timed("writeStats")
+    def writeStats(self, pack_stats):
+        """ writes the statistics returned by the calcStats function to the stats pane
+        :param stats: A tuple of the different stats to be displayed
+        :type: Tuple of type ( TODO )
+        :returns: None
+        :rtype: None
+        """
+
+        for idx, key in enumerate(pack_stats):
+            # the labels are made once, after that only their text and colour change
+            if key not in self.stat_labels:
+                alt = idx * 3
+                lab = tk.Label(self.statsArea, text=key)
+                lab.config(font=(8), anchor="center", width=18)
+                lab.grid(row=alt, column=0)
+
+                lab = tk.Label(self.statsArea)
+                lab.config(font=(8), anchor="center", width=18)
+                lab.grid(row=alt + 1, column=0)
+                self.stat_labels[key] = (lab, lab.cget("foreground"))
+
+                tk.Label(self.statsArea, text=" ").grid(row=alt + 2, column=0)
+
+            lab, plain = self.stat_labels[key]
+            if pack_stats[key][0] == "(":
+                lab.config(text=pack_stats[key], foreground="red")
+            elif pack_stats[key] == "0.0":
+                lab.config(text=pack_stats[key], foreground=plain)
+            else:
+                lab.config(text=pack_stats[key], foreground="green")
+
+    @lagmonitor.tracked
+    def handleDelete(self):
+        """ main method for handling player record deletion
+        :param self: This GUI class
+        :type self: DisplayApp
+        :returns: None
+        :rtype: None
+        """
+        deleteing = Delete_Dialog(self, "Sale Completed")
+
+        if deleteing.userCancelled():
+            return
+
+        id_loc = int(deleteing.getResult())
+        pack = self.data.at[id_loc, "pack_id"]
+
+        self.postDeletion(id_loc)
+        self.curr_index = self.curr_index[self.curr_index != id_loc]
+        self.dropPacks([pack])
+        self.patchRows(removed=[id_loc])
+
+    @metrics.timed("postDeletion")
+    def postDeletion(self, id):
+        """ deletes a row from the table
+        :param loc:
+        :type loc:
+        :returns:
+        :rtype:
+        """
+
+        self.tracker.postDeletion(id)
+
+        return
+
+    @lagmonitor.tracked
+    def handleEdit(self):
+        """ handles workflow for editing a record
+        :returns: None
+        :rtype: None
+        """
+
+        # gets the item row to edit
+        editing = Delete_Dialog(self, "Item to Edit")
+        if editing.userCancelled():
+            return
+        id = editing.getResult()
+
+        edited = Editing_Dialog(self, self.COLUMNS, id, "Edit Values")
+        if edited.userCancelled():
+            return
+        edit = edited.getResult()
+
+        pack = self.data.at[int(id), "pack_id"]
+
+        # the tracker checks the values against the same rules as imports before writing any
+        try:
+            self.postEdit(id, edit)
+        except ValueError as e:
+            tk.messagebox.showerror("Error", str(e))
+            return
+
+        # the row may have moved to a new pack, leaving its old pack empty
+        self.packNav.insert(int(edit[0]))
+        self.typeNav.insert(edit[2])
+        self.dropPacks([pack])
+
+        # the row may have left the filtered pack or type but stays shown, so stop caching its stats
+        if self.curr_filter != ("all",):
+            self.curr_filter = None
+
+        self.patchRows(changed={int(id): None})
+        return
+
+    @metrics.timed("postEdit")
+    def postEdit(self, id, data):
+        """ alters and commits the edit to DB table
+        :param id: The id of the row at which to insert
+        :type id: Integer
+        :param data: The new data values
+        :type data: List of types (int, int, string, string, string, int, int, int)
+        :returns: None
+        :rtype: None
+        """
+
+        self.tracker.postEdit(id, data)
+
+        return
+
+    @lagmonitor.tracked
+    def toggleSelection(self, event, id):
+        """ adds a row to the selection, or removes it if it is already selected
+        :param event: The tkinter event that spawned this call
+        :type event: TKinter event
+        :param id: The primary key of the row that was clicked
+        :type id: Integer
+        :returns: None
+        :rtype: None
+        """
+
+        if id in self.selected:
+            self.selected.discard(id)
+            self.table.select(id, False)
+        else:
+            self.selected.add(id)
+            self.table.select(id, True)
+
+        return
+
+    def clearSelection(self, event=None):
+        """ empties the selection and un-highlights any selected rows
+        :param event: The tkinter event that spawned this call
+        :type event: TKinter event or None
+        :returns: None
+        :rtype: None
+        """
+
+        for id in self.selected:
+            self.table.select(id, False)
+        self.selected = set()
+
+        return
+
+    @lagmonitor.tracked
+    def handleBulkDelete(self):
+        """ deletes every selected row w/ a single statement and a single redraw
+        :returns: None
+        :rtype: None
+        """
+
+        if not self.selected:
+            tk.messagebox.showerror("Error", "Click row ids to select them first")
+            return
+
+        ids = sorted(self.selected)
+        if not tk.messagebox.askyesno("Delete", "Delete %d rows?" % len(ids)):
+            return
+
+        # the tracker patches its data rather than reloading it from the database
+        packs = self.data.loc[ids, "pack_id"].unique()
+        self.postBulkDeletion(ids)
+        self.curr_index = self.curr_index[~self.curr_index.isin(ids)]
+        self.selected = set()
+
+        self.dropPacks(packs)
+        self.patchRows(removed=ids)
+
+        return
+
+    @metrics.timed("postBulkDeletion")
+    def postBulkDeletion(self, ids):
+        """ deletes a set of rows from the table and commits once
+        :param ids: The primary keys of the rows to delete
+        :type ids: List of Integers
+        :returns: None
+        :rtype: None
+        """
+
+        self.tracker.postBulkDeletion(ids)
+
+        return
+
+    @lagmonitor.tracked
+    def handleBulkEdit(self):
+        """ sets one column to one value for every selected row w/ a single statement and redraw
+        :returns: None
+        :rtype: None
+        """
+
+        if not self.selected:
+            tk.messagebox.showerror("Error", "Click row ids to select them first")
+            return
+
+        edited = Bulk_Dialog(self, "Edit Selected")
+        if edited.userCancelled():
+            return
+
+        ids = sorted(self.selected)
+        column = edited.getResult_column()
+        value = edited.getResult()
+
+        # the tracker checks the value before patching its data, rather than reloading it
+        try:
+            self.postBulkEdit(ids, column, value)
+        except ValueError as e:
+            tk.messagebox.showerror("Error", str(e))
+            return
+
+        if column == "pack_type":
+            self.typeNav.insert(value)
+
+        # rows may have left the pack type filter but are still shown, so the view is no longer
+        # what the filter would return and its stats must not be cached under it
+        if column == "pack_type":
+            self.curr_filter = None
+
+        self.patchRows(changed={id: (column,) for id in ids})
+
+        return
+
+    @metrics.timed("postBulkEdit")
+    def postBulkEdit(self, ids, column, value):
+        """ sets a single column for a set of rows in the table and commits once
+        :param ids: The primary keys of the rows to alter
+        :type ids: List of Integers
+        :param column: The column to set, one of BULK_COLUMNS
+        :type column: String
+        :param value: The new value, None stores NULL
+        :type value: String, Integer, or None
+        :returns: None
+        :rtype: None
+        """
+
+        self.tracker.postBulkEdit(ids, column, value)
+
+        return
+
+    def refreshPackBox(self, packs=None):
+        """ lists the packs in the current view in the pack navigator, which leaves its box alone if
+            they are the packs already listed
+        :param packs: (Default None) The packs of the current view, None finds them
+        :type packs: numpy array or None
+        :returns: None
+        :rtype: None
+        """
+
+        if packs is None:
+            packs = self.tracker.packIds(None if self.curr_filter == ("all",) else self.curr_index)
+
+        self.packNav.fill(packs)
+
+        return
+
+    def dropPacks(self, packs):
+        """ stops listing packs that no longer have any rows, after rows were deleted or moved
+        :param packs: The packs the rows were in
+        :type packs: List of Integers
+        :returns: None
+        :rtype: None
+        """
+
+        remaining = set(self.tracker.packIds())
+        for pack in packs:
+            if pack not in remaining:
+                self.packNav.remove(pack)
 
         return
 
-    def handleStats(self, data):
-        """ main method for handling overall profit statistics
-        :param data: A pandas DF containing the data to calc stats on
-        :type data: Pandas DataFrame
+    @lagmonitor.tracked
+    def handleImport(self):
+        """ bulk loads a CSV or JSONL pack history file into the table
         :returns: None
         :rtype: None
         """
 
-        stats = self.calcStats(data)
-        self.writeStats(stats)
+        if self.tracker is None:
+            return
 
-        return
+        import transfer
 
-    def calcStats(self, data):
-        """ calculates the statistics to be displayed in the stats frame
-        :param data: A pandas DF containing the data to calc stats on
-        :type data: Pandas DataFrame
-        :returns: A dictionary containing the stats and their names
-        :rtype: Dictionary
-        """
+        if self.conn is None:
+            tk.messagebox.showerror("Error", "Import from the machine running the server")
+            return
 
-        gross_spend = "(" + str(stats.total_cost(data)) + ")"
-        gross_revenue = str(stats.total_revenue(data))
+        path = filedialog.askopenfilename(
+            title="Import History",
+            filetypes=[("Pack History", "*.csv *.jsonl"), ("All Files", "*.*")],
+        )
+        if not path:
+            return
 
-        net_profit = stats.net_profit(data)
-        if net_profit < 0:
-            net_profit = "(" + str(net_profit).strip("-") + ")"
-        else:
-            net_profit = str(net_profit)
+        try:
+            count = transfer.import_history(self.conn, path)
+        except (ValueError, querylog.error_class(self.conn)) as e:
+            tk.messagebox.showerror("Error", str(e))
+            return
 
-        avg_profit = stats.avg_profit(data)
-        if avg_profit < 0:
-            avg_profit = "(" + str(avg_profit).strip("-") + ")"
-        else:
-            avg_profit = str(avg_profit)
+        self.handleReset()
+        self.markDirty("packs", "types")
+        self.setCounters()
 
-        pack_stats = {
-            "Gross Expenses": gross_spend,
-            "Gross Revenue": gross_revenue,
-            "Net Profit": net_profit,
-            "Profit per Pack": avg_profit,
-        }
+        tk.messagebox.showinfo("Import History", "Imported %d rows" % count)
 
-        return pack_stats
+        return
 
-    def writeStats(self, pack_stats):
-        """ writes the statistics returned by the calcStats function to the stats pane
-        :param stats: A tuple of the different stats to be displayed
-        :type: Tuple of type ( TODO )
+    @lagmonitor.tracked
+    def handleExport(self):
+        """ streams the whole table out to a CSV or JSONL pack history file
         :returns: None
         :rtype: None
         """
 
-        for idx, key in enumerate(pack_stats):
-            alt = idx * 3
-            lab = tk.Label(self.statsArea, text=key)
-            lab.config(font=(8), anchor="center", width=18)
-            lab.grid(row=alt, column=0)
+        if self.tracker is None:
+            return
 
-            lab = tk.Label(self.statsArea, text=pack_stats[key])
-            if pack_stats[key][0] == "(":
-                lab.config(font=(8), anchor="center", width=18, foreground="red")
-            elif pack_stats[key] == "0.0":
-                lab.config(font=(8), anchor="center", width=18)
-            else:
-                lab.config(font=(8), anchor="center", width=18, foreground="green")
-            lab.grid(row=alt + 1, column=0)
+        import transfer
 
-            lab = tk.Label(self.statsArea, text=" ")
-            lab.grid(row=alt + 2, column=0)
+        if self.conn is None:
+            tk.messagebox.showerror("Error", "Export from the machine running the server")
+            return
 
-    def handleDelete(self):
-        """ main method for handling player record deletion
-        :param self: This GUI class
-        :type self: DisplayApp
+        path = filedialog.asksaveasfilename(
+            title="Export History",
+            defaultextension=".csv",
+            filetypes=[("CSV", "*.csv"), ("JSON Lines", "*.jsonl")],
+        )
+        if not path:
+            return
+
+        count = transfer.export_history(self.cursor, path)
+        tk.messagebox.showinfo("Export History", "Exported %d rows" % count)
+
+        return
+
+    def handleMetrics(self):
+        """ writes the latency histograms and counters of this session to a file
         :returns: None
         :rtype: None
         """
-        deleteing = Delete_Dialog(self, "Sale Completed")
 
-        if deleteing.userCancelled():
+        path = filedialog.asksaveasfilename(
+            title="Export Metrics",
+            initialfile=metrics.METRICS_FILE,
+            filetypes=[("JSON", "*.json"), ("Prometheus", "*.prom")],
+        )
+        if not path:
             return
 
-        id_loc = int(deleteing.getResult())
+        metrics.export(path)
 
-        self.postDeletion(id_loc)
-        self.loadData()
-        self.handleWrite(self.COLUMNS, self.curr_index, reload=False, update=True)
+        return
 
-    def postDeletion(self, id):
-        """ deletes a row from the table
-        :param loc:
-        :type loc:
-        :returns:
-        :rtype:
+    def handleProfileStart(self):
+        """ starts profiling and tracing allocations until stop profiling is chosen
+        :returns: None
+        :rtype: None
         """
 
-        query = "DELETE FROM " + TABLE + " WHERE id = (?)"
-        self.cursor.execute(query, id)
-        self.conn.commit()
+        if self.profiler.running():
+            tk.messagebox.showerror("Error", "Already profiling")
+            return
+
+        self.profiler.start()
+        self.root.title("Viewing Axes (profiling)")
 
         return
 
-    def handleEdit(self):
-        """ handles workflow for editing a record
+    def handleProfileStop(self):
+        """ stops profiling and writes the profile, allocation, and widget reports
         :returns: None
         :rtype: None
         """
 
-        # gets the item row to edit
-        editing = Delete_Dialog(self, "Item to Edit")
-        if editing.userCancelled():
-            return
-        id = editing.getResult()
-
-        edited = Editing_Dialog(self, self.COLUMNS, id, "Edit Values")
-        if edited.userCancelled():
+        if not self.profiler.running():
+            tk.messagebox.showerror("Error", "Choose start profiling first")
             return
-        edit = edited.getResult()
-
-        self.postEdit(id, edit)
 
-        if not self.pkBox.__contains__(edit[0]):
-            self.pkBox.insert("end", edit[0])
+        paths = self.profiler.stop()
+        self.root.title("Viewing Axes")
 
-        if not self.cstBox.__contains__(edit[2]):
-            self.cstBox.insert("end", edit[2])
+        tk.messagebox.showinfo("Profiling", "Wrote\n" + "\n".join(paths))
 
-        self.handleWrite(self.COLUMNS, self.curr_index, reload=True, update=True)
         return
 
-    def postEdit(self, id, data):
-        """ alters and commits the edit to DB table
-        :param id: The id of the row at which to insert
-        :type id: Integer
-        :param data: The new data values
-        :type data: List of types (int, int, string, string, string, int, int, int)
+    def handleBreakdown(self):
+        """ opens a window breaking the profit of the current view down by pack type, item type,
+            reward, and pack. The window stays open alongside the main one and refreshes on demand
         :returns: None
         :rtype: None
         """
 
-        query = (
-            "UPDATE "
-            + TABLE
-            + " SET pack_id=(?),"
-            + "pack_price=(?),"
-            + "pack_type=(?),"
-            + "name=(?),"
-            + "type=(?),"
-            + "bid=(?),"
-            + "bin=(?),"
-            + "sold=(?)"
-            + "WHERE id = (?)"
-        )
-
-        self.cursor.execute(
-            query,
-            (
-                data[0],
-                data[1],
-                data[2],
-                data[3],
-                data[4],
-                data[5],
-                data[6],
-                data[7],
-                id,
-            ),
-        )
-        self.conn.commit()
+        Breakdown_Pane(self)
 
         return
 
@@ -917,6 +1896,21 @@ class DisplayApp:
         :rtype: None
         """
 
+        self.lag.stop()
+        self.worker.stop()
+        if self.syncer is not None:
+            self.syncer.stop()
+
+        if "parallel" in sys.modules:
+            sys.modules["parallel"].shutdown()
+
+        # keep the metrics and query log of every session so regressions can be found after the fact
+        try:
+            metrics.export()
+            querylog.QUERIES.export()
+        except OSError:
+            pass
+
         self.root.destroy()
         return
 
@@ -1242,28 +2236,9 @@ class Listing_Dialog(NumberListing_Dialog):
         :rtype: Integer
         """
 
-        rows = self.result
-        qs = self.qs.get()
-        try:
-            for row in rows:
-                if not string_validator(row[0].get()):
-                    return 0
-                if row[0].get() is "":
-                    return -1
-                if int(row[2].get()) < 150:
-                    return -2
-                if int(row[3].get()) < 200:
-                    return -3
-                if int(row[2].get()) > int(row[3].get()):
-                    return -7
-                if len(row[0].get()) > 24:
-                    return -4
-                if int(qs) < 0:
-                    return -5
-        except ValueError:
-            return -6
+        rows = [[item.get() for item in row] for row in self.result]
 
-        return 1
+        return validate_listing(rows, self.qs.get())
 
     def apply(self):
         """ alters types from tk xxxVar to builtins (Override)
@@ -1557,6 +2532,9 @@ class Delete_Dialog(Selling_Dialog):
             search = int(search)
             if search >= self.parent.curr_id or search < 0:
                 return -2
+            # ids of rows deleted since are below curr_id but no longer in the data
+            if search not in self.parent.data.index:
+                return -2
         except ValueError:
             if not string_validator(search):
                 return 0
@@ -1806,6 +2784,307 @@ class Editing_Dialog(Listing_Dialog):
         return
 
 
+class Bulk_Dialog(NumberListing_Dialog):
+    def __init__(self, parent, title=None):
+
+        tk.Toplevel.__init__(self)
+
+        if title:
+            self.title(title)
+
+        self.parent = parent
+        self.cancelled = None
+
+        body = tk.Frame(self)
+        self.column, self.result = self.body(body)
+        body.pack(padx=5, pady=5)
+
+        self.buttonbox()
+
+        self.grab_set()
+
+        self.protocol("WM_DELETE_WINDOW", self.cancel)
+
+        self.geometry(
+            "+%d+%d"
+            % (parent.root.winfo_rootx() + 100, parent.root.winfo_rooty() + 100)
+        )
+
+        self.wait_window(self)
+
+    def body(self, master):
+        """ creates the widgets for the dialog box (Override)
+        :param master: The frame to place widgets into
+        :type master: tk Frame
+        :returns: The results from the widgets
+        :rtype: Tuple of types (StrVar, StrVar)
+        """
+
+        tk.Label(
+            master, text="Editing %d selected rows" % len(self.parent.selected)
+        ).grid(row=0, column=0, columnspan=2)
+
+        column = tk.StringVar()
+        column.set(self.parent.BULK_COLUMNS[0])
+        tk.Label(master, text="Column to set:").grid(row=1, column=0)
+        tk.OptionMenu(master, column, *self.parent.BULK_COLUMNS).grid(row=1, column=1)
+
+        value = tk.StringVar()
+        tk.Label(master, text="New value (blank sold clears it):").grid(row=2, column=0)
+        entry = tk.Entry(master, textvariable=value)
+        entry.grid(row=2, column=1)
+        entry.focus()
+
+        return column, value
+
+    def ok(self, event=None):
+        """ handles actions for the click of the ok button (Override)
+        :returns: None
+        :rtype: None
+        """
+
+        validation = self.validate()
+
+        # handle different error codes:
+        # -1 -> pack type not in PACKS
+        # -2 -> item type not in TYPES
+        # -3 -> sold not blank or a positive integer
+
+        if validation == -1:
+            tk.messagebox.showerror(
+                "Error", "Pack type must be one of " + ", ".join(self.parent.PACKS)
+            )
+            return
+        elif validation == -2:
+            tk.messagebox.showerror(
+                "Error", "Item type must be one of " + ", ".join(self.parent.TYPES)
+            )
+            return
+        elif validation == -3:
+            tk.messagebox.showerror(
+                "Error", "Sale price must be blank or a positive integer"
+            )
+            return
+        else:
+            # applies the results and closes the dialog
+            self.withdraw()
+            self.update_idletasks()
+
+            self.apply()
+            self.cancel(cancelled=False)
+
+    def validate(self):
+        """ validates the information entered into the dialog box (Override)
+        :returns: A exit value related to the error or 1 if data is valid
+        :rtype: Integer
+        """
+
+        column = self.column.get()
+        value = self.result.get().strip()
+
+        if column == "pack_type" and value not in self.parent.PACKS:
+            return -1
+        if column == "type" and value not in self.parent.TYPES:
+            return -2
+        if column == "sold" and value != "":
+            try:
+                if int(value) < 0:
+                    return -3
+            except ValueError:
+                return -3
+
+        return 1
+
+    def apply(self):
+        """ alters types from tk xxxVar to builtins (Override)
+        :returns: None
+        :rtype: None
+        """
+
+        self.column = self.column.get()
+        self.result = self.result.get().strip()
+
+        if self.column == "sold":
+            self.result = int(self.result) if self.result != "" else None
+
+        return
+
+    def getResult_column(self):
+        """ gets the column to edit
+        :returns: The column selected
+        :rtype: String
+        """
+
+        return self.column
+
+
+class Breakdown_Pane(tk.Toplevel):
+    """ A window showing the profit of the parent's current view broken down by pack type, by
+        reward vs paid packs, by item type, and its best and worst packs. Unlike the dialogs it
+        does not grab focus, so it can stay open while the main window is used
+
+        __init__( self, parent )
+        parent - the DisplayApp whose current view is broken down
+    """
+
+    # the columns of each breakdown and the labels they are shown under
+    GROUP_COLUMNS = [
+        ("packs", "Packs"),
+        ("cost", "Cost"),
+        ("revenue", "Revenue"),
+        ("net", "Net"),
+        ("profit_per_pack", "Per Pack"),
+        ("sell_through", "Sold %"),
+    ]
+    ITEM_COLUMNS = [
+        ("items", "Items"),
+        ("sold", "Sold"),
+        ("revenue", "Revenue"),
+        ("revenue_per_item", "Per Item"),
+        ("sell_through", "Sold %"),
+    ]
+    PACK_COLUMNS = [
+        ("pack_type", "Pack Type"),
+        ("items", "Items"),
+        ("cost", "Cost"),
+        ("revenue", "Revenue"),
+        ("net", "Net"),
+    ]
+
+    def __init__(self, parent):
+
+        tk.Toplevel.__init__(self)
+        self.title("Profit Breakdown")
+
+        self.parent = parent
+
+        top = tk.Frame(self)
+        top.pack(side=tk.TOP, fill=tk.X, padx=5, pady=5)
+        tk.Button(top, text="Refresh", command=self.refresh, width=12).pack(side=tk.LEFT)
+        self.summary = tk.Label(top, font=(8))
+        self.summary.pack(side=tk.LEFT, padx=10)
+
+        self.tables = tk.Frame(self)
+        self.tables.pack(side=tk.TOP, padx=5, pady=5)
+
+        # the breakdown being calculated in the background, if any
+        self.pending = None
+
+        self.geometry(
+            "+%d+%d"
+            % (parent.root.winfo_rootx() + 100, parent.root.winfo_rooty() + 100)
+        )
+
+        self.refresh()
+
+    def refresh(self):
+        """ starts recalculating the breakdown of the rows the parent currently shows. The work runs
+            on the process pool of parallel.py and poll shows it once done
+        :returns: None
+        :rtype: None
+        """
+
+        import parallel
+
+        data = self.parent.tracker.data.loc[self.parent.curr_index]
+
+        self.summary.config(text="Calculating...", foreground="black")
+        self.pending = parallel.submit(data)
+        self.after(50, self.poll, self.pending)
+
+        return
+
+    def poll(self, future):
+        """ shows a breakdown once it is calculated, unless a newer refresh replaced it
+        :param future: The breakdown being calculated
+        :type future: concurrent.futures Future
+        :returns: None
+        :rtype: None
+        """
+
+        if future is not self.pending or not self.winfo_exists():
+            return
+
+        if not future.done():
+            self.after(50, self.poll, future)
+            return
+
+        self.pending = None
+        try:
+            parts = future.result()
+        except Exception as e:
+            self.summary.config(text="Could not calculate: %s" % e, foreground="red")
+            return
+
+        self.show(parts)
+
+        return
+
+    def show(self, parts):
+        """ replaces the tables w/ a calculated breakdown
+        :param parts: The breakdowns, see stats.breakdown
+        :type parts: Dictionary
+        :returns: None
+        :rtype: None
+        """
+
+        for widget in self.tables.winfo_children():
+            widget.destroy()
+
+        items = parts["item_type"]["items"].sum()
+        sold = parts["item_type"]["sold"].sum()
+        self.summary.config(
+            text="%d packs, %d of %d items sold (%.1f%%)"
+            % (len(parts["packs"]), sold, items, 100.0 * sold / items if items else 0.0)
+        )
+
+        self.writeTable("By Pack Type", parts["pack_type"], self.GROUP_COLUMNS)
+        self.writeTable("Reward vs Paid", parts["reward"], self.GROUP_COLUMNS)
+        self.writeTable("By Item Type", parts["item_type"], self.ITEM_COLUMNS)
+        self.writeTable("Best Packs", parts["best"], self.PACK_COLUMNS)
+        self.writeTable("Worst Packs", parts["worst"], self.PACK_COLUMNS)
+
+        return
+
+    def writeTable(self, title, table, columns):
+        """ writes one breakdown as a titled grid of labels, w/ losses in red and profits in green
+        :param title: The heading of the table
+        :type title: String
+        :param table: The breakdown, one row per group
+        :type table: pandas DataFrame
+        :param columns: The columns to show and their labels
+        :type columns: List of tuples of Strings
+        :returns: None
+        :rtype: None
+        """
+
+        frame = tk.LabelFrame(self.tables, text=title)
+        frame.pack(side=tk.TOP, fill=tk.X, pady=2)
+
+        tk.Label(frame, text=table.index.name, font=(6), width=10).grid(row=0, column=0)
+        for col, (_, label) in enumerate(columns, start=1):
+            tk.Label(frame, text=label, font=(6), width=10).grid(row=0, column=col)
+
+        for row, (key, values) in enumerate(table.iterrows(), start=1):
+            tk.Label(frame, text=str(key), width=10).grid(row=row, column=0)
+
+            for col, (name, _) in enumerate(columns, start=1):
+                value = values[name]
+                if name == "sell_through":
+                    text = "" if value != value else "%.1f" % (value * 100)
+                elif value != value:
+                    text = ""
+                else:
+                    text = str(value)
+
+                lab = tk.Label(frame, text=text, width=10)
+                if name in ("net", "profit_per_pack") and text:
+                    lab.config(foreground="red" if value < 0 else "green")
+                lab.grid(row=row, column=col)
+
+        return
+
+
 class ScrolledWindow(tk.Frame):
     """
     1. Master widget gets scrollbars and a canvas. Scrollbars are connected 
@@ -1864,6 +3143,12 @@ class ScrolledWindow(tk.Frame):
         self.scrollwindow.bind("<Configure>", self._configure_window)
         self.scrollwindow.bind("<Enter>", self._bound_to_mousewheel)
         self.scrollwindow.bind("<Leave>", self._unbound_to_mousewheel)
+        self.canv.bind("<Enter>", self._bound_to_mousewheel)
+        self.canv.bind("<Leave>", self._unbound_to_mousewheel)
+
+        # whether the canvas follows the size of the inner frame, a table drawn on the canvas itself
+        # sizes it instead
+        self.fit = True
 
         return
 
@@ -1877,6 +3162,9 @@ class ScrolledWindow(tk.Frame):
         self.canv.yview_scroll(int(-1 * (event.delta / 120)), "units")
 
     def _configure_window(self, event):
+        if not self.fit:
+            return
+
         # update the scrollbars to match the size of the inner frame
         size = (self.scrollwindow.winfo_reqwidth(), self.scrollwindow.winfo_reqheight())
         self.canv.config(scrollregion="0 0 %s %s" % size)
@@ -1888,18 +3176,12 @@ class ScrolledWindow(tk.Frame):
             self.canv.config(height=self.scrollwindow.winfo_reqheight())
 
 
-def string_validator(string, search=re.compile(r"[^A-z0-9.\" \"\']").search):
-    """ checks a string for valid characters
-    :param string: a string to check
-    :type string: String
-    :param search: The characters which are valid - default is A-z and '
-    :type search: Regex Pattern object
-    :returns: True if only the characters in search are in the string, otherwise returns False
-    :rtype: Boolean
-    """
-    return not bool(search(string))
+if __name__ == "__main__":
+    import argparse
 
+    parser = argparse.ArgumentParser(description="FIFA pack tracking GUI")
+    parser.add_argument("--server", help="url of a running server.py to use instead of the database")
+    args = parser.parse_args()
 
-if __name__ == "__main__":
-    dapp = DisplayApp(1440, 1280)
+    dapp = DisplayApp(1440, 1280, server=args.server)
     dapp.main()
@@ -0,0 +1,357 @@
+""" parallel.py
+
+This file contains the profit breakdown of stats.py split into partitions and run on a pool of
+processes. By default rows are partitioned into contiguous ranges, which are slices of the columns
+the frame already holds, so this process makes no pass over the whole data. Each worker factorizes
+the pack and item types of its own rows and folds them into a PartialBreakdown of per pack and per
+item type totals w/ its own small tables of type names, and the partials are merged by recoding
+those tables into their union. Each pack and item type keeps the position of its first row, so a
+pack split between partitions is merged back w/ the price and type of its first row and the result
+is the same as stats.breakdown. submit runs the whole thing off the calling thread, so the GUI
+stays responsive
+
+This file contains classes:
+    * PartialBreakdown - Class for the mergeable per pack and per item type totals of some rows
+
+This file contains methods:
+    Global Methods:
+        * pool( ) - returns the process pool, starting it on first use
+        * shutdown( ) - stops the process pool
+        * partitions( data, by, parts ) - returns the row positions of each partition
+        * fold_partition( positions, pack_id, pack_price, pack_type, item_type, sold, mask ) - returns
+          the partial of one partition
+        * breakdown( data, top, by, workers, min_rows ) - returns stats.breakdown computed over partitions
+        * submit( data, top, by ) - runs breakdown in the background and returns its future
+
+    Members of Class PartialBreakdown:
+        * __init__( self ) - creates the partial of no rows
+        * merge( self, other ) - returns the partial of the rows of both
+        * frames( self ) - returns the per pack and per item type totals
+
+Created October 19th, 2026.
+"""
+
+import concurrent.futures
+import multiprocessing
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+import stats
+
+# below this many rows shipping partitions to the pool costs more than it saves, so the breakdown
+# runs in process. Merging the partials and building the per pack tables stays serial, so the pool
+# only pulls ahead of stats.breakdown around a million rows on four cores. The crossover moves w/
+# the number of cores, python benchmarks.py --crossover measures it on the machine it runs on
+PARALLEL_ROWS = 1000000
+
+WORKERS = os.cpu_count() or 1
+
+_pool = None
+_runner = None
+_lock = threading.Lock()
+
+
+class PartialBreakdown:
+    """ The totals of each pack and each item type over some of the rows, mergeable w/ the totals
+        of the other rows. Pack attributes come from the pack's first row, tracked by position.
+        Pack and item types are codes into the partial's own tables of names
+
+        __init__( self )
+    """
+
+    def __init__(self):
+
+        empty = np.zeros(0, dtype=np.int64)
+
+        # the names the pack type and item type codes stand for
+        self.pack_types = np.zeros(0, dtype=object)
+        self.item_types = np.zeros(0, dtype=object)
+
+        # one entry per pack
+        self.ids = empty
+        self.first = empty
+        self.cost = empty
+        self.pack_type = empty
+        self.items = empty
+        self.sold = empty
+        self.revenue = empty
+
+        # one entry per item type
+        self.type_first = empty
+        self.type_items = empty
+        self.type_sold = empty
+        self.type_revenue = empty
+
+    def merge(self, other):
+        """ returns the partial of the rows of this partial and another. A pack in both is left
+            twice until frames, which resolves every split pack at once
+        :param other: The partial of other rows
+        :type other: PartialBreakdown
+        :returns: The merged partial
+        :rtype: PartialBreakdown
+        """
+
+        merged = PartialBreakdown()
+        for name in ["ids", "first", "cost", "items", "sold", "revenue"]:
+            setattr(merged, name, np.concatenate([getattr(self, name), getattr(other, name)]))
+
+        # the tables hold a handful of names, so recoding both sides into their union is cheap
+        pack_types = pd.Index(self.pack_types).append(pd.Index(other.pack_types)).unique()
+        merged.pack_types = np.asarray(pack_types, dtype=object)
+        merged.pack_type = np.concatenate(
+            [
+                pack_types.get_indexer(self.pack_types)[self.pack_type],
+                pack_types.get_indexer(other.pack_types)[other.pack_type],
+            ]
+        )
+
+        item_types = pd.Index(self.item_types).append(pd.Index(other.item_types)).unique()
+        merged.item_types = np.asarray(item_types, dtype=object)
+        merged.type_first = np.full(len(item_types), np.iinfo(np.int64).max, dtype=np.int64)
+        for name in ["type_items", "type_sold", "type_revenue"]:
+            setattr(merged, name, np.zeros(len(item_types), dtype=np.int64))
+
+        for part in [self, other]:
+            at = item_types.get_indexer(part.item_types)
+            merged.type_first[at] = np.minimum(merged.type_first[at], part.type_first)
+            for name in ["type_items", "type_sold", "type_revenue"]:
+                getattr(merged, name)[at] += getattr(part, name)
+
+        return merged
+
+    def frames(self):
+        """ returns the totals of each pack and of each item type, in order of first row
+        :returns: The packs and item types tables stats.finish_breakdown takes
+        :rtype: Tuple of pandas DataFrames
+        """
+
+        order = np.argsort(self.first, kind="stable")
+        ids = self.ids[order]
+
+        # a pack split between partitions shows up once per partition, its first row comes first
+        codes, unique = pd.factorize(ids, sort=False)
+        heads = order[stats.first_rows(codes)]
+
+        def total(values):
+            return np.bincount(codes, weights=values[order], minlength=len(unique)).astype(np.int64)
+
+        packs = pd.DataFrame(
+            {
+                "pack_type": self.pack_types[self.pack_type[heads]],
+                "items": total(self.items),
+                "sold": total(self.sold),
+                "revenue": total(self.revenue),
+                "cost": self.cost[heads],
+            },
+            index=pd.Index(unique, name="pack_id"),
+        )
+
+        order = np.argsort(self.type_first, kind="stable")
+        by_item_type = pd.DataFrame(
+            {
+                "items": self.type_items[order],
+                "sold": self.type_sold[order],
+                "revenue": self.type_revenue[order],
+            },
+            index=pd.Index(self.item_types[order], name="type"),
+        )
+
+        return packs, by_item_type
+
+
+def pool():
+    """ returns the process pool, starting it on first use. Workers are spawned rather than forked,
+        a fork of a process running tk and threads is not safe
+    :returns: The pool
+    :rtype: concurrent.futures ProcessPoolExecutor
+    """
+
+    global _pool
+
+    with _lock:
+        if _pool is None:
+            _pool = concurrent.futures.ProcessPoolExecutor(
+                WORKERS, mp_context=multiprocessing.get_context("spawn")
+            )
+
+    return _pool
+
+
+def shutdown():
+    """ stops the process pool and the background runner, if they were started
+    :returns: None
+    :rtype: None
+    """
+
+    global _pool, _runner
+
+    with _lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+        if _runner is not None:
+            _runner.shutdown(wait=False, cancel_futures=True)
+            _runner = None
+
+    return
+
+
+def partitions(data, by="rows", parts=WORKERS):
+    """ returns the rows of each partition. Ranges of rows read no column, a pack split between two
+        ranges is merged back by its first row. Every row of a pack lands in the same pack id range,
+        and in the same pack type partition unless the pack was edited to mix types, but both read
+        a whole column here and gather every partition's rows w/ a copy
+    :param data: The rows to partition
+    :type data: pandas DataFrame
+    :param by: (Default "rows") Either "rows" for ranges of rows, "pack_id" for ranges of pack ids,
+               or "pack_type"
+    :type by: String
+    :param parts: (Default WORKERS) How many ranges to split into
+    :type parts: Integer
+    :returns: The rows of each non empty partition, as a slice for ranges of rows or as positions
+    :rtype: List of slices or numpy arrays
+    """
+
+    if by == "rows":
+        bounds = np.linspace(0, len(data), parts + 1).astype(np.int64)
+        return [slice(start, stop) for start, stop in zip(bounds[:-1], bounds[1:]) if stop > start]
+    elif by == "pack_id":
+        pack_id = data["pack_id"].to_numpy()
+        edges = np.unique(np.quantile(pack_id, np.linspace(0, 1, parts + 1)[1:-1]))
+        part = np.searchsorted(edges, pack_id, side="right")
+    elif by == "pack_type":
+        part, _ = pd.factorize(data["pack_type"], sort=False)
+    else:
+        raise ValueError("unknown partitioning %s" % by)
+
+    order = np.argsort(part, kind="stable")
+    bounds = np.cumsum(np.bincount(part))[:-1]
+
+    return [positions for positions in np.split(order, bounds) if len(positions)]
+
+
+def fold_partition(positions, pack_id, pack_price, pack_type, item_type, sold, mask):
+    """ returns the partial of one partition, run in a worker process
+    :param positions: The rows of the partition in the whole data, a range or each row's position
+    :type positions: slice or numpy array of Integers
+    :param pack_id: The pack id of each row
+    :type pack_id: numpy array of Integers
+    :param pack_price: The pack price of each row
+    :type pack_price: numpy array of Integers
+    :param pack_type: The pack type of each row
+    :type pack_type: numpy array of Strings
+    :param item_type: The item type of each row
+    :type item_type: numpy array of Strings
+    :param sold: The sale price of each row, 0 where unsold
+    :type sold: numpy array of Integers
+    :param mask: Whether each row sold
+    :type mask: numpy array of Booleans
+    :returns: The partial
+    :rtype: PartialBreakdown
+    """
+
+    partial = PartialBreakdown()
+
+    if isinstance(positions, slice):
+        positions = np.arange(positions.start, positions.stop)
+
+    codes, ids = pd.factorize(pack_id, sort=False)
+    first = stats.first_rows(codes)
+
+    # the type names are factorized here rather than over the whole data in the parent
+    type_codes, partial.pack_types = pd.factorize(pack_type, sort=False)
+    item_codes, partial.item_types = pd.factorize(item_type, sort=False)
+    types = len(partial.item_types)
+
+    def total(weights):
+        return np.rint(np.bincount(codes, weights=weights, minlength=len(ids))).astype(np.int64)
+
+    partial.ids = ids.astype(np.int64)
+    partial.first = positions[first]
+    partial.cost = pack_price[first].astype(np.int64)
+    partial.pack_type = type_codes[first].astype(np.int64)
+    partial.items = np.bincount(codes, minlength=len(ids)).astype(np.int64)
+    partial.sold = np.bincount(codes, weights=mask, minlength=len(ids)).astype(np.int64)
+    partial.revenue = total(sold)
+
+    partial.type_first = positions[stats.first_rows(item_codes)]
+    partial.type_items = np.bincount(item_codes, minlength=types).astype(np.int64)
+    partial.type_sold = np.bincount(item_codes, weights=mask, minlength=types).astype(np.int64)
+    partial.type_revenue = np.rint(
+        np.bincount(item_codes, weights=sold, minlength=types)
+    ).astype(np.int64)
+
+    return partial
+
+
+def breakdown(data, top=5, by="rows", workers=None, min_rows=PARALLEL_ROWS):
+    """ returns the same breakdowns as stats.breakdown, computed over partitions in the process pool
+    :param data: The data from which to calculate the breakdown
+    :type data: pandas DataFrame
+    :param top: (Default 5) How many of the best and worst packs to return
+    :type top: Integer
+    :param by: (Default "rows") Partition by ranges of "rows", "pack_id" ranges, or "pack_type"
+    :type by: String
+    :param workers: (Default None) How many partitions, None uses WORKERS. W/ one worker the
+                    breakdown runs in this process
+    :type workers: Integer or None
+    :param min_rows: (Default PARALLEL_ROWS) Fewer rows than this run in this process
+    :type min_rows: Integer
+    :returns: DataFrames keyed packs, best, worst, pack_type, item_type, and reward
+    :rtype: Dictionary
+    """
+
+    workers = WORKERS if workers is None else workers
+    if workers <= 1 or len(data) < min_rows:
+        return stats.breakdown(data, top)
+
+    # the columns as the frame holds them, the string columns included, w/o a copy
+    pack_id, pack_price, sold, mask = stats.arrays(data)
+    pack_type = np.asarray(data["pack_type"].array)
+    item_type = np.asarray(data["type"].array)
+
+    futures = [
+        pool().submit(
+            fold_partition,
+            part,
+            pack_id[part],
+            pack_price[part],
+            pack_type[part],
+            item_type[part],
+            sold[part],
+            mask[part],
+        )
+        for part in partitions(data, by, workers)
+    ]
+
+    total = PartialBreakdown()
+    for future in futures:
+        total = total.merge(future.result())
+
+    packs, by_item_type = total.frames()
+
+    return stats.finish_breakdown(packs, by_item_type, top)
+
+
+def submit(data, top=5, by="rows"):
+    """ runs breakdown on a background thread, which waits on the pool, and returns its future
+    :param data: The data from which to calculate the breakdown
+    :type data: pandas DataFrame
+    :param top: (Default 5) How many of the best and worst packs to return
+    :type top: Integer
+    :param by: (Default "rows") Partition by ranges of "rows", "pack_id" ranges, or "pack_type"
+    :type by: String
+    :returns: The future of the breakdowns
+    :rtype: concurrent.futures Future
+    """
+
+    global _runner
+
+    with _lock:
+        if _runner is None:
+            _runner = concurrent.futures.ThreadPoolExecutor(1, thread_name_prefix="breakdown")
+
+    return _runner.submit(breakdown, data, top, by)
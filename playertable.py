@@ -0,0 +1,580 @@
+""" playertable.py
+
+This file contains the engines that draw the rows of the player frame. Both draw a header, one row
+per item coloured by its pack from the pallete w/ the sold cell red or green, a separator under the
+last row of each pack, and a highlight on the id of selected rows. Clicking a column header asks for
+the view to be sorted by it, and the sorted column is marked w/ an arrow. The LabelTable grids one tk Label
+per cell, the CanvasTable draws every cell as a text item on the canvas of the ScrolledWindow, which
+costs a fraction of the memory and time of a widget and draws large views far faster
+
+This file contains classes:
+    * LabelTable - Class for drawing the player rows as a grid of labels
+    * CanvasTable - Class for drawing the player rows as text items on a canvas
+
+This file contains methods:
+    Global Methods:
+        * make_table( engine, scroller, pallete, highlight, on_click, on_sort ) - returns the engine named
+        * cell_colour( col, value, colour ) - returns the colour of a cell
+        * header_text( col, sort ) - returns the text of a column header
+
+    Members of Class LabelTable and CanvasTable:
+        * header( self, columns, sort ) - draws the header row
+        * addRow( self, rdx, row, columns, selected ) - draws a row after every drawn row
+        * configRow( self, rdx, row, columns ) - sets the text and colour of cells of a drawn row
+        * separator( self, rdx, show ) - draws or removes the separator under a row
+        * removeRow( self, rdx ) - removes a drawn row
+        * select( self, rdx, on ) - highlights or un-highlights the id of a row
+        * layout( self ) - updates the scroll region once a batch of rows is drawn
+        * clear( self ) - removes every row and the header
+        * __contains__( self, rdx ) - returns whether a row is drawn
+
+    Members of Class CanvasTable:
+        * top( self, position ) - returns the y of the top of a row
+        * click( self, event ), sortClick( self, event ) - hand clicks on ids and headers on
+
+Created October 19th, 2026.
+"""
+
+import tkinter as tk
+from tkinter import ttk
+
+# canvas layout, in pixels
+ROW_HEIGHT = 20
+HEADER_HEIGHT = 26
+ID_WIDTH = 60
+COLUMN_WIDTH = 84
+WIDE_COLUMNS = {"name": 170, "pack_type": 100}
+
+
+def make_table(engine, scroller, pallete, highlight, on_click, on_sort=None):
+    """ returns the table engine named
+    :param engine: Either "labels" or "canvas"
+    :type engine: String
+    :param scroller: The scrolled window to draw in
+    :type scroller: pack_tracking ScrolledWindow
+    :param pallete: The colours of the packs, picked by pack id
+    :type pallete: List of Strings
+    :param highlight: The background of selected ids
+    :type highlight: String
+    :param on_click: Called w/ the event and row id when the id of a row is clicked
+    :type on_click: Function
+    :param on_sort: (Default None) Called w/ the column when a header is clicked, "id" for the id
+    :type on_sort: Function or None
+    :returns: The table
+    :rtype: LabelTable or CanvasTable
+    """
+
+    if engine == "labels":
+        return LabelTable(scroller, pallete, highlight, on_click, on_sort)
+    if engine == "canvas":
+        return CanvasTable(scroller, pallete, highlight, on_click, on_sort)
+
+    raise ValueError("unknown player table engine " + str(engine))
+
+
+def cell_colour(col, value, colour):
+    """ returns the colour of a cell, the sold cell is red until the item sells and green after
+    :param col: The column of the cell
+    :type col: String
+    :param value: The value of the cell
+    :param colour: The colour of the row's pack
+    :type colour: String
+    :returns: The colour
+    :rtype: String
+    """
+
+    if col != "sold":
+        return colour
+
+    # sold is a nullable integer, an unsold item holds pd.NA, which cannot be compared
+    if value is None or str(value) in ("<NA>", "nan"):
+        return "red"
+
+    return "green"
+
+
+def header_text(col, sort):
+    """ returns the text of a column header, w/ an arrow when the view is sorted by it
+    :param col: The column
+    :type col: String
+    :param sort: The column the view is sorted by and whether it is descending, or None
+    :type sort: Tuple of types (String, Boolean) or None
+    :returns: The text
+    :rtype: String
+    """
+
+    if sort is None or sort[0] != col:
+        return col
+
+    return col + (" \u25bc" if sort[1] else " \u25b2")
+
+
+class LabelTable:
+    """ The player rows as a grid of labels. Rows are gridded in the order they are drawn, every
+        other grid row so the separator under a row goes in the grid row between. A removed row
+        leaves its grid rows empty, which takes no space
+
+        __init__( self, scroller, pallete, highlight, on_click, on_sort )
+        scroller - the scrolled window whose scrollwindow frame holds the labels
+        pallete - the colours of the packs
+        highlight - the background of selected ids
+        on_click - called w/ the event and row id when an id is clicked
+        on_sort - (Default None) called w/ the column when a header is clicked
+    """
+
+    def __init__(self, scroller, pallete, highlight, on_click, on_sort=None):
+
+        self.scroller = scroller
+        self.frame = scroller.scrollwindow
+        self.pallete = pallete
+        self.highlight = highlight
+        self.on_click = on_click
+        self.on_sort = on_sort
+
+        self.rows = 0
+        self.grid_rows = {}
+        self.ids = {}
+        self.cells = {}
+        self.separators = {}
+        self.headers = []
+
+    def header(self, columns, sort=None):
+        """ draws the header row and the separator under it
+        :param columns: The columns shown
+        :type columns: List of Strings
+        :param sort: (Default None) The column the view is sorted by and whether it is descending
+        :type sort: Tuple of types (String, Boolean) or None
+        :returns: The number of widgets made
+        :rtype: Integer
+        """
+
+        # the labels follow the size of the frame they are gridded in
+        self.scroller.fit = True
+
+        for cdx, col in enumerate(["id"] + list(columns)):
+            lab = tk.Label(self.frame, text=header_text(col, sort))
+            lab.config(font=(8), anchor="center", width=9)
+            lab.grid(row=0, column=cdx, padx=(7, 0))
+            if self.on_sort is not None:
+                lab.bind("<Button-1>", lambda e, col=col: self.on_sort(col))
+            self.headers.append(lab)
+
+        sep = ttk.Separator(self.frame, orient=tk.HORIZONTAL)
+        sep.grid(column=0, row=1, columnspan=10, sticky="ew")
+        self.headers.append(sep)
+
+        return len(self.headers)
+
+    def addRow(self, rdx, row, columns, selected=False):
+        """ draws the id and cells of a row
+        :param rdx: The id of the row
+        :type rdx: Integer
+        :param row: The values of the row
+        :type row: pandas Series
+        :param columns: The columns to draw
+        :type columns: List of Strings
+        :param selected: (Default False) Whether the id is highlighted
+        :type selected: Boolean
+        :returns: The number of widgets made
+        :rtype: Integer
+        """
+
+        # rows 0 and 1 hold the header and the separator under it
+        self.rows += 1
+        self.grid_rows[rdx] = self.rows * 2
+
+        lab = tk.Label(self.frame, text=rdx, font=(6))
+        lab.grid(row=self.grid_rows[rdx], column=0, padx=(3, 0))
+
+        # clicking the id of a row adds it to or removes it from the selection
+        if selected:
+            lab.config(background=self.highlight)
+        lab.bind("<Button-1>", lambda e, id=rdx: self.on_click(e, id))
+        self.ids[rdx] = lab
+
+        cells = {}
+        for cdx, col in enumerate(columns):
+            lab = tk.Label(self.frame, font=(6))
+            if col == "player":
+                lab.config(width=8)
+            lab.grid(row=self.grid_rows[rdx], column=cdx + 1, padx=(3, 0))
+            cells[col] = lab
+        self.cells[rdx] = cells
+
+        self.configRow(rdx, row, columns)
+
+        return len(cells) + 1
+
+    def configRow(self, rdx, row, columns):
+        """ sets the text and colour of cells of a drawn row
+        :param rdx: The id of the row
+        :type rdx: Integer
+        :param row: The values of the row
+        :type row: pandas Series
+        :param columns: The columns whose cells to set
+        :type columns: List of Strings
+        :returns: None
+        :rtype: None
+        """
+
+        colour = self.pallete[row["pack_id"] % len(self.pallete)]
+        cells = self.cells[rdx]
+
+        for col in columns:
+            cells[col].config(text=row[col], foreground=cell_colour(col, row[col], colour))
+
+        if "pack_id" in columns:
+            self.ids[rdx].config(foreground=colour)
+
+        return
+
+    def separator(self, rdx, show):
+        """ draws or removes the separator under a row
+        :param rdx: The id of the row
+        :type rdx: Integer
+        :param show: Whether the separator should be drawn
+        :type show: Boolean
+        :returns: The number of widgets made
+        :rtype: Integer
+        """
+
+        if show and rdx not in self.separators:
+            self.separators[rdx] = ttk.Separator(self.frame, orient=tk.HORIZONTAL)
+            self.separators[rdx].grid(
+                column=0, row=self.grid_rows[rdx] + 1, columnspan=10, sticky="ew"
+            )
+            return 1
+        if not show and rdx in self.separators:
+            self.separators.pop(rdx).destroy()
+
+        return 0
+
+    def removeRow(self, rdx):
+        """ destroys the labels and separator of a row, the rows around it close the gap
+        :param rdx: The id of the row
+        :type rdx: Integer
+        :returns: None
+        :rtype: None
+        """
+
+        for lab in self.cells.pop(rdx, {}).values():
+            lab.destroy()
+        if rdx in self.ids:
+            self.ids.pop(rdx).destroy()
+        self.separator(rdx, False)
+        self.grid_rows.pop(rdx, None)
+
+        return
+
+    def select(self, rdx, on):
+        """ highlights or un-highlights the id of a drawn row
+        :param rdx: The id of the row
+        :type rdx: Integer
+        :param on: Whether to highlight it
+        :type on: Boolean
+        :returns: None
+        :rtype: None
+        """
+
+        if rdx in self.ids:
+            background = self.highlight if on else self.frame.winfo_toplevel().cget("background")
+            self.ids[rdx].config(background=background)
+
+        return
+
+    def layout(self):
+        """ the frame resizes itself as labels are gridded, so there is nothing to do """
+        return
+
+    def clear(self):
+        """ destroys every row and the header
+        :returns: None
+        :rtype: None
+        """
+
+        for widget in self.headers + list(self.ids.values()) + list(self.separators.values()):
+            widget.destroy()
+        for cells in self.cells.values():
+            for lab in cells.values():
+                lab.destroy()
+
+        self.rows = 0
+        self.grid_rows = {}
+        self.ids = {}
+        self.cells = {}
+        self.separators = {}
+        self.headers = []
+
+        return
+
+    def __contains__(self, rdx):
+        return rdx in self.cells
+
+
+class CanvasTable:
+    """ The player rows as text items on the canvas of the scrolled window. Rows are stacked in the
+        order they are drawn, removing one moves the rows under it up, and the canvas scroll region
+        is set from the number of rows rather than from the size of a frame
+
+        __init__( self, scroller, pallete, highlight, on_click, on_sort )
+        scroller - the scrolled window whose canvas the items are drawn on
+        pallete - the colours of the packs
+        highlight - the background of selected ids
+        on_click - called w/ the event and row id when an id is clicked
+        on_sort - (Default None) called w/ the column when a header is clicked
+    """
+
+    def __init__(self, scroller, pallete, highlight, on_click, on_sort=None):
+
+        self.scroller = scroller
+        self.canv = scroller.canv
+        self.pallete = pallete
+        self.highlight = highlight
+        self.on_click = on_click
+        self.on_sort = on_sort
+
+        self.canv.tag_bind("ids", "<Button-1>", self.click)
+        self.canv.tag_bind("header", "<Button-1>", self.sortClick)
+
+        self.rows = 0
+        self.width = ID_WIDTH
+        self.xs = {}
+        self.ids = {}
+        self.cells = {}
+        self.separators = {}
+        self.highlights = {}
+        self.by_item = {}
+        self.headers = {}
+
+    def header(self, columns, sort=None):
+        """ draws the header row and the line under it, and fixes the x of every column
+        :param columns: The columns shown
+        :type columns: List of Strings
+        :param sort: (Default None) The column the view is sorted by and whether it is descending
+        :type sort: Tuple of types (String, Boolean) or None
+        :returns: The number of items made
+        :rtype: Integer
+        """
+
+        # the canvas is sized by layout from here on, not by the empty frame inside it
+        self.scroller.fit = False
+
+        y = HEADER_HEIGHT // 2
+        item = self.canv.create_text(
+            ID_WIDTH // 2,
+            y,
+            text=header_text("id", sort),
+            font=(8),
+            anchor="center",
+            tags=("header", "table"),
+        )
+        self.headers = {item: "id"}
+
+        x = ID_WIDTH
+        self.xs = {}
+        for col in columns:
+            width = WIDE_COLUMNS.get(col, COLUMN_WIDTH)
+            self.xs[col] = x + 4
+            item = self.canv.create_text(
+                x + width // 2,
+                y,
+                text=header_text(col, sort),
+                font=(8),
+                anchor="center",
+                tags=("header", "table"),
+            )
+            self.headers[item] = col
+            x += width
+        self.width = x
+
+        self.canv.create_line(0, HEADER_HEIGHT - 1, x, HEADER_HEIGHT - 1, tags=("header", "table"))
+
+        return len(columns) + 2
+
+    def top(self, position):
+        """ returns the y of the top of the row at a position """
+        return HEADER_HEIGHT + position * ROW_HEIGHT
+
+    def addRow(self, rdx, row, columns, selected=False):
+        """ draws the id and cells of a row under every drawn row
+        :param rdx: The id of the row
+        :type rdx: Integer
+        :param row: The values of the row
+        :type row: pandas Series
+        :param columns: The columns to draw
+        :type columns: List of Strings
+        :param selected: (Default False) Whether the id is highlighted
+        :type selected: Boolean
+        :returns: The number of items made
+        :rtype: Integer
+        """
+
+        tag = "r%d" % rdx
+        y = self.top(self.rows) + ROW_HEIGHT // 2
+        self.rows += 1
+
+        item = self.canv.create_text(4, y, text=rdx, font=(6), anchor="w", tags=(tag, "ids", "table"))
+        self.ids[rdx] = item
+        self.by_item[item] = rdx
+
+        cells = {}
+        for col in columns:
+            cells[col] = self.canv.create_text(
+                self.xs[col], y, font=(6), anchor="w", tags=(tag, "table")
+            )
+        self.cells[rdx] = cells
+
+        self.configRow(rdx, row, columns)
+        if selected:
+            self.select(rdx, True)
+
+        return len(cells) + 1
+
+    def configRow(self, rdx, row, columns):
+        """ sets the text and colour of cells of a drawn row
+        :param rdx: The id of the row
+        :type rdx: Integer
+        :param row: The values of the row
+        :type row: pandas Series
+        :param columns: The columns whose cells to set
+        :type columns: List of Strings
+        :returns: None
+        :rtype: None
+        """
+
+        colour = self.pallete[row["pack_id"] % len(self.pallete)]
+        cells = self.cells[rdx]
+
+        for col in columns:
+            self.canv.itemconfigure(
+                cells[col], text=row[col], fill=cell_colour(col, row[col], colour)
+            )
+
+        if "pack_id" in columns:
+            self.canv.itemconfigure(self.ids[rdx], fill=colour)
+
+        return
+
+    def separator(self, rdx, show):
+        """ draws or removes the line under a row
+        :param rdx: The id of the row
+        :type rdx: Integer
+        :param show: Whether the line should be drawn
+        :type show: Boolean
+        :returns: The number of items made
+        :rtype: Integer
+        """
+
+        if show and rdx not in self.separators:
+            y = self.canv.coords(self.ids[rdx])[1] + ROW_HEIGHT // 2
+            self.separators[rdx] = self.canv.create_line(
+                0, y, self.width, y, fill="#A0A0A0", tags=("r%d" % rdx, "table")
+            )
+            return 1
+        if not show and rdx in self.separators:
+            self.canv.delete(self.separators.pop(rdx))
+
+        return 0
+
+    def removeRow(self, rdx):
+        """ deletes the items of a row and moves every row under it up by one
+        :param rdx: The id of the row
+        :type rdx: Integer
+        :returns: None
+        :rtype: None
+        """
+
+        if rdx not in self.ids:
+            return
+
+        y = self.canv.coords(self.ids[rdx])[1]
+
+        self.canv.delete("r%d" % rdx)
+        self.by_item.pop(self.ids.pop(rdx))
+        self.cells.pop(rdx)
+        self.separators.pop(rdx, None)
+        self.highlights.pop(rdx, None)
+        self.rows -= 1
+
+        # everything from the row below down, tagged and moved in two calls
+        self.canv.addtag_overlapping(
+            "below", 0, y + ROW_HEIGHT // 2 + 1, self.width, self.top(self.rows + 2)
+        )
+        self.canv.move("below", 0, -ROW_HEIGHT)
+        self.canv.dtag("below", "below")
+
+        return
+
+    def select(self, rdx, on):
+        """ highlights or un-highlights the id of a drawn row
+        :param rdx: The id of the row
+        :type rdx: Integer
+        :param on: Whether to highlight it
+        :type on: Boolean
+        :returns: None
+        :rtype: None
+        """
+
+        if on and rdx in self.ids and rdx not in self.highlights:
+            y = self.canv.coords(self.ids[rdx])[1]
+            self.highlights[rdx] = self.canv.create_rectangle(
+                0,
+                y - ROW_HEIGHT // 2 + 1,
+                ID_WIDTH - 4,
+                y + ROW_HEIGHT // 2 - 1,
+                fill=self.highlight,
+                outline="",
+                tags=("r%d" % rdx, "table"),
+            )
+            self.canv.tag_lower(self.highlights[rdx], self.ids[rdx])
+        elif not on and rdx in self.highlights:
+            self.canv.delete(self.highlights.pop(rdx))
+
+        return
+
+    def click(self, event):
+        """ hands the row of the clicked id to on_click """
+
+        item = self.canv.find_withtag("current")
+        if item and item[0] in self.by_item:
+            self.on_click(event, self.by_item[item[0]])
+
+    def sortClick(self, event):
+        """ hands the column of the clicked header to on_sort """
+
+        item = self.canv.find_withtag("current")
+        if self.on_sort is not None and item and item[0] in self.headers:
+            self.on_sort(self.headers[item[0]])
+
+    def layout(self):
+        """ sizes the canvas and its scroll region to the drawn rows
+        :returns: None
+        :rtype: None
+        """
+
+        height = self.top(self.rows) + ROW_HEIGHT // 2
+        self.canv.config(width=self.width, scrollregion=(0, 0, self.width, height))
+
+        return
+
+    def clear(self):
+        """ deletes every row and the header
+        :returns: None
+        :rtype: None
+        """
+
+        # only the table's items, the canvas also holds the window of the scrolled frame
+        self.canv.delete("table")
+
+        self.rows = 0
+        self.ids = {}
+        self.cells = {}
+        self.separators = {}
+        self.highlights = {}
+        self.by_item = {}
+        self.headers = {}
+
+        return
+
+    def __contains__(self, rdx):
+        return rdx in self.cells
@@ -0,0 +1,180 @@
+""" profiling.py
+
+This file contains an on demand profiling session for the GUI. Between start and stop it runs
+cProfile on the event loop thread and tracemalloc on the process, and counts the tk widgets held by
+every frame. Stopping writes a sorted profile report, the raw profile, and a memory report holding
+the allocation diff and widget count diff to PROFILE_DIR, so slow paths and leaked widgets show up
+
+This file contains classes:
+    * ProfileSession - Class for profiling a user workflow between start and stop
+
+This file contains methods:
+    Global Methods:
+        * widget_counts( root ) - returns how many widgets each frame of a window holds
+
+    Members of Class ProfileSession:
+        * __init__( self, root, out_dir ) - sets up a stopped session
+        * running( self ) - returns whether the session is running
+        * start( self ) - starts profiling and tracing allocations
+        * stop( self ) - stops both and writes the reports
+        * writeProfile( self, path ) - writes the cProfile report
+        * writeMemory( self, path, before, after ) - writes the allocation and widget count diffs
+
+Created October 19th, 2026.
+"""
+
+import cProfile
+import datetime
+import io
+import os
+import pstats
+import tracemalloc
+
+# where the reports of each session are written
+PROFILE_DIR = "profiles"
+
+# widget classes that hold other widgets
+CONTAINERS = ("Tk", "Toplevel", "Frame", "TFrame", "Canvas", "Labelframe", "TLabelframe")
+
+
+def widget_counts(root):
+    """ returns how many widgets each container of a window holds, including nested ones
+    :param root: The window to count
+    :type root: tk Tk or Toplevel
+    :returns: The number of descendants of every container, keyed by tk path name
+    :rtype: Dictionary
+    """
+
+    counts = {}
+
+    def walk(widget):
+        total = 0
+        for child in widget.winfo_children():
+            total += 1 + walk(child)
+        if widget.winfo_class() in CONTAINERS:
+            counts[str(widget)] = total
+        return total
+
+    walk(root)
+
+    return counts
+
+
+class ProfileSession:
+    """ Profiles the event loop thread and traces allocations between start and stop
+
+        __init__( self, root, out_dir )
+        root - the tk root whose widgets are counted
+        out_dir - (Default PROFILE_DIR) where the reports are written
+    """
+
+    def __init__(self, root, out_dir=PROFILE_DIR):
+
+        self.root = root
+        self.out_dir = out_dir
+        self.profile = None
+
+    def running(self):
+        """ returns whether the session is running
+        :returns: Whether start was called w/o stop
+        :rtype: Boolean
+        """
+
+        return self.profile is not None
+
+    def start(self):
+        """ starts profiling, tracing allocations, and takes the starting widget counts
+        :returns: None
+        :rtype: None
+        """
+
+        self.started = datetime.datetime.now()
+        self.widgets = widget_counts(self.root)
+
+        # keep enough frames to tell the tracker, pandas and tk apart
+        self.traced = tracemalloc.is_tracing()
+        if not self.traced:
+            tracemalloc.start(10)
+        self.snapshot = tracemalloc.take_snapshot()
+
+        self.profile = cProfile.Profile()
+        self.profile.enable()
+
+        return
+
+    def stop(self):
+        """ stops the session and writes its reports
+        :returns: The paths of the reports written
+        :rtype: List of Strings
+        """
+
+        self.profile.disable()
+
+        after = tracemalloc.take_snapshot()
+        if not self.traced:
+            tracemalloc.stop()
+
+        os.makedirs(self.out_dir, exist_ok=True)
+        stamp = self.started.strftime("%Y%m%d-%H%M%S")
+        base = os.path.join(self.out_dir, stamp)
+
+        self.profile.dump_stats(base + ".prof")
+        self.writeProfile(base + "-profile.txt")
+        self.writeMemory(base + "-memory.txt", self.snapshot, after)
+
+        self.profile = None
+        self.snapshot = None
+
+        return [base + ".prof", base + "-profile.txt", base + "-memory.txt"]
+
+    def writeProfile(self, path):
+        """ writes the profile sorted by cumulative and by internal time
+        :param path: The file to write
+        :type path: String
+        :returns: None
+        :rtype: None
+        """
+
+        out = io.StringIO()
+        for order in ("cumulative", "tottime"):
+            out.write("==== sorted by %s ====\n" % order)
+            pstats.Stats(self.profile, stream=out).strip_dirs().sort_stats(order).print_stats(40)
+
+        with open(path, "w") as f:
+            f.write(out.getvalue())
+
+        return
+
+    def writeMemory(self, path, before, after):
+        """ writes the allocations that grew during the session and the widgets each frame gained
+        :param path: The file to write
+        :type path: String
+        :param before: The snapshot taken at start
+        :type before: tracemalloc Snapshot
+        :param after: The snapshot taken at stop
+        :type after: tracemalloc Snapshot
+        :returns: None
+        :rtype: None
+        """
+
+        # ignore tracemalloc's own bookkeeping
+        filters = [tracemalloc.Filter(False, tracemalloc.__file__)]
+        diff = after.filter_traces(filters).compare_to(before.filter_traces(filters), "lineno")
+
+        widgets = widget_counts(self.root)
+        frames = sorted(
+            set(widgets) | set(self.widgets),
+            key=lambda path: -(widgets.get(path, 0) - self.widgets.get(path, 0)),
+        )
+
+        with open(path, "w") as f:
+            f.write("==== widgets per frame (start -> stop) ====\n")
+            for frame in frames:
+                start, stop = self.widgets.get(frame, 0), widgets.get(frame, 0)
+                f.write("%+7d  %7d -> %-7d %s\n" % (stop - start, start, stop, frame))
+
+            f.write("\n==== allocation growth by line ====\n")
+            for stat in diff[:40]:
+                f.write(str(stat) + "\n")
+
+        return
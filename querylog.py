@@ -0,0 +1,398 @@
+""" querylog.py
+
+This file contains a wrapper around a DB-API connection that logs every statement sent through it.
+Statements are grouped by shape, their literal parameters redacted, and each shape keeps latency
+histograms of execute and fetch time along w/ row counts. Commits are timed the same way. Any
+statement slower than SLOW_QUERY_SECONDS is appended to SLOW_QUERY_FILE
+
+This file contains classes:
+    * QueryLog - Class for collecting statement timings
+    * LoggedConnection - Class wrapping a connection so its statements and commits are logged
+    * LoggedCursor - Class wrapping a cursor so its statements and fetches are logged
+
+This file contains methods:
+    Global Methods:
+        * shape( query ) - returns the query w/ whitespace and IN lists normalized
+        * redact( params ) - returns the types of the parameters in place of their values
+        * wrap( conn, log ) - wraps a connection so it reports to a QueryLog
+        * error_class( conn ) - returns the exception the driver of a connection raises
+
+    Members of Class QueryLog:
+        * __init__( self, threshold, slow_file ) - creates an empty log
+        * record( self, query, params, rows, execute, fetch ) - logs one finished statement
+        * summary( self ) - returns per shape counts, rows, and latency percentiles
+        * export( self, path ) - writes the summary to a JSON file
+
+    Members of Class LoggedConnection:
+        * cursor( self ) - returns a logged cursor
+        * commit( self ) - commits and logs the commit time
+
+    Members of Class LoggedCursor:
+        * execute( self, query, *params ) - runs and logs a statement
+        * executemany( self, query, seq ) - runs and logs a statement for many parameter sets
+        * timedFetch( self, fetch, *args ) - runs a fetch, adding its time to the statement
+        * fetchone, fetchmany, fetchall, __iter__ - fetch rows, timing the fetch
+        * finish( self ) - logs the statement in progress
+
+Created October 19th, 2026.
+"""
+
+import datetime
+import json
+import re
+import sys
+import threading
+import time
+
+from config import SLOW_QUERY_SECONDS
+from metrics import Histogram
+
+# each slow statement is one JSON line in this file
+SLOW_QUERY_FILE = "slow_queries.jsonl"
+
+# the per shape summary handleQuit writes
+QUERY_LOG_FILE = "query_log.json"
+
+IN_LIST = re.compile(r"IN\s*\(\s*\?(\s*,\s*\?)*\s*\)", re.IGNORECASE)
+
+
+def shape(query):
+    """ returns a query w/ its whitespace collapsed and any IN list of parameters shortened, so
+        statements that only differ in how many rows they touch are grouped together
+    :param query: The sql statement
+    :type query: String
+    :returns: The shape of the statement
+    :rtype: String
+    """
+
+    return IN_LIST.sub("IN (?...)", " ".join(query.split()))
+
+
+def redact(params):
+    """ returns the types of some parameters in place of their values
+    :param params: The parameters of a statement
+    :type params: Tuple, List, or None
+    :returns: The redacted parameters, such as ['int', 'str(6)', 'None']
+    :rtype: List of Strings
+    """
+
+    if params is None:
+        return []
+
+    redacted = []
+    for item in params:
+        if isinstance(item, str):
+            redacted.append("str(%d)" % len(item))
+        else:
+            redacted.append(type(item).__name__)
+
+    # long IN lists only need their size
+    if len(redacted) > 8:
+        redacted = redacted[:8] + ["... %d params" % len(redacted)]
+
+    return redacted
+
+
+class QueryLog:
+    """ Latency histograms and row counts for every statement shape, plus a slow query file
+
+        __init__( self, threshold, slow_file )
+        threshold - (Default SLOW_QUERY_SECONDS) statements slower than this are written to slow_file
+        slow_file - (Default SLOW_QUERY_FILE) where slow statements are appended, None disables it
+    """
+
+    def __init__(self, threshold=SLOW_QUERY_SECONDS, slow_file=SLOW_QUERY_FILE):
+
+        self.threshold = threshold
+        self.slow_file = slow_file
+        self.lock = threading.Lock()
+        self.shapes = {}
+
+    def record(self, query, params, rows, execute, fetch=0.0):
+        """ logs one finished statement
+        :param query: The sql statement, or COMMIT
+        :type query: String
+        :param params: The parameters of the statement
+        :type params: Tuple, List, or None
+        :param rows: The rows fetched or affected, -1 if unknown
+        :type rows: Integer
+        :param execute: Seconds spent in execute
+        :type execute: Float
+        :param fetch: (Default 0.0) Seconds spent fetching the results
+        :type fetch: Float
+        :returns: None
+        :rtype: None
+        """
+
+        key = shape(query)
+
+        with self.lock:
+            if key not in self.shapes:
+                self.shapes[key] = {
+                    "count": 0,
+                    "rows": 0,
+                    "execute": Histogram(),
+                    "fetch": Histogram(),
+                    "total": Histogram(),
+                }
+            entry = self.shapes[key]
+            entry["count"] += 1
+            entry["rows"] += max(rows, 0)
+            entry["execute"].observe(execute)
+            entry["fetch"].observe(fetch)
+            entry["total"].observe(execute + fetch)
+
+        if self.slow_file is not None and execute + fetch >= self.threshold:
+            slow = {
+                "date": datetime.datetime.now().isoformat(timespec="milliseconds"),
+                "shape": key,
+                "params": redact(params),
+                "rows": rows,
+                "execute": round(execute, 6),
+                "fetch": round(fetch, 6),
+            }
+            try:
+                with open(self.slow_file, "a") as f:
+                    f.write(json.dumps(slow) + "\n")
+            except OSError:
+                pass
+
+        return
+
+    def summary(self):
+        """ returns the count, rows, and latency percentiles of every statement shape, slowest first
+        :returns: The summary, keyed by shape
+        :rtype: Dictionary
+        """
+
+        def percentiles(hist):
+            return {q: hist.quantile(v) for q, v in [("p50", 0.5), ("p95", 0.95), ("p99", 0.99)]}
+
+        with self.lock:
+            ranked = sorted(self.shapes.items(), key=lambda item: -item[1]["total"].sum)
+            return {
+                key: {
+                    "count": entry["count"],
+                    "rows": entry["rows"],
+                    "seconds": round(entry["total"].sum, 6),
+                    "execute": percentiles(entry["execute"]),
+                    "fetch": percentiles(entry["fetch"]),
+                    "total": percentiles(entry["total"]),
+                }
+                for key, entry in ranked
+            }
+
+    def export(self, path=QUERY_LOG_FILE):
+        """ writes the summary to a JSON file
+        :param path: (Default QUERY_LOG_FILE) The file to write
+        :type path: String
+        :returns: None
+        :rtype: None
+        """
+
+        with open(path, "w") as f:
+            json.dump(self.summary(), f, indent=2)
+
+        return
+
+
+# the log every connection made by tracker.connect reports to
+QUERIES = QueryLog()
+
+
+class LoggedConnection:
+    """ Wraps a DB-API connection so every statement and commit made through it is logged.
+        Anything else is passed through to the wrapped connection
+
+        __init__( self, conn, log )
+        conn - the connection to wrap
+        log - (Default QUERIES) the QueryLog to report to
+    """
+
+    def __init__(self, conn, log=QUERIES):
+
+        self.conn = conn
+        self.log = log
+
+    def __getattr__(self, name):
+        return getattr(self.conn, name)
+
+    def cursor(self):
+        """ returns a cursor whose statements are logged
+        :returns: The cursor
+        :rtype: LoggedCursor
+        """
+
+        return LoggedCursor(self.conn.cursor(), self.log)
+
+    def commit(self):
+        """ commits, logging how long the commit took
+        :returns: None
+        :rtype: None
+        """
+
+        start = time.perf_counter()
+        self.conn.commit()
+        self.log.record("COMMIT", None, -1, time.perf_counter() - start)
+
+        return
+
+
+class LoggedCursor:
+    """ Wraps a DB-API cursor. Each statement is logged once its results are used up, or when the
+        next statement starts. Anything else, including attribute writes such as fast_executemany,
+        is passed through to the wrapped cursor
+
+        __init__( self, cursor, log )
+        cursor - the cursor to wrap
+        log - the QueryLog to report to
+    """
+
+    OWN = ("cursor", "log", "pending")
+
+    def __init__(self, cursor, log):
+
+        object.__setattr__(self, "cursor", cursor)
+        object.__setattr__(self, "log", log)
+        object.__setattr__(self, "pending", None)
+
+    def __getattr__(self, name):
+        return getattr(self.cursor, name)
+
+    def __setattr__(self, name, value):
+        if name in self.OWN:
+            object.__setattr__(self, name, value)
+        else:
+            setattr(self.cursor, name, value)
+
+    def execute(self, query, *params):
+        """ runs a statement, timing it
+        :param query: The sql statement
+        :type query: String
+        :param params: The parameters, either as one sequence or spread out
+        :returns: This cursor, like pyodbc
+        :rtype: LoggedCursor
+        """
+
+        self.finish()
+
+        start = time.perf_counter()
+        self.cursor.execute(query, *params)
+        took = time.perf_counter() - start
+
+        if len(params) == 1 and isinstance(params[0], (list, tuple)):
+            params = params[0]
+
+        # selects are logged once fetched, everything else right away
+        if query.lstrip()[:6].upper() == "SELECT":
+            self.pending = [query, params, 0, took, 0.0]
+        else:
+            self.log.record(query, params, self.cursor.rowcount, took)
+
+        return self
+
+    def executemany(self, query, seq):
+        """ runs a statement for many parameter sets, timing it
+        :param query: The sql statement
+        :type query: String
+        :param seq: The parameter sets
+        :type seq: List of sequences
+        :returns: None
+        :rtype: None
+        """
+
+        self.finish()
+
+        seq = list(seq)
+        start = time.perf_counter()
+        self.cursor.executemany(query, seq)
+        took = time.perf_counter() - start
+
+        self.log.record(query, seq[0] if seq else None, len(seq), took)
+
+        return
+
+    def timedFetch(self, fetch, *args):
+        """ runs a fetch, adding its time and rows to the statement in progress
+        :param fetch: The fetch method of the wrapped cursor
+        :type fetch: Function
+        :returns: What the fetch returned
+        """
+
+        start = time.perf_counter()
+        rows = fetch(*args)
+        took = time.perf_counter() - start
+
+        if self.pending is not None:
+            self.pending[4] += took
+            if rows is None or (isinstance(rows, list) and len(rows) == 0):
+                self.finish()
+            else:
+                self.pending[2] += len(rows) if isinstance(rows, list) else 1
+
+        return rows
+
+    def fetchone(self):
+        return self.timedFetch(self.cursor.fetchone)
+
+    def fetchmany(self, size):
+        return self.timedFetch(self.cursor.fetchmany, size)
+
+    def fetchall(self):
+        rows = self.timedFetch(self.cursor.fetchall)
+        self.finish()
+        return rows
+
+    def __iter__(self):
+        while True:
+            rows = self.fetchmany(1000)
+            if not rows:
+                return
+            yield from rows
+
+    def finish(self):
+        """ logs the statement in progress, if there is one
+        :returns: None
+        :rtype: None
+        """
+
+        if self.pending is not None:
+            query, params, rows, execute, fetch = self.pending
+            self.pending = None
+            self.log.record(query, params, rows, execute, fetch)
+
+        return
+
+    def close(self):
+        self.finish()
+        self.cursor.close()
+
+
+def wrap(conn, log=QUERIES):
+    """ wraps a connection so every statement and commit made through it is logged
+    :param conn: The connection to wrap
+    :type conn: DB-API connection
+    :param log: (Default QUERIES) The QueryLog to report to
+    :type log: QueryLog
+    :returns: The wrapped connection
+    :rtype: LoggedConnection
+    """
+
+    return LoggedConnection(conn, log)
+
+
+def error_class(conn):
+    """ returns the DB-API Error class of the module a connection came from, such as pyodbc.Error
+        or fakedb.Error, so failed statements can be caught w/o importing the driver
+    :param conn: The connection, wrapped or not
+    :type conn: DB-API connection or LoggedConnection
+    :returns: The driver's Error, or Exception if its module does not define one
+    :rtype: Exception class
+    """
+
+    if isinstance(conn, LoggedConnection):
+        conn = conn.conn
+
+    module = sys.modules.get(type(conn).__module__)
+
+    return getattr(module, "Error", Exception)
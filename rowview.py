@@ -0,0 +1,136 @@
+""" rowview.py
+
+This file contains the view of the data the GUI draws and calculates stats from. A RowView is the
+positions of its rows in the tracker's data and the names of the columns shown, nothing is copied
+when it is made. A column is only gathered for the view's rows when something asks for it, the
+renderer gathers one slice of rows at a time, and a view of every row in table order reads the
+data's own arrays. Positions go stale when rows are deleted, so a view is made for one version of
+the data and the GUI keeps row ids between versions
+
+This file contains classes:
+    * RowView - Class for a set of rows and columns of a frame, held by position
+
+This file contains methods:
+    Members of Class RowView:
+        * __init__( self, data, positions, columns ) - wraps the rows at some positions of a frame
+        * fromIds( cls, data, rows, columns ) - makes a view of the rows w/ some ids
+        * __len__( self ) - returns the number of rows
+        * __getitem__( self, column ) - returns a column for the rows of the view
+        * index( self ) - returns the ids of the rows
+        * take( self, positions ) - returns a view of some rows of this view, in the order given
+        * rows( self, start, stop ) - returns the ids and values of a slice of the rows
+        * frame( self ) - copies the view into a DataFrame, for code that needs one
+
+Created October 19th, 2026.
+"""
+
+import numpy as np
+
+
+class RowView:
+    """ Rows of a frame held by position, w/ the columns shown. Columns are gathered on demand
+
+        __init__( self, data, positions, columns )
+        data - the frame the rows are in
+        positions - the positions of the rows, in the order shown, None for every row in order
+        columns - the names of the columns shown
+    """
+
+    def __init__(self, data, positions, columns):
+
+        self.data = data
+        self.positions = positions
+        self.columns = list(columns)
+
+    @classmethod
+    def fromIds(cls, data, rows, columns):
+        """ makes a view of the rows w/ some ids, in the order given
+        :param data: The frame the rows are in
+        :type data: pandas DataFrame
+        :param rows: The ids of the rows
+        :type rows: pandas Index or List of Integers
+        :param columns: The names of the columns shown
+        :type columns: List of Strings
+        :returns: The view
+        :rtype: RowView
+        """
+
+        # every row in table order needs no positions, its columns are the data's own arrays
+        if rows is data.index or (len(rows) == len(data) and data.index.equals(rows)):
+            return cls(data, None, columns)
+
+        return cls(data, data.index.get_indexer(rows), columns)
+
+    def __len__(self):
+        return len(self.data) if self.positions is None else len(self.positions)
+
+    def __getitem__(self, column):
+        """ returns a column for the rows of the view, gathering only that column
+        :param column: The name of the column
+        :type column: String
+        :returns: The values, a numpy array or a pandas extension array for nullable columns
+        :rtype: Array
+        """
+
+        values = self.data[column].array
+        if self.positions is None:
+            return values
+
+        return values.take(self.positions)
+
+    @property
+    def index(self):
+        """ the ids of the rows, in the order shown """
+
+        if self.positions is None:
+            return self.data.index
+
+        return self.data.index[self.positions]
+
+    def take(self, positions):
+        """ returns a view of some rows of this view
+        :param positions: The positions of the rows within this view, in the order wanted
+        :type positions: numpy array
+        :returns: The view
+        :rtype: RowView
+        """
+
+        if self.positions is not None:
+            positions = self.positions[positions]
+
+        return RowView(self.data, np.asarray(positions, dtype=np.int64), self.columns)
+
+    def rows(self, start=0, stop=None):
+        """ returns the ids and values of a slice of the rows, gathering only that slice
+        :param start: (Default 0) The position of the first row in the view
+        :type start: Integer
+        :param stop: (Default None) The position to stop before, None for the end
+        :type stop: Integer or None
+        :returns: The id of each row w/ its values keyed by column
+        :rtype: List of tuples of types ( Integer, Dictionary )
+        """
+
+        stop = len(self) if stop is None else min(stop, len(self))
+        if self.positions is None:
+            positions = np.arange(start, stop)
+        else:
+            positions = self.positions[start:stop]
+
+        ids = self.data.index[positions]
+        values = [list(self.data[col].array.take(positions)) for col in self.columns]
+
+        return [
+            (ids[idx], {col: values[cdx][idx] for cdx, col in enumerate(self.columns)})
+            for idx in range(len(positions))
+        ]
+
+    def frame(self):
+        """ copies the rows and columns of the view into a DataFrame
+        :returns: The rows
+        :rtype: pandas DataFrame
+        """
+
+        if self.positions is None:
+            return self.data[self.columns]
+
+        return self.data[self.columns].take(self.positions)
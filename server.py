@@ -0,0 +1,750 @@
+""" server.py
+
+This file contains a local HTTP/JSON API server that holds the one authoritative copy of the
+pack data in memory, and the client that lets a PackTracker (and so the GUI) use it instead of
+talking to the database directly. Reads are answered from memory, writes are patched into memory
+at once and written behind to the database in batches, one transaction per batch, on pooled
+connections. Start it w/ python server.py
+
+Every change bumps the version of the server's data. Replies to /meta and /rows carry the version,
+and replies to writes carry the version before and after the write, so a client can tell when its
+copy of the rows is missing changes other clients made and fetch them again
+
+Endpoints, all JSON:
+    GET  /meta                    - the next free row and pack ids, and the data version
+    GET  /rows?pack=&type=&name=  - the rows matching every filter given
+    GET  /stats?pack=&type=       - the stats pane for the rows matching every filter given
+    POST /packs                   - {data, qs_price, pack_type, pack_price} opens a pack
+    POST /sales                   - {id, price} enters a sale
+    POST /edit                    - {id, data} sets every column of a row
+    POST /delete                  - {ids} deletes rows
+    POST /bulk-edit               - {ids, column, value} sets one column of many rows
+
+This file contains classes:
+    * ConnectionPool - Class for sharing a fixed number of database connections
+    * PooledBackend - Class for queueing tracker writes and flushing them in batches
+    * TrackerServer - Class for serving a PackTracker over HTTP
+    * RemoteBackend - Class for sending tracker reads and writes to a TrackerServer
+    * RemoteTracker - Class for using a TrackerServer as a PackTracker
+
+This file contains methods:
+    Global Methods:
+        * to_json( payload ) - encodes a payload, converting numpy and pandas scalars
+        * frame_rows( data ) - returns the rows of a frame as lists in COLUMNS order
+        * main( ) - command line entry point
+
+    Members of Class ConnectionPool:
+        * __init__( self, connect, size ) - sets up the pool, connecting lazily
+        * connection( self ) - context manager lending a connection
+
+    Members of Class PooledBackend:
+        * __init__( self, pool, table ) - sets up an empty write queue
+        * fetchAll( self ) - returns every row of the table
+        * queue( self, method, *args ) - queues a write for the next batch
+        * insertRows, updateSale, updateSales, updateRow, deleteRows, updateRows - queue a write
+        * flushed( self ) - returns a future resolved once every queued write is committed
+        * run( self, tracker ) - flushes queued writes forever
+        * recover( self, tracker, error ) - drops uncommitted writes and reloads the committed data
+        * writeBatch( self, ops ) - writes and commits one batch of queued writes
+
+    Members of Class TrackerServer:
+        * __init__( self, tracker, backend ) - sets up the routes
+        * serve( self, host, port ) - serves requests until cancelled
+        * handle( self, reader, writer ) - answers a single HTTP request
+        * filtered( self, query ) - returns the rows matching the query filters
+        * getMeta, getRows, getStats, postPack, postSale, postEdit, postDelete, postBulkEdit - routes
+
+    Members of Class RemoteBackend:
+        * __init__( self, url ) - points the backend at a server
+        * request( self, method, path, payload ) - sends one request and decodes the reply
+        * fetchRows( self ) - returns every row and the version of the data they are from
+        * wrote( self, reply ) - keeps the copy current if a write was the only change on the server
+        * fetchAll, updateSale, updateSales, updateRow, deleteRows, updateRows - backend methods
+
+    Members of Class RemoteTracker:
+        * __init__( self, url ) - loads the data from a server
+        * setCounters( self ) - gets the next free ids from the server
+        * changes( self ) - fetches every row if other clients changed the data
+        * sync( self, changes ) - loads rows fetched by changes
+        * postData( self, data, qs_price, pack_type, pack_price ) - opens a pack on the server
+
+Created October 19th, 2026.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import queue
+import threading
+import urllib.error
+import urllib.parse
+import urllib.request
+
+import numpy as np
+import pandas as pd
+
+from tracker import (
+    PackTracker,
+    SQLBackend,
+    connect,
+    validate_listing,
+    COLUMNS,
+    PACKS,
+    TYPES,
+    TABLE,
+)
+
+HOST = "127.0.0.1"
+PORT = 8765
+
+# how long to wait before reading the table again when it cannot be read after a failed batch
+RETRY_SECONDS = 1.0
+
+STATUS = {200: "OK", 400: "Bad Request", 404: "Not Found", 500: "Internal Server Error"}
+
+
+def to_json(payload):
+    """ encodes a payload as JSON bytes, converting numpy and pandas scalars to builtins
+    :param payload: The payload to encode
+    :type payload: Dictionary or List
+    :returns: The encoded payload
+    :rtype: Bytes
+    """
+
+    def default(item):
+        if isinstance(item, np.generic):
+            return item.item()
+        if item is pd.NA:
+            return None
+        raise TypeError("cannot encode %r" % (item,))
+
+    return json.dumps(payload, default=default).encode("utf-8")
+
+
+def frame_rows(data):
+    """ returns the rows of a tracker frame as lists in COLUMNS order, w/ None for unsold rows
+    :param data: The rows to convert
+    :type data: pandas DataFrame
+    :returns: The rows
+    :rtype: List of Lists
+    """
+
+    rows = data.reset_index().astype(object)
+
+    return rows.where(rows.notna(), None).values.tolist()
+
+
+class ConnectionPool:
+    """ Lends out up to size database connections, opening them the first time they are needed
+
+        __init__( self, connect, size )
+        connect - function that opens a new connection
+        size - the most connections that may be open at once
+    """
+
+    def __init__(self, connect, size=2):
+
+        self.connect = connect
+        self.free = queue.LifoQueue()
+        self.slots = threading.BoundedSemaphore(size)
+
+    @contextlib.contextmanager
+    def connection(self):
+        """ lends a connection for the duration of a with block
+        :returns: A connection from the pool
+        :rtype: pyodbc connection
+        """
+
+        self.slots.acquire()
+        try:
+            try:
+                conn = self.free.get_nowait()
+            except queue.Empty:
+                conn = self.connect()
+            try:
+                yield conn
+            except Exception:
+                # a connection that raised is closed and dropped rather than lent out again
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+                raise
+            self.free.put(conn)
+        finally:
+            self.slots.release()
+
+
+class PooledBackend:
+    """ A backend for the server's PackTracker. The tracker patches its data at once and every write
+        it makes is queued here, then run() writes the whole queue as one transaction on a pooled
+        connection. Writes arriving while a batch commits form the next batch, so sales from many
+        clients share commits
+
+        __init__( self, pool, table )
+        pool - the ConnectionPool to write through
+        table - (Default TABLE) the name of the pack table
+    """
+
+    def __init__(self, pool, table=TABLE):
+
+        self.pool = pool
+        self.table = table
+        self.ops = []
+        self.waiting = None
+        self.wakeup = None
+
+    def fetchAll(self):
+        """ returns every row of the table, blocking while it is read
+        :returns: The rows in COLUMNS order
+        :rtype: List of tuples
+        """
+
+        with self.pool.connection() as conn:
+            return SQLBackend(conn, self.table).fetchAll()
+
+    def queue(self, method, *args):
+        """ queues a write to run in the next batch
+        :param method: The name of the SQLBackend method that makes the write
+        :type method: String
+        :param args: The arguments to the method
+        :returns: None
+        :rtype: None
+        """
+
+        self.ops.append((method, args))
+        if self.wakeup is not None:
+            self.wakeup.set()
+
+        return
+
+    def insertRows(self, rows):
+        self.queue("insertRows", rows)
+
+    def updateSale(self, id, sale_price):
+        self.queue("updateSale", id, sale_price)
+
+    def updateSales(self, sales):
+        self.queue("updateSales", sales)
+
+    def updateRow(self, id, data):
+        self.queue("updateRow", id, data)
+
+    def deleteRows(self, ids):
+        self.queue("deleteRows", ids)
+
+    def updateRows(self, ids, column, value):
+        self.queue("updateRows", ids, column, value)
+
+    def flushed(self):
+        """ returns a future that resolves once every write queued so far is committed
+        :returns: The future
+        :rtype: asyncio Future
+        """
+
+        loop = asyncio.get_running_loop()
+
+        if not self.ops:
+            done = loop.create_future()
+            done.set_result(0)
+            return done
+
+        if self.waiting is None:
+            self.waiting = loop.create_future()
+
+        return self.waiting
+
+    async def run(self, tracker):
+        """ flushes queued writes forever, one batch at a time
+        :param tracker: The tracker whose data is reloaded if a batch fails
+        :type tracker: PackTracker
+        :returns: None
+        :rtype: None
+        """
+
+        loop = asyncio.get_running_loop()
+        self.wakeup = asyncio.Event()
+        if self.ops:
+            self.wakeup.set()
+
+        while True:
+            await self.wakeup.wait()
+            self.wakeup.clear()
+            if not self.ops:
+                continue
+
+            ops, self.ops = self.ops, []
+            waiting, self.waiting = self.waiting, None
+
+            try:
+                await loop.run_in_executor(None, self.writeBatch, ops)
+            except Exception as e:
+                if waiting is not None:
+                    waiting.set_exception(e)
+                await self.recover(tracker, e)
+            else:
+                if waiting is not None:
+                    waiting.set_result(len(ops))
+
+    async def recover(self, tracker, error):
+        """ puts the tracker back to what the database committed after a batch failed. Writes
+            queued since the batch was taken are already in memory but were never written, so they
+            are dropped along w/ it and their requests fail too, rather than being written on top
+            of data that no longer has the failed batch
+        :param tracker: The tracker whose data is reloaded
+        :type tracker: PackTracker
+        :param error: The error the batch failed w/
+        :type error: Exception
+        :returns: None
+        :rtype: None
+        """
+
+        # only run() writes, so the table holds still while it is read off the event loop
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                rows = await loop.run_in_executor(None, self.fetchAll)
+                break
+            except Exception:
+                await asyncio.sleep(RETRY_SECONDS)
+
+        # no await from here on, so no request patches memory between the drop and the reload
+        self.ops = []
+        waiting, self.waiting = self.waiting, None
+        if waiting is not None:
+            waiting.set_exception(error)
+
+        tracker.loadData(rows)
+        tracker.setCounters()
+
+        return
+
+    def writeBatch(self, ops):
+        """ writes a batch of queued writes in one transaction, merging runs of sales
+        :param ops: The queued writes, each as ( method, args )
+        :type ops: List of tuples
+        :returns: None
+        :rtype: None
+        """
+
+        merged = []
+        for method, args in ops:
+            if method == "updateSale" and merged and merged[-1][0] == "updateSales":
+                merged[-1][1][0].append(args)
+            elif method == "updateSale":
+                merged.append(("updateSales", ([args],)))
+            else:
+                merged.append((method, args))
+
+        with self.pool.connection() as conn:
+            backend = SQLBackend(conn, self.table, autocommit=False)
+            try:
+                for method, args in merged:
+                    getattr(backend, method)(*args)
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+
+        return
+
+
+class TrackerServer:
+    """ Serves a PackTracker over HTTP/JSON to clients on this machine
+
+        __init__( self, tracker, backend )
+        tracker - the PackTracker holding the data
+        backend - the PooledBackend the tracker writes through
+    """
+
+    def __init__(self, tracker, backend):
+
+        self.tracker = tracker
+        self.backend = backend
+
+        self.routes = {
+            ("GET", "/meta"): self.getMeta,
+            ("GET", "/rows"): self.getRows,
+            ("GET", "/stats"): self.getStats,
+            ("POST", "/packs"): self.postPack,
+            ("POST", "/sales"): self.postSale,
+            ("POST", "/edit"): self.postEdit,
+            ("POST", "/delete"): self.postDelete,
+            ("POST", "/bulk-edit"): self.postBulkEdit,
+        }
+
+    async def serve(self, host=HOST, port=PORT):
+        """ serves requests until cancelled
+        :param host: (Default HOST) The address to listen on
+        :type host: String
+        :param port: (Default PORT) The port to listen on
+        :type port: Integer
+        :returns: None
+        :rtype: None
+        """
+
+        writer = asyncio.ensure_future(self.backend.run(self.tracker))
+        server = await asyncio.start_server(self.handle, host, port)
+
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            writer.cancel()
+
+    async def handle(self, reader, writer):
+        """ reads one HTTP request, routes it, and writes the JSON reply
+        :param reader: The stream of the request
+        :type reader: asyncio StreamReader
+        :param writer: The stream of the reply
+        :type writer: asyncio StreamWriter
+        :returns: None
+        :rtype: None
+        """
+
+        try:
+            method, target, _ = (await reader.readline()).decode("latin-1").split(" ", 2)
+
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                key, value = line.decode("latin-1").split(":", 1)
+                headers[key.strip().lower()] = value.strip()
+
+            length = int(headers.get("content-length", 0))
+            body = json.loads(await reader.readexactly(length)) if length else {}
+
+            url = urllib.parse.urlsplit(target)
+            query = dict(urllib.parse.parse_qsl(url.query))
+
+            route = self.routes.get((method, url.path))
+            if route is None:
+                status, payload = 404, {"error": "no route %s %s" % (method, url.path)}
+            else:
+                status, payload = 200, await route(query, body)
+        except (ValueError, KeyError, TypeError) as e:
+            status, payload = 400, {"error": str(e)}
+        except Exception as e:
+            status, payload = 500, {"error": str(e)}
+
+        reply = to_json(payload)
+        writer.write(
+            (
+                "HTTP/1.1 %d %s\r\n" % (status, STATUS[status])
+                + "Content-Type: application/json\r\n"
+                + "Content-Length: %d\r\n" % len(reply)
+                + "Connection: close\r\n\r\n"
+            ).encode("latin-1")
+            + reply
+        )
+        await writer.drain()
+        writer.close()
+
+    def filtered(self, query):
+        """ returns the rows matching every filter in a query
+        :param query: The query parameters, any of pack, type, and name
+        :type query: Dictionary
+        :returns: The matching rows
+        :rtype: pandas DataFrame
+        """
+
+        data = self.tracker.data
+        if "pack" in query:
+            data = data[data["pack_id"] == int(query["pack"])]
+        if "type" in query:
+            data = data[data["pack_type"].str.match(query["type"])]
+        if "name" in query:
+            data = data[data["name"].str.match(query["name"])]
+
+        return data
+
+    async def getMeta(self, query, body):
+        return {
+            "curr_id": self.tracker.curr_id,
+            "curr_pack_id": self.tracker.curr_pack_id,
+            "version": self.tracker.version,
+        }
+
+    async def getRows(self, query, body):
+        rows = frame_rows(self.filtered(query))
+        return {"columns": COLUMNS, "rows": rows, "version": self.tracker.version}
+
+    async def getStats(self, query, body):
+        # clients poll the same filters over and over, so skip filtering too until the data changes
+        return self.tracker.cache.get(
+            ("stats", "query") + tuple(sorted(query.items())),
+            self.tracker.version,
+            lambda: self.tracker.calcStats(self.filtered(query)),
+        )
+
+    async def postPack(self, query, body):
+        data = [list(row) for row in body["data"]]
+        qs_price = int(body["qs_price"])
+        if body["pack_type"] not in PACKS:
+            raise ValueError("unknown pack type %s" % body["pack_type"])
+        if any(row[1] not in TYPES for row in data):
+            raise ValueError("unknown item type")
+        if validate_listing(data, qs_price) != 1:
+            raise ValueError("invalid listing")
+
+        # the versions are read around the write, other writes may land while it is flushed
+        previous = self.tracker.version
+        pack_id = self.tracker.postData(
+            data, qs_price, body["pack_type"], int(body["pack_price"])
+        )
+        rows = frame_rows(self.tracker.data.iloc[-len(data) :])
+        reply = {"pack_id": pack_id, "rows": rows, **(await self.getMeta(query, body))}
+        reply.update(previous=previous)
+        await self.backend.flushed()
+
+        return reply
+
+    async def postSale(self, query, body):
+        id = int(body["id"])
+
+        # the tracker checks the id and the price against the row's bin, as the GUI's sales are
+        previous = self.tracker.version
+        self.tracker.postSale(id, body["price"])
+        version = self.tracker.version
+        sold = self.tracker.data.at[id, "sold"]
+        await self.backend.flushed()
+
+        return {"id": id, "sold": sold, "previous": previous, "version": version}
+
+    async def postEdit(self, query, body):
+        id = int(body["id"])
+
+        previous = self.tracker.version
+        self.tracker.postEdit(id, body["data"])
+        version = self.tracker.version
+        row = frame_rows(self.tracker.data.loc[[id]])[0]
+        await self.backend.flushed()
+
+        return {"row": row, "previous": previous, "version": version}
+
+    async def postDelete(self, query, body):
+        ids = [int(id) for id in body["ids"]]
+        self.tracker.checkIds(ids)
+
+        previous = self.tracker.version
+        self.tracker.postBulkDeletion(ids)
+        version = self.tracker.version
+        await self.backend.flushed()
+
+        return {"deleted": len(ids), "previous": previous, "version": version}
+
+    async def postBulkEdit(self, query, body):
+        ids = [int(id) for id in body["ids"]]
+
+        previous = self.tracker.version
+        self.tracker.postBulkEdit(ids, body["column"], body["value"])
+        version = self.tracker.version
+        await self.backend.flushed()
+
+        return {"edited": len(ids), "previous": previous, "version": version}
+
+
+class RemoteBackend:
+    """ A PackTracker backend that reads and writes through a TrackerServer instead of the database.
+        Rows are inserted by opening packs w/ RemoteTracker.postData, as the server assigns the ids
+
+        __init__( self, url )
+        url - the address of the server, such as http://127.0.0.1:8765
+    """
+
+    def __init__(self, url):
+
+        self.url = url.rstrip("/")
+
+        # the version of the server's data the tracker's copy matches
+        self.synced = None
+
+    def request(self, method, path, payload=None):
+        """ sends one request to the server and decodes the reply
+        :param method: Either GET or POST
+        :type method: String
+        :param path: The path and query of the endpoint
+        :type path: String
+        :param payload: (Default None) The JSON body to send
+        :type payload: Dictionary or None
+        :returns: The decoded reply
+        :rtype: Dictionary
+        """
+
+        body = None if payload is None else to_json(payload)
+        request = urllib.request.Request(
+            self.url + path,
+            data=body,
+            method=method,
+            headers={"Content-Type": "application/json"},
+        )
+
+        try:
+            with urllib.request.urlopen(request) as reply:
+                return json.loads(reply.read())
+        except urllib.error.HTTPError as e:
+            raise ValueError(json.loads(e.read()).get("error", str(e)))
+
+    def fetchRows(self):
+        """ returns every row of the server's data w/o marking the copy synced, the caller does
+            once the rows are loaded
+        :returns: The rows in COLUMNS order, and the version of the data they are from
+        :rtype: Tuple of types (List of tuples, Integer)
+        """
+
+        reply = self.request("GET", "/rows")
+
+        return [tuple(row) for row in reply["rows"]], reply["version"]
+
+    def wrote(self, reply):
+        """ moves the synced version along w/ a write, when the write was the only change made to
+            the server's data since the copy was synced. Otherwise the copy stays behind
+        :param reply: The reply to the write
+        :type reply: Dictionary
+        :returns: The reply
+        :rtype: Dictionary
+        """
+
+        if reply["previous"] == self.synced:
+            self.synced = reply["version"]
+
+        return reply
+
+    def fetchAll(self):
+        rows, self.synced = self.fetchRows()
+        return rows
+
+    def updateSale(self, id, sale_price):
+        self.wrote(self.request("POST", "/sales", {"id": id, "price": sale_price}))
+
+    def updateSales(self, sales):
+        for id, sale_price in sales:
+            self.updateSale(id, sale_price)
+
+    def updateRow(self, id, data):
+        self.wrote(self.request("POST", "/edit", {"id": id, "data": list(data)}))
+
+    def deleteRows(self, ids):
+        self.wrote(self.request("POST", "/delete", {"ids": list(ids)}))
+
+    def updateRows(self, ids, column, value):
+        payload = {"ids": list(ids), "column": column, "value": value}
+        self.wrote(self.request("POST", "/bulk-edit", payload))
+
+
+class RemoteTracker(PackTracker):
+    """ A PackTracker whose data comes from, and whose changes go to, a TrackerServer. Writes made by
+        other clients reach it when changes and sync fetch the rows again
+
+        __init__( self, url )
+        url - the address of the server, such as http://127.0.0.1:8765
+    """
+
+    def __init__(self, url):
+
+        super().__init__(RemoteBackend(url))
+
+    def setCounters(self):
+        """ gets the next free row and pack ids from the server
+        :returns: None
+        :rtype: None
+        """
+
+        meta = self.backend.request("GET", "/meta")
+        self.curr_id = meta["curr_id"]
+        self.curr_pack_id = meta["curr_pack_id"]
+
+        return
+
+    def postData(self, data, qs_price, pack_type, pack_price):
+        """ opens a pack on the server, which assigns its row and pack ids (Override)
+        :param data: The 'meat' of the data to post
+        :type data: List( List( String, String, Integer, Integer ) )
+        :param qs_price: The quick sell price of the pack being posted
+        :type qs_price: Integer
+        :param pack_type: The type of pack the data was gotten from
+        :type pack_type: String
+        :param pack_price: The cost of the pack (This is a field as it may have been a free pack)
+        :type pack_price: Integer
+        :returns: The id of the new pack
+        :rtype: Integer
+        """
+
+        reply = self.backend.request(
+            "POST",
+            "/packs",
+            {
+                "data": data,
+                "qs_price": qs_price,
+                "pack_type": pack_type,
+                "pack_price": pack_price,
+            },
+        )
+
+        self.backend.wrote(reply)
+        self.appendRows([tuple(row) for row in reply["rows"]])
+        self.curr_id = reply["curr_id"]
+        self.curr_pack_id = reply["curr_pack_id"]
+
+        return reply["pack_id"]
+
+    def changes(self):
+        """ fetches every row again if the server's data changed since the copy was synced. Only
+            talks to the server, so it may run off the tk thread
+        :returns: The rows, their version, and the next free ids, or None if nothing changed
+        :rtype: Tuple or None
+        """
+
+        meta = self.backend.request("GET", "/meta")
+        if meta["version"] == self.backend.synced:
+            return None
+
+        rows, version = self.backend.fetchRows()
+
+        return rows, version, meta
+
+    def sync(self, changes):
+        """ loads rows fetched by changes in place of the data
+        :param changes: What changes returned
+        :type changes: Tuple
+        :returns: None
+        :rtype: None
+        """
+
+        rows, version, meta = changes
+
+        self.loadData(rows)
+        self.backend.synced = version
+        self.curr_id = meta["curr_id"]
+        self.curr_pack_id = meta["curr_pack_id"]
+
+        return
+
+
+def main():
+    """ loads the data once and serves it until interrupted
+    :returns: None
+    :rtype: None
+    """
+
+    parser = argparse.ArgumentParser(description="local pack tracking API server")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--pool", type=int, default=2, help="database connections to keep")
+    args = parser.parse_args()
+
+    backend = PooledBackend(ConnectionPool(connect, args.pool))
+    tracker = PackTracker(backend)
+    print("serving %d rows on http://%s:%d" % (len(tracker.data), args.host, args.port))
+
+    try:
+        asyncio.run(TrackerServer(tracker, backend).serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
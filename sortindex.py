@@ -0,0 +1,330 @@
+""" sortindex.py
+
+This file contains the sort orders the tracker keeps of its columns. The first sort by a column
+argsorts it once, after that the order is kept up to date as rows are appended, changed and deleted
+by merging the changed rows into it, so sorting any set of rows by that column is a mask over the
+cached order w/o sorting or copying the frame. Orders are stable, ties stay in table order, and
+missing values sort last, whether the sort is ascending or descending
+
+This file contains classes:
+    * SortIndex - Class for the cached sort order of each column
+
+This file contains methods:
+    Global Methods:
+        * sort_keys( column ) - returns the values of a column as an array numpy can sort
+        * merge( order, keys, positions, values ) - inserts rows into a sorted order
+        * descend( order, keys ) - returns a sorted order largest first, ties and missing values kept
+        * main( ) - run test function
+
+    Members of Class SortIndex:
+        * __init__( self, name ) - creates an index w/o any orders
+        * order( self, data, column ) - returns the positions of every row sorted by a column
+        * entry( self, data, column ) - returns the cached order of a column and its sorted keys
+        * sortRows( self, data, rows, column, descending ) - returns a set of rows sorted by a column
+        * sortPositions( self, data, positions, column, descending ) - sorts rows given by position
+        * append( self, data, start ) - merges rows appended from a position on into every order
+        * update( self, data, positions, columns ) - moves changed rows to their new place
+        * remove( self, positions ) - drops deleted rows and closes the gaps they leave
+        * clear( self ) - drops every order
+
+Created October 19th, 2026.
+"""
+
+import threading
+
+import numpy as np
+import pandas as pd
+
+import metrics
+
+# an update touching more than this fraction of the rows resorts the column instead
+REBUILD_FRACTION = 1 / 64
+
+
+def sort_keys(column):
+    """ returns the values of a column as an array numpy can sort and search, missing numbers become
+        nan so they sort last
+    :param column: The column
+    :type column: pandas Series
+    :returns: The keys
+    :rtype: numpy array
+    """
+
+    if column.dtype.kind in "iufb" or str(column.dtype) in ("Int64", "Float64"):
+        return column.to_numpy(dtype="float64", na_value=np.nan)
+
+    return column.to_numpy(dtype=object)
+
+
+def merge(order, keys, positions, values):
+    """ inserts rows into a sorted order where a stable sort would have put them
+    :param order: The positions of the rows, sorted
+    :type order: numpy array
+    :param keys: The sorted keys of those rows
+    :type keys: numpy array
+    :param positions: The positions of the rows to insert
+    :type positions: numpy array
+    :param values: Their keys
+    :type values: numpy array
+    :returns: The order and keys w/ the rows inserted
+    :rtype: Tuple of numpy arrays
+    """
+
+    # by key, then by position, like a stable sort of the whole column
+    by = np.argsort(positions, kind="stable")
+    by = by[np.argsort(values[by], kind="stable")]
+    positions, values = positions[by], values[by]
+
+    lo = np.searchsorted(keys, values, side="left")
+    at = np.searchsorted(keys, values, side="right")
+
+    # among equal keys the rows are in position order, so find each row's place in its run of ties
+    for i in np.flatnonzero(at > lo):
+        at[i] = lo[i] + np.searchsorted(order[lo[i] : at[i]], positions[i])
+
+    return np.insert(order, at, positions), np.insert(keys, at, values)
+
+
+def descend(order, keys):
+    """ turns an ascending order largest first. Runs of equal keys move as a block, so ties stay
+        in table order, and the missing values stay last
+    :param order: The positions of the rows, sorted ascending
+    :type order: numpy array
+    :param keys: The sorted keys of those rows
+    :type keys: numpy array
+    :returns: The positions, sorted descending
+    :rtype: numpy array
+    """
+
+    # nan sorts last, so the missing rows are the tail from the first nan on
+    present = len(keys)
+    if keys.dtype.kind == "f":
+        present = int(np.searchsorted(keys, np.nan, side="left"))
+
+    if present < 2:
+        return order.copy()
+
+    # number each run of equal keys, then stably sort the runs from the last one
+    runs = np.cumsum(np.concatenate(([False], keys[1:present] != keys[: present - 1])))
+    by = np.argsort(-runs, kind="stable")
+
+    return np.concatenate((order[:present][by], order[present:]))
+
+
+class SortIndex:
+    """ The stable sort order of each column sorted on so far, kept current as the data changes.
+        Positions are row positions in the data, not ids
+
+        __init__( self, name )
+        name - (Default "sort") the prefix of the hit, miss and rebuild counters in metrics
+    """
+
+    def __init__(self, name="sort"):
+
+        self.name = name
+        self.orders = {}
+        self.lock = threading.Lock()
+
+    def order(self, data, column):
+        """ returns the positions of every row sorted by a column, sorting it on the first call
+        :param data: The data, whose order is cached
+        :type data: pandas DataFrame
+        :param column: The column to sort by
+        :type column: String
+        :returns: The sorted positions
+        :rtype: numpy array
+        """
+
+        return self.entry(data, column)[0]
+
+    def entry(self, data, column):
+        """ returns the cached order of a column along w/ its keys in that order, sorting it on the
+            first call
+        :param data: The data, whose order is cached
+        :type data: pandas DataFrame
+        :param column: The column to sort by
+        :type column: String
+        :returns: The sorted positions and their keys
+        :rtype: Tuple of numpy arrays
+        """
+
+        with self.lock:
+            if column in self.orders:
+                metrics.count(self.name + ".hits")
+                return self.orders[column]
+
+            metrics.count(self.name + ".misses")
+            keys = sort_keys(data[column])
+            order = np.argsort(keys, kind="stable")
+            self.orders[column] = (order, keys[order])
+
+            return self.orders[column]
+
+    @metrics.timed("sortRows")
+    def sortRows(self, data, rows, column, descending=False):
+        """ returns a set of rows sorted by a column, picked out of the cached order of every row
+        :param data: The data
+        :type data: pandas DataFrame
+        :param rows: The ids of the rows to sort
+        :type rows: pandas Index
+        :param column: The column to sort by
+        :type column: String
+        :param descending: (Default False) Whether the largest values come first
+        :type descending: Boolean
+        :returns: The ids of the rows, sorted
+        :rtype: pandas Index
+        """
+
+        positions = None if len(rows) == len(data) else data.index.get_indexer(rows)
+
+        return data.index[self.sortPositions(data, positions, column, descending)]
+
+    def sortPositions(self, data, positions, column, descending=False):
+        """ returns the positions of a set of rows sorted by a column
+        :param data: The data
+        :type data: pandas DataFrame
+        :param positions: The positions of the rows to sort, None for every row
+        :type positions: numpy array or None
+        :param column: The column to sort by
+        :type column: String
+        :param descending: (Default False) Whether the largest values come first
+        :type descending: Boolean
+        :returns: The positions, sorted
+        :rtype: numpy array
+        """
+
+        order, keys = self.entry(data, column)
+
+        if positions is None:
+            chosen = order
+        else:
+            shown = np.zeros(len(data), dtype=bool)
+            shown[positions] = True
+            picked = shown[order]
+            chosen, keys = order[picked], keys[picked]
+
+        if descending:
+            chosen = descend(chosen, keys)
+
+        return chosen
+
+    def append(self, data, start):
+        """ merges rows appended to the data into every cached order
+        :param data: The data, after the rows were appended
+        :type data: pandas DataFrame
+        :param start: The position of the first appended row
+        :type start: Integer
+        :returns: None
+        :rtype: None
+        """
+
+        positions = np.arange(start, len(data))
+
+        with self.lock:
+            for column, (order, keys) in self.orders.items():
+                values = sort_keys(data[column].iloc[start:])
+                self.orders[column] = merge(order, keys, positions, values)
+
+        return
+
+    def update(self, data, positions, columns=None):
+        """ moves rows whose values changed to their new place in the orders of those columns
+        :param data: The data, after the change
+        :type data: pandas DataFrame
+        :param positions: The positions of the changed rows
+        :type positions: List of Integers
+        :param columns: (Default None) The columns that changed, None for every column
+        :type columns: List of Strings or None
+        :returns: None
+        :rtype: None
+        """
+
+        positions = np.asarray(positions, dtype=np.int64)
+
+        with self.lock:
+            for column in list(self.orders):
+                if columns is not None and column not in columns:
+                    continue
+
+                # moving many rows one at a time costs more than sorting again when next asked
+                if len(positions) > len(data) * REBUILD_FRACTION:
+                    del self.orders[column]
+                    metrics.count(self.name + ".rebuilds")
+                    continue
+
+                order, keys = self.orders[column]
+                kept = ~np.isin(order, positions)
+                values = sort_keys(data[column].iloc[positions])
+                self.orders[column] = merge(order[kept], keys[kept], positions, values)
+
+        return
+
+    def remove(self, positions):
+        """ drops deleted rows from every order, and shifts the positions after them down
+        :param positions: The positions the rows had before they were deleted
+        :type positions: List of Integers
+        :returns: None
+        :rtype: None
+        """
+
+        gone = np.unique(np.asarray(positions, dtype=np.int64))
+
+        with self.lock:
+            for column, (order, keys) in self.orders.items():
+                kept = ~np.isin(order, gone)
+                order = order[kept]
+                self.orders[column] = (order - np.searchsorted(gone, order), keys[kept])
+
+        return
+
+    def clear(self):
+        """ drops every order, they are sorted again when next asked for
+        :returns: None
+        :rtype: None
+        """
+
+        with self.lock:
+            self.orders = {}
+
+        return
+
+
+def main():
+    """ runs the test function, checking both directions keep ties in table order and missing
+        values last
+    :returns: None
+    :rtype: None
+    """
+
+    data = pd.DataFrame(
+        {
+            "sold": pd.array([300, None, 150, 300, None, 150, 1600], dtype="Int64"),
+            "name": ["ben", "emily", "cat", "ben", "tk", "cat", "ben"],
+        },
+        index=[10, 11, 12, 13, 14, 15, 16],
+    )
+    index = SortIndex()
+
+    assertions = [
+        ("sold", None, False, [2, 5, 0, 3, 6, 1, 4]),
+        ("sold", None, True, [6, 0, 3, 2, 5, 1, 4]),
+        ("sold", [0, 1, 2, 3, 5], True, [0, 3, 2, 5, 1]),
+        ("name", None, False, [0, 3, 6, 2, 5, 1, 4]),
+        ("name", None, True, [4, 1, 2, 5, 0, 3, 6]),
+        ("name", [3, 5, 6], True, [5, 3, 6]),
+    ]
+
+    for column, positions, descending, expected in assertions:
+        chosen = index.sortPositions(data, positions, column, descending)
+        assert list(chosen) == expected, (column, positions, descending, list(chosen))
+
+    # a merged row sorts among its ties by position in both directions
+    data.loc[17] = [300, "ben"]
+    index.append(data, 7)
+    assert list(index.sortRows(data, data.index, "sold", True)) == [16, 10, 13, 17, 12, 15, 11, 14]
+
+    print("all orders consistent")
+
+
+if __name__ == "__main__":
+    main()
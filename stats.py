@@ -1,12 +1,26 @@
 """ stats.py
 
 This file contains functions to calculate necessary statistical details from 
-pandas dataframes
+pandas dataframes. The kernels at the end compute the same stats straight from the numpy arrays
+of the pack_id, pack_price and sold columns, w/o building any intermediate frames
 
 This file contains functions:
     * total_cost( data ) - returns the total cost of all packs
     * total_revenue( data ) - returns the total revenue from player sales
     * net_profit( data ) - returns the net profit of the player
+    * avg_profit( data ) - returns the profit averaged over all packs
+    * first_rows( codes ) - returns the first row of each factorized group
+    * group_totals( codes, groups, columns ) - sums columns per group
+    * summarize( table ) - adds net profit, profit per pack, and sell through to grouped totals
+    * breakdown( data, top ) - returns profit broken down by pack, pack type, item type, and reward
+    * finish_breakdown( packs, by_item_type, top ) - returns the breakdowns of pack and item type totals
+    * arrays( data ) - returns the pack_id, pack_price, and sold arrays and the sold mask of a frame
+    * pack_starts( pack_id ) - returns the first row of every distinct pack
+    * cost_kernel( pack_id, pack_price ) - total_cost over arrays
+    * revenue_kernel( sold, mask ) - total_revenue over arrays
+    * net_kernel( pack_id, pack_price, sold, mask ) - net_profit over arrays
+    * avg_kernel( pack_id, pack_price, sold, mask ) - avg_profit over arrays
+    * stats_kernel( pack_id, pack_price, sold, mask ) - all four over arrays, deduplicating once
     * test( data, assertions ) - tests the values returned by the functions above
     * main( ) - run test function
 
@@ -59,12 +73,271 @@ def avg_profit(data):
     :rtype: Float
     """
 
-    try:
-        avg = round(net_profit(data) / len(data.drop_duplicates("pack_id")), 2)
-        return avg
-    except ZeroDivisionError:
+    # numpy integers divide by zero to nan rather than raising, so check for no packs first
+    packs = len(data.drop_duplicates("pack_id"))
+    if packs == 0:
         return 0
 
+    return round(net_profit(data) / packs, 2)
+
+
+def first_rows(codes):
+    """ returns the position of the first row of each group, given codes numbered in order of
+        first appearance the way pandas factorize numbers them
+    :param codes: The group code of every row
+    :type codes: numpy array of Integers
+    :returns: The first position of group 0, 1, 2, ...
+    :rtype: numpy array of Integers
+    """
+
+    # a group starts wherever the running max of the codes goes up
+    return np.flatnonzero(np.diff(np.maximum.accumulate(codes), prepend=-1) > 0)
+
+
+def group_totals(codes, groups, columns):
+    """ sums several columns per group w/ one bincount each
+    :param codes: The group code of every row
+    :type codes: numpy array of Integers
+    :param groups: The number of groups
+    :type groups: Integer
+    :param columns: The values to sum, by name
+    :type columns: Dictionary of numpy arrays
+    :returns: The totals, one row per group code
+    :rtype: pandas DataFrame
+    """
+
+    return pd.DataFrame(
+        {
+            name: np.rint(np.bincount(codes, weights=values, minlength=groups)).astype(np.int64)
+            for name, values in columns.items()
+        }
+    )
+
+
+def summarize(table):
+    """ adds the net profit, profit per pack, and sell through of grouped pack totals
+    :param table: Totals w/ packs, items, sold, cost, and revenue columns
+    :type table: pandas DataFrame
+    :returns: The same table w/ net, profit_per_pack, and sell_through columns
+    :rtype: pandas DataFrame
+    """
+
+    table["net"] = table["revenue"] - table["cost"]
+    table["profit_per_pack"] = (table["net"] / table["packs"].where(table["packs"] > 0)).round(2)
+    table["sell_through"] = (table["sold"] / table["items"].where(table["items"] > 0)).round(4)
+
+    return table
+
+
+def breakdown(data, top=5):
+    """ breaks profit down by pack, pack type, item type, and reward vs paid packs in one pass.
+        Packs and item types are factorized once, and every total is a bincount over the codes,
+        so no groupby runs and the cost stays linear at millions of rows
+    :param data: The data from which to calculate the breakdown
+    :type data: pandas DataFrame
+    :param top: (Default 5) How many of the best and worst packs to return
+    :type top: Integer
+    :returns: DataFrames keyed packs, best, worst, pack_type, item_type, and reward
+    :rtype: Dictionary
+    """
+
+    sold = data["sold"].to_numpy(dtype="float64", na_value=np.nan)
+    is_sold = ~np.isnan(sold)
+    revenue = np.where(is_sold, sold, 0.0)
+
+    # one code per pack, and the row each pack's price and type are read from
+    pack_codes, pack_ids = pd.factorize(data["pack_id"], sort=False)
+    first = first_rows(pack_codes)
+    packs = group_totals(
+        pack_codes,
+        len(pack_ids),
+        {"items": np.ones(len(data)), "sold": is_sold, "revenue": revenue},
+    )
+    packs.index = pd.Index(pack_ids, name="pack_id")
+    packs.insert(0, "pack_type", data["pack_type"].to_numpy()[first])
+    packs["cost"] = data["pack_price"].to_numpy()[first].astype(np.int64)
+
+    item_codes, item_types = pd.factorize(data["type"], sort=False)
+    by_item_type = group_totals(
+        item_codes,
+        len(item_types),
+        {"items": np.ones(len(data)), "sold": is_sold, "revenue": revenue},
+    )
+    by_item_type.index = pd.Index(item_types, name="type")
+
+    return finish_breakdown(packs, by_item_type, top)
+
+
+def finish_breakdown(packs, by_item_type, top=5):
+    """ builds every breakdown from the totals of each pack and each item type, so totals computed
+        elsewhere, such as merged from partitions, break down the same way
+    :param packs: The pack_type, items, sold, revenue, and cost of each pack, indexed by pack id
+    :type packs: pandas DataFrame
+    :param by_item_type: The items, sold, and revenue of each item type, indexed by type
+    :type by_item_type: pandas DataFrame
+    :param top: (Default 5) How many of the best and worst packs to return
+    :type top: Integer
+    :returns: DataFrames keyed packs, best, worst, pack_type, item_type, and reward
+    :rtype: Dictionary
+    """
+
+    packs["net"] = packs["revenue"] - packs["cost"]
+
+    # reward packs cost nothing, so their stored price is at most zero once quick sell is taken off
+    per_pack = {
+        "packs": np.ones(len(packs)),
+        "items": packs["items"].to_numpy(),
+        "sold": packs["sold"].to_numpy(),
+        "cost": packs["cost"].to_numpy(),
+        "revenue": packs["revenue"].to_numpy(),
+    }
+
+    type_codes, pack_types = pd.factorize(packs["pack_type"], sort=False)
+    by_pack_type = summarize(group_totals(type_codes, len(pack_types), per_pack))
+    by_pack_type.index = pd.Index(pack_types, name="pack_type")
+
+    reward_codes = (packs["cost"].to_numpy() <= 0).astype(np.int64)
+    by_reward = summarize(group_totals(reward_codes, 2, per_pack))
+    by_reward.index = pd.Index(["paid", "reward"], name="pack")
+
+    by_item_type["sell_through"] = (by_item_type["sold"] / by_item_type["items"]).round(4)
+    by_item_type["revenue_per_item"] = (by_item_type["revenue"] / by_item_type["items"]).round(2)
+
+    # only the top k are sorted, the rest are partitioned away
+    net = packs["net"].to_numpy()
+    k = min(top, len(packs))
+    if k == 0:
+        best = worst = packs.iloc[:0]
+    else:
+        best = packs.iloc[np.argpartition(-net, k - 1)[:k]].sort_values("net", ascending=False)
+        worst = packs.iloc[np.argpartition(net, k - 1)[:k]].sort_values("net")
+
+    return {
+        "packs": packs,
+        "best": best,
+        "worst": worst,
+        "pack_type": by_pack_type,
+        "item_type": by_item_type,
+        "reward": by_reward,
+    }
+
+
+def arrays(data):
+    """ returns the columns the kernels need as plain numpy arrays. Unsold rows are 0 in sold and
+        False in the mask, so nothing downstream has to deal w/ the nullable Int64 type
+    :param data: The data to take the columns from
+    :type data: pandas DataFrame or rowview RowView
+    :returns: The pack_id, pack_price, and sold arrays, and whether each row sold
+    :rtype: Tuple of numpy arrays
+    """
+
+    # a frame gives series and a RowView gives arrays, both turn into numpy arrays w/o a copy
+    sold = data["sold"]
+    if isinstance(sold.dtype, pd.api.extensions.ExtensionDtype):
+        mask = ~np.asarray(sold.isna())
+        sold = sold.to_numpy(dtype=np.int64, na_value=0)
+    else:
+        sold = np.asarray(sold)
+        mask = ~np.isnan(sold) if sold.dtype.kind == "f" else np.ones(len(sold), dtype=bool)
+        sold = np.where(mask, sold, 0).astype(np.int64)
+
+    return np.asarray(data["pack_id"]), np.asarray(data["pack_price"]), sold, mask
+
+
+def pack_starts(pack_id):
+    """ returns the position of the first row of every distinct pack, in the order drop_duplicates
+        keeps them. Rows are almost always in pack order, which needs one pass instead of a hash
+    :param pack_id: The pack id of every row
+    :type pack_id: numpy array of Integers
+    :returns: The position of the first row of each pack
+    :rtype: numpy array of Integers
+    """
+
+    if len(pack_id) < 2 or (pack_id[1:] >= pack_id[:-1]).all():
+        return np.flatnonzero(np.diff(pack_id, prepend=pack_id[:1] - 1) != 0)
+
+    # pack ids are dense, so the first row of each can be scattered into a table spanning them
+    low = pack_id.min()
+    span = int(pack_id.max() - low) + 1
+    if span <= 4 * len(pack_id):
+        first = np.full(span, len(pack_id))
+        np.minimum.at(first, pack_id - low, np.arange(len(pack_id)))
+        first = first[first < len(pack_id)]
+    else:
+        # the stable sort makes unique report the first occurrence of each id
+        _, first = np.unique(pack_id, return_index=True)
+    first.sort()
+
+    return first
+
+
+def cost_kernel(pack_id, pack_price):
+    """ returns the total of the pack prices of every distinct pack, the same as total_cost
+    :param pack_id: The pack id of every row
+    :type pack_id: numpy array of Integers
+    :param pack_price: The pack price of every row
+    :type pack_price: numpy array of Integers
+    :returns: The total cost
+    :rtype: numpy int64
+    """
+
+    return pack_price[pack_starts(pack_id)].sum()
+
+
+def revenue_kernel(sold, mask):
+    """ returns the total of the sale prices of the sold rows, the same as total_revenue
+    :param sold: The sale price of every row, 0 where unsold
+    :type sold: numpy array of Integers
+    :param mask: Whether each row sold
+    :type mask: numpy array of Booleans
+    :returns: The total revenue
+    :rtype: numpy int64
+    """
+
+    return np.sum(sold, where=mask)
+
+
+def net_kernel(pack_id, pack_price, sold, mask):
+    """ returns the revenue minus the cost, the same as net_profit
+    :returns: The net profit
+    :rtype: numpy int64
+    """
+
+    return revenue_kernel(sold, mask) - cost_kernel(pack_id, pack_price)
+
+
+def avg_kernel(pack_id, pack_price, sold, mask):
+    """ returns the net profit per distinct pack, the same as avg_profit
+    :returns: The average per pack profit, 0 when there are no packs
+    :rtype: numpy float64 or Integer
+    """
+
+    return stats_kernel(pack_id, pack_price, sold, mask)[3]
+
+
+def stats_kernel(pack_id, pack_price, sold, mask):
+    """ returns the total cost, total revenue, net profit, and average profit at once, finding the
+        distinct packs only once
+    :param pack_id: The pack id of every row
+    :type pack_id: numpy array of Integers
+    :param pack_price: The pack price of every row
+    :type pack_price: numpy array of Integers
+    :param sold: The sale price of every row, 0 where unsold
+    :type sold: numpy array of Integers
+    :param mask: Whether each row sold
+    :type mask: numpy array of Booleans
+    :returns: The cost, revenue, net, and average profit
+    :rtype: Tuple
+    """
+
+    starts = pack_starts(pack_id)
+    cost = pack_price[starts].sum()
+    revenue = revenue_kernel(sold, mask)
+    net = revenue - cost
+    avg = round(net / len(starts), 2) if len(starts) else 0
+
+    return cost, revenue, net, avg
+
 
 def test(data, assertions):
     """ tests the stat gathering functions from this file
@@ -91,6 +364,35 @@ def test(data, assertions):
     true_val = assertions["avg_profit"]
     assert func_ret == true_val, "unexpected total %d, not %d" % (func_ret, true_val)
 
+    # the kernels must agree w/ the frame functions exactly, in table order and shuffled
+    for frame in [data, data.iloc[::-1], data.iloc[:0]]:
+        func_ret = stats_kernel(*arrays(frame))
+        true_val = (total_cost(frame), total_revenue(frame), net_profit(frame), avg_profit(frame))
+        assert func_ret == true_val, "unexpected kernel stats %s, not %s" % (func_ret, true_val)
+
+    parts = breakdown(data, top=1)
+
+    for key in ["pack_type", "reward"]:
+        func_ret = parts[key]["net"].sum()
+        true_val = assertions["net_profit"]
+        assert func_ret == true_val, "unexpected %s net %d, not %d" % (key, func_ret, true_val)
+
+    for pack_type, true_val in assertions["pack_type_net"].items():
+        func_ret = parts["pack_type"].loc[pack_type, "net"]
+        assert func_ret == true_val, "unexpected %s net %d, not %d" % (pack_type, func_ret, true_val)
+
+    func_ret = parts["item_type"].loc["player", "revenue"]
+    true_val = assertions["player_revenue"]
+    assert func_ret == true_val, "unexpected player revenue %d, not %d" % (func_ret, true_val)
+
+    func_ret = parts["item_type"]["sold"].sum() / len(data)
+    true_val = assertions["sell_through"]
+    assert func_ret == true_val, "unexpected sell through %f, not %f" % (func_ret, true_val)
+
+    func_ret = (parts["best"].index[0], parts["worst"].index[0])
+    true_val = assertions["best_worst"]
+    assert func_ret == true_val, "unexpected best and worst packs %s, not %s" % (func_ret, true_val)
+
     print("all values consistent")
 
 
@@ -133,6 +435,10 @@ def main():
         "total_revenue": 2250,
         "net_profit": -4692,
         "avg_profit": -670.29,
+        "pack_type_net": {"bronze": -842, "silver": -4600, "gold": -300, "bronze r": 1050},
+        "player_revenue": 2250,
+        "sell_through": 0.4,
+        "best_worst": (6, 4),
     }
 
     test(data, assertions)
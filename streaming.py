@@ -0,0 +1,257 @@
+""" streaming.py
+
+This file contains the out of core stats of the whole pack history. Rather than loading the table
+into a DataFrame, rows are read a chunk at a time, from the database w/ fetchmany or from a
+transfer file, and each chunk is folded into a PartialStats. Partials are mergeable: two partials of
+consecutive stretches of rows merge into the partial of both, so memory stays the size of one
+chunk however long the history is.
+
+Rows must arrive in pack order, so a pack split across a chunk boundary is the last pack of one
+partial and the first pack of the next. Merging the two counts its price once, keeping the price of
+its first row the way stats.total_cost does
+
+This file contains classes:
+    * PartialStats - Class for the mergeable totals of a stretch of pack ordered rows
+
+This file contains methods:
+    Global Methods:
+        * cursor_chunks( cursor, table, chunksize ) - yields the kernel arrays of the table a chunk at a time
+        * file_chunks( path, fmt, chunksize ) - yields the kernel arrays of a transfer file a chunk at a time
+        * stream_stats( chunks ) - folds chunks into one partial
+        * main( ) - command line entry point
+
+    Members of Class PartialStats:
+        * __init__( self ) - creates the partial of no rows
+        * fold( cls, pack_id, pack_price, sold, mask ) - returns the partial of one chunk
+        * merge( self, other ) - returns the partial of this stretch followed by another
+        * result( self ) - returns the cost, revenue, net, and average profit
+        * summary( self ) - returns the totals as a dictionary
+
+Created October 19th, 2026.
+"""
+
+import argparse
+
+import numpy as np
+
+import stats
+from config import TABLE
+
+CHUNKSIZE = 50000
+
+
+class PartialStats:
+    """ The totals of a stretch of rows in pack order, and the packs at either end of it so a pack
+        split w/ the next stretch is only counted once
+
+        __init__( self )
+    """
+
+    def __init__(self):
+
+        self.rows = 0
+        self.sold = 0
+        self.revenue = 0
+        self.cost = 0
+        self.packs = 0
+
+        # the first and last pack of the stretch, and the price counted for the first
+        self.first = None
+        self.first_price = 0
+        self.last = None
+
+    @classmethod
+    def fold(cls, pack_id, pack_price, sold, mask):
+        """ returns the partial of one chunk
+        :param pack_id: The pack id of every row, in pack order
+        :type pack_id: numpy array of Integers
+        :param pack_price: The pack price of every row
+        :type pack_price: numpy array of Integers
+        :param sold: The sale price of every row, 0 where unsold
+        :type sold: numpy array of Integers
+        :param mask: Whether each row sold
+        :type mask: numpy array of Booleans
+        :returns: The partial
+        :rtype: PartialStats
+        """
+
+        partial = cls()
+        if len(pack_id) == 0:
+            return partial
+
+        if (pack_id[1:] < pack_id[:-1]).any():
+            raise ValueError("rows are not in pack order")
+
+        starts = stats.pack_starts(pack_id)
+
+        partial.rows = len(pack_id)
+        partial.sold = int(mask.sum())
+        partial.revenue = int(stats.revenue_kernel(sold, mask))
+        partial.cost = int(pack_price[starts].sum())
+        partial.packs = len(starts)
+        partial.first = int(pack_id[0])
+        partial.first_price = int(pack_price[0])
+        partial.last = int(pack_id[-1])
+
+        return partial
+
+    def merge(self, other):
+        """ returns the partial of this stretch of rows followed by another
+        :param other: The partial of the rows right after this one
+        :type other: PartialStats
+        :returns: The merged partial
+        :rtype: PartialStats
+        """
+
+        if self.first is None:
+            return other
+        if other.first is None:
+            return self
+
+        if other.first < self.last:
+            raise ValueError(
+                "pack %d comes after pack %d, rows are not in pack order" % (other.first, self.last)
+            )
+
+        merged = PartialStats()
+        merged.rows = self.rows + other.rows
+        merged.sold = self.sold + other.sold
+        merged.revenue = self.revenue + other.revenue
+        merged.cost = self.cost + other.cost
+        merged.packs = self.packs + other.packs
+        merged.first = self.first
+        merged.first_price = self.first_price
+        merged.last = other.last
+
+        # the pack straddles the boundary, only the price of its first row counts
+        if other.first == self.last:
+            merged.cost -= other.first_price
+            merged.packs -= 1
+
+        return merged
+
+    def result(self):
+        """ returns the stats of every row folded in, the same as stats.stats_kernel over them all
+        :returns: The cost, revenue, net, and average profit
+        :rtype: Tuple
+        """
+
+        net = self.revenue - self.cost
+        avg = round(net / self.packs, 2) if self.packs else 0
+
+        return self.cost, self.revenue, net, avg
+
+    def summary(self):
+        """ returns the totals and stats as a dictionary
+        :returns: The rows, packs, sold rows, cost, revenue, net, and average profit
+        :rtype: Dictionary
+        """
+
+        cost, revenue, net, avg = self.result()
+
+        return {
+            "rows": self.rows,
+            "packs": self.packs,
+            "sold": self.sold,
+            "cost": cost,
+            "revenue": revenue,
+            "net": net,
+            "avg": float(avg),
+        }
+
+
+def cursor_chunks(cursor, table=TABLE, chunksize=CHUNKSIZE):
+    """ yields the kernel arrays of the pack table a fetchmany at a time, in pack order
+    :param cursor: A cursor connected to the database
+    :type cursor: pyodbc cursor
+    :param table: (Default TABLE) The pack table
+    :type table: String
+    :param chunksize: (Default CHUNKSIZE) The number of rows fetched at a time
+    :type chunksize: Integer
+    :returns: A generator of ( pack_id, pack_price, sold, mask ) arrays
+    :rtype: Generator of tuples
+    """
+
+    # within a pack, id order makes the first row the same one drop_duplicates would keep
+    cursor.execute("SELECT pack_id, pack_price, sold FROM " + table + " ORDER BY pack_id, id")
+
+    while True:
+        rows = cursor.fetchmany(chunksize)
+        if not rows:
+            return
+
+        pack_id, pack_price, sold = zip(*rows)
+        mask = np.fromiter((value is not None for value in sold), dtype=bool, count=len(rows))
+        yield (
+            np.fromiter(pack_id, dtype=np.int64, count=len(rows)),
+            np.fromiter(pack_price, dtype=np.int64, count=len(rows)),
+            np.fromiter((value or 0 for value in sold), dtype=np.int64, count=len(rows)),
+            mask,
+        )
+
+
+def file_chunks(path, fmt=None, chunksize=CHUNKSIZE):
+    """ yields the kernel arrays of a transfer file a chunk at a time. Exported files are in id
+        order, which is pack order unless rows were since edited into an earlier pack
+    :param path: The file to read
+    :type path: String
+    :param fmt: (Default None) Either "csv" or "jsonl", None guesses from the extension
+    :type fmt: String or None
+    :param chunksize: (Default CHUNKSIZE) The number of rows per chunk
+    :type chunksize: Integer
+    :returns: A generator of ( pack_id, pack_price, sold, mask ) arrays
+    :rtype: Generator of tuples
+    """
+
+    import transfer
+
+    for chunk in transfer.read_chunks(path, fmt, chunksize, ["pack_id", "pack_price", "sold"]):
+        chunk = chunk.astype({"pack_id": "int64", "pack_price": "int64", "sold": "Int64"})
+        yield stats.arrays(chunk)
+
+
+def stream_stats(chunks):
+    """ folds chunks of rows in pack order into one partial
+    :param chunks: The kernel arrays of each chunk, such as cursor_chunks yields
+    :type chunks: Iterable of tuples
+    :returns: The partial of every row
+    :rtype: PartialStats
+    """
+
+    total = PartialStats()
+    for chunk in chunks:
+        total = total.merge(PartialStats.fold(*chunk))
+
+    return total
+
+
+def main():
+    """ prints the stats of the whole history w/o loading it, from the database or a file
+    :returns: None
+    :rtype: None
+    """
+
+    parser = argparse.ArgumentParser(description="stats of the whole pack history, out of core")
+    parser.add_argument("--file", help="a transfer file to read instead of the database")
+    parser.add_argument("--format", choices=["csv", "jsonl"], default=None)
+    parser.add_argument("--chunksize", type=int, default=CHUNKSIZE)
+    args = parser.parse_args()
+
+    if args.file is not None:
+        chunks = file_chunks(args.file, args.format, args.chunksize)
+    else:
+        from tracker import connect
+
+        chunks = cursor_chunks(connect().cursor(), chunksize=args.chunksize)
+
+    try:
+        total = stream_stats(chunks)
+    except ValueError as e:
+        parser.error(str(e))
+
+    for key, value in total.summary().items():
+        print("%-8s %s" % (key, value))
+
+
+if __name__ == "__main__":
+    main()
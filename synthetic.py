@@ -0,0 +1,352 @@
+""" synthetic.py
+
+This file contains a deterministic generator of realistic pack history for load testing. Packs are
+drawn from the real PACKS price table and TYPES list, w/ per tier listing counts, quick sell offsets,
+bid and bin distributions, sell through rates, and a skewed pool of player names. The same seed
+always gives the same rows, generated a block of BLOCK_PACKS packs at a time so millions of rows
+never need to be held at once. Rows can be written to a frame, a storage backend, or a transfer file
+
+This file contains functions:
+    * tier( pack_type ) - returns the tier of a pack type
+    * name_pool( size, seed ) - returns a list of distinct valid player names
+    * generate_block( rng, packs, start_id, start_pack_id, pool ) - returns one block of rows
+    * iter_blocks( packs, seed, start_id, start_pack_id, names ) - yields the rows a block at a time
+    * generate_frame( packs, seed, start_id, start_pack_id, names ) - returns rows in the tracker layout
+    * write_backend( backend, packs, seed, start_id, start_pack_id, names ) - inserts rows into a backend
+    * write_file( path, packs, seed, fmt, names ) - writes rows to a CSV or JSONL transfer file
+    * main( ) - command line entry point
+
+Created October 19th, 2026.
+"""
+
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from config import COLUMNS, PACKS, TYPES
+
+# packs are generated in blocks of this many, each from its own seeded generator
+BLOCK_PACKS = 10000
+
+# how often each pack is opened, and how often it was a free reward pack
+PACK_WEIGHTS = {
+    "bronze": 0.30,
+    "bronze r": 0.08,
+    "silver": 0.22,
+    "silver r": 0.07,
+    "gold": 0.26,
+    "gold r": 0.07,
+}
+REWARD_RATE = 0.06
+
+# a pack holds 12 items, on average this many are worth listing and the rest are quick sold
+LISTED_MEAN = {"bronze": 3.0, "silver": 3.5, "gold": 4.0}
+PACK_SIZE = 12
+
+# quick sell value of each unlisted item, low and high
+QUICK_SELL = {"bronze": (5, 40), "silver": (30, 120), "gold": (100, 500)}
+
+# median buy now price of a listed item
+MEDIAN_BIN = {"bronze": 350, "silver": 650, "gold": 1400}
+
+# share of the listed items of each type
+TYPE_WEIGHTS = {
+    "player": 0.55,
+    "healing": 0.05,
+    "fitness": 0.08,
+    "contract": 0.12,
+    "kit": 0.06,
+    "stadia": 0.03,
+    "badge": 0.05,
+    "manager": 0.03,
+    "coach": 0.03,
+}
+
+# share of listed items that sell, and of the sales that went for the full buy now price
+SELL_RATE = {"player": 0.55, "other": 0.70}
+BIN_RATE = 0.40
+
+# distinct player names, and how strongly the popular ones repeat, the name of rank r is drawn
+# w/ weight 1 / r ** NAME_SKEW
+NAMES = 5000
+NAME_SKEW = 1.0
+
+SYLLABLES = [
+    "al", "an", "ba", "ben", "bo", "ca", "da", "de", "di", "el", "fa", "fer", "ga", "gi", "ha",
+    "is", "ja", "jo", "ka", "ki", "la", "le", "lo", "ma", "mi", "mo", "na", "ni", "no", "pa",
+    "pe", "ra", "re", "ri", "ro", "sa", "se", "si", "ta", "te", "ti", "to", "va", "vi", "za",
+]
+
+
+def tier(pack_type):
+    """ returns the tier of a pack type, such as gold for gold r """
+    return pack_type.split(" ")[0]
+
+
+def name_pool(size=NAMES, seed=0):
+    """ returns distinct player names built from syllables, all of which pass string_validator
+    :param size: (Default NAMES) The number of names
+    :type size: Integer
+    :param seed: (Default 0) The seed of the names
+    :type seed: Integer
+    :returns: The names, most popular first
+    :rtype: List of Strings
+    """
+
+    rng = np.random.default_rng([seed, 0xA11CE])
+
+    names = []
+    seen = set()
+    while len(names) < size:
+        parts = rng.choice(SYLLABLES, size=rng.integers(2, 5))
+        name = "".join(parts)
+
+        # a few names carry an apostrophe or a suffix, as real ones do
+        roll = rng.random()
+        if roll < 0.05:
+            name = "o'" + name
+        elif roll < 0.08:
+            name = name + " jr."
+
+        if name not in seen and len(name) <= 24:
+            seen.add(name)
+            names.append(name)
+
+    return names
+
+
+def generate_block(rng, packs, start_id, start_pack_id, pool):
+    """ generates the rows of a block of packs w/ vectorized draws
+    :param rng: The generator of this block
+    :type rng: numpy Generator
+    :param packs: The number of packs in the block
+    :type packs: Integer
+    :param start_id: The id of the first row
+    :type start_id: Integer
+    :param start_pack_id: The id of the first pack
+    :type start_pack_id: Integer
+    :param pool: The player names, most popular first, as an object array
+    :type pool: numpy ndarray
+    :returns: The rows in COLUMNS order, sold is missing for unsold items
+    :rtype: pandas DataFrame
+    """
+
+    names = list(PACK_WEIGHTS)
+    tiers = np.array([tier(name) for name in names], dtype=object)
+
+    # one draw per pack
+    kind = rng.choice(len(names), size=packs, p=list(PACK_WEIGHTS.values()))
+    pack_tier = tiers[kind]
+    listed_mean = np.array([LISTED_MEAN[t] for t in tiers])[kind]
+    listed = np.clip(1 + rng.poisson(listed_mean - 1), 1, PACK_SIZE)
+
+    qs_low = np.array([QUICK_SELL[t][0] for t in tiers])[kind]
+    qs_high = np.array([QUICK_SELL[t][1] for t in tiers])[kind]
+    quick_sell = rng.integers(qs_low, qs_high + 1) * (PACK_SIZE - listed)
+
+    price = np.array([PACKS[name] for name in names])[kind]
+    price = np.where(rng.random(packs) < REWARD_RATE, 0, price)
+
+    # one draw per listed item
+    pack = np.repeat(np.arange(packs), listed)
+    rows = len(pack)
+
+    item_type = rng.choice(len(TYPES), size=rows, p=[TYPE_WEIGHTS[t] for t in TYPES])
+    is_player = item_type == TYPES.index("player")
+
+    median = np.array([MEDIAN_BIN[t] for t in tiers])[kind][pack]
+    spread = np.where(is_player, 0.8, 0.4)
+    bin_price = median * np.exp(rng.normal(0, spread))
+    step = np.where(bin_price < 1000, 50, 100)
+    bin_price = np.maximum(np.round(bin_price / step) * step, 200).astype(np.int64)
+
+    bid = np.floor(bin_price * rng.uniform(0.5, 0.95, rows) / 50) * 50
+    bid = np.minimum(np.maximum(bid, 150), bin_price).astype(np.int64)
+
+    sell_rate = np.where(is_player, SELL_RATE["player"], SELL_RATE["other"])
+    sold = rng.random(rows) < sell_rate
+    at_bin = rng.random(rows) < BIN_RATE
+    between = bid + np.round(rng.random(rows) * (bin_price - bid) / 50) * 50
+    sale = np.where(at_bin, bin_price, np.minimum(between, bin_price)).astype(np.int64)
+
+    popularity = 1 / np.arange(1, len(pool) + 1) ** NAME_SKEW
+    name = np.where(
+        is_player,
+        pool[rng.choice(len(pool), size=rows, p=popularity / popularity.sum())],
+        pack_tier[pack] + " " + np.array(TYPES, dtype=object)[item_type],
+    )
+
+    block = pd.DataFrame(
+        {
+            "id": np.arange(start_id, start_id + rows, dtype=np.int64),
+            "pack_id": start_pack_id + pack.astype(np.int64),
+            "pack_price": (price - quick_sell)[pack].astype(np.int64),
+            "pack_type": np.array(names, dtype=object)[kind][pack],
+            "name": name,
+            "type": np.array(TYPES, dtype=object)[item_type],
+            "bid": bid,
+            "bin": bin_price,
+            "sold": pd.arrays.IntegerArray(sale, ~sold),
+        }
+    )
+
+    return block[COLUMNS]
+
+
+def iter_blocks(packs, seed=0, start_id=1, start_pack_id=1, names=NAMES):
+    """ yields the rows of a synthetic history a block at a time. Block i is always drawn from
+        the generator seeded w/ ( seed, i ), so the rows only depend on the seed
+    :param packs: The number of packs to generate
+    :type packs: Integer
+    :param seed: (Default 0) The seed of the history
+    :type seed: Integer
+    :param start_id: (Default 1) The id of the first row
+    :type start_id: Integer
+    :param start_pack_id: (Default 1) The id of the first pack
+    :type start_pack_id: Integer
+    :param names: (Default NAMES) The number of distinct player names
+    :type names: Integer
+    :returns: A generator of blocks in COLUMNS order
+    :rtype: Generator of pandas DataFrames
+    """
+
+    pool = np.array(name_pool(names, seed), dtype=object)
+
+    for block, first in enumerate(range(0, packs, BLOCK_PACKS)):
+        rng = np.random.default_rng([seed, block])
+        rows = generate_block(
+            rng, min(BLOCK_PACKS, packs - first), start_id, start_pack_id + first, pool
+        )
+        start_id += len(rows)
+        yield rows
+
+
+def generate_frame(packs, seed=0, start_id=1, start_pack_id=1, names=NAMES):
+    """ returns a synthetic history laid out like PackTracker.data
+    :param packs: The number of packs to generate
+    :type packs: Integer
+    :param seed: (Default 0) The seed of the history
+    :type seed: Integer
+    :param start_id: (Default 1) The id of the first row
+    :type start_id: Integer
+    :param start_pack_id: (Default 1) The id of the first pack
+    :type start_pack_id: Integer
+    :param names: (Default NAMES) The number of distinct player names
+    :type names: Integer
+    :returns: The rows, indexed by id
+    :rtype: pandas DataFrame
+    """
+
+    blocks = list(iter_blocks(packs, seed, start_id, start_pack_id, names))
+    if not blocks:
+        blocks = [pd.DataFrame({col: [] for col in COLUMNS})]
+
+    data = pd.concat(blocks, ignore_index=True).set_index("id")
+    data[["sold"]] = data[["sold"]].astype("Int64")
+
+    return data
+
+
+def write_backend(backend, packs, seed=0, start_id=1, start_pack_id=1, names=NAMES):
+    """ inserts a synthetic history into a storage backend, a block per insert and sales batch
+    :param backend: The storage to write to, such as a SQLBackend
+    :type backend: Backend
+    :param packs: The number of packs to generate
+    :type packs: Integer
+    :param seed: (Default 0) The seed of the history
+    :type seed: Integer
+    :param start_id: (Default 1) The id of the first row, past any id already stored
+    :type start_id: Integer
+    :param start_pack_id: (Default 1) The id of the first pack, past any pack already stored
+    :type start_pack_id: Integer
+    :param names: (Default NAMES) The number of distinct player names
+    :type names: Integer
+    :returns: The number of rows written
+    :rtype: Integer
+    """
+
+    written = 0
+    for block in iter_blocks(packs, seed, start_id, start_pack_id, names):
+        # plain python values, which every DB-API driver accepts
+        columns = [block[col].tolist() for col in COLUMNS[:-1]]
+        backend.insertRows(list(zip(*columns)))
+
+        sold = block[block["sold"].notna()]
+        backend.updateSales(list(zip(sold["id"].tolist(), sold["sold"].astype(int).tolist())))
+
+        written += len(block)
+
+    return written
+
+
+def write_file(path, packs, seed=0, fmt=None, names=NAMES):
+    """ writes a synthetic history to a transfer file that transfer.py can import
+    :param path: The file to write
+    :type path: String
+    :param packs: The number of packs to generate
+    :type packs: Integer
+    :param seed: (Default 0) The seed of the history
+    :type seed: Integer
+    :param fmt: (Default None) Either "csv" or "jsonl", None guesses from the extension
+    :type fmt: String or None
+    :param names: (Default NAMES) The number of distinct player names
+    :type names: Integer
+    :returns: The number of rows written
+    :rtype: Integer
+    """
+
+    from transfer import file_format
+
+    fmt = file_format(path, fmt)
+
+    written = 0
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        for block in iter_blocks(packs, seed, names=names):
+            if fmt == "csv":
+                block.to_csv(f, header=written == 0, index=False)
+            else:
+                # each block ends its last record w/ a newline, so the blocks join w/o blank lines
+                lines = block.to_json(orient="records", lines=True)
+                f.write(lines if lines.endswith("\n") else lines + "\n")
+            written += len(block)
+
+    return written
+
+
+def main():
+    """ writes a synthetic history to a transfer file or straight into the table
+    :returns: None
+    :rtype: None
+    """
+
+    parser = argparse.ArgumentParser(description="generate synthetic FIFA pack history")
+    parser.add_argument("packs", type=int, help="the number of packs to open")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--names", type=int, default=NAMES, help="distinct player names")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--out", help="a .csv or .jsonl file for transfer.py import")
+    target.add_argument("--db", action="store_true", help="append to the table in config.py")
+    args = parser.parse_args()
+
+    if args.out is not None:
+        written = write_file(args.out, args.packs, args.seed, names=args.names)
+        print("wrote %d rows to %s" % (written, args.out))
+        return
+
+    from tracker import SQLBackend, connect
+
+    conn = connect()
+    backend = SQLBackend(conn, autocommit=False)
+    backend.cursor.execute("SELECT MAX(id), MAX(pack_id) FROM " + backend.table)
+    last_id, last_pack_id = backend.cursor.fetchone()
+
+    written = write_backend(
+        backend, args.packs, args.seed, (last_id or 0) + 1, (last_pack_id or 0) + 1, args.names
+    )
+    conn.commit()
+    print("added %d rows to %s" % (written, backend.table))
+
+
+if __name__ == "__main__":
+    main()
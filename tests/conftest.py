@@ -0,0 +1,75 @@
+""" conftest.py
+
+This file contains the fixtures shared by the tests. Every test gets its own fakedb.FakeStore, a
+shared in-memory sqlite database standing in for the SQL Server, so nothing touches a real server
+
+This file contains methods:
+    Global Methods:
+        * rows( ) - returns a small pack history in COLUMNS order
+        * store( rows ) - returns a fakedb store loaded w/ the rows
+        * tracker( store ) - returns a PackTracker over the store
+
+Created October 19th, 2026.
+"""
+
+import os
+import sys
+
+import pytest
+
+# the modules are flat at the top of the repo
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fakedb  # noqa: E402
+from tracker import PackTracker, SQLBackend  # noqa: E402
+
+# id, pack_id, pack_price, pack_type, name, type, bid, bin, sold
+HISTORY = [
+    (0, 1, 353, "bronze", "ben", "player", 150, 300, None),
+    (1, 1, 353, "bronze", "emily", "player", 250, 300, None),
+    (2, 2, 2400, "silver", "hannah", "player", 150, 300, 300),
+    (3, 3, 300, "gold", "tk", "player", 300, 350, None),
+    (4, 4, 2500, "silver", "chris", "healing", 150, 300, None),
+    (5, 6, 750, "bronze r", "cat", "player", 200, 300, 200),
+    (6, 6, 750, "bronze r", "cat", "player", 800, 1600, 1600),
+    (7, 6, 750, "bronze r", "emily", "player", 150, 300, None),
+    (8, 7, 239, "bronze", "o'day", "player", 150, 300, 150),
+    (9, 8, 400, "bronze", "ben", "player", 150, 300, None),
+]
+
+
+@pytest.fixture
+def rows():
+    """ returns the pack history the stats.py self test checks by hand, in COLUMNS order
+    :returns: The rows
+    :rtype: List of tuples
+    """
+
+    return list(HISTORY)
+
+
+@pytest.fixture
+def store(rows):
+    """ returns a fakedb store holding the rows
+    :param rows: The rows to load
+    :type rows: List of tuples
+    :returns: The store
+    :rtype: fakedb FakeStore
+    """
+
+    store = fakedb.FakeStore()
+    store.load(rows)
+
+    return store
+
+
+@pytest.fixture
+def tracker(store):
+    """ returns a tracker reading and writing the store through a SQLBackend
+    :param store: The store
+    :type store: fakedb FakeStore
+    :returns: The tracker
+    :rtype: tracker PackTracker
+    """
+
+    return PackTracker(SQLBackend(store.connect()))
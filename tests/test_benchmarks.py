@@ -0,0 +1,95 @@
+""" test_benchmarks.py
+
+This file contains the tests of the benchmark suite's bookkeeping: the repeat bounds of a timing,
+which medians count as regressions, and saving then checking baselines from the command line. The
+benchmarks run at a tiny size w/ no budget, only the ones that need no window
+
+Created October 19th, 2026.
+"""
+
+import json
+import sys
+
+import pytest
+
+import benchmarks
+
+HEADLESS = ["loadData", "stats.", "calcStats", "sort", "view."]
+
+
+def test_measure_repeats_within_bounds():
+    calls = []
+    timing = benchmarks.measure(lambda: calls.append(1), budget=0.0)
+
+    assert timing["repeats"] == len(calls) == benchmarks.MIN_REPEATS
+    assert timing["min"] <= timing["median"]
+
+    timing = benchmarks.measure(lambda: None, budget=60.0)
+
+    assert timing["repeats"] == benchmarks.MAX_REPEATS
+
+
+def test_compare_threshold_and_noise():
+    baselines = {
+        "slow@1000": {"median": 0.010},
+        "jitter@1000": {"median": 0.0001},
+        "fast@1000": {"median": 0.010},
+    }
+    results = {
+        "slow@1000": {"median": 0.0130},
+        "jitter@1000": {"median": 0.0009},
+        "fast@1000": {"median": 0.0120},
+        "new@1000": {"median": 1.0},
+    }
+
+    assert benchmarks.compare(results, baselines) == {"slow@1000": (0.010, 0.0130)}
+    assert benchmarks.compare(results, baselines, threshold=0.5) == {}
+
+
+def test_run_headless_benchmarks():
+    results, skipped = benchmarks.run(sizes=[200], only=HEADLESS, budget=0.0)
+
+    assert skipped == {}
+    assert {"loadData@200", "stats.breakdown@200", "sortRows@200", "view.rows@200"} <= set(results)
+    assert all(result["repeats"] >= benchmarks.MIN_REPEATS for result in results.values())
+
+
+def run_main(monkeypatch, *args):
+    """ runs the benchmark command line on the headless benchmarks at a tiny size """
+
+    argv = ["benchmarks", "--sizes", "200", "--budget", "0", "--only"] + HEADLESS + list(args)
+    monkeypatch.setattr(sys, "argv", argv)
+    benchmarks.main()
+
+
+def test_save_then_check(monkeypatch, tmp_path, capsys):
+    baseline = str(tmp_path / "benchmarks.json")
+
+    run_main(monkeypatch, "--baseline", baseline, "--save")
+
+    with open(baseline) as f:
+        stored = json.load(f)
+
+    assert "loadData@200" in stored["results"]
+
+    # an hour long baseline can never regress
+    for result in stored["results"].values():
+        result["median"] = 3600.0
+    with open(baseline, "w") as f:
+        json.dump(stored, f)
+
+    run_main(monkeypatch, "--baseline", baseline)
+
+    assert "no regressions" in capsys.readouterr().out
+
+    # and a nanosecond one always does, loadData takes more than NOISE
+    for result in stored["results"].values():
+        result["median"] = 1e-9
+    with open(baseline, "w") as f:
+        json.dump(stored, f)
+
+    with pytest.raises(SystemExit) as exit:
+        run_main(monkeypatch, "--baseline", baseline, "--threshold", "0")
+
+    assert exit.value.code == 1
+    assert "REGRESSION" in capsys.readouterr().out
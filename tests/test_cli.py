@@ -0,0 +1,95 @@
+""" test_cli.py
+
+This file contains the tests of the headless command line. Each command runs against the fakedb
+store, and bad arguments must exit through the parser w/o writing anything
+
+Created October 19th, 2026.
+"""
+
+import sys
+
+import pytest
+
+import tracker
+from tracker import PackTracker, SQLBackend
+
+
+@pytest.fixture
+def cli(store, monkeypatch):
+    """ returns a function running the command line on the store w/ some arguments """
+
+    monkeypatch.setattr(tracker, "connect", store.connect)
+
+    def run(*args):
+        monkeypatch.setattr(sys, "argv", ["tracker"] + list(args))
+        tracker.main()
+
+    return run
+
+
+def reload(store):
+    """ returns the data as stored """
+    return PackTracker(SQLBackend(store.connect())).data
+
+
+def test_add_pack(cli, store, capsys):
+    cli("add-pack", "gold", "ben,player,150,300", "cat,healing,200,400", "--qs", "30")
+
+    data = reload(store)
+    added = data[data["pack_id"] == 9]
+
+    assert "added pack 9 with 2 items" in capsys.readouterr().out
+    assert list(added["name"]) == ["ben", "cat"]
+    assert set(added["pack_type"]) == {"gold"}
+
+
+def test_sell_by_id_and_name(cli, store, capsys):
+    cli("sell", "3", "350")
+    cli("sell", "hannah", "250")
+
+    data = reload(store)
+
+    assert data.at[3, "sold"] == 350 and data.at[2, "sold"] == 250
+    assert "row 3 sold for 350" in capsys.readouterr().out
+
+
+@pytest.mark.parametrize(
+    "args",
+    [
+        ("sell", "3", "400"),
+        ("sell", "42", "300"),
+        ("sell", "ben", "300"),
+        ("add-pack", "gold", "ben,player,150"),
+        ("add-pack", "gold", "ben,trainer,150,300"),
+        ("add-pack", "gold", "ben,player,100,300"),
+    ],
+)
+def test_bad_arguments_exit_w_o_writing(cli, store, args):
+    before = reload(store)
+
+    with pytest.raises(SystemExit) as exit:
+        cli(*args)
+
+    assert exit.value.code == 2
+    assert reload(store).equals(before)
+
+
+def test_stats_report_and_breakdown(cli, store, capsys):
+    expected = PackTracker(SQLBackend(store.connect())).calcStats()
+
+    cli("stats")
+    out = capsys.readouterr().out
+
+    for key, value in expected.items():
+        assert "%-16s %s" % (key, value) in out
+
+    cli("report", "--pack", "6")
+    lines = capsys.readouterr().out.splitlines()
+
+    assert len(lines) == 3 and lines[-1].split()[0] == "6"
+
+    cli("breakdown", "--type", "bronze", "--top", "2")
+    out = capsys.readouterr().out
+
+    assert "==== pack type ====" in out and "==== worst ====" in out
+    assert "silver" not in out
@@ -0,0 +1,51 @@
+""" test_config.py
+
+This file contains the tests of the startup split: importing the GUI module must not load pandas,
+numpy or pyodbc, which are only imported by the background load, and the validators moved to
+config.py must return the same error codes the dialogs show messages for
+
+Created October 19th, 2026.
+"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+from config import string_validator, validate_listing
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.mark.parametrize("module", ["config", "pack_tracking"])
+def test_startup_imports_no_heavy_modules(module):
+    code = "import sys, %s; print(sorted({'pandas', 'numpy', 'pyodbc', 'tracker'} & set(sys.modules)))"
+    out = subprocess.run(
+        [sys.executable, "-c", code % module], cwd=ROOT, capture_output=True, text=True, check=True
+    ).stdout
+
+    assert out.strip() == "[]"
+
+
+def test_string_validator():
+    assert string_validator("o'day jr.")
+    assert not string_validator("ben;")
+
+
+@pytest.mark.parametrize(
+    "rows, qs, code",
+    [
+        ([["ben", "player", "150", "300"]], "23", 1),
+        ([["ben!", "player", "150", "300"]], "23", 0),
+        ([["", "player", "150", "300"]], "23", -1),
+        ([["ben", "player", "149", "300"]], "23", -2),
+        ([["ben", "player", "150", "199"]], "23", -3),
+        ([["b" * 25, "player", "150", "300"]], "23", -4),
+        ([["ben", "player", "150", "300"]], "-1", -5),
+        ([["ben", "player", "lots", "300"]], "23", -6),
+        ([["ben", "player", "400", "300"]], "23", -7),
+    ],
+)
+def test_validate_listing_codes(rows, qs, code):
+    assert validate_listing(rows, qs) == code
@@ -0,0 +1,66 @@
+""" test_fakedb.py
+
+This file contains the tests of the pyodbc stand-in the other tests run on: rows come back padded like
+nchar columns, each connection has its own transaction, and failed statements raise fakedb.Error
+
+Created October 19th, 2026.
+"""
+
+import pytest
+
+import fakedb
+
+
+def test_nchar_columns_are_padded(store):
+    cursor = store.connect().cursor()
+
+    row = cursor.execute("SELECT pack_type, name, bid FROM " + store.table + " WHERE id = ?", 0)
+    row = row.fetchone()
+
+    assert row == ("bronze".ljust(10), "ben".ljust(24), 150)
+
+
+def test_fetches_and_iteration_agree(store):
+    cursor = store.connect().cursor()
+    query = "SELECT id, name FROM " + store.table + " ORDER BY id"
+
+    every = cursor.execute(query).fetchall()
+    some = cursor.execute(query).fetchmany(3)
+    iterated = list(cursor.execute(query))
+
+    assert len(every) == store.count() == 10
+    assert some == every[:3] and iterated == every
+
+
+def test_rowcount(store):
+    cursor = store.connect().cursor()
+
+    cursor.execute("UPDATE " + store.table + " SET sold = ? WHERE bin = ?", 300, 300)
+
+    assert cursor.rowcount == 8
+
+
+def test_uncommitted_writes_roll_back(store):
+    conn = store.connect()
+    conn.cursor().execute("DELETE FROM " + store.table + " WHERE id < ?", 5)
+
+    conn.rollback()
+
+    assert store.count() == 10
+
+
+def test_commit_is_seen_by_other_connections(store):
+    conn = store.connect()
+    conn.cursor().execute("DELETE FROM " + store.table + " WHERE id < ?", 5)
+    conn.commit()
+
+    cursor = store.connect().cursor()
+
+    assert cursor.execute("SELECT COUNT(*) FROM " + store.table).fetchone() == (5,)
+
+
+def test_failed_statement_raises_error(store):
+    cursor = store.connect().cursor()
+
+    with pytest.raises(fakedb.Error):
+        cursor.execute("INSERT INTO " + store.table + " (id) VALUES (?)", 0)
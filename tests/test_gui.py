@@ -0,0 +1,167 @@
+""" test_gui.py
+
+This file contains the tests that drive the real window through harness.py. Whole sessions are
+replayed w/ each table engine, after which the rows held in memory, the rows drawn and the packs
+listed must all agree w/ the fakedb store. Writes in one handler must repaint once, a large view
+must be drawn a slice at a time, a sale must redraw only the sold row, and the pack navigator's
+page must follow inserts, removes and searches. They need a display, or Xvfb to make one, and are
+skipped w/o either
+
+Created October 19th, 2026.
+"""
+
+import tkinter as tk
+
+import pandas as pd
+import pytest
+
+import harness
+import navigator
+import pack_tracking
+from config import FIRST_ROWS
+from tracker import PackTracker, SQLBackend
+
+
+@pytest.fixture(scope="module")
+def display():
+    """ makes sure tk has a display, skipping the tests when there is none to be had """
+
+    try:
+        proc = harness.virtual_display()
+    except RuntimeError as e:
+        pytest.skip(str(e))
+
+    yield
+
+    if proc is not None:
+        proc.terminate()
+
+
+@pytest.fixture
+def root(display):
+    """ returns a hidden tk root """
+
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        pytest.skip(str(e))
+    root.withdraw()
+
+    yield root
+
+    root.destroy()
+
+
+@pytest.fixture(params=["labels", "canvas"])
+def gui(display, request, monkeypatch):
+    """ returns a harness w/ the window launched on more rows than the first screenful """
+
+    monkeypatch.setattr(pack_tracking, "PLAYER_TABLE", request.param)
+    gui = harness.Harness(rows=120, seed=2)
+
+    yield gui
+
+    gui.close()
+
+
+def test_sessions_keep_window_and_store_in_sync(gui):
+    gui.replay(harness.BULK_EVERY)
+    gui.reset()
+
+    app = gui.app
+    stored = PackTracker(SQLBackend(gui.store.connect())).data
+
+    pd.testing.assert_frame_equal(app.data, stored)
+    assert set(app.table.cells) == set(app.data.index)
+    assert list(app.packNav.items) == list(app.tracker.packIds())
+    assert gui.report()["failed"] == {}
+
+
+def test_writes_in_one_handler_repaint_once(gui, monkeypatch):
+    gui.reset()
+    app = gui.app
+    drawn = []
+    write = app.writePlayers
+
+    def counted(data, update_stats):
+        drawn.append(len(data))
+        write(data, update_stats)
+
+    monkeypatch.setattr(app, "writePlayers", counted)
+
+    for _ in range(3):
+        app.handleWrite(app.COLUMNS, app.data.index, reload=False)
+    app.markDirty("stats")
+
+    while app.flush_pending or app.rendering():
+        app.root.update()
+
+    assert drawn == [len(app.data)]
+
+
+def test_large_views_are_drawn_a_slice_at_a_time(gui):
+    gui.reset()
+    app = gui.app
+    assert len(app.data) > FIRST_ROWS
+
+    # the flush is an idle callback, the slices after the first screenful are timers
+    app.handleWrite(app.COLUMNS, app.data.index, reload=False)
+    app.root.update_idletasks()
+
+    assert app.rendering() and len(app.table.cells) == FIRST_ROWS
+
+    while app.rendering():
+        app.root.update()
+
+    assert set(app.table.cells) == set(app.data.index)
+
+
+def test_sale_redraws_only_the_sold_row(gui):
+    # reset waits for every row to be drawn, a sale during the first draw redraws them all
+    gui.reset()
+    app = gui.app
+    id = int(app.data.index[app.data["sold"].isna()][0])
+    cells = {rdx: app.table.cells[rdx] for rdx in app.table.cells if rdx != id}
+
+    gui.sell(id, int(app.data.at[id, "bin"]))
+
+    assert app.data.at[id, "sold"] == app.data.at[id, "bin"]
+    assert all(app.table.cells[rdx] is cells[rdx] for rdx in cells)
+
+
+def test_navigator_page_follows_changes(root):
+    kinds = {item: "bronze" if item % 3 == 0 else "gold" for item in range(1, 60)}
+    nav = navigator.Navigator(root, "Packs", 10, page=20, kinds=lambda: kinds)
+    nav.fill(list(kinds))
+
+    def check():
+        page = nav.shown[nav.start : nav.start + nav.page]
+        assert [str(item) for item in nav.box.get(0, "end")] == [str(item) for item in page]
+
+    check()
+    nav.turn(1)
+    assert nav.start == 20
+    check()
+
+    # one before the page shifts it, one on it pulls the next page's first item up
+    nav.remove(5)
+    check()
+    nav.remove(25)
+    check()
+
+    kinds[60] = "silver"
+    nav.insert(60)
+    check()
+    assert 5 not in nav and 60 in nav and len(nav) == 58
+
+    nav.search("bron")
+    assert nav.start == 0 and nav.shown == [item for item in nav.items if kinds[item] == "bronze"]
+    check()
+
+    nav.search("1")
+    assert nav.shown == [item for item in nav.items if str(item).startswith("1")]
+    check()
+
+    nav.search("")
+    assert nav.shown == list(nav.items)
+    check()
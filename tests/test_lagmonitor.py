@@ -0,0 +1,96 @@
+""" test_lagmonitor.py
+
+This file contains the tests of the event loop lag monitor. Heartbeats are called by hand in place
+of tk, so a late one is a stall, and each stall must be blamed on the handler that blocked the loop
+
+Created October 19th, 2026.
+"""
+
+import json
+import time
+
+import pytest
+
+import lagmonitor
+from lagmonitor import LagMonitor, tracked
+
+
+class FakeRoot:
+    """ Keeps the callbacks given to after w/o running them """
+
+    def __init__(self):
+        self.pending = []
+
+    def after(self, ms, func):
+        self.pending.append(func)
+
+
+@pytest.fixture
+def monitor(tmp_path):
+    monitor = LagMonitor(
+        FakeRoot(), interval=0.0, stall=0.05, stall_file=str(tmp_path / "stalls.jsonl")
+    )
+    monitor.start()
+    yield monitor
+    monitor.stop()
+
+
+def stalls(monitor):
+    with open(monitor.stall_file) as f:
+        return [json.loads(line) for line in f]
+
+
+def test_on_time_beat_is_no_stall(monitor):
+    monitor.beat()
+
+    assert monitor.stalls == 0
+    assert len(monitor.root.pending) == 2
+
+
+def test_slow_handler_is_blamed(monitor):
+    @tracked
+    def handleSlow():
+        time.sleep(0.12)
+
+    @tracked
+    def handleQuick():
+        return "quick"
+
+    assert handleQuick() == "quick"
+    handleSlow()
+    monitor.beat()
+
+    stall = stalls(monitor)[0]
+
+    assert monitor.stalls == 1
+    assert stall["handler"] == "handleSlow" and stall["lag"] >= 0.1
+    assert [name for name, _ in stall["ran"]] == ["handleQuick", "handleSlow"]
+    assert stall["samples"] > 0 and "handleSlow" in " ".join(stall["stacks"][0]["stack"])
+
+    # the next beat starts over
+    monitor.beat()
+
+    assert monitor.stalls == 1
+
+
+def test_handler_still_running_is_blamed(monitor):
+    @tracked
+    def handleDialog():
+        time.sleep(0.06)
+        monitor.beat()
+
+    handleDialog()
+
+    assert stalls(monitor)[0]["handler"] == "handleDialog"
+
+
+def test_stall_w_o_handlers_blames_tk(monitor):
+    time.sleep(0.06)
+    monitor.beat()
+
+    assert stalls(monitor)[0]["handler"] == "tk (redraw or geometry)"
+
+
+def test_tracked_is_a_no_op_w_o_monitor():
+    assert lagmonitor.MONITOR is None
+    assert tracked(lambda: 7)() == 7
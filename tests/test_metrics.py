@@ -0,0 +1,76 @@
+""" test_metrics.py
+
+This file contains the tests of the latency histograms and counters the hot paths report to, and of
+their JSON and Prometheus exports
+
+Created October 19th, 2026.
+"""
+
+import json
+
+import pytest
+
+import metrics
+
+
+def test_histogram_counts_and_extremes():
+    hist = metrics.Histogram([0.01, 0.1, 1])
+    for value in [0.005, 0.05, 0.05, 0.5, 2]:
+        hist.observe(value)
+
+    summary = hist.summary()
+
+    assert hist.counts == [1, 2, 1, 1]
+    assert summary["count"] == 5 and summary["sum"] == pytest.approx(2.605)
+    assert summary["min"] == 0.005 and summary["max"] == 2
+    assert summary["buckets"] == [[0.01, 1], [0.1, 3], [1, 4], ["+Inf", 5]]
+
+
+def test_quantiles_stay_within_their_bucket():
+    hist = metrics.Histogram([0.01, 0.1, 1])
+    for _ in range(90):
+        hist.observe(0.005)
+    for _ in range(10):
+        hist.observe(0.5)
+
+    assert 0.0 < hist.quantile(0.5) <= 0.01
+    assert 0.1 < hist.quantile(0.95) <= 0.5
+    assert hist.quantile(1.0) == 0.5
+    assert metrics.Histogram().quantile(0.5) is None
+
+
+def test_timed_observes_failed_calls_too():
+    registry = metrics.Registry()
+    saved, metrics.METRICS = metrics.METRICS, registry
+
+    @metrics.timed("op")
+    def fails():
+        raise RuntimeError
+
+    try:
+        with pytest.raises(RuntimeError):
+            fails()
+        metrics.count("done", 3)
+    finally:
+        metrics.METRICS = saved
+
+    assert registry.histograms["op"].total == 1
+    assert registry.counters == {"done": 3}
+
+
+def test_exports(tmp_path):
+    registry = metrics.Registry()
+    registry.observe("load", 0.2)
+    registry.count("cache.hits", 2)
+
+    registry.export(str(tmp_path / "metrics.json"))
+    registry.export(str(tmp_path / "metrics.prom"))
+
+    written = json.loads((tmp_path / "metrics.json").read_text())
+    assert written["latency_seconds"]["load"]["count"] == 1
+    assert written["counters"] == {"cache.hits": 2}
+
+    prom = (tmp_path / "metrics.prom").read_text()
+    assert 'pack_tracking_latency_seconds_bucket{op="load",le="+Inf"} 1' in prom
+    assert 'pack_tracking_latency_seconds_count{op="load"} 1' in prom
+    assert 'pack_tracking_total{name="cache.hits"} 2' in prom
@@ -0,0 +1,93 @@
+""" test_parallel.py
+
+This file contains the tests of the partitioned breakdown. Whatever the partitioning and however
+many workers, the merged partials must break down exactly like stats.breakdown over every row, w/
+the rows shuffled so packs and item types are split between partitions
+
+Created October 19th, 2026.
+"""
+
+import pandas as pd
+import pytest
+
+import parallel
+import stats
+import synthetic
+
+
+@pytest.fixture(scope="module")
+def history():
+    """ returns a shuffled synthetic history w/ an unsold row, so partitions split packs """
+
+    data = synthetic.generate_frame(600, seed=11)
+    data.loc[data.index[5], "sold"] = pd.NA
+
+    return data.sample(frac=1, random_state=0)
+
+
+@pytest.fixture(scope="module", autouse=True)
+def stop_pool():
+    """ stops the process pool once the module's tests are done """
+    yield
+    parallel.shutdown()
+
+
+def assert_same(got, want):
+    """ checks every frame of two breakdowns is identical """
+
+    assert set(got) == set(want)
+    for key in want:
+        pd.testing.assert_frame_equal(got[key], want[key], check_exact=True)
+
+
+@pytest.mark.parametrize("by", ["rows", "pack_id", "pack_type"])
+def test_partials_merge_to_stats_breakdown(history, by):
+    # folding in process checks the merge w/o paying for the pool on every case
+    pack_id, pack_price, sold, mask = stats.arrays(history)
+    pack_type = history["pack_type"].to_numpy()
+    item_type = history["type"].to_numpy()
+
+    for workers in (2, 3, 5):
+        total = parallel.PartialBreakdown()
+        for part in parallel.partitions(history, by, workers):
+            total = total.merge(
+                parallel.fold_partition(
+                    part,
+                    pack_id[part],
+                    pack_price[part],
+                    pack_type[part],
+                    item_type[part],
+                    sold[part],
+                    mask[part],
+                )
+            )
+
+        assert_same(stats.finish_breakdown(*total.frames(), top=5), stats.breakdown(history))
+
+
+def test_pool_breakdown_matches_stats(history):
+    got = parallel.breakdown(history, top=3, workers=2, min_rows=0)
+
+    assert_same(got, stats.breakdown(history, top=3))
+
+
+def test_small_data_runs_in_process(history, monkeypatch):
+    monkeypatch.setattr(parallel, "pool", lambda: pytest.fail("the pool was used"))
+
+    got = parallel.breakdown(history, workers=4, min_rows=len(history) + 1)
+
+    assert_same(got, stats.breakdown(history))
+
+
+def test_partitions_cover_every_row_once(history):
+    for by in ("rows", "pack_id", "pack_type"):
+        positions = []
+        for part in parallel.partitions(history, by, 3):
+            if isinstance(part, slice):
+                part = range(part.start, part.stop)
+            positions.extend(part)
+
+        assert sorted(positions) == list(range(len(history)))
+
+    with pytest.raises(ValueError):
+        parallel.partitions(history, "name", 3)
@@ -0,0 +1,79 @@
+""" test_profiling.py
+
+This file contains the tests of the on demand profiling session. A tree of fake widgets stands in for
+the window, so the widget counts and the reports a session writes are checked w/o a display
+
+Created October 19th, 2026.
+"""
+
+import pstats
+
+import pytest
+
+from profiling import ProfileSession, widget_counts
+
+
+class FakeWidget:
+    """ Answers the winfo calls widget_counts makes """
+
+    def __init__(self, path, cls, children=()):
+        self.path = path
+        self.cls = cls
+        self.children = list(children)
+
+    def __str__(self):
+        return self.path
+
+    def winfo_children(self):
+        return self.children
+
+    def winfo_class(self):
+        return self.cls
+
+
+@pytest.fixture
+def window():
+    labels = [FakeWidget(".players.l%d" % i, "Label") for i in range(3)]
+    players = FakeWidget(".players", "Frame", labels)
+    table = FakeWidget(".table", "Canvas", [players])
+    return FakeWidget(".", "Tk", [table, FakeWidget(".button", "Button")])
+
+
+def test_widget_counts_nested(window):
+    assert widget_counts(window) == {".": 6, ".table": 4, ".players": 3}
+
+
+def busy_work():
+    return sorted(str(i) for i in range(20000))
+
+
+def test_session_writes_reports(window, tmp_path):
+    session = ProfileSession(window, out_dir=str(tmp_path))
+
+    assert not session.running()
+
+    session.start()
+    busy_work()
+    leaked = [bytearray(1024) for _ in range(200)]
+    window.children[0].children[0].children.append(FakeWidget(".players.l3", "Label"))
+    paths = session.stop()
+
+    assert not session.running()
+    assert len(leaked) == 200
+
+    prof, profile, memory = paths
+    names = {func[2] for func in pstats.Stats(prof).stats}
+
+    assert "busy_work" in names
+
+    with open(profile) as f:
+        text = f.read()
+
+    assert "sorted by cumulative" in text and "sorted by tottime" in text
+
+    with open(memory) as f:
+        lines = f.read().splitlines()
+
+    assert lines[0] == "==== widgets per frame (start -> stop) ===="
+    assert ["+1", "6", "->", "7", "."] in [line.split() for line in lines[1:4]]
+    assert any("test_profiling.py" in line for line in lines)
@@ -0,0 +1,77 @@
+""" test_querylog.py
+
+This file contains the tests of the statement log wrapped around connections. Statements on a fakedb
+connection are grouped by shape w/ their parameters redacted, selects are logged once fetched, and
+slow statements reach the slow query file
+
+Created October 19th, 2026.
+"""
+
+import json
+
+import fakedb
+
+import querylog
+
+
+def test_shape_groups_in_lists():
+    first = querylog.shape("DELETE FROM t\n  WHERE id IN (?, ?, ?)")
+    second = querylog.shape("DELETE FROM t WHERE id IN (?)")
+
+    assert first == second == "DELETE FROM t WHERE id IN (?...)"
+
+
+def test_redact_keeps_types_only():
+    assert querylog.redact((3, "emily", None)) == ["int", "str(5)", "NoneType"]
+    assert querylog.redact(list(range(10)))[-1] == "... 10 params"
+    assert querylog.redact(None) == []
+
+
+def test_statements_are_logged_by_shape(store, tmp_path):
+    log = querylog.QueryLog(slow_file=None)
+    conn = querylog.wrap(store.connect(), log)
+    cursor = conn.cursor()
+
+    for id in (1, 2, 3):
+        cursor.execute("UPDATE " + store.table + " SET sold = ? WHERE id = ?", 200, id)
+    conn.commit()
+    cursor.execute("SELECT * FROM " + store.table + " WHERE id IN (?,?)", 1, 2)
+    cursor.fetchmany(1)
+    cursor.fetchmany(1)
+    cursor.fetchmany(1)
+
+    summary = log.summary()
+    update = summary["UPDATE " + store.table + " SET sold = ? WHERE id = ?"]
+    select = summary["SELECT * FROM " + store.table + " WHERE id IN (?...)"]
+
+    assert update["count"] == 3 and update["rows"] == 3
+    assert select["count"] == 1 and select["rows"] == 2
+    assert summary["COMMIT"]["count"] == 1
+
+
+def test_slow_statements_are_written(store, tmp_path):
+    path = tmp_path / "slow.jsonl"
+    log = querylog.QueryLog(threshold=0.0, slow_file=str(path))
+    cursor = querylog.wrap(store.connect(), log).cursor()
+
+    cursor.execute("SELECT name FROM " + store.table + " WHERE name = ?", "emily").fetchall()
+
+    slow = [json.loads(line) for line in path.read_text().splitlines()]
+    assert slow[0]["params"] == ["str(5)"] and slow[0]["rows"] == 2
+    assert "emily" not in path.read_text()
+
+
+def test_attributes_pass_through(store):
+    cursor = querylog.wrap(store.connect(), querylog.QueryLog(slow_file=None)).cursor()
+
+    cursor.fast_executemany = True
+
+    assert cursor.cursor.fast_executemany is True
+
+
+def test_error_class_of_wrapped_connection(store):
+    conn = store.connect()
+
+    assert querylog.error_class(conn) is fakedb.Error
+    assert querylog.error_class(querylog.wrap(conn)) is fakedb.Error
+    assert querylog.error_class(object()) is Exception
@@ -0,0 +1,69 @@
+""" test_rowview.py
+
+This file contains the tests of the row views the GUI draws from: a view of some ids gathers the
+same values as selecting those rows from the frame, and a view of every row in order reads the
+frame's own arrays
+
+Created October 19th, 2026.
+"""
+
+import pandas as pd
+
+from rowview import RowView
+
+COLUMNS = ["name", "bin", "sold"]
+
+
+def test_every_row_in_order_reads_the_data(tracker):
+    view = RowView.fromIds(tracker.data, tracker.data.index, COLUMNS)
+
+    assert view.positions is None
+    assert len(view) == len(tracker.data)
+    assert view.index.equals(tracker.data.index)
+    assert view["sold"] is tracker.data["sold"].array
+
+
+def test_ids_gather_the_same_rows_as_loc(tracker):
+    ids = [9, 2, 6, 0]
+    view = RowView.fromIds(tracker.data, ids, COLUMNS)
+    expected = tracker.data.loc[ids, COLUMNS]
+
+    assert len(view) == 4
+    assert list(view.index) == ids
+    assert list(view["name"]) == list(expected["name"])
+    pd.testing.assert_frame_equal(view.frame(), expected)
+
+
+def test_rows_slices(tracker):
+    ids = [9, 2, 6, 0]
+    view = RowView.fromIds(tracker.data, ids, COLUMNS)
+    data = tracker.data
+
+    assert view.rows(1, 3) == [
+        (idx, {col: data.at[idx, col] for col in COLUMNS}) for idx in (2, 6)
+    ]
+    assert [idx for idx, _ in view.rows(2)] == [6, 0]
+    assert [idx for idx, _ in view.rows(3, 100)] == [0]
+
+    whole = RowView.fromIds(data, data.index, COLUMNS)
+
+    assert [idx for idx, _ in whole.rows(8)] == [8, 9]
+
+
+def test_take_picks_within_the_view(tracker):
+    view = RowView.fromIds(tracker.data, [9, 2, 6, 0], COLUMNS)
+
+    assert list(view.take([3, 1]).index) == [0, 2]
+
+    whole = RowView.fromIds(tracker.data, tracker.data.index, COLUMNS)
+
+    assert list(whole.take([5, 1]).index) == [5, 1]
+    pd.testing.assert_frame_equal(
+        whole.take([5, 1]).frame(), tracker.data.loc[[5, 1], COLUMNS]
+    )
+
+
+def test_missing_values_stay_missing(tracker):
+    view = RowView.fromIds(tracker.data, [0, 2], COLUMNS)
+
+    assert pd.isna(view["sold"][0]) and view["sold"][1] == 300
@@ -0,0 +1,221 @@
+""" test_server.py
+
+This file contains the tests of the API server and its clients. A TrackerServer over a fakedb store
+is served on a free local port from a background thread, and RemoteTrackers talk to it over HTTP the
+way the GUI does. The write-behind batches and their recovery are tested on the PooledBackend directly
+
+Created October 19th, 2026.
+"""
+
+import asyncio
+import socket
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+import server
+from tracker import PackTracker, SQLBackend
+
+
+@pytest.fixture
+def served(store):
+    """ serves a tracker over the store until the test ends
+    :param store: The store the server writes to
+    :type store: fakedb FakeStore
+    :returns: The url, and the server's tracker
+    :rtype: Tuple of types (String, PackTracker)
+    """
+
+    with socket.socket() as probe:
+        probe.bind((server.HOST, 0))
+        port = probe.getsockname()[1]
+
+    backend = server.PooledBackend(server.ConnectionPool(store.connect, 2))
+    tracker = PackTracker(backend)
+    loop = asyncio.new_event_loop()
+    task = loop.create_task(server.TrackerServer(tracker, backend).serve(server.HOST, port))
+
+    def run():
+        try:
+            loop.run_until_complete(task)
+        except asyncio.CancelledError:
+            pass
+        finally:
+            loop.close()
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+
+    url = "http://%s:%d" % (server.HOST, port)
+    for _ in range(100):
+        try:
+            socket.create_connection((server.HOST, port), timeout=0.1).close()
+            break
+        except OSError:
+            time.sleep(0.02)
+
+    yield url, tracker
+
+    loop.call_soon_threadsafe(task.cancel)
+    thread.join(5)
+
+
+def stored(store):
+    """ returns the store's table as a tracker would load it """
+    return PackTracker(SQLBackend(store.connect())).data
+
+
+def test_getRows_and_meta(served):
+    url, tracker = served
+    client = server.RemoteBackend(url)
+
+    rows = client.request("GET", "/rows?type=bronze%20r")["rows"]
+    meta = client.request("GET", "/meta")
+
+    assert [row[0] for row in rows] == [5, 6, 7]
+    assert meta["curr_id"] == 10 and meta["curr_pack_id"] == 9
+    assert meta["version"] == tracker.version
+
+
+def test_getStats(served):
+    url, tracker = served
+
+    reply = server.RemoteBackend(url).request("GET", "/stats?pack=6")
+
+    assert reply == tracker.calcStats(tracker.data[tracker.data["pack_id"] == 6])
+
+
+def test_writes_reach_memory_and_store(served, store):
+    url, tracker = served
+    client = server.RemoteTracker(url)
+
+    client.postSale(3, 320)
+    client.postEdit(4, [4, 2500, "silver", "chris", "healing", 150, 400, None])
+    client.postBulkEdit([8, 9], "type", "contract")
+    client.postBulkDeletion([2])
+    pack_id = client.postData([["zoe", "player", 150, 300]], 0, "gold", 5000)
+
+    assert pack_id == 9
+    pd.testing.assert_frame_equal(client.data, tracker.data, check_dtype=False)
+    pd.testing.assert_frame_equal(stored(store), tracker.data, check_dtype=False)
+
+
+@pytest.mark.parametrize(
+    "path, payload",
+    [
+        ("/sales", {"id": 3, "price": 1000000}),
+        ("/sales", {"id": 42, "price": 200}),
+        ("/sales", {"id": 3, "price": -1}),
+        ("/edit", {"id": 3, "data": [3, 300, "gold", "tk", "player", 300, 350, 400]}),
+        ("/edit", {"id": 42, "data": [3, 300, "gold", "tk", "player", 300, 350, None]}),
+        ("/bulk-edit", {"ids": [0, 6], "column": "sold", "value": 301}),
+        ("/bulk-edit", {"ids": [0, 42], "column": "type", "value": "player"}),
+        ("/delete", {"ids": [42]}),
+        ("/packs", {"data": [["zoe", "player", 100, 300]], "qs_price": 0,
+                    "pack_type": "gold", "pack_price": 5000}),
+    ],
+)
+def test_invalid_writes_are_rejected(served, store, path, payload):
+    url, tracker = served
+    before = tracker.data.copy()
+
+    with pytest.raises(ValueError):
+        server.RemoteBackend(url).request("POST", path, payload)
+
+    pd.testing.assert_frame_equal(tracker.data, before)
+    pd.testing.assert_frame_equal(stored(store), before, check_dtype=False)
+
+
+def test_remote_tracker_syncs_other_clients_writes(served):
+    url, tracker = served
+    first, second = server.RemoteTracker(url), server.RemoteTracker(url)
+
+    first.postSale(0, 200)
+    assert first.changes() is None
+
+    changes = second.changes()
+    assert changes is not None
+    second.sync(changes)
+
+    assert second.data.at[0, "sold"] == 200
+    assert second.changes() is None
+    pd.testing.assert_frame_equal(second.data, tracker.data, check_dtype=False)
+
+
+class Flaky:
+    """ Stands in for writeBatch, failing the first batch once the test lets it finish and writing
+        any later ones
+    """
+
+    def __init__(self, write):
+        self.write = write
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def __call__(self, ops):
+        if self.started.is_set():
+            return self.write(ops)
+
+        self.started.set()
+        self.release.wait(5)
+        raise RuntimeError("lost the connection")
+
+
+def test_failed_batch_drops_every_uncommitted_write(store):
+    backend = server.PooledBackend(server.ConnectionPool(store.connect, 2))
+    tracker = PackTracker(backend)
+    committed = tracker.data.copy()
+    flaky = backend.writeBatch = Flaky(backend.writeBatch)
+
+    async def scenario():
+        writer = asyncio.ensure_future(backend.run(tracker))
+
+        tracker.postSale(0, 200)
+        first = backend.flushed()
+        await asyncio.get_running_loop().run_in_executor(None, flaky.started.wait, 5)
+
+        # queued while the first batch is in flight, so it is in memory but not yet written
+        tracker.postSale(1, 250)
+        second = backend.flushed()
+        flaky.release.set()
+
+        results = await asyncio.gather(first, second, return_exceptions=True)
+
+        # give the writer the chance to write anything still queued
+        await asyncio.sleep(0.1)
+        writer.cancel()
+
+        return results
+
+    results = asyncio.run(scenario())
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert backend.ops == []
+    pd.testing.assert_frame_equal(tracker.data, committed)
+    pd.testing.assert_frame_equal(stored(store), committed, check_dtype=False)
+
+
+def test_pool_closes_connections_that_raised():
+    opened = []
+
+    class Connection:
+        closed = False
+
+        def close(self):
+            self.closed = True
+
+    def connect():
+        opened.append(Connection())
+        return opened[-1]
+
+    pool = server.ConnectionPool(connect, 1)
+    with pytest.raises(RuntimeError):
+        with pool.connection():
+            raise RuntimeError("broken")
+    with pool.connection() as conn:
+        pass
+
+    assert opened[0].closed and conn is opened[1]
+    assert not opened[1].closed
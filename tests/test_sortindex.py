@@ -0,0 +1,123 @@
+""" test_sortindex.py
+
+This file contains the tests of the cached sort orders: both directions keep ties in table order and
+missing values last, and an order kept up to date through appends, changes and deletes is the same
+as sorting the data from scratch
+
+Created October 19th, 2026.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import sortindex
+from sortindex import SortIndex
+
+
+def fresh(data, column, descending=False):
+    """ returns the positions of the rows stably sorted by a column, ties in table order and
+        missing values last in both directions
+    """
+
+    values = list(data[column])
+    present = [pos for pos, value in enumerate(values) if not pd.isna(value)]
+    missing = [pos for pos, value in enumerate(values) if pd.isna(value)]
+
+    # sorted() is stable, and the reverse flag keeps ties in their original order
+    return sorted(present, key=lambda pos: values[pos], reverse=descending) + missing
+
+
+def frame(rng, size):
+    """ returns a frame w/ many ties and some missing values in a nullable and a string column """
+
+    sold = pd.array(rng.choice([150, 300, 350, 1600], size=size), dtype="Int64")
+    sold[rng.random(size) < 0.2] = pd.NA
+    name = rng.choice(["ben", "cat", "emily", "tk"], size=size)
+
+    return pd.DataFrame({"sold": sold, "name": name}, index=rng.permutation(size * 2)[:size])
+
+
+@pytest.mark.parametrize("column", ["sold", "name"])
+@pytest.mark.parametrize("descending", [False, True])
+def test_orders_match_a_fresh_sort(column, descending):
+    data = frame(np.random.default_rng(3), 200)
+    index = SortIndex()
+
+    assert list(index.sortPositions(data, None, column, descending)) == fresh(
+        data, column, descending
+    )
+
+    # a subset is the full order masked down to those rows
+    positions = np.random.default_rng(4).choice(len(data), size=50, replace=False)
+    expected = [pos for pos in fresh(data, column, descending) if pos in set(positions)]
+
+    assert list(index.sortPositions(data, positions, column, descending)) == expected
+    assert list(index.sortRows(data, data.index[positions], column, descending)) == list(
+        data.index[expected]
+    )
+
+
+def test_first_sort_misses_then_hits():
+    data = frame(np.random.default_rng(5), 20)
+    index = SortIndex(name="test_sort")
+
+    first = index.order(data, "sold")
+
+    assert index.order(data, "sold") is first
+    assert "sold" in index.orders
+
+    index.clear()
+
+    assert index.orders == {}
+
+
+def test_changes_keep_orders_in_sync(monkeypatch):
+    # never rebuild, so every change goes through the merge
+    monkeypatch.setattr(sortindex, "REBUILD_FRACTION", 1.0)
+    rng = np.random.default_rng(6)
+    data = frame(rng, 60).reset_index(drop=True)
+    index = SortIndex()
+    index.order(data, "sold")
+    index.order(data, "name")
+
+    for step in range(40):
+        action = rng.integers(3)
+
+        if action == 0:
+            start = len(data)
+            data = pd.concat([data, frame(rng, int(rng.integers(1, 4)))], ignore_index=True)
+            index.append(data, start)
+        elif action == 1:
+            positions = rng.choice(len(data), size=int(rng.integers(1, 4)), replace=False)
+            data.loc[data.index[positions], "sold"] = pd.array(
+                rng.choice([150, 300, None], size=len(positions)), dtype="Int64"
+            )
+            index.update(data, positions, ["sold"])
+        else:
+            positions = rng.choice(len(data), size=int(rng.integers(1, 4)), replace=False)
+            data = data.drop(data.index[positions])
+            index.remove(positions)
+
+        for column in ("sold", "name"):
+            for descending in (False, True):
+                assert list(index.sortPositions(data, None, column, descending)) == fresh(
+                    data, column, descending
+                ), (step, action, column, descending)
+
+
+def test_large_update_drops_the_order():
+    data = frame(np.random.default_rng(7), 20).reset_index(drop=True)
+    index = SortIndex()
+    index.order(data, "sold")
+    index.order(data, "name")
+
+    data["sold"] = pd.array([300] * len(data), dtype="Int64")
+    index.update(data, list(range(len(data))), ["sold"])
+
+    assert "sold" not in index.orders and "name" in index.orders
+    assert list(index.order(data, "sold")) == fresh(data, "sold")
+
+
+def test_self_test():
+    sortindex.main()
@@ -0,0 +1,141 @@
+""" test_stats.py
+
+This file contains the tests of the stats behind the stats pane and the breakdown window, checked
+against plain pandas groupbys over synthetic histories as well as the hand calculated totals of the
+stats.py self test
+
+Created October 19th, 2026.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import stats
+import synthetic
+
+
+@pytest.fixture(scope="module")
+def history():
+    """ returns a synthetic history big enough for every pack and item type to appear
+    :returns: The rows, indexed by id
+    :rtype: pandas DataFrame
+    """
+
+    return synthetic.generate_frame(400, seed=7)
+
+
+def reference(data):
+    """ returns the per pack and per item type totals computed w/ groupby """
+
+    sold = data["sold"].notna()
+    revenue = data["sold"].fillna(0).astype(np.int64)
+    rows = data.assign(is_sold=sold, revenue=revenue)
+
+    packs = rows.groupby("pack_id", sort=False).agg(
+        pack_type=("pack_type", "first"),
+        items=("name", "size"),
+        sold=("is_sold", "sum"),
+        revenue=("revenue", "sum"),
+        cost=("pack_price", "first"),
+    )
+    packs["net"] = packs["revenue"] - packs["cost"]
+
+    item_type = rows.groupby("type", sort=False).agg(
+        items=("name", "size"), sold=("is_sold", "sum"), revenue=("revenue", "sum")
+    )
+
+    return packs, item_type
+
+
+def test_breakdown_matches_groupby(history):
+    parts = stats.breakdown(history, top=5)
+    packs, item_type = reference(history)
+
+    columns = ["items", "sold", "revenue", "cost", "net"]
+    pd.testing.assert_frame_equal(parts["packs"][columns], packs[columns], check_dtype=False)
+    assert list(parts["packs"]["pack_type"]) == list(packs["pack_type"])
+
+    columns = ["items", "sold", "revenue"]
+    pd.testing.assert_frame_equal(
+        parts["item_type"][columns], item_type[columns], check_dtype=False
+    )
+
+    by_type = packs.groupby("pack_type", sort=False)[["items", "cost", "net"]].sum()
+    pd.testing.assert_frame_equal(
+        parts["pack_type"][["items", "cost", "net"]], by_type, check_dtype=False, check_names=False
+    )
+
+
+def test_breakdown_reward_split(history):
+    parts = stats.breakdown(history)
+    packs, _ = reference(history)
+    reward = packs["cost"] <= 0
+
+    assert parts["reward"].loc["reward", "packs"] == reward.sum()
+    assert parts["reward"].loc["paid", "net"] == packs.loc[~reward, "net"].sum()
+    assert parts["reward"]["net"].sum() == stats.net_profit(history)
+
+
+def test_breakdown_best_and_worst(history):
+    parts = stats.breakdown(history, top=3)
+    net = reference(history)[0]["net"]
+
+    assert list(parts["best"]["net"]) == sorted(net, reverse=True)[:3]
+    assert list(parts["worst"]["net"]) == sorted(net)[:3]
+
+
+def test_breakdown_of_no_rows(history):
+    parts = stats.breakdown(history.iloc[:0])
+
+    assert len(parts["packs"]) == len(parts["best"]) == 0
+    assert parts["reward"]["packs"].sum() == 0
+
+
+def test_self_test():
+    stats.main()
+
+
+def frame_stats(data):
+    """ returns the four stats through the pandas functions """
+    return (
+        stats.total_cost(data),
+        stats.total_revenue(data),
+        stats.net_profit(data),
+        stats.avg_profit(data),
+    )
+
+
+@pytest.mark.parametrize(
+    "pick",
+    [
+        lambda data: data,
+        lambda data: data.iloc[::-1],
+        lambda data: data.sample(frac=1, random_state=3),
+        lambda data: data[data["pack_type"] == "gold"],
+        lambda data: data[data["sold"].isna()],
+        lambda data: data.iloc[:0],
+    ],
+)
+def test_kernels_match_frame_functions(history, pick):
+    data = pick(history)
+
+    assert stats.stats_kernel(*stats.arrays(data)) == frame_stats(data)
+
+
+def test_kernels_each_match(history):
+    pack_id, pack_price, sold, mask = stats.arrays(history)
+
+    assert stats.cost_kernel(pack_id, pack_price) == stats.total_cost(history)
+    assert stats.revenue_kernel(sold, mask) == stats.total_revenue(history)
+    assert stats.net_kernel(pack_id, pack_price, sold, mask) == stats.net_profit(history)
+    assert stats.avg_kernel(pack_id, pack_price, sold, mask) == stats.avg_profit(history)
+
+
+def test_pack_starts_in_drop_duplicates_order():
+    pack_id = np.array([4, 4, 2, 9, 2, 4, 9, 1])
+
+    expected = pd.Series(pack_id).drop_duplicates().index
+
+    assert list(stats.pack_starts(pack_id)) == list(expected)
+    assert list(stats.pack_starts(np.sort(pack_id))) == [0, 1, 3, 6]
@@ -0,0 +1,92 @@
+""" test_streaming.py
+
+This file contains the tests of the out of core stats: however the history is split into chunks,
+from fakedb w/ fetchmany or from a transfer file, the merged partials must give exactly what
+stats.py gives over the whole history at once
+
+Created October 19th, 2026.
+"""
+
+import numpy as np
+import pytest
+
+import fakedb
+import stats
+import streaming
+import synthetic
+
+
+@pytest.fixture(scope="module")
+def history():
+    """ returns a synthetic history, in pack order like the table and its exports """
+    return synthetic.generate_frame(300, seed=9)
+
+
+def expected(data):
+    """ returns the four stats of stats.py over every row at once """
+    return (
+        stats.total_cost(data),
+        stats.total_revenue(data),
+        stats.net_profit(data),
+        stats.avg_profit(data),
+    )
+
+
+@pytest.mark.parametrize("chunksize", [1, 7, 100, 100000])
+def test_cursor_chunks_match_stats(history, chunksize):
+    store = fakedb.FakeStore()
+    store.load(history)
+
+    cursor = store.connect().cursor()
+    total = streaming.stream_stats(streaming.cursor_chunks(cursor, store.table, chunksize))
+
+    assert total.result() == expected(history)
+    assert total.rows == len(history)
+    assert total.packs == history["pack_id"].nunique()
+
+
+@pytest.mark.parametrize("fmt", ["csv", "jsonl"])
+def test_file_chunks_match_stats(history, tmp_path, fmt):
+    path = str(tmp_path / ("history." + fmt))
+    synthetic.write_file(path, 300, seed=9)
+
+    total = streaming.stream_stats(streaming.file_chunks(path, chunksize=50))
+
+    assert total.result() == expected(history)
+
+
+def test_merge_of_any_split_matches_stats(history):
+    pack_id, pack_price, sold, mask = stats.arrays(history)
+    rng = np.random.default_rng(1)
+
+    for _ in range(20):
+        cuts = np.sort(rng.choice(np.arange(1, len(history)), size=5, replace=False))
+        bounds = [0, *cuts, len(history)]
+        partials = [
+            streaming.PartialStats.fold(
+                pack_id[lo:hi], pack_price[lo:hi], sold[lo:hi], mask[lo:hi]
+            )
+            for lo, hi in zip(bounds, bounds[1:])
+        ]
+
+        total = streaming.PartialStats()
+        for partial in partials:
+            total = total.merge(partial)
+
+        assert total.result() == expected(history)
+
+
+def test_rows_out_of_pack_order_are_rejected(history):
+    pack_id, pack_price, sold, mask = stats.arrays(history.iloc[::-1])
+
+    with pytest.raises(ValueError):
+        streaming.PartialStats.fold(pack_id, pack_price, sold, mask)
+
+    later = streaming.PartialStats.fold(*stats.arrays(history.iloc[100:]))
+    earlier = streaming.PartialStats.fold(*stats.arrays(history.iloc[:100]))
+    with pytest.raises(ValueError):
+        later.merge(earlier)
+
+
+def test_no_rows():
+    assert streaming.stream_stats([]).result() == (0, 0, 0, 0)
@@ -0,0 +1,67 @@
+""" test_synthetic.py
+
+This file contains the tests of the synthetic history generator: the same seed gives the same rows,
+the rows pass the import rules, and the transfer files and backend writes hold exactly those rows
+
+Created October 19th, 2026.
+"""
+
+import pandas as pd
+
+import synthetic
+import transfer
+from tracker import PackTracker, SQLBackend
+
+
+def test_same_seed_same_rows():
+    first = synthetic.generate_frame(300, seed=4)
+    again = synthetic.generate_frame(300, seed=4)
+    other = synthetic.generate_frame(300, seed=5)
+
+    pd.testing.assert_frame_equal(first, again)
+    assert not first.equals(other)
+
+
+def test_rows_pass_import_rules():
+    chunk = synthetic.generate_frame(500, seed=1).reset_index()
+
+    _, errors = transfer.validate_chunk(chunk)
+
+    assert errors == {}
+
+
+def test_write_file_jsonl_has_no_blank_lines(tmp_path, monkeypatch):
+    # small blocks, so the file is written in several
+    monkeypatch.setattr(synthetic, "BLOCK_PACKS", 40)
+    path = tmp_path / "history.jsonl"
+
+    written = synthetic.write_file(str(path), 100, seed=2)
+
+    lines = path.read_text().split("\n")
+    assert lines[-1] == "" and "" not in lines[:-1]
+    assert len(lines) - 1 == written
+
+
+def test_write_file_round_trips(tmp_path, monkeypatch):
+    monkeypatch.setattr(synthetic, "BLOCK_PACKS", 40)
+    expected = synthetic.generate_frame(100, seed=3).reset_index()
+
+    for fmt in ("csv", "jsonl"):
+        path = str(tmp_path / ("history." + fmt))
+        synthetic.write_file(path, 100, seed=3)
+        read = pd.concat(transfer.read_chunks(path), ignore_index=True)
+
+        assert list(read["id"]) == list(expected["id"])
+        assert list(read["name"]) == list(expected["name"])
+
+
+def test_write_backend(store):
+    store.keeper.execute("DELETE FROM " + store.table)
+    store.keeper.commit()
+    backend = SQLBackend(store.connect())
+
+    written = synthetic.write_backend(backend, 120, seed=6)
+
+    assert written == store.count()
+    loaded = PackTracker(backend).data
+    pd.testing.assert_frame_equal(loaded, synthetic.generate_frame(120, seed=6), check_dtype=False)
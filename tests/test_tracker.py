@@ -0,0 +1,182 @@
+""" test_tracker.py
+
+This file contains the tests of PackTracker's mutations. Each one checks the change reached both the
+loaded data and the fakedb store, that invalid input raises before either is touched, and that the
+cached sort orders still agree w/ sorting the data from scratch
+
+Created October 19th, 2026.
+"""
+
+import pandas as pd
+import pytest
+
+from tracker import PackTracker, SQLBackend
+
+
+def stored(store, id):
+    """ returns the row w/ an id as the store holds it, or None """
+    return store.keeper.execute("SELECT * FROM " + store.table + " WHERE id = ?", (id,)).fetchone()
+
+
+def assert_sorted(tracker, column, descending=False):
+    """ checks the cached order of a column against a fresh stable sort of the data """
+
+    expected = tracker.data.sort_values(
+        column, ascending=not descending, kind="stable", na_position="last"
+    ).index
+    if descending:
+        # sort_values reverses ties when descending, the tracker keeps them in table order
+        keys = tracker.data[column]
+        expected = sorted(
+            tracker.data.index,
+            key=lambda id: (pd.isna(keys[id]), 0 if pd.isna(keys[id]) else -keys[id]),
+        )
+
+    assert list(tracker.sortRows(tracker.data.index, column, descending)) == list(expected)
+
+
+def test_postSale(tracker, store):
+    tracker.postSale(3, 340)
+
+    assert tracker.data.at[3, "sold"] == 340
+    assert stored(store, 3)[-1] == 340
+
+
+def test_postSale_rejects_deleted_id(tracker, store):
+    tracker.postDeletion(3)
+
+    with pytest.raises(ValueError):
+        tracker.postSale(3, 200)
+
+    assert 3 not in tracker.data.index
+    assert len(tracker.data) == 9
+    tracker.calcStats()
+
+
+def test_postSale_rejects_price_above_bin(tracker, store):
+    with pytest.raises(ValueError):
+        tracker.postSale(3, 1000000)
+
+    assert pd.isna(tracker.data.at[3, "sold"])
+    assert stored(store, 3)[-1] is None
+
+
+def test_postSales_writes_nothing_if_any_is_invalid(tracker, store):
+    with pytest.raises(ValueError):
+        tracker.postSales([(0, 200), (42, 200)])
+
+    assert pd.isna(tracker.data.at[0, "sold"])
+    assert stored(store, 0)[-1] is None
+
+
+def test_postEdit(tracker, store):
+    tracker.postEdit(1, [9, 500, "gold", "emily", "player", 200, 400, "350"])
+
+    assert list(tracker.data.loc[1]) == [9, 500, "gold", "emily", "player", 200, 400, 350]
+    assert stored(store, 1) == (1, 9, 500, "gold", "emily", "player", 200, 400, 350)
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        [9, 500, "gold", "emily", "player", 200, 400, 500],
+        [9, 500, "plastic", "emily", "player", 200, 400, None],
+        [9, 500, "gold", "", "player", 200, 400, None],
+        [9, 500, "gold", "emily", "player", 500, 400, None],
+        [9, 500, "gold", "emily", "player", 200, 400],
+    ],
+)
+def test_postEdit_rejects(tracker, store, data):
+    before = tracker.data.copy()
+
+    with pytest.raises(ValueError):
+        tracker.postEdit(1, data)
+
+    pd.testing.assert_frame_equal(tracker.data, before)
+    assert stored(store, 1) == (1, 1, 353, "bronze", "emily", "player", 250, 300, None)
+
+
+def test_postEdit_rejects_deleted_id(tracker):
+    tracker.postDeletion(1)
+
+    with pytest.raises(ValueError):
+        tracker.postEdit(1, [9, 500, "gold", "emily", "player", 200, 400, None])
+
+    assert 1 not in tracker.data.index
+
+
+def test_postBulkEdit(tracker, store):
+    tracker.postBulkEdit([0, 1, 9], "pack_type", "gold")
+    tracker.postBulkEdit([0, 1], "sold", "300")
+    tracker.postBulkEdit([1], "sold", "")
+
+    assert list(tracker.data.loc[[0, 1, 9], "pack_type"]) == ["gold"] * 3
+    assert tracker.data.at[0, "sold"] == 300 and pd.isna(tracker.data.at[1, "sold"])
+    assert stored(store, 0)[3] == "gold" and stored(store, 0)[-1] == 300
+    assert stored(store, 1)[-1] is None
+
+
+@pytest.mark.parametrize(
+    "column, value",
+    [("name", "bob"), ("pack_type", "plastic"), ("sold", "-1"), ("sold", "301"), ("sold", "x")],
+)
+def test_postBulkEdit_rejects(tracker, store, column, value):
+    before = tracker.data.copy()
+
+    with pytest.raises(ValueError):
+        tracker.postBulkEdit([0, 6], column, value)
+
+    pd.testing.assert_frame_equal(tracker.data, before)
+
+
+def test_postBulkDeletion(tracker, store):
+    tracker.postBulkDeletion([2, 5, 6])
+
+    assert list(tracker.data.index) == [0, 1, 3, 4, 7, 8, 9]
+    assert store.count() == 7
+    assert stored(store, 5) is None
+
+
+def test_mutations_bump_version(tracker):
+    version = tracker.version
+    tracker.filterPack(6)
+
+    tracker.postSale(7, 200)
+
+    assert tracker.version > version
+    assert list(tracker.filterPack(6)) == [5, 6, 7]
+
+
+def test_postData_appends_pack(tracker, store):
+    pack_id = tracker.postData([["zoe", "player", 150, 300]], 0, "gold", 5000)
+
+    added = tracker.data[tracker.data["pack_id"] == pack_id]
+    assert list(added["name"]) == ["zoe"]
+    assert store.count() == 11
+
+
+def test_reload_matches_patched_data(tracker, store):
+    tracker.postSale(0, 250)
+    tracker.postEdit(4, [4, 2500, "silver", "chris", "healing", 150, 400, None])
+    tracker.postBulkEdit([8, 9], "type", "contract")
+    tracker.postDeletion(2)
+
+    reloaded = PackTracker(SQLBackend(store.connect()))
+
+    pd.testing.assert_frame_equal(tracker.data, reloaded.data, check_dtype=False)
+
+
+@pytest.mark.parametrize("descending", [False, True])
+def test_sort_orders_follow_mutations(tracker, descending):
+    for column in ("sold", "bin", "pack_id"):
+        tracker.sortRows(tracker.data.index, column, descending)
+
+    tracker.postSale(0, 100)
+    tracker.postSales([(1, 300), (9, 150)])
+    tracker.postEdit(3, [3, 300, "gold", "tk", "player", 300, 1600, 1600])
+    tracker.postBulkEdit([4, 7], "sold", "300")
+    tracker.postDeletion(5)
+    tracker.postData([["zoe", "player", 150, 300]], 0, "gold", 5000)
+
+    for column in ("sold", "bin", "pack_id"):
+        assert_sorted(tracker, column, descending)
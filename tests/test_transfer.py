@@ -0,0 +1,116 @@
+""" test_transfer.py
+
+This file contains the tests of importing and exporting pack history. Exports of the fakedb table
+are imported into an empty one in both formats, and files breaking each import rule must be rejected
+w/o loading any of their rows
+
+Created October 19th, 2026.
+"""
+
+import pandas as pd
+import pytest
+
+import fakedb
+import transfer
+from config import COLUMNS
+from tracker import PackTracker, SQLBackend
+
+
+def empty_store():
+    """ returns a store w/ an empty table """
+    return fakedb.FakeStore()
+
+
+def write_csv(path, rows):
+    """ writes rows in COLUMNS order to a csv transfer file """
+    pd.DataFrame(rows, columns=COLUMNS).to_csv(path, index=False)
+
+
+@pytest.mark.parametrize("fmt", ["csv", "jsonl"])
+def test_export_import_round_trip(store, tmp_path, fmt):
+    path = str(tmp_path / ("history." + fmt))
+
+    written = transfer.export_history(store.connect().cursor(), path, chunksize=3)
+
+    target = empty_store()
+    loaded = transfer.import_history(target.connect(), path, chunksize=4)
+
+    assert written == loaded == 10
+    pd.testing.assert_frame_equal(
+        PackTracker(SQLBackend(target.connect())).data,
+        PackTracker(SQLBackend(store.connect())).data,
+    )
+
+
+@pytest.mark.parametrize(
+    "row, message",
+    [
+        ((10, 9, 400, "gold", "b@d", "player", 150, 300, None), "invalid name characters"),
+        ((10, 9, 400, "gold", "", "player", 150, 300, None), "empty name"),
+        ((10, 9, 400, "gold", "x" * 25, "player", 150, 300, None), "name longer than 24"),
+        ((10, 9, 400, "plastic", "zoe", "player", 150, 300, None), "unknown pack type"),
+        ((10, 9, 400, "gold", "zoe", "trainer", 150, 300, None), "unknown item type"),
+        ((10, 9, 400, "gold", "zoe", "player", 100, 300, None), "bid less than 150"),
+        ((10, 9, 400, "gold", "zoe", "player", 150, 199, None), "bin less than 200"),
+        ((10, 9, 400, "gold", "zoe", "player", 350, 300, None), "bid greater than bin"),
+        ((10, 9, 400, "gold", "zoe", "player", 150, 300, -5), "negative sale price"),
+        ((10, 9, 400, "gold", "zoe", "player", 150, 300, 301), "sale price greater than bin"),
+        ((10, 9, 400, "gold", "zoe", "player", "lots", 300, None), "bid is not an integer"),
+        ((10, 9, 400, "gold", "zoe", "player", 150, 300.5, None), "bin is not an integer"),
+    ],
+)
+def test_invalid_rows_reject_the_whole_file(tmp_path, row, message):
+    path = str(tmp_path / "history.csv")
+    valid = (11, 9, 400, "gold", "ann", "player", 150, 300, 200)
+    write_csv(path, [valid, row])
+    target = empty_store()
+
+    with pytest.raises(ValueError) as e:
+        transfer.import_history(target.connect(), path)
+
+    assert "row 2: " + message in str(e.value)
+    assert target.count() == 0
+
+
+def test_duplicate_ids_are_rejected(tmp_path):
+    path = str(tmp_path / "history.csv")
+    write_csv(path, [(10, 9, 400, "gold", "zoe", "player", 150, 300, None)] * 2)
+
+    _, errors = transfer.validate_chunk(next(transfer.read_chunks(path)))
+
+    assert errors == {0: "duplicate id", 1: "duplicate id"}
+
+
+def test_missing_columns_are_rejected(tmp_path):
+    path = str(tmp_path / "history.csv")
+    pd.DataFrame({"id": [1], "name": ["zoe"]}).to_csv(path, index=False)
+
+    with pytest.raises(ValueError, match="missing columns"):
+        transfer.import_history(empty_store().connect(), path)
+
+
+def test_failed_insert_rolls_back_every_chunk(store, tmp_path):
+    # the second chunk collides w/ an id already in the table, after the first was inserted
+    path = str(tmp_path / "history.csv")
+    write_csv(
+        path,
+        [(10 + i, 9, 400, "gold", "zoe", "player", 150, 300, None) for i in range(3)]
+        + [(0, 9, 400, "gold", "zoe", "player", 150, 300, None)],
+    )
+
+    with pytest.raises(fakedb.Error):
+        transfer.import_history(store.connect(), path, chunksize=3)
+
+    assert store.count() == 10
+
+
+def test_unsold_rows_import_as_null(tmp_path):
+    path = str(tmp_path / "history.jsonl")
+    pd.DataFrame(
+        [(1, 1, 400, "gold", "zoe", "player", 150, 300, None)], columns=COLUMNS
+    ).to_json(path, orient="records", lines=True)
+    target = empty_store()
+
+    transfer.import_history(target.connect(), path)
+
+    assert target.keeper.execute("SELECT sold FROM " + target.table).fetchone() == (None,)
@@ -0,0 +1,98 @@
+""" test_viewcache.py
+
+This file contains the tests of the versioned cache of filtered rows and stats: entries are only
+returned for the version they were computed at, the least recently used are evicted first, and the
+tracker's cached filters never outlive a change to its data
+
+Created October 19th, 2026.
+"""
+
+from viewcache import ViewCache
+
+
+class Counter:
+    """ A compute function that counts how often it runs """
+
+    def __init__(self, value):
+        self.value = value
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return self.value
+
+
+def test_hit_at_same_version_only():
+    cache = ViewCache(size=4)
+    compute = Counter("rows")
+
+    assert cache.get(("pack", 1), 0, compute) == "rows"
+    assert cache.get(("pack", 1), 0, compute) == "rows"
+    assert compute.calls == 1
+
+    cache.get(("pack", 1), 1, compute)
+
+    assert compute.calls == 2
+    assert cache.summary()["hits"] == 1 and cache.summary()["misses"] == 2
+    assert len(cache.entries) == 1
+
+
+def test_least_recently_used_is_evicted():
+    cache = ViewCache(size=2)
+    cache.get("a", 0, Counter(1))
+    cache.get("b", 0, Counter(2))
+    cache.get("a", 0, Counter(1))
+    cache.get("c", 0, Counter(3))
+
+    assert list(cache.entries) == ["a", "c"]
+    assert cache.evictions == 1
+
+
+def test_clear_keeps_counts():
+    cache = ViewCache()
+    cache.get("a", 0, Counter(1))
+    cache.get("a", 0, Counter(1))
+
+    cache.clear()
+
+    assert len(cache.entries) == 0
+    assert cache.hitRate() == 0.5
+
+
+def test_tracker_filters_follow_mutations(tracker):
+    assert list(tracker.filterType("gold")) == [3]
+    assert list(tracker.filterPack(1)) == [0, 1]
+
+    tracker.postBulkEdit([0, 1], "pack_type", "gold")
+    tracker.postDeletion(1)
+
+    assert list(tracker.filterType("gold")) == [0, 3]
+    assert list(tracker.filterPack(1)) == [0]
+
+
+def test_tracker_stats_cached_per_filter(tracker):
+    rows = tracker.data.loc[tracker.filterPack(6)]
+    first = tracker.calcStats(rows, ("pack", 6))
+    misses = tracker.cache.misses
+
+    assert tracker.calcStats(rows, ("pack", 6)) == first
+    assert tracker.cache.misses == misses
+
+    tracker.postSale(7, 300)
+
+    rows = tracker.data.loc[tracker.filterPack(6)]
+    assert tracker.calcStats(rows, ("pack", 6)) != first
+
+
+def test_stats_of_stale_rows_are_not_cached_as_current(tracker):
+    version = tracker.version
+    stale = tracker.data.loc[tracker.filterPack(6)]
+
+    # the worker read the rows, then a sale landed before it got to the stats
+    tracker.postSale(7, 300)
+    tracker.calcStats(stale, ("pack", 6), version)
+
+    current = tracker.data.loc[tracker.filterPack(6)]
+
+    assert tracker.calcStats(current, ("pack", 6)) == tracker.calcStats(current)
+    assert tracker.calcStats(current, ("pack", 6)) != tracker.calcStats(stale)
@@ -0,0 +1,114 @@
+""" test_worker.py
+
+This file contains the tests of the latest-wins worker. A fake root stands in for tk, running the
+callbacks given to after when pumped, so results are delivered on the test thread like they would
+be on the tk thread
+
+Created October 19th, 2026.
+"""
+
+import threading
+import time
+
+import pytest
+
+from worker import LatestWorker
+
+
+class FakeRoot:
+    """ Queues the callbacks given to after, pump runs them like the tk event loop would """
+
+    def __init__(self):
+        self.pending = []
+
+    def after(self, ms, func):
+        self.pending.append(func)
+
+    def pump(self, timeout=5.0):
+        """ runs callbacks until none are scheduled """
+
+        deadline = time.monotonic() + timeout
+        while self.pending:
+            assert time.monotonic() < deadline, "the worker never went idle"
+            func = self.pending.pop(0)
+            time.sleep(0.001)
+            func()
+
+
+@pytest.fixture
+def root():
+    return FakeRoot()
+
+
+@pytest.fixture
+def worker(root):
+    worker = LatestWorker(root, poll=0.001)
+    yield worker
+    worker.stop()
+
+
+def test_result_is_delivered_then_polling_stops(root, worker):
+    got = []
+    worker.submit(lambda a, b: a + b, (2, 3), done=got.append)
+
+    root.pump()
+
+    assert got == [5]
+    assert not worker.busy() and not worker.polling
+
+
+def test_only_the_newest_of_a_burst_is_delivered(root, worker):
+    release = threading.Event()
+    started = threading.Event()
+    ran, got = [], []
+
+    def slow(name):
+        started.set()
+        release.wait(5)
+        ran.append(name)
+        return name
+
+    def quick(name):
+        ran.append(name)
+        return name
+
+    first = worker.submit(slow, ("first",), done=got.append)
+    started.wait(5)
+    for name in ("second", "third", "fourth"):
+        last = worker.submit(quick, (name,), done=got.append)
+
+    assert not worker.current(first) and worker.current(last)
+
+    release.set()
+    root.pump()
+
+    # the running request finished but was superseded, the waiting ones were dropped
+    assert ran == ["first", "fourth"]
+    assert got == ["fourth"]
+
+
+def test_errors_go_to_failed(root, worker):
+    errors = []
+
+    def broken():
+        raise ValueError("bad filter")
+
+    worker.submit(broken, done=pytest.fail, failed=errors.append)
+    root.pump()
+
+    assert len(errors) == 1 and str(errors[0]) == "bad filter"
+
+
+def test_error_w_o_failed_raises_on_delivery(root, worker):
+    worker.submit(lambda: 1 / 0)
+
+    with pytest.raises(ZeroDivisionError):
+        root.pump()
+
+
+def test_stop_ends_the_thread(root):
+    worker = LatestWorker(root, poll=0.001)
+    worker.stop()
+    worker.thread.join(5)
+
+    assert not worker.thread.is_alive()
@@ -0,0 +1,963 @@
+""" tracker.py
+
+This file contains the headless core of the pack tracker. It owns the pack data, the lookups
+built on it and the storage backend, so it can run without a GUI. Run it as a command line
+tool w/ python -m tracker. The database settings and app wide constants live in config.py
+
+This file contains classes:
+    * SQLBackend - Class for reading and writing the pack table through a DB-API connection
+    * PackTracker - Class holding the pack data and every operation on it
+
+This file contains methods:
+    Global Methods:
+        * connect( driver, server, database, trust ) - opens a connection to the MSSQL database
+        * check_edit( data ) - validates and casts the new values of a row
+        * check_bulk( column, value, bins ) - validates and casts a value for a bulk edit
+        * format_money( value ) - formats a value the way the stats pane shows it
+        * main( ) - command line entry point
+
+    Members of Class SQLBackend:
+        * __init__( self, conn, table, autocommit ) - wraps a connection
+        * commit( self ) - commits the last write unless the caller commits
+        * fetchAll( self ) - returns every row of the table
+        * insertRows( self, rows ) - inserts rows and commits
+        * updateSale( self, id, sale_price ) - sets the sale price of a row and commits
+        * updateSales( self, sales ) - sets the sale prices of many rows and commits once
+        * updateRow( self, id, data ) - sets every column of a row and commits
+        * deleteRows( self, ids ) - deletes rows and commits
+        * updateRows( self, ids, column, value ) - sets one column of many rows and commits
+
+    Members of Class PackTracker:
+        * __init__( self, backend ) - loads the data from the backend
+        * loadData( self, rows ) - loads the data into a pandas DF from the backend, or from rows given
+        * bumpVersion( self ) - marks the data changed so no cached view of it is returned
+        * setCounters( self ) - sets the next free row and pack ids
+        * packIds( self, index ) - returns the unique pack ids in a set of rows
+        * packTypes( self, index ) - returns the unique pack types in a set of rows
+        * packKinds( self ) - returns the pack type of every pack
+        * filterPack( self, pack_id ) - returns the rows of one pack
+        * filterType( self, pack_type ) - returns the rows of one pack type
+        * findRows( self, name ) - returns the rows whose name matches
+        * sortRows( self, rows, column, descending ) - returns a set of rows sorted by a column
+        * view( self, rows, columns ) - returns a RowView of some rows w/o copying them
+        * sortView( self, view, column, descending ) - returns a RowView sorted by a column
+        * addPack( self, data, qs_price, pack_type, reward ) - prices and posts a newly opened pack
+        * postData( self, data, qs_price, pack_type, pack_price ) - posts a pack of items
+        * appendRows( self, rows ) - appends full rows to the data
+        * checkIds( self, ids ) - raises for ids not in the data
+        * checkSales( self, sales ) - validates and casts sales before they are posted
+        * postSale( self, id, sale_price ) - posts the sale price of a row
+        * postSales( self, sales ) - posts the sale prices of many rows at once
+        * postEdit( self, id, data ) - posts new values for every column of a row
+        * postDeletion( self, id ) - posts the deletion of a row
+        * postBulkDeletion( self, ids ) - posts the deletion of a set of rows
+        * postBulkEdit( self, ids, column, value ) - posts one column value for a set of rows
+        * calcStats( self, data, key, version ) - calculates the formatted stats of a set of rows
+        * packReport( self, data ) - calculates cost, revenue and net for each pack
+        * breakdown( self, data, top ) - breaks profit down by pack, pack type, item type and reward
+
+Created October 19th, 2026.
+"""
+
+import argparse
+
+import pandas as pd
+
+import metrics
+import parallel
+import querylog
+import stats
+from rowview import RowView
+from sortindex import SortIndex
+from viewcache import ViewCache
+from config import (
+    DRIVER,
+    SERVER,
+    DATABASE,
+    TABLE,
+    MAX_PARAMS,
+    COLUMNS,
+    PACKS,
+    TYPES,
+    BULK_COLUMNS,
+    validate_listing,
+)
+
+# what each error code of validate_listing means, worded like transfer.validate_chunk
+LISTING_ERRORS = {
+    0: "invalid name characters",
+    -1: "empty name",
+    -2: "bid less than 150",
+    -3: "bin less than 200",
+    -4: "name longer than 24 characters",
+    -5: "negative quick sell price",
+    -6: "bid and bin must be integers",
+    -7: "bid greater than bin",
+}
+
+
+def connect(driver=DRIVER, server=SERVER, database=DATABASE, trust="yes"):
+    """ connects to the MSSQL database
+    :param driver: the driver name of the sql server
+    :type driver: String
+    :param server: the name of the sql server
+    :type server: String
+    :param database: the name of the sql database
+    :type database: String
+    :param trust: whether to trust the connection
+    :type trust: String
+    :returns: the connection object for db interaction
+    :rtype: querylog LoggedConnection
+    """
+
+    import pyodbc
+
+    # every statement made through the connection is timed in querylog.QUERIES
+    return querylog.wrap(
+        pyodbc.connect(
+            driver=driver, server=server, database=database, Trusted_Connection=trust
+        )
+    )
+
+
+def check_edit(data):
+    """ validates the new values of a row against the rules the dialogs and imports enforce, and
+        casts them to the types of their columns
+    :param data: The values of pack_id, pack_price, pack_type, name, type, bid, bin, and sold
+    :type data: List
+    :returns: The cast values, w/ a blank or None sold as None
+    :rtype: List
+    :raises ValueError: If any value is invalid
+    """
+
+    if len(data) != len(COLUMNS) - 1:
+        raise ValueError("expected %d values, got %d" % (len(COLUMNS) - 1, len(data)))
+
+    pack_id, pack_price, pack_type, name, item_type, bid, bin, sold = data
+
+    try:
+        pack_id, pack_price = int(pack_id), int(pack_price)
+        sold = None if sold is None or str(sold).strip() == "" else int(sold)
+    except (TypeError, ValueError):
+        raise ValueError("pack_id, pack_price, and sold must be integers")
+
+    if pack_type not in PACKS:
+        raise ValueError("unknown pack type %s" % pack_type)
+    if item_type not in TYPES:
+        raise ValueError("unknown item type %s" % item_type)
+    if not isinstance(name, str):
+        raise ValueError("name must be a string")
+
+    try:
+        code = validate_listing([[name, item_type, bid, bin]], 0)
+    except TypeError:
+        code = -6
+    if code != 1:
+        raise ValueError(LISTING_ERRORS[code])
+
+    bid, bin = int(bid), int(bin)
+    if sold is not None and sold < 0:
+        raise ValueError("negative sale price")
+    if sold is not None and sold > bin:
+        raise ValueError("sale price greater than bin")
+
+    return [pack_id, pack_price, pack_type, name, item_type, bid, bin, sold]
+
+
+def check_bulk(column, value, bins):
+    """ validates a value set on many rows at once, and casts it to the type of its column
+    :param column: The column to set
+    :type column: String
+    :param value: The new value, a blank or None sold clears the sale
+    :type value: String, Integer, or None
+    :param bins: The buy it now prices of the rows, no sale may be greater than them
+    :type bins: pandas Series
+    :returns: The cast value
+    :rtype: String, Integer, or None
+    :raises ValueError: If the column may not be bulk edited or the value is invalid
+    """
+
+    if column not in BULK_COLUMNS:
+        raise ValueError("cannot bulk edit column %s" % column)
+    if column == "pack_type" and value not in PACKS:
+        raise ValueError("unknown pack type %s" % value)
+    if column == "type" and value not in TYPES:
+        raise ValueError("unknown item type %s" % value)
+
+    if column != "sold" or value is None or str(value).strip() == "":
+        return None if column == "sold" else value
+
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        raise ValueError("sold must be an integer")
+    if value < 0:
+        raise ValueError("negative sale price")
+    if (bins < value).any():
+        raise ValueError("sale price greater than bin")
+
+    return value
+
+
+class SQLBackend:
+    """ Reads and writes the pack table through any DB-API connection using qmark parameters
+
+        __init__( self, conn, table, autocommit )
+        conn - an open database connection
+        table - (Default TABLE) the name of the pack table
+        autocommit - (Default True) whether each write commits, otherwise the caller commits
+    """
+
+    def __init__(self, conn, table=TABLE, autocommit=True):
+
+        self.conn = conn
+        self.cursor = conn.cursor()
+        self.table = table
+        self.autocommit = autocommit
+
+    def commit(self):
+        """ commits the last write if this backend commits its own writes
+        :returns: None
+        :rtype: None
+        """
+
+        if self.autocommit:
+            self.conn.commit()
+
+        return
+
+    def fetchAll(self):
+        """ returns every row of the table
+        :returns: The rows in COLUMNS order
+        :rtype: List of tuples
+        """
+
+        self.cursor.execute("SELECT " + ",".join(COLUMNS) + " FROM " + self.table)
+
+        return list(self.cursor)
+
+    def insertRows(self, rows):
+        """ inserts rows into the table w/ one batched statement and commits once
+        :param rows: The rows to insert, in COLUMNS order w/o the sold column
+        :type rows: List of tuples
+        :returns: None
+        :rtype: None
+        """
+
+        query = (
+            "INSERT INTO "
+            + self.table
+            + "(id,pack_id,pack_price,pack_type,name,type,bid,bin) VALUES (?,?,?,?,?,?,?,?)"
+        )
+
+        # pyodbc sends a whole parameter array per round trip when this is set
+        if hasattr(self.cursor, "fast_executemany"):
+            self.cursor.fast_executemany = True
+
+        self.cursor.executemany(query, rows)
+        self.commit()
+
+        return
+
+    def updateSale(self, id, sale_price):
+        """ updates the sale price of a row in the table and commits
+        :param id: the primary key of the row to update
+        :type id: Integer
+        :param sale_price: The sale price to store in the database
+        :type sale_price: Integer
+        :returns: None
+        :rtype: None
+        """
+
+        query = "UPDATE " + self.table + " SET sold = (?) WHERE id = (?)"
+        self.cursor.execute(query, (sale_price, id))
+        self.commit()
+
+        return
+
+    def updateSales(self, sales):
+        """ updates the sale prices of many rows w/ one batched statement and commits once
+        :param sales: The sales, each as ( id, sale_price )
+        :type sales: List of tuples
+        :returns: None
+        :rtype: None
+        """
+
+        query = "UPDATE " + self.table + " SET sold = (?) WHERE id = (?)"
+        self.cursor.executemany(query, [(price, id) for id, price in sales])
+        self.commit()
+
+        return
+
+    def updateRow(self, id, data):
+        """ sets every column of a row and commits
+        :param id: The id of the row to alter
+        :type id: Integer
+        :param data: The new data values
+        :type data: List of types (int, int, string, string, string, int, int, int)
+        :returns: None
+        :rtype: None
+        """
+
+        query = (
+            "UPDATE "
+            + self.table
+            + " SET pack_id=(?),"
+            + "pack_price=(?),"
+            + "pack_type=(?),"
+            + "name=(?),"
+            + "type=(?),"
+            + "bid=(?),"
+            + "bin=(?),"
+            + "sold=(?)"
+            + "WHERE id = (?)"
+        )
+
+        self.cursor.execute(query, tuple(data[:8]) + (id,))
+        self.commit()
+
+        return
+
+    def deleteRows(self, ids):
+        """ deletes a set of rows from the table and commits once
+        :param ids: The primary keys of the rows to delete
+        :type ids: List of Integers
+        :returns: None
+        :rtype: None
+        """
+
+        for start in range(0, len(ids), MAX_PARAMS):
+            chunk = [int(id) for id in ids[start : start + MAX_PARAMS]]
+            query = (
+                "DELETE FROM "
+                + self.table
+                + " WHERE id IN ("
+                + ",".join("?" * len(chunk))
+                + ")"
+            )
+            self.cursor.execute(query, chunk)
+        self.commit()
+
+        return
+
+    def updateRows(self, ids, column, value):
+        """ sets a single column for a set of rows in the table and commits once
+        :param ids: The primary keys of the rows to alter
+        :type ids: List of Integers
+        :param column: The column to set, one of BULK_COLUMNS
+        :type column: String
+        :param value: The new value, None stores NULL
+        :type value: String, Integer, or None
+        :returns: None
+        :rtype: None
+        """
+
+        # the column name is concatenated into the query so only allow known columns
+        if column not in BULK_COLUMNS:
+            raise ValueError("cannot bulk edit column %s" % column)
+
+        for start in range(0, len(ids), MAX_PARAMS):
+            chunk = [int(id) for id in ids[start : start + MAX_PARAMS]]
+            query = (
+                "UPDATE "
+                + self.table
+                + " SET "
+                + column
+                + " = (?) WHERE id IN ("
+                + ",".join("?" * len(chunk))
+                + ")"
+            )
+            self.cursor.execute(query, [value] + chunk)
+        self.commit()
+
+        return
+
+
+class PackTracker:
+    """ The pack data, the lookups over it, and every operation that changes it. Mutations are
+        written to the backend and patched into the loaded data, so the data never needs a reload.
+        Lookups and stats are cached against the version of the data, which every mutation bumps
+
+        __init__( self, backend )
+        backend - the storage the data is loaded from and written to, such as a SQLBackend
+    """
+
+    def __init__(self, backend):
+
+        self.backend = backend
+        self.version = 0
+        self.cache = ViewCache(name="tracker.cache")
+        self.sorts = SortIndex(name="tracker.sort")
+
+        self.loadData()
+        self.setCounters()
+
+    @metrics.timed("tracker.loadData")
+    def loadData(self, rows=None):
+        """ loads the data from the backend into a pandas DataFrame
+        :param rows: (Default None) Rows already fetched from the backend, None fetches them
+        :type rows: List of tuples or None
+        :returns: None
+        :rtype: None
+        """
+
+        if rows is None:
+            rows = self.backend.fetchAll()
+
+        # make a data frame from the rows, stripping off all whitespace
+        records = pd.DataFrame.from_records(rows, columns=COLUMNS)
+        self.data = records.apply(lambda x: x.str.strip() if x.dtype in ("object", "str") else x)
+        self.data.set_index("id", inplace=True)
+        self.data[["sold"]] = self.data[["sold"]].astype("Int64")
+        self.sorts.clear()
+        self.bumpVersion()
+
+        return
+
+    def bumpVersion(self):
+        """ marks the data changed, every cached lookup and stat of an older version goes stale
+        :returns: None
+        :rtype: None
+        """
+
+        self.version += 1
+
+        return
+
+    def setCounters(self):
+        """ sets the next free row and pack ids from the loaded data
+        :returns: None
+        :rtype: None
+        """
+
+        try:
+            self.curr_pack_id = self.data["pack_id"].unique().max() + 1
+            self.curr_id = self.data.index.unique().max() + 1
+        except ValueError:
+            self.curr_pack_id = 1
+            self.curr_id = 1
+
+        return
+
+    def packIds(self, index=None):
+        """ returns the unique pack ids in a set of rows, in table order
+        :param index: (Default None) The rows to look at, None looks at all rows
+        :type index: pandas Index or None
+        :returns: The pack ids
+        :rtype: numpy array
+        """
+
+        if index is None:
+            return self.cache.get(("pack ids",), self.version, lambda: self.data["pack_id"].unique())
+
+        return pd.unique(self.data["pack_id"].to_numpy()[self.data.index.get_indexer(index)])
+
+    def packTypes(self, index=None):
+        """ returns the unique pack types in a set of rows, in table order
+        :param index: (Default None) The rows to look at, None looks at all rows
+        :type index: pandas Index or None
+        :returns: The pack types
+        :rtype: numpy array
+        """
+
+        if index is None:
+            return self.cache.get(
+                ("pack types",), self.version, lambda: self.data["pack_type"].unique()
+            )
+
+        return pd.unique(self.data["pack_type"].to_numpy()[self.data.index.get_indexer(index)])
+
+    def packKinds(self):
+        """ returns the pack type of every pack, the type of its first row
+        :returns: The pack types, keyed by pack id
+        :rtype: Dictionary
+        """
+
+        def kinds():
+            first = ~self.data["pack_id"].duplicated()
+            return dict(zip(self.data["pack_id"][first], self.data["pack_type"][first]))
+
+        return self.cache.get(("pack kinds",), self.version, kinds)
+
+    def filterPack(self, pack_id):
+        """ returns the rows belonging to one pack
+        :param pack_id: The pack to filter on
+        :type pack_id: Integer
+        :returns: The ids of the matching rows
+        :rtype: pandas Index
+        """
+
+        return self.cache.get(
+            ("pack", pack_id),
+            self.version,
+            lambda: self.data[self.data["pack_id"] == pack_id].index,
+        )
+
+    def filterType(self, pack_type):
+        """ returns the rows opened from one type of pack
+        :param pack_type: The pack type to filter on
+        :type pack_type: String
+        :returns: The ids of the matching rows
+        :rtype: pandas Index
+        """
+
+        return self.cache.get(
+            ("type", str(pack_type)),
+            self.version,
+            lambda: self.data[self.data["pack_type"].str.match(str(pack_type))].index,
+        )
+
+    def findRows(self, name):
+        """ returns the rows whose player name matches
+        :param name: The name, or start of the name, to match
+        :type name: String
+        :returns: The ids of the matching rows
+        :rtype: pandas Index
+        """
+
+        return self.data[self.data["name"].str.match(name)].index
+
+    def sortRows(self, rows, column, descending=False):
+        """ returns a set of rows sorted by a column, w/ ties in table order and missing values last.
+            The order of every row is cached and kept up to date, so this never sorts the rows
+        :param rows: The ids of the rows to sort
+        :type rows: pandas Index
+        :param column: The column to sort by
+        :type column: String
+        :param descending: (Default False) Whether the largest values come first
+        :type descending: Boolean
+        :returns: The ids of the rows, sorted
+        :rtype: pandas Index
+        """
+
+        return self.sorts.sortRows(self.data, rows, column, descending)
+
+    def view(self, rows=None, columns=COLUMNS[1:]):
+        """ returns a view of some rows and columns that holds their positions instead of a copy.
+            It is only valid until the data next changes
+        :param rows: (Default None) The ids of the rows, None for every row
+        :type rows: pandas Index or None
+        :param columns: (Default every column but id) The columns shown
+        :type columns: List of Strings
+        :returns: The view
+        :rtype: RowView
+        """
+
+        return RowView.fromIds(self.data, self.data.index if rows is None else rows, columns)
+
+    def sortView(self, view, column, descending=False):
+        """ returns a view of the same rows sorted by a column, from the cached order of the column
+        :param view: The rows to sort
+        :type view: RowView
+        :param column: The column to sort by
+        :type column: String
+        :param descending: (Default False) Whether the largest values come first
+        :type descending: Boolean
+        :returns: The sorted view
+        :rtype: RowView
+        """
+
+        positions = self.sorts.sortPositions(self.data, view.positions, column, descending)
+
+        return RowView(self.data, positions, view.columns)
+
+    def addPack(self, data, qs_price, pack_type, reward=False):
+        """ prices a newly opened pack and posts its items
+        :param data: The items listed from the pack
+        :type data: List( List( String, String, Integer, Integer ) )
+        :param qs_price: The quick sell price of the pack being posted
+        :type qs_price: Integer
+        :param pack_type: The type of pack the data was gotten from
+        :type pack_type: String
+        :param reward: (Default False) Whether the pack was a free reward pack
+        :type reward: Boolean
+        :returns: The id of the new pack
+        :rtype: Integer
+        """
+
+        # reward packs cost nothing, which keeps the profit and loss statistics accurate
+        if reward:
+            pack_price = 0
+        else:
+            pack_price = PACKS[pack_type]
+
+        return self.postData(data, qs_price, pack_type, pack_price)
+
+    def postData(self, data, qs_price, pack_type, pack_price):
+        """ posts a pack of items to the backend and appends them to the data
+        :param data: The 'meat' of the data to post
+        :type data: List( List( String, String, Integer, Integer ) )
+        :param qs_price: The quick sell price of the pack being posted
+        :type qs_price: Integer
+        :param pack_type: The type of pack the data was gotten from
+        :type pack_type: String
+        :param pack_price: The cost of the pack (This is a field as it may have been a free pack)
+        :type pack_price: Integer
+        :returns: The id of the new pack
+        :rtype: Integer
+        """
+
+        pack_id = int(self.curr_pack_id)
+
+        rows = []
+        for row in data:
+            rows.append(
+                (
+                    int(self.curr_id),
+                    pack_id,
+                    pack_price - qs_price,
+                    pack_type,
+                    row[0],
+                    row[1],
+                    int(row[2]),
+                    int(row[3]),
+                )
+            )
+            self.curr_id += 1
+
+        self.backend.insertRows(rows)
+        self.appendRows([row + (None,) for row in rows])
+
+        self.curr_pack_id += 1
+
+        return pack_id
+
+    def appendRows(self, rows):
+        """ appends rows to the end of the data w/o touching the backend
+        :param rows: The rows to append, in COLUMNS order
+        :type rows: List of tuples
+        :returns: None
+        :rtype: None
+        """
+
+        added = pd.DataFrame.from_records(rows, columns=COLUMNS).set_index("id")
+        added[["sold"]] = added[["sold"]].astype("Int64")
+        start = len(self.data)
+        self.data = pd.concat([self.data, added]) if len(self.data) else added
+        self.sorts.append(self.data, start)
+        self.bumpVersion()
+
+        return
+
+    def checkIds(self, ids):
+        """ raises for ids that are not in the data, such as rows already deleted, so patching them
+            in memory does not add them back as empty rows
+        :param ids: The primary keys of the rows
+        :type ids: List of Integers
+        :returns: None
+        :rtype: None
+        :raises ValueError: If any id is not in the data
+        """
+
+        missing = pd.Index([int(id) for id in ids]).difference(self.data.index)
+        if len(missing):
+            raise ValueError("no row w/ id %s" % ", ".join(str(id) for id in missing))
+
+        return
+
+    def checkSales(self, sales):
+        """ validates sales against the rules of an edit of sold, and casts their prices
+        :param sales: The sales, each as ( id, sale_price )
+        :type sales: List of tuples
+        :returns: The sales w/ integer ids, and prices cast or None for a cleared sale
+        :rtype: List of tuples
+        :raises ValueError: If any row does not exist or any price is invalid
+        """
+
+        self.checkIds([id for id, _ in sales])
+        bins = self.data.loc[[int(id) for id, _ in sales], "bin"].to_numpy()
+
+        return [
+            (int(id), check_bulk("sold", sale_price, bins[i : i + 1]))
+            for i, (id, sale_price) in enumerate(sales)
+        ]
+
+    def postSale(self, id, sale_price):
+        """ posts the sale price of a row
+        :param id: the primary key of the row to update
+        :type id: Integer
+        :param sale_price: The sale price to store
+        :type sale_price: Integer
+        :returns: None
+        :rtype: None
+        :raises ValueError: If the row does not exist or the price is invalid, before anything is
+                            written
+        """
+
+        [(id, sale_price)] = self.checkSales([(id, sale_price)])
+
+        self.backend.updateSale(id, sale_price)
+        self.data.loc[id, "sold"] = pd.NA if sale_price is None else sale_price
+        self.sorts.update(self.data, [self.data.index.get_loc(id)], ["sold"])
+        self.bumpVersion()
+
+        return
+
+    def postSales(self, sales):
+        """ posts the sale prices of many rows w/ a single backend call
+        :param sales: The sales, each as ( id, sale_price )
+        :type sales: List of tuples
+        :returns: None
+        :rtype: None
+        :raises ValueError: If any row does not exist or any price is invalid, before anything is
+                            written
+        """
+
+        sales = self.checkSales(sales)
+
+        self.backend.updateSales(sales)
+        for id, sale_price in sales:
+            self.data.loc[id, "sold"] = pd.NA if sale_price is None else sale_price
+        self.sorts.update(self.data, self.data.index.get_indexer([id for id, _ in sales]), ["sold"])
+        self.bumpVersion()
+
+        return
+
+    def postEdit(self, id, data):
+        """ posts new values for every column of a row
+        :param id: The id of the row to alter
+        :type id: Integer
+        :param data: The new data values
+        :type data: List of types (int, int, string, string, string, int, int, int)
+        :returns: None
+        :rtype: None
+        :raises ValueError: If any value is invalid, before anything is written
+        """
+
+        # nothing is written unless every value is valid, so memory and the backend never disagree
+        self.checkIds([id])
+        data = check_edit(data)
+
+        self.backend.updateRow(int(id), data)
+        self.data.loc[int(id)] = [pd.NA if item is None else item for item in data]
+        self.sorts.update(self.data, [self.data.index.get_loc(int(id))])
+        self.bumpVersion()
+
+        return
+
+    def postDeletion(self, id):
+        """ deletes a row
+        :param id: The id of the row to delete
+        :type id: Integer
+        :returns: None
+        :rtype: None
+        """
+
+        self.postBulkDeletion([id])
+
+        return
+
+    def postBulkDeletion(self, ids):
+        """ deletes a set of rows w/ a single backend call
+        :param ids: The primary keys of the rows to delete
+        :type ids: List of Integers
+        :returns: None
+        :rtype: None
+        """
+
+        self.backend.deleteRows(ids)
+        positions = self.data.index.get_indexer([int(id) for id in ids])
+        self.data.drop([int(id) for id in ids], inplace=True, errors="ignore")
+        self.sorts.remove(positions[positions >= 0])
+        self.bumpVersion()
+
+        return
+
+    def postBulkEdit(self, ids, column, value):
+        """ sets a single column for a set of rows w/ a single backend call
+        :param ids: The primary keys of the rows to alter
+        :type ids: List of Integers
+        :param column: The column to set, one of BULK_COLUMNS
+        :type column: String
+        :param value: The new value, None clears the sale
+        :type value: String, Integer, or None
+        :returns: None
+        :rtype: None
+        :raises ValueError: If the column or value is invalid, before anything is written
+        """
+
+        self.checkIds(ids)
+        value = check_bulk(column, value, self.data.loc[ids, "bin"])
+
+        self.backend.updateRows(ids, column, value)
+        self.data.loc[ids, column] = pd.NA if value is None else value
+        self.sorts.update(self.data, self.data.index.get_indexer(ids), [column])
+        self.bumpVersion()
+
+        return
+
+    def calcStats(self, data=None, key=None, version=None):
+        """ calculates the statistics to be displayed in the stats frame
+        :param data: (Default None) The rows to calc stats on, None uses all data
+        :type data: Pandas DataFrame, rowview RowView, or None
+        :param key: (Default None) The filter the rows came from, such as ( "pack", 12 ). Stats
+                    of a keyed filter are cached until the data changes, None always calculates
+        :type key: Hashable or None
+        :param version: (Default None) The version the rows were taken at, so stats of rows read
+                        before an edit are not cached as the edited version's. None uses the
+                        current version
+        :type version: Integer or None
+        :returns: A dictionary containing the stats and their names
+        :rtype: Dictionary
+        """
+
+        if data is None:
+            data = self.data
+            key = ("all",) if key is None else key
+
+        if key is not None:
+            version = self.version if version is None else version
+            return self.cache.get(("stats",) + tuple(key), version, lambda: self.calcStats(data))
+
+        # the kernels find the distinct packs once for all four stats, w/o intermediate frames
+        cost, revenue, net, avg = stats.stats_kernel(*stats.arrays(data))
+
+        pack_stats = {
+            "Gross Expenses": "(" + str(cost) + ")",
+            "Gross Revenue": str(revenue),
+            "Net Profit": format_money(net),
+            "Profit per Pack": format_money(avg),
+        }
+
+        return pack_stats
+
+    def packReport(self, data=None):
+        """ calculates the cost, revenue, and net profit of each pack
+        :param data: (Default None) The rows to report on, None uses all data
+        :type data: Pandas DataFrame or None
+        :returns: One row per pack, indexed by pack id
+        :rtype: Pandas DataFrame
+        """
+
+        if data is None:
+            data = self.data
+
+        grouped = data.groupby("pack_id", sort=False)
+        report = grouped.agg(
+            pack_type=("pack_type", "first"),
+            items=("name", "size"),
+            cost=("pack_price", "first"),
+            revenue=("sold", "sum"),
+        )
+        report["net"] = report["revenue"] - report["cost"]
+
+        return report
+
+    def breakdown(self, data=None, top=5):
+        """ breaks profit down by pack, pack type, item type, and reward vs paid packs
+        :param data: (Default None) The rows to break down, None uses all data
+        :type data: Pandas DataFrame or None
+        :param top: (Default 5) How many of the best and worst packs to include
+        :type top: Integer
+        :returns: The breakdowns, see stats.breakdown
+        :rtype: Dictionary
+        """
+
+        if data is None:
+            data = self.data
+
+        # large histories are split into partitions and broken down on every core
+        return parallel.breakdown(data, top)
+
+
+def format_money(value):
+    """ formats a value the way the stats pane shows it, w/ losses in parentheses
+    :param value: The value to format
+    :type value: Integer or Float
+    :returns: The formatted value
+    :rtype: String
+    """
+
+    if value < 0:
+        return "(" + str(value).strip("-") + ")"
+
+    return str(value)
+
+
+def main():
+    """ adds packs, enters sales, and prints stats from the command line
+    :returns: None
+    :rtype: None
+    """
+
+    parser = argparse.ArgumentParser(
+        prog="python -m tracker", description="headless FIFA pack tracking"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    add = commands.add_parser("add-pack", help="post a newly opened pack")
+    add.add_argument("pack_type", choices=list(PACKS))
+    add.add_argument("items", nargs="+", help="each item as name,type,bid,bin")
+    add.add_argument("--qs", type=int, default=23, help="quick sell value of the pack")
+    add.add_argument("--reward", action="store_true", help="the pack was free")
+
+    sell = commands.add_parser("sell", help="enter a completed sale")
+    sell.add_argument("search", help="the row id or player name that sold")
+    sell.add_argument("price", type=int)
+
+    for name, text in [
+        ("stats", "print the stats pane"),
+        ("report", "print per pack profits"),
+        ("breakdown", "print profits by pack type, item type and reward"),
+    ]:
+        sub = commands.add_parser(name, help=text)
+        sub.add_argument("--pack", type=int, help="only the given pack id")
+        sub.add_argument("--type", help="only the given pack type")
+        if name == "breakdown":
+            sub.add_argument("--top", type=int, default=5, help="best and worst packs to show")
+
+    args = parser.parse_args()
+
+    tracker = PackTracker(SQLBackend(connect()))
+
+    if args.command == "add-pack":
+        items = [item.split(",") for item in args.items]
+        if any(len(item) != 4 for item in items):
+            parser.error("items must be given as name,type,bid,bin")
+        if any(item[1] not in TYPES for item in items):
+            parser.error("item types must be one of " + ", ".join(TYPES))
+        if validate_listing(items, args.qs) != 1:
+            parser.error("invalid items, bids must be at least 150 and below bins of at least 200")
+
+        pack_id = tracker.addPack(items, args.qs, args.pack_type, args.reward)
+        print("added pack %d with %d items" % (pack_id, len(items)))
+
+    elif args.command == "sell":
+        try:
+            id = int(args.search)
+        except ValueError:
+            found = tracker.findRows(args.search)
+            if len(found) != 1:
+                parser.error("%d rows match %s, use a row id" % (len(found), args.search))
+            id = int(found[0])
+
+        if id not in tracker.data.index:
+            parser.error("no row with id %d" % id)
+
+        try:
+            tracker.postSale(id, args.price)
+        except ValueError as error:
+            parser.error(str(error))
+        print("row %d sold for %d" % (id, args.price))
+
+    else:
+        data = tracker.data
+        if args.pack is not None:
+            data = data.loc[tracker.filterPack(args.pack)]
+        if args.type is not None:
+            data = data.loc[tracker.filterType(args.type)]
+
+        if args.command == "stats":
+            for key, value in tracker.calcStats(data).items():
+                print("%-16s %s" % (key, value))
+        elif args.command == "report":
+            print(tracker.packReport(data).to_string())
+        else:
+            parts = tracker.breakdown(data, args.top)
+            for key in ["pack_type", "reward", "item_type", "best", "worst"]:
+                print("==== %s ====" % key.replace("_", " "))
+                print(parts[key].to_string() + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,253 @@
+""" transfer.py
+
+This file contains functions to move pack history in and out of the MSSQL table in bulk,
+streaming rows in the COLUMNS layout to and from CSV or JSONL files a chunk at a time
+
+This file contains functions:
+    * file_format( path, fmt ) - returns the file format to use for a path
+    * export_history( cursor, path, fmt, chunksize ) - streams the table out to a file
+    * read_chunks( path, fmt, chunksize, columns ) - yields DataFrame chunks read from a file
+    * validate_chunk( chunk ) - returns a message for each invalid row of a chunk
+    * import_history( conn, path, fmt, chunksize ) - validates and bulk loads a file into the table
+    * main( ) - command line entry point
+
+Created October 19th, 2026.
+"""
+
+import argparse
+import csv
+import json
+import os
+
+import pandas as pd
+
+from config import COLUMNS, PACKS, TYPES, TABLE, INVALID_CHARS
+from tracker import connect
+
+CHUNKSIZE = 10000
+
+INTEGER_COLUMNS = ["id", "pack_id", "pack_price", "bid", "bin", "sold"]
+
+
+def file_format(path, fmt=None):
+    """ returns the format of a transfer file, guessing from the extension if not given
+    :param path: The path of the file
+    :type path: String
+    :param fmt: (Default None) Either "csv" or "jsonl", None guesses from the extension
+    :type fmt: String or None
+    :returns: The format of the file
+    :rtype: String
+    """
+
+    if fmt is None:
+        fmt = "jsonl" if os.path.splitext(path)[1].lower() in (".jsonl", ".json") else "csv"
+
+    if fmt not in ("csv", "jsonl"):
+        raise ValueError("unknown transfer format %s" % fmt)
+
+    return fmt
+
+
+def export_history(cursor, path, fmt=None, chunksize=CHUNKSIZE):
+    """ streams every row of the table to a file w/o holding the table in memory
+    :param cursor: A cursor connected to the database
+    :type cursor: pyodbc cursor
+    :param path: The file to write
+    :type path: String
+    :param fmt: (Default None) Either "csv" or "jsonl", None guesses from the extension
+    :type fmt: String or None
+    :param chunksize: (Default CHUNKSIZE) The number of rows fetched at a time
+    :type chunksize: Integer
+    :returns: The number of rows written
+    :rtype: Integer
+    """
+
+    fmt = file_format(path, fmt)
+    cursor.execute("SELECT " + ",".join(COLUMNS) + " FROM " + TABLE + " ORDER BY id")
+
+    written = 0
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        if fmt == "csv":
+            writer = csv.writer(f)
+            writer.writerow(COLUMNS)
+
+        while True:
+            rows = cursor.fetchmany(chunksize)
+            if not rows:
+                break
+
+            # nchar columns come back padded w/ whitespace
+            rows = [
+                [item.strip() if isinstance(item, str) else item for item in row]
+                for row in rows
+            ]
+
+            if fmt == "csv":
+                writer.writerows(rows)
+            else:
+                f.writelines(json.dumps(dict(zip(COLUMNS, row))) + "\n" for row in rows)
+
+            written += len(rows)
+
+    return written
+
+
+def read_chunks(path, fmt=None, chunksize=CHUNKSIZE, columns=COLUMNS):
+    """ yields the rows of a transfer file as DataFrames of at most chunksize rows
+    :param path: The file to read
+    :type path: String
+    :param fmt: (Default None) Either "csv" or "jsonl", None guesses from the extension
+    :type fmt: String or None
+    :param chunksize: (Default CHUNKSIZE) The number of rows per chunk
+    :type chunksize: Integer
+    :param columns: (Default COLUMNS) The columns to read, csv files skip parsing the others
+    :type columns: List of Strings
+    :returns: A generator of chunks
+    :rtype: Generator of pandas DataFrames
+    """
+
+    fmt = file_format(path, fmt)
+
+    if fmt == "csv":
+        reader = pd.read_csv(
+            path,
+            chunksize=chunksize,
+            usecols=lambda col: col in columns,
+            dtype={"pack_type": str, "name": str, "type": str},
+            keep_default_na=False,
+            na_values={"sold": [""]},
+        )
+    else:
+        reader = pd.read_json(path, lines=True, chunksize=chunksize, dtype=False)
+
+    for chunk in reader:
+        missing = [col for col in columns if col not in chunk]
+        if missing:
+            raise ValueError("file is missing columns " + ", ".join(missing))
+        yield chunk[columns]
+
+
+def validate_chunk(chunk):
+    """ checks a chunk against the same rules the dialogs enforce, one vectorized pass per rule
+    :param chunk: The rows to check, in the COLUMNS layout
+    :type chunk: pandas DataFrame
+    :returns: The coerced chunk, and a message for each invalid row keyed by chunk index
+    :rtype: Tuple of types (pandas DataFrame, Dictionary)
+    """
+
+    chunk = chunk.copy()
+    errors = {}
+
+    def flag(mask, message):
+        for idx in chunk.index[mask]:
+            errors.setdefault(idx, message)
+
+    # every integer column must parse, sold may be empty
+    for col in INTEGER_COLUMNS:
+        numbers = pd.to_numeric(chunk[col], errors="coerce")
+        bad = numbers.isna() & chunk[col].notna() if col == "sold" else numbers.isna()
+        bad |= numbers.notna() & (numbers != numbers.round())
+        flag(bad, "%s is not an integer" % col)
+        chunk[col] = numbers.where(~bad).round().astype("Int64")
+
+    for col in ["pack_type", "name", "type"]:
+        chunk[col] = chunk[col].fillna("").astype(str).str.strip()
+
+    name = chunk["name"]
+    flag(name.str.contains(INVALID_CHARS.pattern, regex=True), "invalid name characters")
+    flag(name == "", "empty name")
+    flag(name.str.len() > 24, "name longer than 24 characters")
+    flag(~chunk["pack_type"].isin(list(PACKS)), "unknown pack type")
+    flag(~chunk["type"].isin(TYPES), "unknown item type")
+    flag((chunk["bid"] < 150).fillna(False), "bid less than 150")
+    flag((chunk["bin"] < 200).fillna(False), "bin less than 200")
+    flag((chunk["bid"] > chunk["bin"]).fillna(False), "bid greater than bin")
+    flag((chunk["sold"] < 0).fillna(False), "negative sale price")
+    flag((chunk["sold"] > chunk["bin"]).fillna(False), "sale price greater than bin")
+    flag(chunk["id"].duplicated(keep=False).fillna(False), "duplicate id")
+
+    return chunk, errors
+
+
+def import_history(conn, path, fmt=None, chunksize=CHUNKSIZE):
+    """ validates a transfer file chunk by chunk and bulk loads it in a single transaction
+    :param conn: A connection to the database
+    :type conn: pyodbc connection
+    :param path: The file to read
+    :type path: String
+    :param fmt: (Default None) Either "csv" or "jsonl", None guesses from the extension
+    :type fmt: String or None
+    :param chunksize: (Default CHUNKSIZE) The number of rows validated and inserted at a time
+    :type chunksize: Integer
+    :returns: The number of rows loaded
+    :rtype: Integer
+    """
+
+    cursor = conn.cursor()
+
+    # pyodbc sends a whole parameter array per round trip when this is set
+    if hasattr(cursor, "fast_executemany"):
+        cursor.fast_executemany = True
+
+    query = (
+        "INSERT INTO "
+        + TABLE
+        + "("
+        + ",".join(COLUMNS)
+        + ") VALUES ("
+        + ",".join("?" * len(COLUMNS))
+        + ")"
+    )
+
+    loaded = 0
+    try:
+        for chunk in read_chunks(path, fmt, chunksize):
+            chunk, errors = validate_chunk(chunk)
+            if errors:
+                shown = sorted(errors.items())[:10]
+                raise ValueError(
+                    "invalid rows, nothing was imported\n"
+                    + "\n".join("row %d: %s" % (idx + 1, msg) for idx, msg in shown)
+                )
+
+            # hand the driver builtins, w/ NULL for unsold rows
+            rows = [
+                tuple(None if pd.isna(item) else item for item in row)
+                for row in chunk.astype(object).itertuples(index=False, name=None)
+            ]
+            cursor.executemany(query, rows)
+            loaded += len(rows)
+    except Exception:
+        conn.rollback()
+        raise
+
+    conn.commit()
+
+    return loaded
+
+
+def main():
+    """ imports or exports the pack history from the command line
+    :returns: None
+    :rtype: None
+    """
+
+    parser = argparse.ArgumentParser(description="bulk import or export pack history")
+    parser.add_argument("action", choices=["import", "export"])
+    parser.add_argument("path")
+    parser.add_argument("--format", choices=["csv", "jsonl"], default=None)
+    parser.add_argument("--chunksize", type=int, default=CHUNKSIZE)
+    args = parser.parse_args()
+
+    conn = connect()
+
+    if args.action == "export":
+        count = export_history(conn.cursor(), args.path, args.format, args.chunksize)
+        print("exported %d rows to %s" % (count, args.path))
+    else:
+        count = import_history(conn, args.path, args.format, args.chunksize)
+        print("imported %d rows from %s" % (count, args.path))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+""" viewcache.py
+
+This file contains the cache the tracker keeps of filtered rows and their stats. Entries are keyed
+by what was asked for, such as the rows of a pack or the stats of a pack type, together w/ the
+version of the data they were computed from. Every change to the data bumps its version, so a
+stale entry can never be returned, and the least recently used entries are evicted once the cache
+is full. Hits and misses are counted here and in metrics so the size can be tuned
+
+This file contains classes:
+    * ViewCache - Class for a versioned least recently used cache
+
+This file contains methods:
+    Members of Class ViewCache:
+        * __init__( self, size, name ) - creates an empty cache
+        * get( self, key, version, compute ) - returns a cached value, computing it on a miss
+        * clear( self ) - drops every entry
+        * hitRate( self ) - returns the fraction of lookups that hit
+        * summary( self ) - returns the size, hits, misses, evictions and hit rate
+
+Created October 19th, 2026.
+"""
+
+import collections
+import threading
+
+import metrics
+from config import CACHE_SIZE
+
+
+class ViewCache:
+    """ A least recently used cache whose entries are only valid for one version of the data
+
+        __init__( self, size, name )
+        size - (Default CACHE_SIZE) the most entries to keep
+        name - (Default "cache") the prefix of the hit and miss counters in metrics
+    """
+
+    def __init__(self, size=CACHE_SIZE, name="cache"):
+
+        self.size = size
+        self.name = name
+        self.entries = collections.OrderedDict()
+        self.lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, version, compute):
+        """ returns the value cached for a key at a version, computing and caching it on a miss
+        :param key: What is being asked for, such as ( "pack", 12 )
+        :type key: Hashable
+        :param version: The version of the data the value must have been computed from
+        :type version: Integer
+        :param compute: Computes the value when it is not cached
+        :type compute: Function w/o arguments
+        :returns: The value
+        :rtype: Any
+        """
+
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry[0] == version:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                metrics.count(self.name + ".hits")
+                return entry[1]
+
+            self.misses += 1
+            metrics.count(self.name + ".misses")
+
+        value = compute()
+
+        with self.lock:
+            # an entry of an older version is replaced in place rather than evicting another
+            self.entries[key] = (version, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.size:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+        return value
+
+    def clear(self):
+        """ drops every entry, keeping the hit and miss counts
+        :returns: None
+        :rtype: None
+        """
+
+        with self.lock:
+            self.entries.clear()
+
+        return
+
+    def hitRate(self):
+        """ returns the fraction of lookups that were answered from the cache
+        :returns: The hit rate, 0.0 before any lookups
+        :rtype: Float
+        """
+
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def summary(self):
+        """ returns the state of the cache for tuning its size
+        :returns: The size, entries, hits, misses, evictions and hit rate
+        :rtype: Dictionary
+        """
+
+        return {
+            "size": self.size,
+            "entries": len(self.entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hitRate(), 4),
+        }
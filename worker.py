@@ -0,0 +1,170 @@
+""" worker.py
+
+This file contains a background worker for the GUI where the newest request wins. Requests are
+run one at a time on a worker thread, a request still waiting when a newer one arrives is dropped
+w/o running, and the result of a request that was superseded while it ran is thrown away. Results
+are handed back on the tk thread, polled w/ root.after only while work is outstanding, so only the
+last of a burst of list box clicks is ever drawn
+
+This file contains classes:
+    * LatestWorker - Class for running the latest request off the event loop
+
+This file contains methods:
+    Members of Class LatestWorker:
+        * __init__( self, root, poll ) - starts the worker thread
+        * submit( self, func, args, done, failed ) - runs a request, superseding any earlier one
+        * current( self, ticket ) - returns whether a request is still the newest
+        * busy( self ) - returns whether a request is waiting, running, or undelivered
+        * run( self ) - the worker thread, runs the newest waiting request
+        * deliver( self ) - hands finished results to their callbacks on the tk thread
+        * stop( self ) - stops the worker thread
+
+Created October 19th, 2026.
+"""
+
+import queue
+import threading
+
+import metrics
+
+# seconds between checks for a finished result, a frame at 60 hz
+POLL_SECONDS = 0.016
+
+
+class LatestWorker:
+    """ Runs requests on a background thread, where each request supersedes every earlier one
+
+        __init__( self, root, poll )
+        root - the tk root results are delivered on
+        poll - (Default POLL_SECONDS) seconds between checks for a finished result
+    """
+
+    def __init__(self, root, poll=POLL_SECONDS):
+
+        self.root = root
+        self.poll = poll
+
+        self.ticket = 0
+        self.waiting = None
+        self.running = False
+        self.polling = False
+        self.stopped = False
+        self.results = queue.Queue()
+
+        self.wakeup = threading.Condition()
+        self.thread = threading.Thread(target=self.run, name="latest worker", daemon=True)
+        self.thread.start()
+
+    def submit(self, func, args=(), done=None, failed=None):
+        """ queues a request, dropping any request still waiting and superseding any running one
+        :param func: The work, run on the worker thread. It must not touch tk
+        :type func: Function
+        :param args: (Default ()) The arguments to the work
+        :type args: Tuple
+        :param done: (Default None) Called w/ the result on the tk thread, if still the newest
+        :type done: Function or None
+        :param failed: (Default None) Called w/ the exception on the tk thread, if still the newest
+        :type failed: Function or None
+        :returns: The ticket of the request
+        :rtype: Integer
+        """
+
+        with self.wakeup:
+            self.ticket += 1
+            if self.waiting is not None:
+                metrics.count("worker.dropped")
+            elif self.running:
+                metrics.count("worker.superseded")
+            self.waiting = (self.ticket, func, args, done, failed)
+            self.wakeup.notify()
+
+        if not self.polling:
+            self.polling = True
+            self.root.after(int(self.poll * 1000), self.deliver)
+
+        return self.ticket
+
+    def current(self, ticket):
+        """ returns whether a request is still the newest, long running work may check to stop early
+        :param ticket: The ticket submit returned
+        :type ticket: Integer
+        :returns: Whether no newer request was submitted
+        :rtype: Boolean
+        """
+
+        return ticket == self.ticket
+
+    def busy(self):
+        """ returns whether any request is waiting, running, or finished but not yet delivered
+        :returns: Whether the worker has outstanding work
+        :rtype: Boolean
+        """
+
+        with self.wakeup:
+            return self.waiting is not None or self.running or not self.results.empty()
+
+    def run(self):
+        """ runs the newest waiting request, over and over, until stopped
+        :returns: None
+        :rtype: None
+        """
+
+        while True:
+            with self.wakeup:
+                while self.waiting is None and not self.stopped:
+                    self.wakeup.wait()
+                if self.stopped:
+                    return
+                ticket, func, args, done, failed = self.waiting
+                self.waiting = None
+                self.running = True
+
+            try:
+                result = (ticket, done, func(*args), None)
+            except Exception as e:
+                result = (ticket, failed, None, e)
+
+            with self.wakeup:
+                self.results.put(result)
+                self.running = False
+
+    def deliver(self):
+        """ hands finished results to their callbacks if they are still the newest, then keeps
+            polling while work is outstanding
+        :returns: None
+        :rtype: None
+        """
+
+        while True:
+            try:
+                ticket, callback, value, error = self.results.get_nowait()
+            except queue.Empty:
+                break
+
+            if not self.current(ticket):
+                metrics.count("worker.discarded")
+                continue
+
+            if callback is not None:
+                callback(value if error is None else error)
+            elif error is not None:
+                raise error
+
+        if self.busy() and not self.stopped:
+            self.root.after(int(self.poll * 1000), self.deliver)
+        else:
+            self.polling = False
+
+        return
+
+    def stop(self):
+        """ stops the worker thread once the request it is running finishes
+        :returns: None
+        :rtype: None
+        """
+
+        with self.wakeup:
+            self.stopped = True
+            self.wakeup.notify()
+
+        return